@@ -15,6 +15,14 @@ from src.koios_logger import KoiosLogger
 # Import our mock implementation
 from src.nats_mock import Connection, ConnectionState
 
+try:
+    # Decodes framed Mycelium envelopes (available when run from the repository root)
+    from subsystems.MYCELIUM.core.codec import FRAME_MAGIC, decode_envelope
+
+    HAS_MYCELIUM_CODEC = True
+except ImportError:
+    HAS_MYCELIUM_CODEC = False
+
 # Setup KoiosLogger
 logger = KoiosLogger.get_logger("DASHBOARD.NatsClient")
 
@@ -145,21 +153,22 @@ class NatsConnectionManager:
             msg: The NATS message
         """
         subject = msg.subject
-        data = msg.data.decode()
+
+        # Route on the subject first, so messages nobody displays are never decoded
+        if subject.startswith("egos.status."):
+            processor = self._process_status_update
+        elif subject.startswith("egos.metrics."):
+            processor = self._process_metrics_update
+        elif subject.startswith("egos.alerts."):
+            processor = self._process_alert
+        elif subject.startswith("egos.heartbeat."):
+            processor = self._process_heartbeat
+        else:
+            processor = None
 
         try:
-            # Try to parse as JSON
-            payload = json.loads(data)
-
-            # Process based on subject pattern
-            if subject.startswith("egos.status."):
-                self._process_status_update(subject, payload)
-            elif subject.startswith("egos.metrics."):
-                self._process_metrics_update(subject, payload)
-            elif subject.startswith("egos.alerts."):
-                self._process_alert(subject, payload)
-            elif subject.startswith("egos.heartbeat."):
-                self._process_heartbeat(subject, payload)
+            if processor is not None:
+                processor(subject, self._decode_payload(msg.data))
 
             # Log message received
             KoiosLogger.log_system_event(
@@ -174,8 +183,9 @@ class NatsConnectionManager:
                 },
             )
 
-        except json.JSONDecodeError:
+        except ValueError:  # Includes json.JSONDecodeError
             # Handle non-JSON messages
+            data = msg.data.decode("utf-8", errors="replace")
             st.session_state.nats_messages.append(f"Raw message on {subject}: {data}")
 
             # Log invalid message format
@@ -186,6 +196,26 @@ class NatsConnectionManager:
                 {"subject": subject, "data": data[:100] + "..." if len(data) > 100 else data},
             )
 
+    def _decode_payload(self, data):
+        """
+        Decode message data: plain JSON or a framed Mycelium envelope (any codec,
+        compressed or split). Of a Mycelium envelope, only the payload is returned.
+
+        Raises:
+            ValueError: If the data cannot be decoded
+        """
+        if HAS_MYCELIUM_CODEC and data.startswith(FRAME_MAGIC):
+            message, _ = decode_envelope(data)
+        else:
+            message = json.loads(data.decode("utf-8"))
+        if (
+            isinstance(message, dict)
+            and "payload" in message
+            and ("metadata" in message or "header" in message)
+        ):
+            return message["payload"]
+        return message
+
     def _process_status_update(self, subject, payload):
         """Process subsystem status updates."""
         # Extract subsystem from subject (e.g., egos.status.ETHIK)
@@ -0,0 +1,2 @@
+# subsystems/ETHIK/benchmarks/__init__.py
+"""Performance benchmarks for the ETHIK subsystem (see run_benchmarks.py)."""
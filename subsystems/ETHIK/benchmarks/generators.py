@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Benchmark Generators: Synthetic rule sets, content and action contexts.
+
+All generators are deterministic for a given seed, so results of different commits
+are measured on identical inputs. Sanitization rules mix literal, regex and
+conditional (context-gated) rules; validation rules mix condition expressions over
+`action_context` with content keywords. Content is filler text with PII samples
+(e-mail addresses, phone numbers, CPF numbers, API keys) inserted at a controlled
+density.
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+# PII kinds inserted into content, with a sample generator each
+PII_KINDS = ("email", "phone", "cpf", "api_key")
+# Regex patterns matching the generated PII, used by generated sanitization rules
+PII_PATTERNS = {
+    "email": r"[\w.+-]+@[\w-]+\.[\w.]+",
+    "phone": r"\(\d{2}\) \d{4,5}-\d{4}",
+    "cpf": r"\d{3}\.\d{3}\.\d{3}-\d{2}",
+    "api_key": r"sk_[A-Za-z0-9]{24}",
+}
+ACTION_TYPES = ("file_write", "file_read", "chat", "tool_call", "deploy", "config_change")
+COMPONENTS = ("ETHIK", "KOIOS", "CORUJA", "MYCELIUM", "ATLAS", "NEXUS", "CRONOS")
+
+_WORDS = (
+    "ethical system data user request process model value context review quality "
+    "response analysis module network secure private public policy access record "
+    "message service report update change result source target content action"
+).split()
+_ALPHANUMERIC = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+def _pii_sample(kind: str, rng: random.Random) -> str:
+    if kind == "email":
+        return f"{rng.choice(_WORDS)}.{rng.randint(1, 999)}@{rng.choice(_WORDS)}.com"
+    if kind == "phone":
+        return f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+    if kind == "cpf":
+        digits = [rng.randint(0, 9) for _ in range(11)]
+        return "{}{}{}.{}{}{}.{}{}{}-{}{}".format(*digits)
+    return "sk_" + "".join(rng.choice(_ALPHANUMERIC) for _ in range(24))
+
+
+def generate_content(size: int, pii_density: float = 0.01, seed: int = 0) -> str:
+    """Generates text of about `size` characters with PII samples mixed in.
+
+    Args:
+        size: Target length in characters (the result is cut to exactly this length).
+        pii_density: Fraction of tokens that are PII samples (0 to 1).
+        seed: Random seed.
+    """
+    rng = random.Random(seed)
+    # Filler is built from a shuffled block of words, repeated, so large documents
+    # are cheap to generate; PII tokens are drawn individually
+    block = " ".join(rng.choice(_WORDS) for _ in range(512))
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        if pii_density > 0 and rng.random() < pii_density:
+            token = _pii_sample(rng.choice(PII_KINDS), rng)
+        else:
+            start = rng.randrange(0, len(block) - 64)
+            token = block[start : start + rng.randint(16, 64)].strip()
+        parts.append(token)
+        length += len(token) + 1
+    return " ".join(parts)[:size]
+
+
+def generate_sanitization_rules(
+    count: int,
+    seed: int = 0,
+    literal_ratio: float = 0.4,
+    conditional_ratio: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """Generates sanitization rule definitions (as stored in sanitization_rules.json).
+
+    Every rule has one pattern. The first rules cover the PII kinds of
+    generate_content; the rest are literal words (`literal_ratio`) or word-based
+    regexes. A `conditional_ratio` share of rules only applies to some contexts.
+
+    Args:
+        count: Number of rules.
+        seed: Random seed.
+        literal_ratio: Share of literal (non-regex) rules.
+        conditional_ratio: Share of rules with a context condition.
+    """
+    rng = random.Random(seed)
+    rules: List[Dict[str, Any]] = []
+    for number in range(count):
+        if number < len(PII_KINDS):
+            kind = PII_KINDS[number]
+            pattern, replacement = PII_PATTERNS[kind], f"[{kind.upper()}]"
+        elif rng.random() < literal_ratio:
+            pattern = f"{rng.choice(_WORDS)}{number}"
+            replacement = "[TERM]"
+        else:
+            pattern = rf"\b{rng.choice(_WORDS)}[a-z]{{0,3}}{number}\b"
+            replacement = "[MATCH]"
+        conditions = []
+        if number >= len(PII_KINDS) and rng.random() < conditional_ratio:
+            conditions = [f"context.get('channel') != '{rng.choice(('internal', 'audit'))}'"]
+        rules.append(
+            {
+                "id": f"bench-sanitize-{number:05d}",
+                "name": f"Benchmark rule {number}",
+                "description": "Synthetic benchmark rule",
+                "severity": rng.choice(("low", "medium", "high", "critical")),
+                "patterns": [pattern],
+                "replacements": {pattern: replacement},
+                "conditions": conditions,
+            }
+        )
+    return rules
+
+
+def generate_validation_rules(
+    count: int, seed: int = 0, keyword_ratio: float = 0.3
+) -> List[Dict[str, Any]]:
+    """Generates validation rule definitions (as stored in validation_rules.json).
+
+    Rules are gated by an action type, an affected component or a context key, as
+    real rules are; a `keyword_ratio` share also carries content keywords.
+
+    Args:
+        count: Number of rules.
+        seed: Random seed.
+        keyword_ratio: Share of rules with keyword conditions.
+    """
+    rng = random.Random(seed)
+    rules: List[Dict[str, Any]] = []
+    for number in range(count):
+        gate = rng.random()
+        if gate < 0.6:
+            conditions = [f"action_context.get('action_type') == '{rng.choice(ACTION_TYPES)}'"]
+        elif gate < 0.85:
+            component = rng.choice(COMPONENTS)
+            conditions = [f"'{component}' in action_context.get('affected_components', [])"]
+        else:
+            conditions = [f"action_context.get('risk_{number % 50}', 0) > 0.5"]
+        if rng.random() < keyword_ratio:
+            conditions += [f"{rng.choice(_WORDS)}{number % 100}", rng.choice(_WORDS)]
+        rules.append(
+            {
+                "id": f"bench-validate-{number:05d}",
+                "name": f"Benchmark rule {number}",
+                "description": "Synthetic benchmark rule",
+                "severity": rng.choice(("low", "medium", "high", "critical")),
+                "conditions": conditions,
+                "threshold": rng.choice((0.5, 0.8, 0.95)),
+                "action": rng.choice(("log", "warn", "block")),
+            }
+        )
+    return rules
+
+
+def generate_action_contexts(
+    count: int,
+    content_size: int = 256,
+    repeat_ratio: float = 0.0,
+    seed: int = 0,
+    pii_density: Optional[float] = 0.01,
+) -> List[Dict[str, Any]]:
+    """Generates action contexts for validate_action.
+
+    Args:
+        count: Number of contexts.
+        content_size: Length of each context's content.
+        repeat_ratio: Share of contexts that repeat an earlier one (as retries do).
+        seed: Random seed.
+        pii_density: PII density of the content.
+    """
+    rng = random.Random(seed)
+    contexts: List[Dict[str, Any]] = []
+    for number in range(count):
+        if contexts and rng.random() < repeat_ratio:
+            contexts.append(dict(rng.choice(contexts)))
+            continue
+        contexts.append(
+            {
+                "action_type": rng.choice(ACTION_TYPES),
+                "affected_components": rng.sample(COMPONENTS, 2),
+                f"risk_{number % 50}": rng.random(),
+                "content": generate_content(content_size, pii_density or 0.0, seed + number),
+            }
+        )
+    return contexts
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Benchmark Harness: Timing, latency percentiles, peak memory and comparison.
+
+`measure()` and `measure_async()` run an operation for a number of iterations (after a
+warm-up) and return a BenchmarkResult with throughput and p50/p95/p99 latency. Peak RSS
+is the process-wide peak at the end of the benchmark: it never decreases, so compare it
+between runs of the same suite rather than between cases. Reports are plain JSON, and
+`compare_reports()` flags cases whose throughput or p99 latency regressed beyond a
+tolerance.
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import json
+import math
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    import resource  # Unix only
+
+    HAS_RESOURCE = True
+except ImportError:
+    HAS_RESOURCE = False
+
+try:
+    import psutil  # Optional: peak memory on Windows
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+REPORT_FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one benchmark case."""
+
+    name: str
+    params: Dict[str, Any]
+    iterations: int
+    total_seconds: float
+    ops_per_sec: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    bytes_per_op: int = 0  # Input size per operation, for throughput in bytes
+    peak_rss_bytes: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Identifies the case across reports: name plus sorted parameters."""
+        params = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Returns the peak resident set size of this process, if it can be determined."""
+    if HAS_RESOURCE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+    if HAS_PSUTIL:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+
+def _result(
+    name: str,
+    params: Dict[str, Any],
+    latencies: List[float],
+    total: float,
+    bytes_per_op: int,
+) -> BenchmarkResult:
+    latencies.sort()
+    return BenchmarkResult(
+        name=name,
+        params=params,
+        iterations=len(latencies),
+        total_seconds=total,
+        ops_per_sec=len(latencies) / total if total > 0 else 0.0,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        max_ms=latencies[-1] * 1000 if latencies else 0.0,
+        bytes_per_op=bytes_per_op,
+        peak_rss_bytes=peak_rss_bytes(),
+    )
+
+
+def measure(
+    name: str,
+    operation: Callable[[int], Any],
+    iterations: int,
+    params: Optional[Dict[str, Any]] = None,
+    warmup: int = 1,
+    bytes_per_op: int = 0,
+) -> BenchmarkResult:
+    """Times a synchronous operation.
+
+    Args:
+        name: Benchmark name.
+        operation: Called with the iteration number (warm-up runs get negative numbers).
+        iterations: Measured iterations.
+        params: Parameters identifying the case (rule count, content size, ...).
+        warmup: Unmeasured iterations run first.
+        bytes_per_op: Input size per operation, reported for byte throughput.
+    """
+    for number in range(-warmup, 0):
+        operation(number)
+    clock = time.perf_counter
+    latencies: List[float] = []
+    started = clock()
+    for number in range(iterations):
+        op_start = clock()
+        operation(number)
+        latencies.append(clock() - op_start)
+    return _result(name, params or {}, latencies, clock() - started, bytes_per_op)
+
+
+def measure_async(
+    name: str,
+    operation: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    params: Optional[Dict[str, Any]] = None,
+    warmup: int = 1,
+    bytes_per_op: int = 0,
+    concurrency: int = 1,
+) -> BenchmarkResult:
+    """Times a coroutine operation, optionally with several operations in flight.
+
+    With `concurrency` > 1, that many workers share the iterations on one event loop;
+    latency is measured per operation and throughput over the whole run.
+    """
+
+    async def run() -> BenchmarkResult:
+        for number in range(-warmup, 0):
+            await operation(number)
+        clock = time.perf_counter
+        latencies: List[float] = []
+        numbers = iter(range(iterations))
+
+        async def worker() -> None:
+            for number in numbers:
+                op_start = clock()
+                await operation(number)
+                latencies.append(clock() - op_start)
+
+        started = clock()
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        return _result(name, params or {}, latencies, clock() - started, bytes_per_op)
+
+    return asyncio.run(run())
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def build_report(results: Sequence[BenchmarkResult], suite: str) -> Dict[str, Any]:
+    """Builds the machine-readable report of a benchmark run."""
+    return {
+        "format_version": REPORT_FORMAT_VERSION,
+        "suite": suite,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [dict(asdict(result), key=result.key) for result in results],
+    }
+
+
+def write_report(report: Dict[str, Any], path: Union[str, Path]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: Union[str, Path]) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.10
+) -> List[Dict[str, Any]]:
+    """Compares two reports case by case.
+
+    Args:
+        baseline: Report of the reference run.
+        current: Report of the run to check.
+        tolerance: Allowed relative loss of throughput / growth of p99 latency.
+
+    Returns:
+        One entry per case present in both reports, with the relative changes and a
+        'regression' flag.
+    """
+    reference = {result["key"]: result for result in baseline.get("results", [])}
+    comparison: List[Dict[str, Any]] = []
+    for result in current.get("results", []):
+        before = reference.get(result["key"])
+        if before is None:
+            continue
+        throughput_change = (
+            result["ops_per_sec"] / before["ops_per_sec"] - 1 if before["ops_per_sec"] else 0.0
+        )
+        p99_change = result["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0.0
+        comparison.append(
+            {
+                "key": result["key"],
+                "ops_per_sec": (before["ops_per_sec"], result["ops_per_sec"]),
+                "p99_ms": (before["p99_ms"], result["p99_ms"]),
+                "throughput_change": throughput_change,
+                "p99_change": p99_change,
+                "regression": throughput_change < -tolerance or p99_change > tolerance,
+            }
+        )
+    return comparison
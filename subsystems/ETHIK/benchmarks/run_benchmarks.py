@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Benchmarks: Throughput and latency of sanitization, validation and handlers.
+
+Usage:
+    python -m subsystems.ETHIK.benchmarks.run_benchmarks --profile quick \\
+        --output ethik_bench.json [--baseline previous.json --tolerance 0.1]
+
+Every case runs on generated rules and content (see generators.py) and reports ops/sec,
+p50/p95/p99 latency and peak RSS. With --baseline, cases whose throughput dropped or
+whose p99 latency grew by more than the tolerance are listed and the exit code is 1.
+Result caches are disabled except in the '*_cached' cases, so repeated inputs measure
+the full rule evaluation.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import sys
+import tempfile
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from subsystems.ETHIK.benchmarks.generators import (
+    generate_action_contexts,
+    generate_content,
+    generate_sanitization_rules,
+    generate_validation_rules,
+)
+from subsystems.ETHIK.benchmarks.harness import (
+    BenchmarkResult,
+    build_report,
+    compare_reports,
+    load_report,
+    measure,
+    measure_async,
+    write_report,
+)
+from subsystems.ETHIK.core.sanitizer import EthikSanitizer
+from subsystems.ETHIK.core.validator import EthikValidator
+
+KB = 1024
+MB = 1024 * KB
+
+# Case matrix per profile; iterations shrink for large content (see _iterations)
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "quick": {
+        "sanitize_rules": [10, 100],
+        "content_sizes": [1 * KB, 64 * KB],
+        "validate_rules": [10, 1000],
+        "pii_density": 0.01,
+        "iterations": 50,
+        "bytes_budget": 16 * MB,
+    },
+    "full": {
+        "sanitize_rules": [10, 100, 1000, 10000],
+        "content_sizes": [1 * KB, 64 * KB, 1 * MB, 50 * MB],
+        "validate_rules": [10, 100, 1000, 10000],
+        "pii_density": 0.01,
+        "iterations": 500,
+        "bytes_budget": 512 * MB,
+    },
+}
+SUITES = ("sanitize", "sanitize_async", "validate", "handlers")
+
+
+class _NullInterface:
+    """Mycelium stand-in that accepts and drops every message."""
+
+    async def publish(self, topic: str, message: Any) -> None:
+        return None
+
+    async def subscribe(self, topic: str, handler: Any) -> None:
+        return None
+
+
+def _iterations(profile: Dict[str, Any], size: int) -> int:
+    """Iterations for a content size: the profile's count, capped by its byte budget."""
+    return max(3, min(profile["iterations"], profile["bytes_budget"] // max(1, size)))
+
+
+def _write_rules(directory: Path, name: str, rules: List[Dict[str, Any]]) -> Path:
+    path = directory / name
+    path.write_text(json.dumps({"rules": rules}), encoding="utf-8")
+    return path
+
+
+def _make_sanitizer(
+    directory: Path, rule_count: int, log_level: int, parallel: bool = False
+) -> EthikSanitizer:
+    rules_file = _write_rules(
+        directory, f"sanitize_{rule_count}.json", generate_sanitization_rules(rule_count)
+    )
+    logger = logging.getLogger("ETHIK.Benchmark.Sanitizer")
+    logger.setLevel(log_level)
+    config = {
+        "rules_file": str(rules_file),
+        "performance": {
+            "caching": {"enabled": False},
+            "process_pool": {"enabled": False},
+            "parallel_processing": {"enabled": parallel, "max_workers": 4},
+        },
+    }
+    return EthikSanitizer(config, _NullInterface(), logger)
+
+
+def _make_validator(
+    directory: Path, rule_count: int, log_level: int, cache: bool = False
+) -> EthikValidator:
+    rules_file = _write_rules(
+        directory, f"validate_{rule_count}.json", generate_validation_rules(rule_count)
+    )
+    config_file = directory / f"validator_{rule_count}_{int(cache)}.json"
+    config_file.write_text(
+        json.dumps({"rules_file": str(rules_file), "result_cache": {"enabled": cache}}),
+        encoding="utf-8",
+    )
+    validator = EthikValidator(config_file)
+    validator.logger.setLevel(log_level)
+    return validator
+
+
+def bench_sanitize(
+    profile: Dict[str, Any], directory: Path, log_level: int
+) -> List[BenchmarkResult]:
+    results = []
+    for rule_count in profile["sanitize_rules"]:
+        sanitizer = _make_sanitizer(directory, rule_count, log_level)
+        for size in profile["content_sizes"]:
+            content = generate_content(size, profile["pii_density"], seed=size)
+            results.append(
+                measure(
+                    "sanitize_content",
+                    lambda _, c=content, s=sanitizer: s.sanitize_content(c),
+                    _iterations(profile, size),
+                    params={"rules": rule_count, "content_bytes": size},
+                    bytes_per_op=size,
+                )
+            )
+    return results
+
+
+def bench_sanitize_async(
+    profile: Dict[str, Any], directory: Path, log_level: int
+) -> List[BenchmarkResult]:
+    results = []
+    rule_count = profile["sanitize_rules"][-1]
+    sanitizer = _make_sanitizer(directory, rule_count, log_level, parallel=True)
+    try:
+        for size in profile["content_sizes"][:2]:  # Concurrency matters for small requests
+            content = generate_content(size, profile["pii_density"], seed=size)
+            for concurrency in (1, 8):
+                results.append(
+                    measure_async(
+                        "sanitize_content_async",
+                        lambda _, c=content: sanitizer.sanitize_content_async(c),
+                        _iterations(profile, size),
+                        params={
+                            "rules": rule_count,
+                            "content_bytes": size,
+                            "concurrency": concurrency,
+                        },
+                        bytes_per_op=size,
+                        concurrency=concurrency,
+                    )
+                )
+    finally:
+        sanitizer.executor.shutdown(wait=False)
+    return results
+
+
+def bench_validate(
+    profile: Dict[str, Any], directory: Path, log_level: int
+) -> List[BenchmarkResult]:
+    results = []
+    for rule_count in profile["validate_rules"]:
+        for cache, repeat_ratio in ((False, 0.0), (True, 0.8)):
+            validator = _make_validator(directory, rule_count, log_level, cache)
+            contexts = generate_action_contexts(256, repeat_ratio=repeat_ratio, seed=rule_count)
+            results.append(
+                measure_async(
+                    "validate_action_cached" if cache else "validate_action",
+                    lambda number, v=validator, ctx=contexts: v.validate_action(
+                        ctx[number % len(ctx)], {}
+                    ),
+                    profile["iterations"],
+                    params={"rules": rule_count, "repeat_ratio": repeat_ratio},
+                )
+            )
+    return results
+
+
+def bench_handlers(
+    profile: Dict[str, Any], directory: Path, log_level: int
+) -> List[BenchmarkResult]:
+    """Mycelium request handlers end to end (parsing, work, response publishing)."""
+    rule_count = profile["sanitize_rules"][-1]
+    sanitizer = _make_sanitizer(directory, rule_count, log_level)
+    content = generate_content(1 * KB, profile["pii_density"], seed=1)
+    validator = _make_validator(directory, profile["validate_rules"][-1], log_level)
+    validator.topics = {}
+    contexts = generate_action_contexts(256, seed=2)
+
+    def sanitize_message(number: int) -> Dict[str, Any]:
+        return {"id": f"bench-{number}", "payload": {"content": content, "context": {}}}
+
+    def validate_message(number: int) -> Any:
+        return SimpleNamespace(
+            id=f"bench-{number}",
+            data={"action_context": contexts[number % len(contexts)], "params": {}},
+        )
+
+    return [
+        measure_async(
+            "handle_sanitize_request",
+            lambda number: sanitizer.handle_sanitize_request(sanitize_message(number)),
+            profile["iterations"],
+            params={"rules": rule_count, "content_bytes": 1 * KB},
+            bytes_per_op=1 * KB,
+        ),
+        measure_async(
+            "handle_validation_request",
+            lambda number: validator._handle_validation_request(validate_message(number)),
+            profile["iterations"],
+            params={"rules": profile["validate_rules"][-1]},
+        ),
+    ]
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any], Path, int], List[BenchmarkResult]]] = {
+    "sanitize": bench_sanitize,
+    "sanitize_async": bench_sanitize_async,
+    "validate": bench_validate,
+    "handlers": bench_handlers,
+}
+
+
+def run(
+    profile_name: str, suites: Optional[List[str]] = None, log_level: int = logging.ERROR
+) -> Dict[str, Any]:
+    """Runs the selected suites of a profile and returns the report."""
+    profile = PROFILES[profile_name]
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory(prefix="ethik_bench_") as directory:
+        for suite in suites or SUITES:
+            results.extend(BENCHMARKS[suite](profile, Path(directory), log_level))
+    return build_report(results, profile_name)
+
+
+def _print_results(report: Dict[str, Any]) -> None:
+    print(f"{'case':<72} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for result in report["results"]:
+        print(
+            f"{result['key']:<72} {result['ops_per_sec']:>10.1f} {result['p50_ms']:>9.3f} "
+            f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f}"
+        )
+    peaks = [r["peak_rss_bytes"] for r in report["results"] if r["peak_rss_bytes"]]
+    if peaks:
+        print(f"Peak RSS: {max(peaks) / MB:.1f} MiB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run ETHIK performance benchmarks.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument(
+        "--suite", action="append", choices=SUITES, help="Suite to run (repeatable; default all)."
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file.")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed relative throughput loss / p99 growth before flagging (default 0.10).",
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.profile, args.suite)
+    _print_results(report)
+    if args.output:
+        write_report(report, args.output)
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        comparison = compare_reports(load_report(args.baseline), report, args.tolerance)
+        regressions = [entry for entry in comparison if entry["regression"]]
+        for entry in regressions:
+            print(
+                f"REGRESSION {entry['key']}: throughput {entry['throughput_change']:+.1%}, "
+                f"p99 {entry['p99_change']:+.1%}"
+            )
+        print(f"{len(comparison)} cases compared, {len(regressions)} regressions.")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
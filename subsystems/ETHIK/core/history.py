@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK History: Fixed-capacity, time-indexed history of processing outcomes.
+
+Sanitization and validation outcomes are stored as compact records (digest, score,
+triggered rule IDs, timing) in a ring buffer, so appending never rebuilds or shifts a
+list. Records are kept in append order and indexed by a non-decreasing timestamp key,
+which makes time-range queries a binary search. Aggregates over the stored records
+(pass rate, mean score and timing, score percentiles, outcome and cache hit counts) are
+maintained incrementally on append and eviction, so dashboards read them in constant
+time.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import datetime
+import math
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Score histogram resolution for percentiles: scores in [0, 1] map to 1/SCORE_BINS steps
+SCORE_BINS = 100
+DEFAULT_PERCENTILES = (0.5, 0.9, 0.99)
+
+TimeBound = Union[datetime, float, None]
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    """Compact record of one sanitization or validation outcome."""
+
+    timestamp: datetime
+    digest: str  # Content digest or canonical context hash
+    score: float
+    passed: bool  # Clean content / valid action
+    rule_ids: Tuple[str, ...]  # Rules that triggered
+    processing_time: float  # Seconds
+    outcome: str  # e.g. 'clean', 'sanitized', 'allowed', 'blocked'
+    cache_hit: bool = False  # Outcome reused from a result cache rather than evaluated
+    result: Optional[Any] = None  # Full result, only when content retention is enabled
+
+
+def _time_key(value: Union[datetime, float]) -> float:
+    """Converts a datetime (naive local or aware) or epoch seconds to epoch seconds."""
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+class HistoryStore:
+    """Thread-safe ring buffer of HistoryRecords with time-range queries."""
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        retention_seconds: Optional[float] = None,
+        retain_results: bool = False,
+    ):
+        """Initializes the store.
+
+        Args:
+            capacity: Maximum number of records; the oldest record is overwritten first.
+            retention_seconds: Records older than this are dropped as new ones arrive;
+                None or 0 keeps records until they are overwritten.
+            retain_results: Keep the full result object attached to each record.
+
+        Raises:
+            ValueError: If the capacity is not positive.
+        """
+        if capacity <= 0:
+            raise ValueError(f"History capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.retention_seconds = retention_seconds or None
+        self.retain_results = retain_results
+        self._records: List[Optional[HistoryRecord]] = [None] * capacity
+        self._keys: List[float] = [0.0] * capacity
+        self._head = 0  # Physical index of the oldest record
+        self._size = 0
+        self._last_key = float("-inf")
+        self._lock = threading.Lock()
+        # Incremental aggregates over the stored records
+        self._passed = 0
+        self._cache_hits = 0
+        self._score_sum = 0.0
+        self._time_sum = 0.0
+        self._score_bins = [0] * (SCORE_BINS + 1)
+        self._outcomes: Counter = Counter()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[HistoryRecord]:
+        return iter(self.range())
+
+    def __getitem__(self, index: int) -> HistoryRecord:
+        with self._lock:
+            if index < 0:
+                index += self._size
+            if not 0 <= index < self._size:
+                raise IndexError("history index out of range")
+            return self._records[(self._head + index) % self.capacity]
+
+    def append(self, record: HistoryRecord) -> None:
+        """Adds a record, evicting the oldest one when full or expired."""
+        if record.result is not None and not self.retain_results:
+            record = replace(record, result=None)
+        timestamp_key = _time_key(record.timestamp)
+        with self._lock:
+            # Keys never decrease, so that records stay sorted for binary search even when
+            # concurrent producers append slightly out of timestamp order.
+            key = max(timestamp_key, self._last_key)
+            if self._size == self.capacity:
+                self._evict_oldest()
+            index = (self._head + self._size) % self.capacity
+            self._records[index] = record
+            self._keys[index] = key
+            self._size += 1
+            self._last_key = key
+            self._account(record, 1)
+            if self.retention_seconds:
+                self._evict_before(time.time() - self.retention_seconds)
+
+    def range(
+        self, start: TimeBound = None, end: TimeBound = None, limit: Optional[int] = None
+    ) -> List[HistoryRecord]:
+        """Returns records with start <= timestamp <= end, oldest first.
+
+        Args:
+            start: Inclusive lower time bound (datetime or epoch seconds).
+            end: Inclusive upper time bound (datetime or epoch seconds).
+            limit: Return only the most recent `limit` matching records.
+        """
+        with self._lock:
+            low = 0 if start is None else self._bisect(_time_key(start), right=False)
+            high = self._size if end is None else self._bisect(_time_key(end), right=True)
+            if limit is not None and limit > 0:
+                low = max(low, high - limit)
+            return [
+                self._records[(self._head + offset) % self.capacity] for offset in range(low, high)
+            ]
+
+    def latest(self, limit: int = 100) -> List[HistoryRecord]:
+        """Returns the most recent records, oldest first."""
+        return self.range(limit=limit)
+
+    def clear(self, older_than: TimeBound = None) -> int:
+        """Drops all records, or only those with timestamp <= older_than.
+
+        Returns:
+            The number of records removed.
+        """
+        with self._lock:
+            initial = self._size
+            if older_than is None:
+                while self._size:
+                    self._evict_oldest()
+            else:
+                self._evict_before(_time_key(older_than), inclusive=True)
+            return initial - self._size
+
+    def aggregates(
+        self,
+        start: TimeBound = None,
+        end: TimeBound = None,
+        percentiles: Tuple[float, ...] = DEFAULT_PERCENTILES,
+    ) -> Dict[str, Any]:
+        """Returns pass rate, score and timing aggregates.
+
+        Aggregates over the whole store are precomputed; a time range is summarized
+        from the matching records.
+        """
+        if start is None and end is None:
+            with self._lock:
+                return self._summarize(
+                    self._size,
+                    self._passed,
+                    self._cache_hits,
+                    self._score_sum,
+                    self._time_sum,
+                    list(self._score_bins),
+                    dict(self._outcomes),
+                    percentiles,
+                )
+
+        records = self.range(start, end)
+        bins = [0] * (SCORE_BINS + 1)
+        outcomes: Counter = Counter()
+        for record in records:
+            bins[self._score_bin(record.score)] += 1
+            outcomes[record.outcome] += 1
+        return self._summarize(
+            len(records),
+            sum(1 for record in records if record.passed),
+            sum(1 for record in records if record.cache_hit),
+            sum(record.score for record in records),
+            sum(record.processing_time for record in records),
+            bins,
+            dict(outcomes),
+            percentiles,
+        )
+
+    # --- Internal helpers (caller holds the lock) --- #
+
+    @staticmethod
+    def _score_bin(score: float) -> int:
+        return int(round(min(max(score, 0.0), 1.0) * SCORE_BINS))
+
+    def _account(self, record: HistoryRecord, sign: int) -> None:
+        self._passed += sign if record.passed else 0
+        self._cache_hits += sign if record.cache_hit else 0
+        self._score_sum += sign * record.score
+        self._time_sum += sign * record.processing_time
+        self._score_bins[self._score_bin(record.score)] += sign
+        self._outcomes[record.outcome] += sign
+        if self._outcomes[record.outcome] <= 0:
+            del self._outcomes[record.outcome]
+
+    def _evict_oldest(self) -> None:
+        record = self._records[self._head]
+        self._records[self._head] = None
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        self._account(record, -1)
+        if not self._size:
+            self._head = 0
+
+    def _evict_before(self, cutoff: float, inclusive: bool = False) -> None:
+        while self._size:
+            key = self._keys[self._head]
+            if key > cutoff or (key == cutoff and not inclusive):
+                return
+            self._evict_oldest()
+
+    def _bisect(self, key: float, right: bool) -> int:
+        """Binary search over logical positions of the ring buffer."""
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            value = self._keys[(self._head + middle) % self.capacity]
+            if value < key or (right and value == key):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def _summarize(
+        count: int,
+        passed: int,
+        cache_hits: int,
+        score_sum: float,
+        time_sum: float,
+        bins: List[int],
+        outcomes: Dict[str, int],
+        percentiles: Tuple[float, ...],
+    ) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "count": count,
+            "pass_rate": passed / count if count else None,
+            "cache_hits": cache_hits,
+            "mean_score": score_sum / count if count else None,
+            "mean_processing_time": time_sum / count if count else None,
+            "outcomes": outcomes,
+        }
+        for percentile in percentiles:
+            name = f"score_p{percentile * 100:g}"
+            if not count:
+                summary[name] = None
+                continue
+            rank = max(1, math.ceil(percentile * count))
+            seen = 0
+            for index, bin_count in enumerate(bins):
+                seen += bin_count
+                if seen >= rank:
+                    summary[name] = index / SCORE_BINS
+                    break
+        return summary
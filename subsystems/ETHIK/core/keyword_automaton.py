@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Keyword Automaton: Aho-Corasick matcher for literal keywords.
+
+Finds every occurrence of a set of literal keywords in a single left-to-right
+pass over the text, independent of how many keywords are registered. Used by the
+sanitization engine for literal patterns and by validation rules for keyword conditions.
+"""
+
+from collections import deque
+from typing import Any, Dict, Hashable, Iterator, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton mapping literal keywords to arbitrary values.
+
+    Keywords can be added and removed at any time. The trie is updated in place and
+    failure links are recomputed lazily on the next search, so rule changes never
+    require rebuilding the automaton from scratch.
+    """
+
+    def __init__(self):
+        """Initializes an empty automaton containing only the root state."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._depth: List[int] = [0]
+        # Values registered for the keyword ending exactly at each state.
+        self._values: List[List[Any]] = [[]]
+        # Nearest state on the failure chain that has values ("dictionary link").
+        self._output_link: List[int] = [-1]
+        self._dirty = False
+        self._keyword_count = 0
+
+    def __len__(self) -> int:
+        """Returns the number of registered (keyword, value) pairs."""
+        return self._keyword_count
+
+    def add(self, keyword: str, value: Any) -> None:
+        """Registers a value for a keyword.
+
+        Args:
+            keyword: The literal text to match. Empty keywords are ignored.
+            value: Payload returned with every match of this keyword.
+        """
+        if not keyword:
+            return
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[state] + 1)
+                self._values.append([])
+                self._output_link.append(-1)
+                self._goto[state][char] = next_state
+            state = next_state
+        self._values[state].append(value)
+        self._keyword_count += 1
+        self._dirty = True
+
+    def remove(self, keyword: str, value: Hashable) -> bool:
+        """Removes a previously registered (keyword, value) pair.
+
+        Trie states are kept so other keywords sharing the prefix are unaffected.
+
+        Returns:
+            True if the pair was registered and has been removed, False otherwise.
+        """
+        state = 0
+        for char in keyword:
+            state = self._goto[state].get(char, -1)
+            if state < 0:
+                return False
+        try:
+            self._values[state].remove(value)
+        except ValueError:
+            return False
+        self._keyword_count -= 1
+        self._dirty = True
+        return True
+
+    def build(self) -> None:
+        """Recomputes failure and dictionary links with a breadth-first walk.
+
+        Searches call this automatically after keywords change. Call it eagerly before
+        sharing the automaton between threads so that searches never mutate it.
+        """
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._output_link[child] = -1
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                fail_state = self._fail[child]
+                self._output_link[child] = (
+                    fail_state if self._values[fail_state] else self._output_link[fail_state]
+                )
+                queue.append(child)
+        self._dirty = False
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yields every keyword occurrence in the text, including overlapping ones.
+
+        Args:
+            text: The text to scan.
+
+        Yields:
+            (start, end, value) tuples ordered by end position.
+        """
+        if not self._keyword_count:
+            return
+        if self._dirty:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        depth = self._depth
+        values = self._values
+        output_link = self._output_link
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            match_state = state if values[state] else output_link[state]
+            while match_state > 0:
+                end = index + 1
+                start = end - depth[match_state]
+                for value in values[match_state]:
+                    yield start, end, value
+                match_state = output_link[match_state]
+
+    def matched_values(self, text: str) -> Set[Hashable]:
+        """Returns the values of every keyword that occurs at least once in the text.
+
+        Cheaper than iter_matches when only presence matters: the dictionary-link chain
+        of a state is walked only the first time the state is reached.
+        """
+        found: Set[Hashable] = set()
+        if not self._keyword_count:
+            return found
+        if self._dirty:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        values = self._values
+        output_link = self._output_link
+        reported: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            match_state = state if values[state] else output_link[state]
+            # A reported state's whole chain has been reported with it
+            while match_state > 0 and match_state not in reported:
+                reported.add(match_state)
+                found.update(values[match_state])
+                match_state = output_link[match_state]
+        return found
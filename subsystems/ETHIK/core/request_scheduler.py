@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Request Scheduler: Admission control in front of the Mycelium request handlers.
+
+Requests wait in a bounded priority queue and a fixed number of workers run them, so a
+burst queues up instead of starting unbounded work. Priority comes from the request's
+severity and source subsystem (lower value runs first). A request is rejected, and its
+`reject` callback sends an OVERLOADED response, when:
+
+* the queue is full and it does not outrank the lowest-priority queued request
+  (which is shed instead when it does);
+* its deadline cannot be met given the work queued ahead of it;
+* its deadline passed while it was waiting.
+
+Deadlines are only checked before a request starts; running requests are not cancelled.
+`stats()` reports queue depth, in-flight requests, outcome counters and wait times.
+"""
+
+import asyncio
+from collections import Counter, deque
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional
+
+# Status of the response sent for a rejected request
+OVERLOADED = "OVERLOADED"
+# Rejection reasons
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_SHED = "shed"
+REJECT_DEADLINE_UNREACHABLE = "deadline_unreachable"
+REJECT_DEADLINE_EXPIRED = "deadline_expired"
+REJECT_SHUTDOWN = "shutdown"
+
+DEFAULT_SEVERITY_PRIORITIES = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+DEFAULT_PRIORITY = 4
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_MAX_CONCURRENCY = 8
+# Wait-time samples kept for the percentiles in stats()
+WAIT_SAMPLE_SIZE = 1024
+# Weight of the newest run in the moving average of the service time
+SERVICE_TIME_SMOOTHING = 0.1
+
+Work = Callable[[], Awaitable[Any]]
+Reject = Callable[[str], Awaitable[Any]]
+
+
+@dataclass(order=True)
+class _QueuedRequest:
+    """A request waiting for a worker; ordered by priority, then arrival."""
+
+    priority: int
+    sequence: int
+    work: Work = field(compare=False)
+    reject: Reject = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    deadline: Optional[float] = field(compare=False)  # time.monotonic() value
+
+
+class RequestScheduler:
+    """Bounded priority queue with a fixed pool of asyncio workers."""
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        default_timeout: Optional[float] = None,
+        severity_priorities: Optional[Mapping[str, int]] = None,
+        source_priorities: Optional[Mapping[str, int]] = None,
+        default_priority: int = DEFAULT_PRIORITY,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the scheduler.
+
+        Args:
+            max_queue_size: Requests that may wait for a worker.
+            max_concurrency: Requests run at the same time.
+            default_timeout: Deadline in seconds for requests that do not set one;
+                None waits indefinitely.
+            severity_priorities: Priority by request severity (lower runs first).
+            source_priorities: Priority by source subsystem (e.g. {'CORUJA': 0}).
+            default_priority: Priority when neither severity nor source is mapped.
+            logger: Logger for rejections and failed requests.
+        """
+        self.max_queue_size = max(1, max_queue_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.default_timeout = default_timeout
+        self.severity_priorities = {
+            name.lower(): value
+            for name, value in (severity_priorities or DEFAULT_SEVERITY_PRIORITIES).items()
+        }
+        self.source_priorities = {
+            name.upper(): value for name, value in (source_priorities or {}).items()
+        }
+        self.default_priority = default_priority
+        self.logger = logger or logging.getLogger(__name__)
+        self._queue: List[_QueuedRequest] = []
+        self._depth_by_priority: Counter = Counter()
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self.in_flight = 0
+        self.peak_queue_depth = 0
+        self._counters: Counter = Counter()
+        self._rejections: Counter = Counter()
+        self._wait_samples: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._max_wait = 0.0
+        self._service_time: Optional[float] = None  # Moving average, seconds
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def priority_for(self, severity: Optional[str] = None, source: Optional[str] = None) -> int:
+        """Returns the priority of a request: the most urgent of its severity and source."""
+        candidates = []
+        if isinstance(severity, str) and severity.lower() in self.severity_priorities:
+            candidates.append(self.severity_priorities[severity.lower()])
+        if isinstance(source, str) and source.upper() in self.source_priorities:
+            candidates.append(self.source_priorities[source.upper()])
+        return min(candidates) if candidates else self.default_priority
+
+    def start(self) -> None:
+        """Starts the workers on the running event loop (no-op if already running)."""
+        if self._workers:
+            return
+        # Created here so the condition belongs to the loop the workers run on
+        self._condition = asyncio.Condition()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+    async def stop(self) -> None:
+        """Stops the workers and rejects every request still queued."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        pending, self._queue = self._queue, []
+        self._depth_by_priority.clear()
+        for request in pending:
+            await self._reject(request, REJECT_SHUTDOWN)
+
+    async def submit(
+        self,
+        work: Work,
+        reject: Reject,
+        priority: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Queues a request, starting the workers if needed.
+
+        Args:
+            work: Coroutine function that processes the request and sends its response.
+            reject: Coroutine function called with the rejection reason instead of
+                `work` when the request is not run; it sends the OVERLOADED response.
+            priority: Request priority (lower runs first); default_priority if None.
+            timeout: Seconds from now until the request is no longer worth starting;
+                default_timeout if None.
+
+        Returns:
+            True if the request was queued, False if it was rejected.
+        """
+        self.start()
+        now = time.monotonic()
+        priority = self.default_priority if priority is None else priority
+        timeout = self.default_timeout if timeout is None else timeout
+        request = _QueuedRequest(
+            priority=priority,
+            sequence=next(self._sequence),
+            work=work,
+            reject=reject,
+            enqueued_at=now,
+            deadline=now + timeout if timeout is not None and timeout > 0 else None,
+        )
+        self._counters["submitted"] += 1
+
+        if request.deadline is not None:
+            expected_wait = self._expected_wait(priority)
+            if expected_wait is not None and now + expected_wait > request.deadline:
+                await self._reject(request, REJECT_DEADLINE_UNREACHABLE)
+                return False
+
+        shed: Optional[_QueuedRequest] = None
+        if len(self._queue) >= self.max_queue_size:
+            lowest = max(self._queue)
+            if lowest.priority <= priority:
+                await self._reject(request, REJECT_QUEUE_FULL)
+                return False
+            shed = lowest
+            self._queue.remove(lowest)
+            heapq.heapify(self._queue)
+            self._depth_by_priority[lowest.priority] -= 1
+
+        async with self._condition:
+            heapq.heappush(self._queue, request)
+            self._depth_by_priority[priority] += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, len(self._queue))
+            self._condition.notify()
+        if shed is not None:
+            await self._reject(shed, REJECT_SHED)
+        return True
+
+    def _expected_wait(self, priority: int) -> Optional[float]:
+        """Estimated time until a new request of this priority starts, if known."""
+        if self._service_time is None:
+            return None
+        ahead = sum(count for level, count in self._depth_by_priority.items() if level <= priority)
+        busy = self.in_flight >= self.max_concurrency
+        if not ahead and not busy:
+            return 0.0
+        return (ahead // self.max_concurrency + (1 if busy else 0)) * self._service_time
+
+    async def _reject(self, request: _QueuedRequest, reason: str) -> None:
+        self._rejections[reason] += 1
+        self.logger.warning(
+            f"Request rejected ({reason}): priority {request.priority}, "
+            f"queue depth {len(self._queue)}, in flight {self.in_flight}"
+        )
+        try:
+            await request.reject(reason)
+        except Exception as e:
+            self.logger.error(f"Failed to send overload response: {e}", exc_info=True)
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._condition:
+                while not self._queue:
+                    await self._condition.wait()
+                request = heapq.heappop(self._queue)
+                self._depth_by_priority[request.priority] -= 1
+
+            started = time.monotonic()
+            if request.deadline is not None and started > request.deadline:
+                await self._reject(request, REJECT_DEADLINE_EXPIRED)
+                continue
+            wait = started - request.enqueued_at
+            self._wait_samples.append(wait)
+            self._max_wait = max(self._max_wait, wait)
+
+            self.in_flight += 1
+            try:
+                await request.work()
+                self._counters["completed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._counters["failed"] += 1
+                self.logger.error(f"Scheduled request failed: {e}", exc_info=True)
+            finally:
+                self.in_flight -= 1
+                elapsed = time.monotonic() - started
+                if self._service_time is None:
+                    self._service_time = elapsed
+                else:
+                    self._service_time += SERVICE_TIME_SMOOTHING * (elapsed - self._service_time)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth, outcome counters and wait-time percentiles (ms)."""
+        samples = sorted(self._wait_samples)
+
+        def wait_percentile(fraction: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000
+
+        return {
+            "queue_depth": len(self._queue),
+            "queue_depth_by_priority": {
+                level: count for level, count in sorted(self._depth_by_priority.items()) if count
+            },
+            "peak_queue_depth": self.peak_queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "submitted": self._counters["submitted"],
+            "completed": self._counters["completed"],
+            "failed": self._counters["failed"],
+            "rejected": dict(self._rejections),
+            "wait_ms": {
+                "p50": wait_percentile(0.50),
+                "p95": wait_percentile(0.95),
+                "p99": wait_percentile(0.99),
+                "max": self._max_wait * 1000,
+            },
+            "service_time_ms": (self._service_time or 0.0) * 1000,
+        }
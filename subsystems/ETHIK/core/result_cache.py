@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Result Cache: Bounded, byte-aware cache for processing results.
+
+Entries are bounded by count and by an estimated total size in bytes, expire after a
+TTL, and are tied to a rule-set version so that any rule change invalidates them.
+Eviction follows either least-recently-used (LRU) or least-frequently-used (LFU) order.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached value together with its bookkeeping data."""
+
+    value: Any
+    size: int
+    version: int
+    expires_at: float
+    hits: int = 0
+
+
+class BoundedResultCache:
+    """Thread-safe result cache bounded by entry count, total bytes and TTL."""
+
+    POLICIES = ("lru", "lfu")
+
+    def __init__(
+        self,
+        max_entries: int = 500,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        policy: str = "lru",
+    ):
+        """Initializes the cache.
+
+        Args:
+            max_entries: Maximum number of cached entries.
+            max_bytes: Maximum estimated size of all cached values, in bytes.
+            ttl_seconds: Lifetime of an entry; 0 or less disables expiry.
+            policy: Eviction policy, 'lru' or 'lfu'.
+
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown cache policy '{policy}'. Expected one of {self.POLICIES}.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.policy = policy
+        self.version = 0
+        self.total_bytes = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        # LFU bookkeeping: hit count -> keys with that count, oldest first
+        self._frequency_buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Returns the live entry for a key, or None on a miss.
+
+        Expired entries and entries from an older rule-set version count as misses
+        and are dropped.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.version != self.version:
+                self._remove(key)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if self.ttl_seconds > 0 and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._unlink_frequency(key, entry.hits)
+            entry.hits += 1
+            self._link_frequency(key, entry.hits)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, value: Any, size: int, version: int) -> bool:
+        """Stores a value computed under the given rule-set version.
+
+        Values computed under an outdated version, or larger than the byte budget,
+        are not stored.
+
+        Returns:
+            True if the value was stored.
+        """
+        with self._lock:
+            if version != self.version or size > self.max_bytes or self.max_entries <= 0:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            expires_at = time.monotonic() + self.ttl_seconds
+            self._entries[key] = CacheEntry(value, size, version, expires_at)
+            self._link_frequency(key, 0)
+            self.total_bytes += size
+
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._remove(self._select_victim(keep=key))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, version: int) -> None:
+        """Drops every entry and moves the cache to a new rule-set version."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._frequency_buckets.clear()
+            self.total_bytes = 0
+            self.version = version
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns counters and current occupancy."""
+        return {
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "rules_version": self.version,
+        }
+
+    # --- Internal helpers (caller holds the lock) --- #
+
+    def _select_victim(self, keep: Hashable) -> Hashable:
+        """Returns the entry to evict next, never `keep` (the entry being stored)."""
+        if self.policy == "lfu":
+            # A new entry has the lowest count; evicting it would make every put a no-op
+            lowest = min(self._frequency_buckets)
+            for key in self._frequency_buckets[lowest]:
+                if key != keep:
+                    return key
+            lowest = min(hits for hits in self._frequency_buckets if hits != lowest)
+            return next(iter(self._frequency_buckets[lowest]))
+        return next(iter(self._entries))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._unlink_frequency(key, entry.hits)
+        self.total_bytes -= entry.size
+
+    def _link_frequency(self, key: Hashable, hits: int) -> None:
+        if self.policy == "lfu":
+            self._frequency_buckets.setdefault(hits, OrderedDict())[key] = None
+
+    def _unlink_frequency(self, key: Hashable, hits: int) -> None:
+        if self.policy == "lfu":
+            bucket = self._frequency_buckets.get(hits)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._frequency_buckets[hits]
@@ -1,15 +1,33 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
 from koios.logger import KoiosLogger
 from ..interfaces.rule_engine_interface import RuleEngineInterface
 from ..core.validator import ValidationRule # Adjust import path as needed
+from ..core.rule_keywords import RuleKeywordMatcher
 
 logger = KoiosLogger.get_logger("ETHIK.Core.BasicRuleEngine")
 
 class BasicRuleEngine(RuleEngineInterface):
     """A basic implementation of the rule engine using placeholder logic."""
 
+    def __init__(self, keyword_matcher: Optional[RuleKeywordMatcher] = None):
+        """Initializes the engine.
+
+        Args:
+            keyword_matcher: Matcher shared with other engines; rules are registered
+                in it on first evaluation so one content scan serves all of them.
+        """
+        self.keyword_matcher = keyword_matcher or RuleKeywordMatcher()
+        self._registered: Dict[str, ValidationRule] = {}
+
+    def _keyword_hits(self, rule: ValidationRule, content: Any) -> int:
+        """Counts the rule's conditions found in the content (one scan for all rules)."""
+        if self._registered.get(rule.id) is not rule:
+            self.keyword_matcher.add_rule(rule.id, rule.conditions or [])
+            self._registered[rule.id] = rule
+        return self.keyword_matcher.hit_counts(content).get(rule.id, 0)
+
     def evaluate(self, rule: ValidationRule, action_context: Dict[str, Any]) -> Dict[str, Any]:
         """Applies a single validation rule to the action context (placeholder logic)."""
         rule_result = {
@@ -27,13 +45,8 @@ class BasicRuleEngine(RuleEngineInterface):
         try:
             # --- Placeholder Evaluation Logic (Moved from EthikValidator) --- #
             # Simulate a check based on keywords in context (very basic example)
-            conditions_met_count = 0
-            content_str = str(action_context.get("content", "")).lower()
-            if rule.conditions:
-                for condition in rule.conditions:
-                    # Simple case-insensitive keyword check
-                    if condition.lower() in content_str:
-                        conditions_met_count += 1
+            # (case-insensitive; one shared scan of the content serves all rules)
+            conditions_met_count = self._keyword_hits(rule, action_context.get("content", ""))
 
             # Example scoring logic - lower score if conditions are met (inverted logic)
             # Ensure threshold is handled as float throughout
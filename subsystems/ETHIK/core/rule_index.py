@@ -0,0 +1,457 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Rule Index: Compiled rule conditions and indexed rule dispatch.
+
+Validation rule conditions are either Python expressions over `action_context`
+(e.g. ``action_context.get('action_type') == 'file_write'``), which decide whether a
+rule applies, or plain keywords, which are matched against the action content when the
+rule is evaluated. Expressions are compiled once into predicates when rules load.
+
+Each rule is also analysed for a necessary condition that can be looked up directly:
+an action type (``==``/``in`` on ``action_type``), an affected component (``'x' in
+action_context.get('affected_components', [])``) or a context key that must be present.
+Rules are filed under one such entry of an inverted index, so a request only evaluates
+the predicates of rules that can possibly apply to it. The keyword conditions of all
+indexed rules share one RuleKeywordMatcher, which scans the content once per request.
+"""
+
+import ast
+from dataclasses import dataclass
+import logging
+import marshal
+from types import CodeType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .rule_keywords import RuleKeywordMatcher
+
+CONTEXT_NAME = "action_context"
+ACTION_TYPE_KEY = "action_type"
+COMPONENTS_KEY = "affected_components"
+
+# Builtins available to condition expressions
+SAFE_BUILTINS: Dict[str, Any] = {
+    "True": True,
+    "False": False,
+    "None": None,
+    "abs": abs,
+    "all": all,
+    "any": any,
+    "bool": bool,
+    "dict": dict,
+    "float": float,
+    "int": int,
+    "isinstance": isinstance,
+    "len": len,
+    "list": list,
+    "max": max,
+    "min": min,
+    "round": round,
+    "set": set,
+    "sorted": sorted,
+    "str": str,
+    "sum": sum,
+    "tuple": tuple,
+}
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A condition expression compiled into a predicate over the action context."""
+
+    source: str
+    code: CodeType
+
+    def __call__(self, action_context: Dict[str, Any]) -> bool:
+        namespace = {"__builtins__": SAFE_BUILTINS, CONTEXT_NAME: action_context}
+        return bool(eval(self.code, namespace))
+
+    def __reduce__(self):
+        # Code objects cannot be pickled; marshal them (rule bundles record the
+        # interpreter version, as the marshal format is version specific)
+        return _restore_condition, (self.source, marshal.dumps(self.code))
+
+
+def _restore_condition(source: str, code: bytes) -> CompiledCondition:
+    return CompiledCondition(source, marshal.loads(code))
+
+
+@dataclass(frozen=True)
+class RulePredicate:
+    """Compiled applicability test of one rule, with its index entry."""
+
+    rule_id: str
+    conditions: Tuple[CompiledCondition, ...]
+    keywords: Tuple[str, ...]  # Non-expression conditions, matched against content
+    # Top-level context keys the expressions read; None if they use the context otherwise
+    context_keys: Optional[FrozenSet[str]] = frozenset()
+    action_types: Optional[FrozenSet[str]] = None
+    components: Optional[FrozenSet[str]] = None
+    required_key: Optional[str] = None
+
+    def matches(self, action_context: Dict[str, Any]) -> bool:
+        """Returns True if every condition expression holds.
+
+        Raises:
+            Exception: Whatever a condition raises while being evaluated.
+        """
+        for condition in self.conditions:
+            if not condition(action_context):
+                return False
+        return True
+
+
+# --- Condition analysis --- #
+
+
+def _constant(node: ast.AST) -> Any:
+    return node.value if isinstance(node, ast.Constant) else _MISSING
+
+
+def _context_path(node: ast.AST) -> Optional[Tuple[List[str], List[Any]]]:
+    """Parses ``action_context.get('a', d1).get('b')`` / ``action_context['a']`` chains.
+
+    Returns:
+        The accessed keys and the default used at each level (None for subscripts and
+        missing defaults), or None if the node is not such a chain.
+    """
+    keys: List[str] = []
+    defaults: List[Any] = []
+    while True:
+        if isinstance(node, ast.Name) and node.id == CONTEXT_NAME:
+            return keys[::-1], defaults[::-1]
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "get"
+            and not node.keywords
+            and 1 <= len(node.args) <= 2
+            and isinstance(_constant(node.args[0]), str)
+        ):
+            keys.append(node.args[0].value)
+            if len(node.args) == 2:
+                try:
+                    defaults.append(ast.literal_eval(node.args[1]))
+                except ValueError:
+                    return None
+            else:
+                defaults.append(None)
+            node = node.func.value
+        elif isinstance(node, ast.Subscript) and isinstance(_constant(node.slice), str):
+            keys.append(node.slice.value)
+            defaults.append(None)
+            node = node.value
+        else:
+            return None
+
+
+def _literal_strings(node: ast.AST) -> Optional[FrozenSet[str]]:
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        values = [_constant(element) for element in node.elts]
+        if values and all(isinstance(value, str) for value in values):
+            return frozenset(values)
+    return None
+
+
+def _top_level_keys(tree: ast.AST) -> Optional[Set[str]]:
+    """Returns the context keys an expression reads, or None if it uses the context
+    in any other way (iteration, membership, methods other than get, ...)."""
+    keys: Set[str] = set()
+    covered: Set[int] = set()
+    for node in ast.walk(tree):
+        path = _context_path(node)
+        if path is not None and path[0] and id(node) not in covered:
+            keys.add(path[0][0])
+            # Inner nodes of this chain are part of the same access
+            for inner in ast.walk(node):
+                covered.add(id(inner))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id == CONTEXT_NAME and id(node) not in covered:
+            return None
+    return keys
+
+
+def _conjuncts(tree: ast.Expression) -> List[ast.expr]:
+    body = tree.body
+    if isinstance(body, ast.BoolOp) and isinstance(body.op, ast.And):
+        return list(body.values)
+    return [body]
+
+
+def _action_types(node: ast.expr) -> Optional[FrozenSet[str]]:
+    """Action types allowed by ``action_type == 'x'`` or ``action_type in [...]``."""
+    if not (isinstance(node, ast.Compare) and len(node.ops) == 1):
+        return None
+    left, op, right = node.left, node.ops[0], node.comparators[0]
+    if isinstance(op, ast.Eq) and _context_path(left) is None:
+        left, right = right, left  # 'x' == action_context.get('action_type')
+    path = _context_path(left)
+    # A non-None default could itself satisfy the comparison
+    if path is None or path[0] != [ACTION_TYPE_KEY] or path[1] != [None]:
+        return None
+    if isinstance(op, ast.Eq) and isinstance(_constant(right), str):
+        return frozenset([right.value])
+    if isinstance(op, ast.In):
+        return _literal_strings(right)
+    return None
+
+
+def _component(node: ast.expr) -> Optional[str]:
+    """Component required by ``'x' in action_context.get('affected_components', [])``."""
+    if not (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], ast.In)
+        and isinstance(_constant(node.left), str)
+    ):
+        return None
+    path = _context_path(node.comparators[0])
+    if path is None or path[0] != [COMPONENTS_KEY] or path[1][0] not in (None, [], ()):
+        return None
+    return node.left.value
+
+
+def _requires_key(node: ast.expr, key: str) -> bool:
+    """True if a conjunct reading only `key` is false (or fails) when the key is absent."""
+    code = compile(ast.Expression(body=node), "<condition>", "eval")
+    try:
+        return not CompiledCondition("", code)({})
+    except Exception:
+        return True
+
+
+def is_expression_condition(condition: str) -> bool:
+    """Returns True if a condition is a Python expression over the action context."""
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+    except SyntaxError:
+        return False
+    return any(isinstance(node, ast.Name) and node.id == CONTEXT_NAME for node in ast.walk(tree))
+
+
+def compile_rule(rule: Any) -> RulePredicate:
+    """Compiles the conditions of a rule and picks its index entry.
+
+    Args:
+        rule: A rule exposing `id` and `conditions`.
+    """
+    conditions: List[CompiledCondition] = []
+    keywords: List[str] = []
+    action_types: Optional[FrozenSet[str]] = None
+    components: List[str] = []
+    required_keys: List[str] = []
+    context_keys: Optional[Set[str]] = set()
+
+    for condition in rule.conditions or []:
+        if not isinstance(condition, str) or not is_expression_condition(condition):
+            keywords.append(str(condition))
+            continue
+        tree = ast.parse(condition.strip(), mode="eval")
+        conditions.append(CompiledCondition(condition, compile(tree, "<condition>", "eval")))
+        if context_keys is not None:
+            read_keys = _top_level_keys(tree)
+            context_keys = None if read_keys is None else context_keys | read_keys
+
+        for conjunct in _conjuncts(tree):
+            types = _action_types(conjunct)
+            if types is not None:
+                # Several action-type conjuncts must all hold: intersect them
+                action_types = types if action_types is None else action_types & types
+                continue
+            component = _component(conjunct)
+            if component is not None:
+                components.append(component)
+                continue
+            keys = _top_level_keys(conjunct)
+            if keys is not None and len(keys) == 1:
+                key = next(iter(keys))
+                if _requires_key(conjunct, key):
+                    required_keys.append(key)
+
+    # File the rule under a single necessary condition, the most selective first
+    predicate_args: Dict[str, Any] = {}
+    if action_types is not None:
+        predicate_args["action_types"] = action_types
+    elif components:
+        predicate_args["components"] = frozenset(components[:1])
+    elif required_keys:
+        predicate_args["required_key"] = min(required_keys)
+    return RulePredicate(
+        rule.id,
+        tuple(conditions),
+        tuple(keywords),
+        None if context_keys is None else frozenset(context_keys),
+        **predicate_args,
+    )
+
+
+class RuleIndex:
+    """Inverted indexes from action type, affected component and context key to rules."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.predicates: Dict[str, RulePredicate] = {}
+        self.rules: Dict[str, Any] = {}
+        self._order: Dict[str, int] = {}
+        self._sequence = 0
+        self._by_action_type: Dict[str, Set[str]] = {}
+        self._by_component: Dict[str, Set[str]] = {}
+        self._by_key: Dict[str, Set[str]] = {}
+        self._unindexed: Set[str] = set()
+        self.keywords = RuleKeywordMatcher()
+        self._context_keys: Any = _MISSING  # Union of the predicates' keys, computed lazily
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self.rules
+
+    def copy(self) -> "RuleIndex":
+        """Returns an independent index with the same rules and compiled predicates."""
+        clone = RuleIndex(self.logger)
+        clone.predicates = dict(self.predicates)
+        clone.rules = dict(self.rules)
+        clone._order = dict(self._order)
+        clone._sequence = self._sequence
+        for name in ("_by_action_type", "_by_component", "_by_key"):
+            setattr(clone, name, {key: set(ids) for key, ids in getattr(self, name).items()})
+        clone._unindexed = set(self._unindexed)
+        clone.keywords = self.keywords.copy()
+        clone._context_keys = self._context_keys
+        return clone
+
+    def rebuild(self, rules: Iterable[Any]) -> None:
+        """Replaces the indexed rules, keeping their iteration order."""
+        self._reset()
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: Any, predicate: Optional[RulePredicate] = None) -> RulePredicate:
+        """Compiles and indexes a rule, replacing any rule with the same id.
+
+        Args:
+            rule: The rule to index.
+            predicate: Already compiled predicate of this rule, to skip compilation.
+        """
+        order = self._order.get(rule.id)
+        if order is None:
+            order = self._sequence
+            self._sequence += 1
+        else:
+            self.remove(rule.id)  # Updated rules keep their position
+        if predicate is None:
+            predicate = compile_rule(rule)
+        self.rules[rule.id] = rule
+        self.predicates[rule.id] = predicate
+        self._order[rule.id] = order
+        for bucket in self._buckets(predicate):
+            bucket.add(rule.id)
+        self.keywords.add_rule(rule.id, predicate.keywords)
+        self._context_keys = _MISSING
+        return predicate
+
+    def remove(self, rule_id: str) -> bool:
+        """Removes a rule from the index; returns False if it was not indexed."""
+        predicate = self.predicates.pop(rule_id, None)
+        if predicate is None:
+            return False
+        for bucket in self._buckets(predicate):
+            bucket.discard(rule_id)
+        del self.rules[rule_id]
+        del self._order[rule_id]
+        self.keywords.remove_rule(rule_id)
+        self._context_keys = _MISSING
+        return True
+
+    @property
+    def context_keys(self) -> Optional[FrozenSet[str]]:
+        """Top-level context keys read by the condition expressions of all rules.
+
+        None if some rule uses the action context in a way that cannot be analysed, in
+        which case any part of the context may influence the outcome.
+        """
+        keys = self._context_keys
+        if keys is _MISSING:
+            union: Optional[Set[str]] = set()
+            for predicate in self.predicates.values():
+                if predicate.context_keys is None:
+                    union = None
+                    break
+                union.update(predicate.context_keys)
+            keys = self._context_keys = None if union is None else frozenset(union)
+        return keys
+
+    def _buckets(self, predicate: RulePredicate) -> List[Set[str]]:
+        if predicate.action_types is not None:
+            return [self._by_action_type.setdefault(t, set()) for t in predicate.action_types]
+        if predicate.components is not None:
+            return [self._by_component.setdefault(c, set()) for c in predicate.components]
+        if predicate.required_key is not None:
+            return [self._by_key.setdefault(predicate.required_key, set())]
+        return [self._unindexed]
+
+    def candidates(self, action_context: Dict[str, Any]) -> List[str]:
+        """Returns ids of the rules that may apply to a context, in rule order."""
+        found: Set[str] = set(self._unindexed)
+        action_type = action_context.get(ACTION_TYPE_KEY)
+        if isinstance(action_type, str):
+            found.update(self._by_action_type.get(action_type, ()))
+        if self._by_component:
+            components = action_context.get(COMPONENTS_KEY) or ()
+            if isinstance(components, (list, tuple, set, frozenset)):
+                for component in components:
+                    if isinstance(component, str):
+                        found.update(self._by_component.get(component, ()))
+        if self._by_key:
+            if len(action_context) < len(self._by_key):
+                for key in action_context:
+                    found.update(self._by_key.get(key, ()))
+            else:
+                for key, rule_ids in self._by_key.items():
+                    if key in action_context:
+                        found.update(rule_ids)
+        return sorted(found, key=self._order.__getitem__)
+
+    def matches(self, rule_id: str, action_context: Dict[str, Any]) -> bool:
+        """Evaluates a rule's compiled conditions; evaluation errors count as no match."""
+        predicate = self.predicates[rule_id]
+        try:
+            return predicate.matches(action_context)
+        except Exception as e:
+            self.logger.warning(f"Error evaluating conditions of rule '{rule_id}': {e}")
+            return False
+
+    def keyword_hits(self, rule_id: str, content: Any) -> int:
+        """Returns how many keyword conditions of an indexed rule occur in the content."""
+        return self.keywords.hit_counts(content).get(rule_id, 0)
+
+    def applicable_rules(
+        self, action_context: Dict[str, Any], rule_ids: Optional[Sequence[str]] = None
+    ) -> List[Any]:
+        """Returns the rules whose conditions hold for a context.
+
+        Args:
+            action_context: The context of the action being validated.
+            rule_ids: Restrict evaluation to these rules (unknown ids are ignored).
+        """
+        if rule_ids:
+            selected = [rule_id for rule_id in rule_ids if rule_id in self.rules]
+        else:
+            selected = self.candidates(action_context)
+        rules = self.rules
+        return [rules[rule_id] for rule_id in selected if self.matches(rule_id, action_context)]
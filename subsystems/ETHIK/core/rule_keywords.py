@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Rule Keywords: Shared keyword-condition matching for validation rules.
+
+Keyword conditions of every registered rule are matched case-insensitively in a single
+pass over the content, and the result is returned as per-rule hit counts (the number
+of a rule's keyword conditions found in the content). The content is lowercased once,
+each distinct keyword is looked for once however many rules use it, and the counts of
+the last scanned content are reused by every rule evaluated against it. Rules can be
+added and removed at any time; the keyword automaton is updated in place.
+
+Small keyword sets are checked with plain substring tests, which run in C; from
+KEYWORD_AUTOMATON_THRESHOLD distinct keywords on, an Aho-Corasick automaton finds all of
+them in one pass whose cost barely grows with the number of keywords.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .keyword_automaton import KeywordAutomaton
+
+# Below this many distinct keywords, C-level substring checks beat a Python automaton
+KEYWORD_AUTOMATON_THRESHOLD = 200
+
+
+class RuleKeywordMatcher:
+    """Counts keyword-condition hits for many rules with one scan of the content."""
+
+    def __init__(self, automaton_threshold: int = KEYWORD_AUTOMATON_THRESHOLD):
+        """Initializes an empty matcher.
+
+        Args:
+            automaton_threshold: Minimum number of distinct keywords before the
+                Aho-Corasick automaton is used instead of per-keyword substring checks.
+        """
+        self.automaton_threshold = automaton_threshold
+        self._rule_keywords: Dict[str, Tuple[str, ...]] = {}
+        # Keyword -> rule id -> number of that rule's conditions using the keyword
+        self._keyword_rules: Dict[str, Dict[str, int]] = {}
+        # Built on first use above the threshold, then maintained incrementally
+        self._automaton: Optional[KeywordAutomaton] = None
+        self._lock = threading.Lock()
+        # (content, lowercased content, hit counts) of the last scan
+        self._last_scan: Optional[Tuple[Any, str, Dict[str, int]]] = None
+
+    def __len__(self) -> int:
+        return len(self._rule_keywords)
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rule_keywords
+
+    @property
+    def keyword_count(self) -> int:
+        """Number of distinct keywords across all rules."""
+        return len(self._keyword_rules)
+
+    def copy(self) -> "RuleKeywordMatcher":
+        """Returns an independent matcher with the same rules (the automaton is rebuilt
+        lazily by the copy)."""
+        with self._lock:
+            clone = RuleKeywordMatcher(self.automaton_threshold)
+            clone._rule_keywords = dict(self._rule_keywords)
+            clone._keyword_rules = {
+                keyword: dict(users) for keyword, users in self._keyword_rules.items()
+            }
+            return clone
+
+    def rebuild(self, rules: Iterable[Tuple[str, Iterable[str]]]) -> None:
+        """Replaces all registered rules with (rule id, keywords) pairs."""
+        with self._lock:
+            self._rule_keywords.clear()
+            self._keyword_rules.clear()
+            self._automaton = None
+            self._last_scan = None
+        for rule_id, keywords in rules:
+            self.add_rule(rule_id, keywords)
+
+    def add_rule(self, rule_id: str, keywords: Iterable[str]) -> None:
+        """Registers (or replaces) the keyword conditions of a rule."""
+        lowered = tuple(str(keyword).lower() for keyword in keywords)
+        with self._lock:
+            if rule_id in self._rule_keywords:
+                self._unregister(rule_id)
+            self._rule_keywords[rule_id] = lowered
+            for keyword in lowered:
+                users = self._keyword_rules.get(keyword)
+                if users is None:
+                    users = self._keyword_rules[keyword] = {}
+                    # The empty keyword occurs in any content and is not automaton-matched
+                    if keyword and self._automaton is not None:
+                        self._automaton.add(keyword, keyword)
+                users[rule_id] = users.get(rule_id, 0) + 1
+            if self._last_scan is not None:
+                # Bring the cached counts up to date instead of rescanning
+                _, text, counts = self._last_scan
+                hits = sum(1 for keyword in lowered if keyword in text)
+                if hits:
+                    counts[rule_id] = hits
+
+    def remove_rule(self, rule_id: str) -> bool:
+        """Unregisters a rule; returns False if it was not registered."""
+        with self._lock:
+            if rule_id not in self._rule_keywords:
+                return False
+            self._unregister(rule_id)
+            return True
+
+    def _unregister(self, rule_id: str) -> None:
+        """Drops a rule (caller holds the lock)."""
+        for keyword in self._rule_keywords.pop(rule_id):
+            users = self._keyword_rules[keyword]
+            users[rule_id] -= 1
+            if users[rule_id] <= 0:
+                del users[rule_id]
+            if not users:
+                del self._keyword_rules[keyword]
+                if keyword and self._automaton is not None:
+                    self._automaton.remove(keyword, keyword)
+        if self._last_scan is not None:
+            self._last_scan[2].pop(rule_id, None)
+
+    def hit_counts(self, content: Any) -> Dict[str, int]:
+        """Returns, per rule with hits, how many of its keyword conditions occur in content.
+
+        Matching is case-insensitive substring matching on ``str(content)``. The result
+        for the most recent content is cached, so evaluating many rules against the same
+        content scans it only once. The returned mapping must not be modified.
+        """
+        with self._lock:
+            last = self._last_scan
+            if last is not None and (last[0] is content or last[0] == content):
+                return last[2]
+            text = str(content).lower()
+            counts: Dict[str, int] = {}
+            for keyword in self._find_keywords(text):
+                for rule_id, uses in self._keyword_rules[keyword].items():
+                    counts[rule_id] = counts.get(rule_id, 0) + uses
+            self._last_scan = (content, text, counts)
+            return counts
+
+    def _find_keywords(self, text: str) -> Set[Any]:
+        """Returns the registered keywords occurring in the text (caller holds the lock)."""
+        if len(self._keyword_rules) < self.automaton_threshold:
+            return {keyword for keyword in self._keyword_rules if keyword in text}
+        if self._automaton is None:
+            self._automaton = KeywordAutomaton()
+            for keyword in self._keyword_rules:
+                if keyword:
+                    self._automaton.add(keyword, keyword)
+        found = self._automaton.matched_values(text)
+        if "" in self._keyword_rules:
+            found.add("")
+        return found
@@ -1,9 +1,9 @@
-import json
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 from datetime import datetime, timezone
 
 from koios.logger import KoiosLogger
+from .rule_snapshot import FileState, RuleSnapshot, read_rules_file, rule_fingerprint
 from .validator import ValidationRule # Assuming ValidationRule is in validator.py
 
 logger = KoiosLogger.get_logger("ETHIK.Core.RuleLoader")
@@ -18,9 +18,16 @@ class RuleLoader:
             config: Configuration dictionary, expected to contain 'rules_file'.
         """
         self.config = config
+        self.fingerprints: Dict[str, str] = {}  # Definition hash per rule of the last load
+        self.source: Optional[FileState] = None  # State of the last loaded rules file
 
-    def load_rules(self) -> Dict[str, ValidationRule]:
-        """Loads validation rules from the JSON file specified in the configuration."""
+    def load_rules(self, previous: Optional[RuleSnapshot] = None) -> Dict[str, ValidationRule]:
+        """Loads validation rules from the JSON file specified in the configuration.
+
+        Args:
+            previous: Snapshot of the currently active rules; rules whose definition is
+                unchanged are reused instead of being parsed again.
+        """
         rules_file_path_str = self.config.get("rules_file")
         if not rules_file_path_str:
             logger.error("'rules_file' not found in config. Cannot load rules.")
@@ -45,8 +52,7 @@ class RuleLoader:
             return {}
 
         try:
-            with rules_path.open("r", encoding="utf-8") as f:
-                rules_data = json.load(f)
+            rules_data, source = read_rules_file(rules_path)
 
             if not isinstance(rules_data, dict) or "rules" not in rules_data:
                 raise ValueError("Invalid format: Missing top-level 'rules' key.")
@@ -54,10 +60,21 @@ class RuleLoader:
                 raise ValueError("Invalid format: 'rules' key must contain a list.")
 
             loaded_rules: Dict[str, ValidationRule] = {}
+            fingerprints: Dict[str, str] = {}
             for i, rule_dict in enumerate(rules_data["rules"]):
                 if not isinstance(rule_dict, dict):
                     logger.warning(f"Skipping invalid rule entry #{i+1}: Not a dict.")
                     continue
+                fingerprint = rule_fingerprint(rule_dict)
+                rule_id = rule_dict.get("id")
+                if (
+                    previous is not None
+                    and isinstance(rule_id, str)
+                    and previous.fingerprints.get(rule_id) == fingerprint
+                ):
+                    loaded_rules[rule_id] = previous.rules[rule_id]
+                    fingerprints[rule_id] = fingerprint
+                    continue
                 try:
                     required_keys = {"id", "name", "description", "severity", "conditions", "threshold", "action"}
                     if not required_keys.issubset(rule_dict.keys()):
@@ -74,11 +91,14 @@ class RuleLoader:
                     if rule.id in loaded_rules:
                         logger.warning(f"Duplicate rule ID '{rule.id}'. Overwriting.")
                     loaded_rules[rule.id] = rule
+                    fingerprints[rule.id] = fingerprint
                 except (TypeError, ValueError) as rule_parse_err:
                     logger.error(f"Error parsing rule entry #{i+1}: {rule_parse_err}")
                 except Exception as inner_e:
                      logger.error(f"Unexpected error processing rule entry #{i+1}: {inner_e}", exc_info=True)
 
+            self.fingerprints = fingerprints
+            self.source = source
             logger.info(f"Successfully loaded {len(loaded_rules)} validation rules from {rules_path.name}")
             return loaded_rules
 
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Rule Snapshots: Immutable, versioned rule sets with hot reload.
+
+A RuleSnapshot bundles a read-only view of the rules with everything compiled from
+them (rule index, sanitization engine, ...) under one version number. Readers fetch
+the current snapshot once per request and keep using it, so a request always finishes
+on the rule set it started with and never observes a half-applied change. Writers never
+modify a published snapshot: they copy the rule mapping, apply their change, compile
+the result and swap the new snapshot in with a single reference assignment.
+
+Every rule carries a fingerprint (hash of its source definition). When the rules file
+changes, only rules whose fingerprint differs are re-created; builders receive the
+previous snapshot and reuse whatever was compiled for unchanged rule objects.
+
+RuleFileWatcher polls a rules file in a background thread. It compares modification
+time and size first and hashes the file only when they change, so a touch without
+content changes does not trigger a reload.
+"""
+
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple, Union
+
+DEFAULT_WATCH_INTERVAL = 2.0  # Seconds between rules file checks
+
+
+@dataclass(frozen=True)
+class FileState:
+    """Identity of a rules file version."""
+
+    mtime_ns: int
+    size: int
+    digest: str  # SHA-256 of the file content
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    """Immutable rule set together with its compiled form."""
+
+    version: int
+    rules: Mapping[str, Any]
+    fingerprints: Mapping[str, str]  # Rule id -> definition hash ('' when unknown)
+    compiled: Any = None  # Built by the owner from `rules`; never mutated once published
+    source: Optional[FileState] = None  # File the rules were loaded from, if any
+    created_at: float = field(default_factory=time.time)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def rule_fingerprint(definition: Any) -> str:
+    """Returns a stable hash of a rule definition (key order independent)."""
+    canonical = json.dumps(definition, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def read_file_state(path: Union[str, Path]) -> Tuple[bytes, FileState]:
+    """Reads a rules file without parsing it, returning its raw content and file state.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    with open(path, "rb") as f:
+        data = f.read()
+    return data, FileState(mtime_ns, len(data), hashlib.sha256(data).hexdigest())
+
+
+def read_rules_file(path: Union[str, Path]) -> Tuple[Any, FileState]:
+    """Reads and parses a JSON rules file, returning its content and file state.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not valid JSON (json.JSONDecodeError).
+    """
+    data, state = read_file_state(path)
+    return json.loads(data), state
+
+
+class RuleSnapshotHolder:
+    """Publishes rule snapshots copy-on-write; readers never take a lock."""
+
+    def __init__(
+        self,
+        build: Callable[[Mapping[str, Any], Optional[RuleSnapshot]], Any],
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the holder with an empty snapshot (version 0).
+
+        Args:
+            build: Compiles a rule mapping; receives the previous snapshot so that
+                artifacts of unchanged rules can be reused.
+            logger: Logger for publish notices.
+        """
+        self._build = build
+        self.logger = logger or logging.getLogger(__name__)
+        self._write_lock = threading.RLock()
+        empty: Mapping[str, Any] = MappingProxyType({})
+        self._current = RuleSnapshot(0, empty, empty, build({}, None))
+
+    @property
+    def current(self) -> RuleSnapshot:
+        """The latest published snapshot."""
+        return self._current
+
+    def publish(
+        self,
+        rules: Mapping[str, Any],
+        fingerprints: Optional[Mapping[str, str]] = None,
+        source: Optional[FileState] = None,
+        compiled: Any = None,
+    ) -> RuleSnapshot:
+        """Compiles a complete rule set and makes it current.
+
+        If compilation raises, the current snapshot stays in place.
+
+        Args:
+            rules: The complete rule set.
+            fingerprints: Definition hash per rule.
+            source: State of the file the rules were loaded from.
+            compiled: Already compiled form of `rules` (e.g. from a rule bundle); the
+                build function is only called when this is None.
+        """
+        with self._write_lock:
+            previous = self._current
+            rules = dict(rules)
+            fingerprints = fingerprints or {}
+            if fingerprints.keys() == rules.keys():
+                prints = dict(fingerprints)
+            else:
+                prints = {rule_id: fingerprints.get(rule_id, "") for rule_id in rules}
+            snapshot = RuleSnapshot(
+                version=previous.version + 1,
+                rules=MappingProxyType(rules),
+                fingerprints=MappingProxyType(prints),
+                compiled=compiled if compiled is not None else self._build(rules, previous),
+                source=source if source is not None else previous.source,
+            )
+            self._current = snapshot  # Single reference swap: readers see old or new
+            self.logger.debug(f"Published rule snapshot v{snapshot.version} ({len(rules)} rules)")
+            return snapshot
+
+    def update(
+        self,
+        upserts: Optional[Mapping[str, Any]] = None,
+        removals: Iterable[str] = (),
+        fingerprints: Optional[Mapping[str, str]] = None,
+    ) -> RuleSnapshot:
+        """Publishes a copy of the current rules with rules added, replaced or removed."""
+        with self._write_lock:
+            current = self._current
+            rules = dict(current.rules)
+            prints = dict(current.fingerprints)
+            for rule_id in removals:
+                rules.pop(rule_id, None)
+                prints.pop(rule_id, None)
+            for rule_id, rule in (upserts or {}).items():
+                rules[rule_id] = rule
+                prints[rule_id] = (fingerprints or {}).get(rule_id, "")
+            return self.publish(rules, prints)
+
+
+class RuleFileWatcher:
+    """Background poller that reports content changes of a rules file."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        on_change: Callable[[bytes, FileState], None],
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        logger: Optional[logging.Logger] = None,
+        initial_state: Optional[FileState] = None,
+    ):
+        """Initializes the watcher (call start() to begin polling).
+
+        Args:
+            path: The file to watch.
+            on_change: Called with the new content and state when the content changes.
+            interval: Seconds between checks.
+            logger: Logger for reload errors.
+            initial_state: State of the already loaded version, if known.
+        """
+        self.path = Path(path)
+        self.on_change = on_change
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.state = initial_state
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts polling in a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"rule-watcher:{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stops polling and waits for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check(self) -> bool:
+        """Checks the file once; returns True if a content change was reported."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False  # Missing or unreadable: keep the loaded rules
+        state = self.state
+        if state is not None and (stat.st_mtime_ns, stat.st_size) == (state.mtime_ns, state.size):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        new_state = FileState(stat.st_mtime_ns, len(data), hashlib.sha256(data).hexdigest())
+        self.state = new_state
+        if state is not None and new_state.digest == state.digest:
+            return False  # Touched or rewritten with identical content
+        self.on_change(data, new_state)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Error reloading rules from {self.path}: {e}", exc_info=True)
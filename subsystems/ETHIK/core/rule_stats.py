@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Rule Stats: Per-rule and per-pattern profiling with a pattern time budget.
+
+The compiled engine matches all patterns in one combined pass, so per-pattern time is
+not observable on ordinary scans. Counters that are (invocations, matches, bytes
+scanned) are recorded for every scan at the cost of one dictionary update per scan and
+one per match. Timing comes from profiled scans: every `sample_every`-th scan is
+repeated with each pattern run on its own, which yields cumulative, maximum and p99
+time per pattern and per rule.
+
+PatternGuard checks profiled pattern times against a budget. A pattern over budget is
+flagged; with the 'quarantine' action, a pattern that exceeds the budget
+`max_violations` times is reported for exclusion from compiled engines, so a
+catastrophic-backtracking pattern cannot keep stalling the scans that follow.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# (rule id, pattern) identifies a pattern across engines and rule-set versions
+PatternKey = Tuple[str, str]
+
+# Recent profiled run times kept per pattern and rule for percentiles
+DEFAULT_SAMPLE_SIZE = 1024
+# Scans between two profiled scans; 0 disables profiling
+DEFAULT_SAMPLE_EVERY = 1000
+DEFAULT_BUDGET_MS = 50.0
+
+
+@dataclass
+class _TimingStats:
+    """Counters and recent run times of one rule or pattern."""
+
+    invocations: int = 0
+    matches: int = 0
+    bytes_scanned: int = 0
+    timed_runs: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=DEFAULT_SAMPLE_SIZE))
+
+    def add_time(self, elapsed: float) -> None:
+        self.timed_runs += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.samples.append(elapsed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else 0.0
+        return {
+            "invocations": self.invocations,
+            "matches": self.matches,
+            "bytes_scanned": self.bytes_scanned,
+            "timed_runs": self.timed_runs,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.timed_runs if self.timed_runs else 0.0,
+            "p99_time": p99,
+            "max_time": self.max_time,
+        }
+
+
+class RuleStatsCollector:
+    """Thread-safe accumulator of per-rule and per-pattern scan statistics."""
+
+    def __init__(
+        self, sample_every: int = DEFAULT_SAMPLE_EVERY, sample_size: int = DEFAULT_SAMPLE_SIZE
+    ):
+        """Initializes the collector.
+
+        Args:
+            sample_every: Scans between two profiled scans; 0 disables profiling.
+            sample_size: Profiled run times kept per pattern and rule for percentiles.
+        """
+        self.sample_every = sample_every
+        self.sample_size = sample_size
+        self.scans = 0
+        self.profiled_scans = 0
+        self._lock = threading.Lock()
+        # Pattern set of an engine -> [scans, bytes scanned]; expanded per pattern on read
+        self._engine_scans: Dict[Tuple[PatternKey, ...], List[int]] = {}
+        self._match_counts: Dict[PatternKey, int] = {}
+        self._pattern_times: Dict[PatternKey, _TimingStats] = {}
+        self._rule_times: Dict[str, _TimingStats] = {}
+
+    def record_scan(
+        self, pattern_keys: Tuple[PatternKey, ...], size: int, matched: Iterable[PatternKey]
+    ) -> bool:
+        """Counts one scan of `size` characters by an engine holding `pattern_keys`.
+
+        Args:
+            pattern_keys: The patterns of the scanning engine.
+            size: Number of characters scanned.
+            matched: The pattern of every accepted match.
+
+        Returns:
+            True if this scan is due for profiling.
+        """
+        with self._lock:
+            self.scans += 1
+            totals = self._engine_scans.get(pattern_keys)
+            if totals is None:
+                totals = self._engine_scans[pattern_keys] = [0, 0]
+            totals[0] += 1
+            totals[1] += size
+            counts = self._match_counts
+            for key in matched:
+                counts[key] = counts.get(key, 0) + 1
+            return self.sample_every > 0 and self.scans % self.sample_every == 0
+
+    def record_profile(self, timings: Sequence[Tuple[PatternKey, float]]) -> None:
+        """Adds the per-pattern run times of one profiled scan."""
+        rule_totals: Dict[str, float] = {}
+        for (rule_id, _), elapsed in timings:
+            rule_totals[rule_id] = rule_totals.get(rule_id, 0.0) + elapsed
+        with self._lock:
+            self.profiled_scans += 1
+            for key, elapsed in timings:
+                self._timing(self._pattern_times, key).add_time(elapsed)
+            for rule_id, elapsed in rule_totals.items():
+                self._timing(self._rule_times, rule_id).add_time(elapsed)
+
+    def _timing(self, table: Dict[Any, _TimingStats], key: Any) -> _TimingStats:
+        stats = table.get(key)
+        if stats is None:
+            stats = table[key] = _TimingStats(samples=deque(maxlen=self.sample_size))
+        return stats
+
+    def stats(self, rule_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Returns per-rule and per-pattern statistics.
+
+        Args:
+            rule_ids: Restrict the report to these rules (default: all rules seen).
+
+        Returns:
+            A dict with scan totals, 'rules' (by rule id) and 'patterns' (a list of
+            per-pattern entries carrying 'rule_id' and 'pattern'). Time values are in
+            seconds and come from profiled scans only.
+        """
+        wanted: Optional[Set[str]] = set(rule_ids) if rule_ids is not None else None
+        with self._lock:
+            patterns: Dict[PatternKey, _TimingStats] = {}
+            rules: Dict[str, _TimingStats] = {}
+            for keys, (scans, size) in self._engine_scans.items():
+                for rule_id in {rule_id for rule_id, _ in keys}:
+                    rule = rules.setdefault(rule_id, _TimingStats())
+                    rule.invocations += scans
+                    rule.bytes_scanned += size
+                for key in keys:
+                    pattern = patterns.setdefault(key, _TimingStats())
+                    pattern.invocations += scans
+                    pattern.bytes_scanned += size
+            for key, count in self._match_counts.items():
+                patterns.setdefault(key, _TimingStats()).matches += count
+                rules.setdefault(key[0], _TimingStats()).matches += count
+            for table, timed in ((patterns, self._pattern_times), (rules, self._rule_times)):
+                for key, source in timed.items():
+                    target = table.setdefault(key, _TimingStats())
+                    target.timed_runs = source.timed_runs
+                    target.total_time = source.total_time
+                    target.max_time = source.max_time
+                    target.samples = source.samples
+            report = {
+                "scans": self.scans,
+                "profiled_scans": self.profiled_scans,
+                "rules": {
+                    rule_id: stats.as_dict()
+                    for rule_id, stats in rules.items()
+                    if wanted is None or rule_id in wanted
+                },
+                "patterns": [
+                    dict(rule_id=rule_id, pattern=pattern, **stats.as_dict())
+                    for (rule_id, pattern), stats in patterns.items()
+                    if wanted is None or rule_id in wanted
+                ],
+            }
+        return report
+
+    def reset(self) -> None:
+        """Clears all statistics."""
+        with self._lock:
+            self.scans = 0
+            self.profiled_scans = 0
+            self._engine_scans.clear()
+            self._match_counts.clear()
+            self._pattern_times.clear()
+            self._rule_times.clear()
+
+
+class PatternGuard:
+    """Flags or quarantines patterns whose profiled run time exceeds a budget."""
+
+    ACTIONS = ("flag", "quarantine")
+
+    def __init__(
+        self,
+        budget_seconds: float = DEFAULT_BUDGET_MS / 1000,
+        action: str = "flag",
+        max_violations: int = 1,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the guard.
+
+        Args:
+            budget_seconds: Allowed time for one pattern on one scan.
+            action: 'flag' only records and logs violations; 'quarantine' also reports
+                the pattern for exclusion once it reaches `max_violations`.
+            max_violations: Violations before a pattern is quarantined.
+            logger: Logger for violation warnings.
+
+        Raises:
+            ValueError: If the action is unknown.
+        """
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown guard action '{action}'. Expected one of {self.ACTIONS}.")
+        self.budget_seconds = budget_seconds
+        self.action = action
+        self.max_violations = max(1, max_violations)
+        self.logger = logger or logging.getLogger(__name__)
+        self.violations: Dict[PatternKey, int] = {}
+        self._quarantined: Set[PatternKey] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def quarantined(self) -> frozenset:
+        """Patterns currently excluded from compiled engines."""
+        return frozenset(self._quarantined)
+
+    def check(self, timings: Sequence[Tuple[PatternKey, float]], size: int) -> List[PatternKey]:
+        """Records violations in the timings of one profiled scan.
+
+        Returns:
+            The patterns newly quarantined by this scan.
+        """
+        newly_quarantined: List[PatternKey] = []
+        with self._lock:
+            for key, elapsed in timings:
+                if elapsed <= self.budget_seconds:
+                    continue
+                count = self.violations[key] = self.violations.get(key, 0) + 1
+                self.logger.warning(
+                    f"Sanitization pattern {key[1]!r} of rule {key[0]} took "
+                    f"{elapsed * 1000:.1f} ms on {size} characters "
+                    f"(budget {self.budget_seconds * 1000:.1f} ms, violation {count})."
+                )
+                if (
+                    self.action == "quarantine"
+                    and count >= self.max_violations
+                    and key not in self._quarantined
+                ):
+                    self._quarantined.add(key)
+                    newly_quarantined.append(key)
+        for rule_id, pattern in newly_quarantined:
+            self.logger.error(f"Quarantined sanitization pattern {pattern!r} of rule {rule_id}.")
+        return newly_quarantined
+
+    def release(self, keys: Optional[Iterable[PatternKey]] = None) -> List[PatternKey]:
+        """Lifts the quarantine of the given patterns (default: all) and resets their counts.
+
+        Returns:
+            The patterns released.
+        """
+        with self._lock:
+            released = list(self._quarantined if keys is None else set(keys) & self._quarantined)
+            for key in released:
+                self._quarantined.discard(key)
+                self.violations.pop(key, None)
+        return released
@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Sanitization Engine: Compiled single-pass matcher for sanitization rules.
+
+The engine is built once from an ordered set of sanitization rules. Regex patterns are
+merged into one alternation with a named group per pattern, literal patterns are served
+by an Aho-Corasick automaton, and the few patterns that cannot be merged (backreferences,
+named groups, global inline flags) are kept as standalone compiled expressions. A scan
+walks the content once, left to right, taking the leftmost match (at equal start, the
+earliest rule/pattern).
+
+Overlapping matches are resolved as the sequential sanitizer resolves them: the
+earliest rule/pattern claims its span first, even when a later one starts further
+left. When a higher-priority pattern may match inside an accepted span, the content
+is rescanned pattern by pattern, each pattern searching only the text that earlier
+patterns left unclaimed. Content without such overlaps never pays for the rescan.
+"""
+
+from dataclasses import dataclass
+import logging
+import re
+import time
+from typing import AbstractSet, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .keyword_automaton import KeywordAutomaton
+
+DEFAULT_REPLACEMENT = "[REDACTED]"
+
+# Below this many literal patterns the C regex engine beats a Python-level automaton,
+# so literals are folded into the combined alternation instead.
+LITERAL_AUTOMATON_THRESHOLD = 32
+
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Constructs whose meaning depends on group numbering/naming or on the whole expression.
+_UNMERGEABLE_PATTERN = re.compile(r"\(\?P[<=]|\(\?<|\(\?\(|\\[1-9]|\\g<|^\(\?[aiLmsux]+\)")
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """A single sanitization pattern with its resolved replacement."""
+
+    order: int  # Global rule/pattern order; lower values win ties at the same position
+    rule_index: int
+    rule_id: str
+    pattern: str
+    replacement: str
+
+
+@dataclass(frozen=True)
+class EngineMatch:
+    """A match accepted by the engine, with positions in the scanned content."""
+
+    start: int
+    end: int
+    original: str
+    spec: CompiledPattern
+
+
+_Candidate = Tuple[int, int, CompiledPattern]
+
+
+def is_literal_pattern(pattern: str) -> bool:
+    """Returns True if the pattern contains no regex metacharacters."""
+    return bool(pattern) and not any(char in _REGEX_METACHARACTERS for char in pattern)
+
+
+class CompiledSanitizationEngine:
+    """Matches all patterns of an ordered rule set in a single pass."""
+
+    def __init__(
+        self,
+        rules: Sequence[Any],
+        logger: Optional[logging.Logger] = None,
+        literal_threshold: int = LITERAL_AUTOMATON_THRESHOLD,
+        excluded: AbstractSet[Tuple[str, str]] = frozenset(),
+    ):
+        """Compiles the rule set.
+
+        Args:
+            rules: Ordered rules exposing `id`, `patterns` and `replacements`.
+            logger: Logger used to report invalid patterns.
+            literal_threshold: Minimum number of literal patterns before the
+                Aho-Corasick automaton is used instead of the combined regex.
+            excluded: (rule id, pattern) pairs to leave out, e.g. quarantined patterns.
+        """
+        self.rules = list(rules)
+        self.logger = logger or logging.getLogger(__name__)
+        self.excluded = frozenset(excluded)
+        self.patterns: List[CompiledPattern] = []
+        # (rule id, pattern) of every compiled pattern, in pattern order
+        self.pattern_keys: Tuple[Tuple[str, str], ...] = ()
+        # Standalone expression per pattern, for profiling (None: compiled on first use)
+        self._regexes: Optional[List[re.Pattern]] = []
+        self._combined: Optional[re.Pattern] = None
+        self._group_specs: Dict[str, CompiledPattern] = {}
+        self._standalone: List[Tuple[re.Pattern, CompiledPattern]] = []
+        self._automaton: Optional[KeywordAutomaton] = None
+        self._longest_literal = 0  # Length of the longest pattern in the automaton
+        self._compile(literal_threshold)
+
+    def _compile(self, literal_threshold: int) -> None:
+        """Classifies every pattern and builds the scanners."""
+        mergeable: List[CompiledPattern] = []
+        literals: List[CompiledPattern] = []
+
+        for rule_index, rule in enumerate(self.rules):
+            replacements = rule.replacements or {}
+            for pattern in rule.patterns:
+                if (rule.id, pattern) in self.excluded:
+                    continue
+                try:
+                    compiled = re.compile(pattern)
+                except re.error as e:
+                    self.logger.error(
+                        f"Skipping invalid pattern {pattern!r} in sanitization rule {rule.id}: {e}"
+                    )
+                    continue
+                spec = CompiledPattern(
+                    order=len(self.patterns),
+                    rule_index=rule_index,
+                    rule_id=rule.id,
+                    pattern=pattern,
+                    replacement=replacements.get(pattern, DEFAULT_REPLACEMENT),
+                )
+                self.patterns.append(spec)
+                self._regexes.append(compiled)
+                if is_literal_pattern(pattern):
+                    literals.append(spec)
+                elif _UNMERGEABLE_PATTERN.search(pattern):
+                    self._standalone.append((compiled, spec))
+                else:
+                    mergeable.append(spec)
+
+        self.pattern_keys = tuple((spec.rule_id, spec.pattern) for spec in self.patterns)
+
+        if len(literals) >= literal_threshold:
+            self._automaton = KeywordAutomaton()
+            for spec in literals:
+                self._automaton.add(spec.pattern, spec)
+            self._automaton.build()
+            self._longest_literal = max(len(spec.pattern) for spec in literals)
+        else:
+            mergeable = sorted(mergeable + literals, key=lambda spec: spec.order)
+
+        if mergeable:
+            alternatives = []
+            for spec in mergeable:
+                group_name = f"_ethik_p{spec.order}"
+                self._group_specs[group_name] = spec
+                alternatives.append(f"(?P<{group_name}>{spec.pattern})")
+            try:
+                self._combined = re.compile("|".join(alternatives))
+            except re.error as e:
+                # Defensive: keep every pattern working even if the merge itself fails.
+                self.logger.warning(
+                    f"Could not merge sanitization patterns ({e}); scanning them separately."
+                )
+                self._group_specs.clear()
+                self._standalone.extend((re.compile(spec.pattern), spec) for spec in mergeable)
+                self._standalone.sort(key=lambda item: item[1].order)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled into rule bundles: the per-pattern expressions were only needed to
+        # validate the patterns and are recompiled if profiling needs them
+        state = self.__dict__.copy()
+        state.pop("logger", None)
+        state["_regexes"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the engine has no usable patterns."""
+        return not self.patterns
+
+    def _regex_scanner(
+        self,
+        compiled: re.Pattern,
+        resolve: Callable[[re.Match], CompiledPattern],
+        content: str,
+        endpos: int,
+    ) -> Callable[[int], Optional[_Candidate]]:
+        """Returns a function yielding the first non-empty match at or after a position."""
+
+        def next_from(position: int) -> Optional[_Candidate]:
+            while position <= endpos:
+                match = compiled.search(content, position, endpos)
+                if match is None:
+                    return None
+                if match.end() > match.start():
+                    return match.start(), match.end(), resolve(match)
+                position = match.start() + 1  # Zero-width matches are never replaced
+            return None
+
+        return next_from
+
+    def _literal_scanner(
+        self, content: str, pos: int, endpos: int
+    ) -> Callable[[int], Optional[_Candidate]]:
+        """Runs the automaton once and serves its matches in (start, order) order."""
+        window = content[pos:endpos]
+        found = sorted(
+            (
+                (start + pos, end + pos, spec)
+                for start, end, spec in self._automaton.iter_matches(window)
+            ),
+            key=lambda candidate: (candidate[0], candidate[2].order),
+        )
+        cursor = 0
+
+        def next_from(position: int) -> Optional[_Candidate]:
+            nonlocal cursor
+            while cursor < len(found) and found[cursor][0] < position:
+                cursor += 1
+            return found[cursor] if cursor < len(found) else None
+
+        return next_from
+
+    def finditer(
+        self, content: str, pos: int = 0, endpos: Optional[int] = None
+    ) -> Iterator[EngineMatch]:
+        """Yields non-overlapping matches from left to right.
+
+        Where matches of different patterns overlap, the earliest rule/pattern keeps
+        its span, as with sequential substitution (see the module docstring).
+
+        Args:
+            content: The text to scan.
+            pos: Index where scanning starts (lookbehinds may still see earlier text).
+            endpos: Index where scanning stops; defaults to the end of the content.
+        """
+        endpos = len(content) if endpos is None else endpos
+        matches = list(self._single_pass(content, pos, endpos))
+        if any(self._may_be_preempted(content, match, endpos) for match in matches):
+            matches = self._scan_in_order(content, pos, endpos)
+        return iter(matches)
+
+    def _single_pass(self, content: str, pos: int, endpos: int) -> Iterator[EngineMatch]:
+        """Yields leftmost matches (earliest pattern at equal start) in one pass."""
+        group_specs = self._group_specs
+
+        # Fast path: everything lives in the combined alternation.
+        if self._combined is not None and not self._standalone and self._automaton is None:
+            for match in self._combined.finditer(content, pos, endpos):
+                if match.end() > match.start():
+                    yield EngineMatch(
+                        match.start(), match.end(), match.group(), group_specs[match.lastgroup]
+                    )
+            return
+
+        scanners: List[Callable[[int], Optional[_Candidate]]] = []
+        if self._combined is not None:
+            scanners.append(
+                self._regex_scanner(
+                    self._combined, lambda m: group_specs[m.lastgroup], content, endpos
+                )
+            )
+        for compiled, spec in self._standalone:
+            scanners.append(self._regex_scanner(compiled, lambda m, s=spec: s, content, endpos))
+        if self._automaton is not None:
+            scanners.append(self._literal_scanner(content, pos, endpos))
+
+        heads = [scanner(pos) for scanner in scanners]
+        while True:
+            best_index = -1
+            best: Optional[_Candidate] = None
+            for index, head in enumerate(heads):
+                if head is not None and (
+                    best is None or (head[0], head[2].order) < (best[0], best[2].order)
+                ):
+                    best_index, best = index, head
+            if best is None:
+                return
+            start, end, spec = best
+            yield EngineMatch(start, end, content[start:end], spec)
+            heads[best_index] = scanners[best_index](end)
+            for index, head in enumerate(heads):
+                if head is not None and head[0] < end:
+                    heads[index] = scanners[index](end)
+
+    def _may_be_preempted(self, content: str, match: EngineMatch, endpos: int) -> bool:
+        """Returns True if an earlier pattern may match starting inside a match.
+
+        Sequentially, that pattern would have claimed its span first. The check is
+        conservative: a false positive only costs a rescan.
+        """
+        order = match.spec.order
+        if order == 0:
+            return False
+        for position in range(match.start + 1, match.end):
+            if self._combined is not None:
+                found = self._combined.match(content, position, endpos)
+                if found is not None and self._group_specs[found.lastgroup].order < order:
+                    return True
+            for compiled, spec in self._standalone:
+                if spec.order >= order:
+                    break  # Sorted by order
+                if compiled.match(content, position, endpos) is not None:
+                    return True
+        if self._automaton is not None:
+            window_end = min(endpos, match.end + self._longest_literal - 1)
+            for start, _, spec in self._automaton.iter_matches(
+                content[match.start + 1 : window_end]
+            ):
+                if start < match.end - match.start - 1 and spec.order < order:
+                    return True
+        return False
+
+    def _scan_in_order(self, content: str, pos: int, endpos: int) -> List[EngineMatch]:
+        """Matches pattern by pattern, each in the gaps earlier patterns left free."""
+        claimed: List[Tuple[int, int]] = []  # Accepted spans, sorted by start
+        matches: List[EngineMatch] = []
+        for spec, compiled in zip(self.patterns, self._pattern_regexes()):
+            gaps, last = [], pos
+            for start, end in claimed:
+                if start > last:
+                    gaps.append((last, start))
+                last = max(last, end)
+            if last < endpos:
+                gaps.append((last, endpos))
+            for gap_start, gap_end in gaps:
+                for found in compiled.finditer(content, gap_start, gap_end):
+                    if found.end() > found.start():
+                        claimed.append((found.start(), found.end()))
+                        matches.append(EngineMatch(found.start(), found.end(), found.group(), spec))
+            claimed.sort()
+        matches.sort(key=lambda match: match.start)
+        return matches
+
+    def _pattern_regexes(self) -> List[re.Pattern]:
+        """Returns the standalone expression of every pattern, in pattern order."""
+        if self._regexes is None:
+            self._regexes = [re.compile(spec.pattern) for spec in self.patterns]
+        return self._regexes
+
+    def profile(self, content: str) -> List[Tuple[CompiledPattern, float]]:
+        """Runs every pattern on its own over the content and times it.
+
+        Slower than a normal scan by roughly the number of patterns; meant for sampled
+        profiling, not for sanitizing.
+
+        Returns:
+            (pattern, seconds) for every pattern, in pattern order.
+        """
+        timings: List[Tuple[CompiledPattern, float]] = []
+        clock = time.perf_counter
+        for spec, compiled in zip(self.patterns, self._pattern_regexes()):
+            start = clock()
+            for _ in compiled.finditer(content):
+                pass
+            timings.append((spec, clock() - start))
+        return timings
+
+    @staticmethod
+    def substitute(content: str, matches: Sequence[EngineMatch], offset: int = 0) -> str:
+        """Builds the sanitized text for content with a single join.
+
+        Args:
+            content: The scanned text.
+            matches: Matches in ascending, non-overlapping order.
+            offset: Value subtracted from match positions (for scans of a larger buffer).
+        """
+        parts: List[str] = []
+        last = 0
+        for match in matches:
+            parts.append(content[last : match.start - offset])
+            parts.append(match.spec.replacement)
+            last = match.end - offset
+        parts.append(content[last:])
+        return "".join(parts)
+
+    def sanitize(self, content: str) -> Tuple[str, List[EngineMatch]]:
+        """Sanitizes content in one pass.
+
+        Returns:
+            The sanitized text and the accepted matches in positional order.
+        """
+        matches = list(self.finditer(content))
+        if not matches:
+            return content, matches
+        return self.substitute(content, matches), matches
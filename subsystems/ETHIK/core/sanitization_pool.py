@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""ETHIK Sanitization Pool: Process pool with warm, precompiled rule sets.
+
+Pattern matching is CPU-bound Python, so threads give little speedup under the GIL.
+This pool runs sanitization in worker processes instead. Every worker compiles the rule
+set once, in its initializer, and keeps engines for context-specific rule subsets, so a
+task only carries the texts to scan. Workers return compact match tuples; the parent
+process rebuilds full results with its own engine, whose pattern order is identical.
+The pool is recreated whenever the rule-set version changes.
+"""
+
+import concurrent.futures
+from dataclasses import dataclass
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .sanitization_engine import CompiledSanitizationEngine
+
+# Worker output per text: (sanitized text or None when unchanged,
+# [(start, end, pattern order), ...], error message or None)
+WorkerOutput = Tuple[Optional[str], List[Tuple[int, int, int]], Optional[str]]
+
+# Upper bound on subset engines kept by each worker
+MAX_WORKER_VARIANTS = 32
+
+
+@dataclass(frozen=True)
+class WorkerRule:
+    """The parts of a sanitization rule a worker needs to compile it."""
+
+    id: str
+    patterns: Tuple[str, ...]
+    replacements: Dict[str, str]
+
+
+# --- Worker process state and entry points --- #
+
+_worker_rules: List[WorkerRule] = []
+_worker_threshold = 0
+_worker_engines: Dict[Optional[Tuple[int, ...]], CompiledSanitizationEngine] = {}
+
+
+def _init_worker(rules: List[WorkerRule], literal_threshold: int) -> None:
+    """Compiles the full rule set once per worker process."""
+    global _worker_rules, _worker_threshold, _worker_engines
+    _worker_rules = rules
+    _worker_threshold = literal_threshold
+    _worker_engines = {None: CompiledSanitizationEngine(rules, literal_threshold=literal_threshold)}
+
+
+def _worker_engine(rule_indexes: Optional[Tuple[int, ...]]) -> CompiledSanitizationEngine:
+    engine = _worker_engines.get(rule_indexes)
+    if engine is None:
+        subset = [_worker_rules[index] for index in rule_indexes]
+        engine = CompiledSanitizationEngine(subset, literal_threshold=_worker_threshold)
+        if len(_worker_engines) > MAX_WORKER_VARIANTS:
+            # Keep the full engine (inserted first), drop the oldest subset
+            _worker_engines.pop(next(key for key in _worker_engines if key is not None))
+        _worker_engines[rule_indexes] = engine
+    return engine
+
+
+def _sanitize_in_worker(
+    rule_indexes: Optional[Tuple[int, ...]], contents: List[str]
+) -> List[WorkerOutput]:
+    """Sanitizes a chunk of texts with the (subset) engine for the given rules."""
+    engine = _worker_engine(rule_indexes)
+    outputs: List[WorkerOutput] = []
+    for content in contents:
+        try:
+            matches = list(engine.finditer(content))
+            sanitized = engine.substitute(content, matches) if matches else None
+            outputs.append(
+                (sanitized, [(match.start, match.end, match.spec.order) for match in matches], None)
+            )
+        except Exception as e:
+            outputs.append((None, [], str(e)))
+    return outputs
+
+
+class SanitizationWorkerPool:
+    """Process pool whose workers hold a warm copy of one rule-set version."""
+
+    def __init__(self, max_workers: Optional[int] = None, logger: Optional[logging.Logger] = None):
+        """Initializes the pool; worker processes are started on first use.
+
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count).
+            logger: Logger for pool lifecycle messages.
+        """
+        self.max_workers = max_workers
+        self.logger = logger or logging.getLogger(__name__)
+        self.version: Optional[int] = None
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        engine: CompiledSanitizationEngine,
+        version: int,
+        rule_indexes: Optional[Sequence[int]],
+        contents: List[str],
+        literal_threshold: int,
+    ) -> concurrent.futures.Future:
+        """Schedules a chunk of texts on the workers.
+
+        Args:
+            engine: The full engine of the rule-set version being used.
+            version: Rule-set version of the engine; a different version than the
+                running workers hold restarts the pool.
+            rule_indexes: Indexes (into engine.rules) of the applicable rules, or None
+                when all rules apply.
+            contents: Texts to sanitize.
+            literal_threshold: Literal automaton threshold used to compile engines.
+
+        Returns:
+            A future resolving to one WorkerOutput per text.
+        """
+        executor = self._ensure_executor(engine, version, literal_threshold)
+        key = None if rule_indexes is None else tuple(rule_indexes)
+        return executor.submit(_sanitize_in_worker, key, contents)
+
+    def _ensure_executor(
+        self, engine: CompiledSanitizationEngine, version: int, literal_threshold: int
+    ) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is not None and self.version == version:
+                return self._executor
+            if self._executor is not None:
+                # Tasks already submitted still complete against the old rules
+                self._executor.shutdown(wait=False)
+            # Excluded (quarantined) patterns are dropped so that pattern orders match
+            rules = [
+                WorkerRule(
+                    rule.id,
+                    tuple(p for p in rule.patterns if (rule.id, p) not in engine.excluded),
+                    dict(rule.replacements or {}),
+                )
+                for rule in engine.rules
+            ]
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(rules, literal_threshold),
+            )
+            self.version = version
+            self.logger.info(
+                f"Started sanitization process pool for rules version {version} "
+                f"({len(rules)} rules)."
+            )
+            return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+                self.version = None
@@ -15,19 +15,83 @@ Love: 0.999
 
 import asyncio
 import concurrent.futures
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 import datetime
 import hashlib
 import json
 import logging
 from pathlib import Path
-from queue import PriorityQueue
-import re
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+import time
+from typing import (
+    AbstractSet,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 # Import Mycelium Interface (adjust path if necessary)
 from subsystems.MYCELIUM.core.interface import MyceliumInterface
 
+from . import keyword_automaton, sanitization_engine
+from .history import HistoryRecord, HistoryStore
+from .request_scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_QUEUE_SIZE,
+    DEFAULT_PRIORITY,
+    OVERLOADED,
+    RequestScheduler,
+)
+from .result_cache import BoundedResultCache
+from .rule_bundle import RuleBundle, RuleBundleStore, code_tag
+from .rule_snapshot import (
+    DEFAULT_WATCH_INTERVAL,
+    FileState,
+    RuleFileWatcher,
+    RuleSnapshot,
+    RuleSnapshotHolder,
+    read_file_state,
+    rule_fingerprint,
+)
+from .rule_stats import DEFAULT_BUDGET_MS, DEFAULT_SAMPLE_EVERY, PatternGuard, RuleStatsCollector
+from .sanitization_engine import (
+    LITERAL_AUTOMATON_THRESHOLD,
+    CompiledSanitizationEngine,
+    EngineMatch,
+)
+from .sanitization_pool import SanitizationWorkerPool, WorkerOutput
+
+# Ethical score deduction per applied rule, by rule severity ('low' and unknown: 0.05)
+SEVERITY_PENALTIES = {"critical": 0.5, "high": 0.2, "medium": 0.1}
+# Upper bound on engines compiled for context-specific subsets of the rules
+MAX_ENGINE_VARIANTS = 32
+# Cache key component used when every loaded rule applies
+ALL_RULES_KEY = "*"
+# Characters carried across chunk boundaries by streaming sanitization; a pattern match
+# longer than this may be split by a boundary if the chunk source never pauses
+DEFAULT_STREAM_OVERLAP = 1024
+# Changes kept in a streaming result; later changes are only counted
+DEFAULT_STREAM_MAX_CHANGES = 1000
+# Batches with fewer uncached items are sanitized in-process: IPC would cost more
+DEFAULT_BATCH_MIN_SIZE = 64
+# Items sent to a worker process per task
+DEFAULT_BATCH_CHUNK_SIZE = 32
+# Records kept in the sanitization history ring buffer
+DEFAULT_HISTORY_SIZE = 10000
+# Topic and period of rule statistics published while monitoring (interval 0: off)
+DEFAULT_METRICS_TOPIC = "ethik.metrics.rules"
+DEFAULT_METRICS_INTERVAL = 60.0
+
 
 @dataclass
 class SanitizationRule:
@@ -61,6 +125,221 @@ class SanitizationResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class _CompiledRuleSet:
+    """Compiled form of one rule snapshot: the full engine and context-specific subsets."""
+
+    engine: CompiledSanitizationEngine
+    # Subset engines for contexts that exclude some rules; a cache, filled on demand
+    variants: Dict[str, CompiledSanitizationEngine] = field(default_factory=dict)
+
+
+class SanitizationStream:
+    """Incremental sanitization of a sequence of text chunks.
+
+    Iterate with ``for`` over a plain iterable of chunks, or with ``async for`` over an
+    async or plain iterable. Sanitized text is yielded as soon as it can no longer be
+    affected by later input; memory stays bounded by the chunk size plus the overlap.
+    Once the stream is exhausted, ``result`` summarizes it. The content itself is not
+    retained, so ``original_content`` and ``sanitized_content`` of the result are empty.
+    """
+
+    def __init__(
+        self,
+        sanitizer: "EthikSanitizer",
+        chunks: Union[Iterable[str], AsyncIterable[str]],
+        context: Optional[Dict[str, Any]] = None,
+        overlap: int = DEFAULT_STREAM_OVERLAP,
+        max_changes: int = DEFAULT_STREAM_MAX_CHANGES,
+    ):
+        """Initializes the stream.
+
+        Args:
+            sanitizer: The sanitizer whose rules are applied; the rule set is fixed
+                when the stream is created.
+            chunks: Source of text chunks.
+            context: Optional context used to select the applicable rules.
+            overlap: Characters held back at the end of the buffer (and kept before it
+                as look-behind) so that matches spanning a chunk boundary are found.
+            max_changes: Maximum number of changes recorded in the result.
+        """
+        self.sanitizer = sanitizer
+        self.context = context or {}
+        self.overlap = max(0, overlap)
+        self.max_changes = max_changes
+        self.result: Optional[SanitizationResult] = None
+        self._chunks = chunks
+        self._rules_key, self._engine = sanitizer._get_engine(self.context)
+        self._digest = hashlib.md5()
+        self._buffer = ""
+        self._scan_from = 0  # Buffer index where unprocessed text starts
+        self._consumed = 0  # Source characters already emitted
+        self._chunk_count = 0
+        self._changes: List[EngineMatch] = []
+        self._change_count = 0
+        self._rule_indexes: Set[int] = set()
+        self._start_time = datetime.datetime.now()
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            output = self._feed(chunk)
+            if output:
+                yield output
+        output = self._finish()
+        if output:
+            yield output
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate_async()
+
+    async def _iterate_async(self) -> AsyncIterator[str]:
+        executor = self.sanitizer.executor
+        loop = asyncio.get_running_loop()
+
+        async def feed(chunk: str) -> str:
+            if executor:
+                # Keep scanning of large chunks off the event loop
+                return await loop.run_in_executor(executor, self._feed, chunk)
+            return self._feed(chunk)
+
+        if hasattr(self._chunks, "__aiter__"):
+            async for chunk in self._chunks:
+                output = await feed(chunk)
+                if output:
+                    yield output
+        else:
+            for chunk in self._chunks:
+                output = await feed(chunk)
+                if output:
+                    yield output
+        output = self._finish()
+        if output:
+            yield output
+
+    def _feed(self, chunk: str) -> str:
+        """Adds a chunk and returns the sanitized text that is now final."""
+        if not isinstance(chunk, str):
+            raise TypeError(f"Stream chunks must be str, got {type(chunk).__name__}")
+        self._digest.update(chunk.encode())
+        self._chunk_count += 1
+        self._buffer += chunk
+        return self._drain(final=False)
+
+    def _drain(self, final: bool) -> str:
+        """Sanitizes the buffered text up to the hold-back point."""
+        buffer, start = self._buffer, self._scan_from
+        cut = len(buffer) if final else len(buffer) - self.overlap
+        if cut <= start:
+            return ""
+
+        committed: List[EngineMatch] = []
+        for match in self._engine.finditer(buffer, start):
+            if match.end <= cut:
+                committed.append(match)
+                continue
+            # The match reaches into the held-back text and may still grow: wait for it
+            cut = min(cut, match.start)
+            break
+        if cut <= start:
+            return ""
+
+        output = self._engine.substitute(buffer[start:cut], committed, offset=start)
+        self._record(committed, self._consumed - start)
+        self.sanitizer.rule_stats.record_scan(  # Counted only: chunks are not profiled
+            self._engine.pattern_keys,
+            cut - start,
+            [(match.spec.rule_id, match.spec.pattern) for match in committed],
+        )
+        self._consumed += cut - start
+
+        # Keep look-behind context before the cut for anchors such as \b
+        keep_from = max(0, cut - self.overlap)
+        self._buffer = buffer[keep_from:]
+        self._scan_from = cut - keep_from
+        return output
+
+    def _record(self, matches: List[EngineMatch], shift: int) -> None:
+        """Tracks applied rules and records changes with positions in the whole stream."""
+        for match in matches:
+            self._rule_indexes.add(match.spec.rule_index)
+            self._change_count += 1
+            if len(self._changes) < self.max_changes:
+                self._changes.append(
+                    replace(match, start=match.start + shift, end=match.end + shift)
+                )
+
+    def _finish(self) -> str:
+        """Flushes the remaining text and builds the stream result."""
+        output = self._drain(final=True)
+        self._buffer = ""
+        self._scan_from = 0
+
+        sanitizer = self.sanitizer
+        end_time = datetime.datetime.now()
+        processing_time = (end_time - self._start_time).total_seconds()
+        applied_rules, ethical_score = sanitizer._score_rules(self._engine, self._rule_indexes)
+        self.result = SanitizationResult(
+            content_id=self._digest.hexdigest(),
+            timestamp=end_time,
+            original_content="",
+            sanitized_content="",
+            applied_rules=applied_rules,
+            changes_made=sanitizer._describe_changes(self._changes),
+            ethical_score=ethical_score,
+            is_clean=self._change_count == 0,
+            performance_metrics={
+                "processing_time": processing_time,
+                "rules_applied": len(applied_rules),
+                "cache_hit": False,
+                "chunks": self._chunk_count,
+                "characters": self._consumed,
+                "changes_total": self._change_count,
+                "changes_truncated": self._change_count > len(self._changes),
+            },
+            resource_usage={
+                "start_time": self._start_time.isoformat(),
+                "end_time": end_time.isoformat(),
+                "processing_time": processing_time,
+                "cpu_usage": 0,
+                "memory_usage": 0,
+            },
+            metadata={"usage_count": 1, "context": self.context, "streamed": True},
+        )
+        sanitizer._record_history(self.result)
+        sanitizer.logger.debug(
+            f"Stream sanitization finished for content_id: {self.result.content_id} "
+            f"({self._consumed} chars, {self._chunk_count} chunks)."
+        )
+        return output
+
+
+@dataclass
+class _BatchJob:
+    """A chunk of batch items sharing one rule set."""
+
+    rules_key: str
+    engine: CompiledSanitizationEngine
+    indexes: List[int]
+
+
+@dataclass
+class _BatchPlan:
+    """Work left for a batch after cache lookups."""
+
+    items: Sequence[str]
+    contexts: List[Dict[str, Any]]
+    content_ids: List[str]
+    rules_version: int
+    engine: CompiledSanitizationEngine  # Full engine of rules_version
+    start_time: datetime.datetime
+    ready: Dict[int, SanitizationResult] = field(default_factory=dict)
+    jobs: List[_BatchJob] = field(default_factory=list)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(job.indexes) for job in self.jobs)
+
+
 class EthikSanitizer:
     """Automated ethical content sanitization system - Adapted for Mycelium"""
 
@@ -72,11 +351,20 @@ class EthikSanitizer:
         self.interface = mycelium_interface
         self.logger = logger  # Use the passed logger
         self.node_id = "ETHIK_SANITIZER"  # Or derive from config/ETHIK service
-        self.rules: Dict[str, SanitizationRule] = {}
-        self.sanitization_history: List[SanitizationResult] = []
-        self.content_cache: Dict[str, SanitizationResult] = {}
-        self.priority_queue = PriorityQueue()
+        # Per-rule/pattern statistics and the pattern time budget (used when compiling)
+        profiling_config = self.config.get("profiling", {})
+        self.rule_stats = RuleStatsCollector(
+            sample_every=profiling_config.get("sample_every", DEFAULT_SAMPLE_EVERY)
+        )
+        self.pattern_guard = self._create_pattern_guard()
+        self._metrics_task: Optional[asyncio.Task] = None
+        # Immutable, versioned rule sets with their compiled engines, swapped atomically
+        self._snapshots = RuleSnapshotHolder(self._compile_rule_set, self.logger)
+        self._rule_watcher: Optional[RuleFileWatcher] = None
+        self.sanitization_history = self._create_history()
+        self.content_cache = self._create_cache()
         self.executor = None
+        self.process_pool: Optional[SanitizationWorkerPool] = None
         self.monitoring_active = False  # Added monitoring state
 
         # Load configuration (assuming config now contains sanitizer_config)
@@ -88,8 +376,18 @@ class EthikSanitizer:
                 max_workers=self.config["performance"]["parallel_processing"].get("max_workers", 4)
             )
 
+        # Worker processes for batch sanitization (started lazily on the first large batch)
+        pool_config = self.config.get("performance", {}).get("process_pool", {})
+        if pool_config.get("enabled", True):
+            self.process_pool = SanitizationWorkerPool(pool_config.get("max_workers"), self.logger)
+
+        # Admission control for Mycelium requests (None handles every message as it arrives)
+        self.request_scheduler = self._create_request_scheduler()
+
         # Load sanitization rules from external file
         self._load_rules()
+        if self.config.get("hot_reload", {}).get("enabled", False):
+            self.start_rule_watcher()
 
         # Removed WebSocket initialization
 
@@ -108,9 +406,24 @@ class EthikSanitizer:
         )  # Use self.logger
 
         try:
-            await self.interface.subscribe("request.ethik.sanitize", self.handle_sanitize_request)
+            handler = (
+                self.enqueue_sanitize_request
+                if self.request_scheduler
+                else self.handle_sanitize_request
+            )
+            await self.interface.subscribe("request.ethik.sanitize", handler)
+            if self.request_scheduler:
+                self.request_scheduler.start()
             self.logger.info("Subscribed to 'request.ethik.sanitize' topic.")  # Use self.logger
             self.monitoring_active = True
+            profiling_config = self.config.get("profiling", {})
+            interval = profiling_config.get("metrics_interval_seconds", DEFAULT_METRICS_INTERVAL)
+            if interval > 0:
+                self._metrics_task = asyncio.create_task(
+                    self._publish_rule_stats_periodically(
+                        interval, profiling_config.get("metrics_topic", DEFAULT_METRICS_TOPIC)
+                    )
+                )
             self.logger.info("ETHIK Sanitizer monitoring started.")  # Use self.logger
         except Exception as e:
             self.logger.error(
@@ -125,10 +438,62 @@ class EthikSanitizer:
 
         self.logger.info("Stopping ETHIK Sanitizer monitoring...")  # Use self.logger
         self.monitoring_active = False
+        if self._metrics_task is not None:
+            self._metrics_task.cancel()
+            self._metrics_task = None
+        self.stop_rule_watcher()
+        if self.request_scheduler:
+            await self.request_scheduler.stop()
+        if self.process_pool:
+            self.process_pool.shutdown(wait=False)
         # Unsubscribe logic might be needed depending on MyceliumInterface implementation
         # await self.interface.unsubscribe("request.ethik.sanitize", self.handle_sanitize_request)
         self.logger.info("ETHIK Sanitizer monitoring stopped.")  # Use self.logger
 
+    async def enqueue_sanitize_request(self, message: Dict[str, Any]):
+        """Queue an incoming sanitization request on the request scheduler.
+
+        The request's priority comes from its 'severity' and 'source' fields and its
+        deadline from 'timeout_ms' (both read from the message or its payload). A
+        request the scheduler rejects gets an OVERLOADED error response.
+        """
+        if self.request_scheduler is None:
+            await self.handle_sanitize_request(message)
+            return
+        request_id = message.get("id", "unknown")
+        payload = message.get("payload") or {}
+        context = payload.get("context") or {}
+        timeout_ms = payload.get("timeout_ms", message.get("timeout_ms"))
+        priority = self.request_scheduler.priority_for(
+            payload.get("severity", message.get("severity")),
+            message.get("source") or payload.get("source") or context.get("source"),
+        )
+        await self.request_scheduler.submit(
+            lambda: self.handle_sanitize_request(message),
+            lambda reason: self._publish_overloaded(request_id, reason),
+            priority,
+            timeout_ms / 1000 if timeout_ms else None,
+        )
+
+    async def _publish_overloaded(self, request_id: str, reason: str) -> None:
+        await self.interface.publish(
+            topic=f"response.sanitization.{request_id}",
+            message={
+                "type": "sanitization_error",
+                "status": OVERLOADED,
+                "reason": reason,
+                "reference_id": request_id,
+                "timestamp": datetime.datetime.now().isoformat(),
+                "error": f"Sanitizer overloaded ({reason})",
+            },
+        )
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Returns queue depth, wait times and rejections of the request scheduler."""
+        if self.request_scheduler is None:
+            return {"enabled": False}
+        return dict(self.request_scheduler.stats(), enabled=True)
+
     async def handle_sanitize_request(self, message: Dict[str, Any]):
         """Handle incoming sanitization requests from Mycelium."""
         request_id = message.get("id", "unknown")
@@ -186,48 +551,174 @@ class EthikSanitizer:
                     f"Failed to publish error response for {request_id}: {pub_e}"
                 )  # Use self.logger
 
-    def _update_cache(self, result: SanitizationResult):
-        """Update the sanitization cache using priority queue"""
-        try:
-            # Calculate priority based on usage and importance
-            priority = self._calculate_cache_priority(result)
+    def _create_cache(self) -> BoundedResultCache:
+        """Create the result cache from the 'performance.caching' configuration."""
+        caching_config = self.config.get("performance", {}).get("caching", {})
+        default_ttl = self.config.get("cache_retention_hours", 1) * 3600
+        return BoundedResultCache(
+            max_entries=caching_config.get("max_size", 500),
+            max_bytes=caching_config.get("max_bytes", 64 * 1024 * 1024),
+            ttl_seconds=caching_config.get("ttl_seconds", default_ttl),
+            policy=caching_config.get("policy", "lru"),
+        )
 
-            # Add to priority queue
-            self.priority_queue.put((priority, result.content_id))
+    def _cache_enabled(self) -> bool:
+        return self.config.get("performance", {}).get("caching", {}).get("enabled", False)
 
-            # Add to cache
-            self.content_cache[result.content_id] = result
+    @staticmethod
+    def _estimate_result_size(result: SanitizationResult) -> int:
+        """Rough in-memory size of a compacted cached result, in bytes."""
+        size = 512 + sys.getsizeof(result.sanitized_content)
+        for change in result.changes_made:
+            size += 256 + sys.getsizeof(change["original"]) + sys.getsizeof(change["replacement"])
+        return size
 
-            # Clean cache if needed
-            self._clean_cache_if_needed()
+    def _update_cache(self, cache_key: Tuple[str, str], result: SanitizationResult, version: int):
+        """Store a compacted copy of a result (without the original content)."""
+        try:
+            compact = replace(
+                result,
+                original_content="",
+                # Clean content is identical to the input, which every lookup supplies
+                sanitized_content="" if result.is_clean else result.sanitized_content,
+                performance_metrics={},
+                metadata={},
+            )
+            self.content_cache.put(cache_key, compact, self._estimate_result_size(compact), version)
         except Exception as e:
             self.logger.error(f"Error updating cache: {e}")  # Use self.logger
 
-    def _calculate_cache_priority(self, result: SanitizationResult) -> float:
-        """Calculate cache priority for a result"""
-        priority = 0.0
+    def _result_from_cache(
+        self,
+        cached: SanitizationResult,
+        hits: int,
+        content: str,
+        context: Dict[str, Any],
+        start_time: datetime.datetime,
+    ) -> SanitizationResult:
+        """Rebuild a full result from a compacted cache entry."""
+        return replace(
+            cached,
+            original_content=content,
+            sanitized_content=content if cached.is_clean else cached.sanitized_content,
+            changes_made=list(cached.changes_made),
+            performance_metrics={
+                "processing_time": (datetime.datetime.now() - start_time).total_seconds(),
+                "rules_applied": len(cached.applied_rules),
+                "cache_hit": True,
+                "cache": self.content_cache.stats(),
+            },
+            metadata={"usage_count": hits + 1, "context": context},
+        )
 
-        # Factor 1: Ethical score (higher score = higher priority)
-        priority += result.ethical_score * 0.4
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return result cache counters (hits, misses, evictions, ...) and occupancy."""
+        return self.content_cache.stats()
+
+    # --- Rule profiling --- #
+
+    def _create_pattern_guard(self) -> Optional[PatternGuard]:
+        """Create the pattern time budget guard from 'profiling.guard' (None if disabled)."""
+        guard_config = self.config.get("profiling", {}).get("guard", {})
+        if not guard_config.get("enabled", False):
+            return None
+        return PatternGuard(
+            budget_seconds=guard_config.get("budget_ms", DEFAULT_BUDGET_MS) / 1000,
+            action=guard_config.get("action", "flag"),
+            max_violations=guard_config.get("max_violations", 1),
+            logger=self.logger,
+        )
 
-        # Factor 2: Usage frequency (from metadata)
-        usage_count = result.metadata.get("usage_count", 0)
-        priority += min(usage_count / 100, 0.3)
+    def _observe_scan(
+        self,
+        engine: CompiledSanitizationEngine,
+        content: str,
+        matches: List[EngineMatch],
+        scan_time: Optional[float] = None,
+    ):
+        """Count a scan in the rule stats and profile it when sampled or over budget.
 
-        # Factor 3: Resource intensity (lower is better)
-        resource_usage = result.resource_usage.get("cpu_usage", 0)
-        priority += 1 - min(resource_usage / 100, 0.3)
+        A scan slower than the guard budget is profiled right away to find the pattern
+        responsible; quarantined patterns are compiled out of a new rule snapshot.
+        """
+        due = self.rule_stats.record_scan(
+            engine.pattern_keys,
+            len(content),
+            [(match.spec.rule_id, match.spec.pattern) for match in matches],
+        )
+        guard = self.pattern_guard
+        over_budget = (
+            guard is not None and scan_time is not None and scan_time > guard.budget_seconds
+        )
+        if not (due or over_budget) or engine.is_empty:
+            return
+
+        timings = [
+            ((spec.rule_id, spec.pattern), elapsed) for spec, elapsed in engine.profile(content)
+        ]
+        self.rule_stats.record_profile(timings)
+        if guard is not None and guard.check(timings, len(content)):
+            snapshot = self._snapshots.update()  # Recompile without the quarantined patterns
+            self.content_cache.invalidate(snapshot.version)
 
-        return priority
+    def get_rule_stats(self, rule_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Return per-rule and per-pattern statistics.
 
-    def _clean_cache_if_needed(self):
-        """Clean cache if it exceeds max size"""
-        max_size = self.config.get("performance", {}).get("caching", {}).get("max_size", 500)
-        while len(self.content_cache) > max_size:
-            # Remove lowest priority item
-            _, content_id = self.priority_queue.get()
-            if content_id in self.content_cache:
-                del self.content_cache[content_id]
+        Invocation, match and byte counts cover every scan; times (cumulative, mean,
+        p99, max, in seconds) come from sampled profiling scans
+        (`profiling.sample_every`). Scans of worker processes are counted but only
+        profiled when sampled in this process.
+
+        Args:
+            rule_ids: Restrict the report to these rules (default: all).
+        """
+        stats = self.rule_stats.stats(rule_ids)
+        stats["rules_version"] = self.rules_version
+        guard = self.pattern_guard
+        if guard is not None:
+            stats["guard"] = {
+                "budget_ms": guard.budget_seconds * 1000,
+                "action": guard.action,
+                "violations": [
+                    {"rule_id": rule_id, "pattern": pattern, "count": count}
+                    for (rule_id, pattern), count in guard.violations.items()
+                ],
+                "quarantined": [
+                    {"rule_id": rule_id, "pattern": pattern}
+                    for rule_id, pattern in sorted(guard.quarantined)
+                ],
+            }
+        return stats
+
+    def release_quarantined_patterns(
+        self, patterns: Optional[Iterable[Tuple[str, str]]] = None
+    ) -> List[Tuple[str, str]]:
+        """Put quarantined (rule id, pattern) pairs (default: all) back into service."""
+        if self.pattern_guard is None:
+            return []
+        released = self.pattern_guard.release(patterns)
+        if released:
+            snapshot = self._snapshots.update()
+            self.content_cache.invalidate(snapshot.version)
+            self.logger.info(f"Released {len(released)} quarantined sanitization patterns.")
+        return released
+
+    async def _publish_rule_stats_periodically(self, interval: float, topic: str):
+        """Publish get_rule_stats() on a Mycelium topic while monitoring is active."""
+        while self.monitoring_active:
+            await asyncio.sleep(interval)
+            try:
+                await self.interface.publish(
+                    topic=topic,
+                    message={
+                        "type": "sanitization_rule_stats",
+                        "source": self.node_id,
+                        "timestamp": datetime.datetime.now().isoformat(),
+                        "payload": self.get_rule_stats(),
+                    },
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to publish rule stats to {topic}: {e}")
 
     async def sanitize_content_async(
         self, content: str, context: Optional[Dict[str, Any]] = None
@@ -255,60 +746,81 @@ class EthikSanitizer:
         context = context or {}
         start_time = datetime.datetime.now()
         content_id = hashlib.md5(content.encode()).hexdigest()
+        cache_enabled = self._cache_enabled()
 
-        # Check cache
-        if self.config.get("performance", {}).get("caching", {}).get("enabled", False):
-            if content_id in self.content_cache:
-                cached_result = self.content_cache[content_id]
-                # Update usage count in metadata (assuming it exists)
-                cached_result.metadata["usage_count"] = (
-                    cached_result.metadata.get("usage_count", 0) + 1
-                )
-                self._update_cache(cached_result)  # Update priority
-                self.logger.info(f"Returning cached result for content ID: {content_id}")
-                return cached_result
-
-        # Start timer for performance measurement
-        # process_start_time = datetime.datetime.now() # F841: Unused variable
+        try:
+            # Pin one rule snapshot: the engine and cache version always match, and a
+            # concurrent rule change only affects later requests
+            snapshot = self._snapshots.current
+            rules_version = snapshot.version
+            rules_key, engine = self._get_engine(context, snapshot)
+        except Exception as e:
+            self.logger.error(f"Error selecting rules for content {content_id}: {e}", exc_info=True)
+            return self._create_error_result(content_id, content, str(e))
 
-        # Initialize variables
-        sanitized = content
-        applied_rules: List[str] = []
-        changes_made: List[Dict[str, Any]] = []
-        ethical_score = 1.0  # Start with perfect score
+        # Check cache (keyed by content and by the set of rules that apply)
+        cache_key = (content_id, rules_key)
+        if cache_enabled:
+            entry = self.content_cache.get(cache_key)
+            if entry is not None:
+                self.logger.debug(f"Returning cached result for content ID: {content_id}")
+                return self._result_from_cache(
+                    entry.value, entry.hits, content, context, start_time
+                )
 
         try:
-            # Apply each rule
-            for _rule_id, rule in self.rules.items():
-                if self._should_apply_rule(rule, context):
-                    sanitized, rule_changes = self._apply_rule(rule, sanitized)
-                    if rule_changes:
-                        applied_rules.append(rule.id)
-                        changes_made.extend(rule_changes)
-                        # Adjust ethical score based on rule severity
-                        if rule.severity == "critical":
-                            ethical_score -= 0.5
-                        elif rule.severity == "high":
-                            ethical_score -= 0.2
-                        elif rule.severity == "medium":
-                            ethical_score -= 0.1
-                        else:
-                            ethical_score -= 0.05
-
-            # Ensure score doesn't go below 0
-            ethical_score = max(0.0, ethical_score)
-
+            # All applicable rules are matched in a single pass by the compiled engine
+            sanitized, matches, scan_time, cpu_time = self._scan(engine, content)
+            result = self._build_result(
+                content_id, content, context, engine, sanitized, matches, start_time, cpu_time
+            )
         except Exception as e:
             self.logger.error(f"Error applying rules to content {content_id}: {e}", exc_info=True)
             # Create an error result
             return self._create_error_result(content_id, content, str(e))
 
+        self._observe_scan(engine, content, matches, scan_time)
+        self._store_result(result, cache_key if cache_enabled else None, rules_version)
+        return result
+
+    @staticmethod
+    def _scan(
+        engine: CompiledSanitizationEngine, content: str
+    ) -> Tuple[str, List[EngineMatch], float, float]:
+        """Sanitize content with an engine, returning wall-clock and CPU seconds too."""
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        sanitized, matches = engine.sanitize(content)
+        return (
+            sanitized,
+            matches,
+            time.perf_counter() - wall_start,
+            time.thread_time() - cpu_start,
+        )
+
+    def _build_result(
+        self,
+        content_id: str,
+        content: str,
+        context: Dict[str, Any],
+        engine: CompiledSanitizationEngine,
+        sanitized: str,
+        matches: List[EngineMatch],
+        start_time: datetime.datetime,
+        cpu_time: Optional[float] = None,
+    ) -> SanitizationResult:
+        """Create a sanitization result from the matches of one engine scan.
+
+        Args:
+            cpu_time: CPU seconds spent scanning, when the scan ran in this process.
+        """
+        applied_rules, changes_made, ethical_score = self._summarize_matches(engine, matches)
+
         # Update resource usage
         end_time = datetime.datetime.now()
         processing_time = (end_time - start_time).total_seconds()
         resource_usage = {
             "start_time": start_time.isoformat(),
-            "cpu_usage": 0,  # Placeholder - actual measurement might need psutil or similar
+            "cpu_usage": cpu_time or 0.0,  # CPU seconds of the scan (this thread only)
             "memory_usage": 0,  # Placeholder
         }
         resource_usage.update(
@@ -316,7 +828,7 @@ class EthikSanitizer:
         )
 
         # Create result
-        result = SanitizationResult(
+        return SanitizationResult(
             content_id=content_id,
             timestamp=end_time,
             original_content=content,
@@ -329,24 +841,333 @@ class EthikSanitizer:
                 "processing_time": processing_time,
                 "rules_applied": len(applied_rules),
                 "cache_hit": False,  # Since we are past the cache check
+                "cache": self.content_cache.stats(),
             },
             resource_usage=resource_usage,
             metadata={"usage_count": 1, "context": context},  # Include context in metadata
         )
 
+    def _store_result(
+        self,
+        result: SanitizationResult,
+        cache_key: Optional[Tuple[str, str]],
+        rules_version: int,
+    ):
+        """Cache a fresh result (when a cache key is given) and add it to history."""
         # Update cache
-        self._update_cache(result)
+        if cache_key is not None:
+            self._update_cache(cache_key, result, rules_version)
 
         # Add to history
-        self.sanitization_history.append(result)
-        self._clean_history()  # Clean history periodically
+        self._record_history(result)
 
         # Removed direct WebSocket update call
 
         self.logger.debug(
-            f"Sanitization finished for content_id: {content_id}. Score: {result.ethical_score:.2f}"
+            f"Sanitization finished for content_id: {result.content_id}. "
+            f"Score: {result.ethical_score:.2f}"
         )
-        return result
+
+    # --- Batch sanitization --- #
+
+    def sanitize_batch(
+        self,
+        items: Sequence[str],
+        contexts: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]] = None,
+        ordered: bool = True,
+    ) -> Iterator[SanitizationResult]:
+        """
+        Sanitize many contents, using worker processes for large batches
+
+        Results are yielded as they become available, each with its position in the
+        batch in ``metadata["batch_index"]``. Batches with fewer uncached items than
+        'performance.process_pool.min_batch_size' are sanitized in-process.
+
+        Args:
+            items: Contents to sanitize
+            contexts: One context for all items, or one context per item
+            ordered: Yield results in input order (True) or as they complete (False)
+        """
+        plan = self._plan_batch(items, contexts)
+        futures = self._submit_batch(plan)
+        if futures is None:
+            # Small batch or no process pool: run in-process
+            for job in plan.jobs:
+                self._run_job_in_process(plan, job)
+            yield from self._drain_ready(plan, range(len(items)))
+            return
+
+        if ordered:
+            job_futures = {
+                index: future for future, job in futures.items() for index in job.indexes
+            }
+            for index in range(len(items)):
+                if index not in plan.ready:
+                    future = job_futures[index]
+                    self._complete_job(plan, futures[future], future)
+                yield from self._drain_ready(plan, [index])
+        else:
+            yield from self._drain_ready(plan, range(len(items)))
+            for future in concurrent.futures.as_completed(futures):
+                job = futures[future]
+                self._complete_job(plan, job, future)
+                yield from self._drain_ready(plan, job.indexes)
+
+    async def sanitize_batch_async(
+        self,
+        items: Sequence[str],
+        contexts: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]] = None,
+        ordered: bool = True,
+    ) -> AsyncIterator[SanitizationResult]:
+        """Asynchronous version of sanitize_batch; iterate with ``async for``"""
+        plan = self._plan_batch(items, contexts)
+        futures = self._submit_batch(plan)
+        loop = asyncio.get_running_loop()
+        if futures is None:
+            for job in plan.jobs:
+                if self.executor:
+                    await loop.run_in_executor(self.executor, self._run_job_in_process, plan, job)
+                else:
+                    self._run_job_in_process(plan, job)
+            for result in self._drain_ready(plan, range(len(items))):
+                yield result
+            return
+
+        wrapped = {asyncio.wrap_future(future, loop=loop): job for future, job in futures.items()}
+        if ordered:
+            job_futures = {
+                index: future for future, job in wrapped.items() for index in job.indexes
+            }
+            for index in range(len(items)):
+                if index not in plan.ready:
+                    future = job_futures[index]
+                    await asyncio.wait([future])
+                    self._complete_job(plan, wrapped[future], future)
+                for result in self._drain_ready(plan, [index]):
+                    yield result
+        else:
+            for result in self._drain_ready(plan, range(len(items))):
+                yield result
+            pending = set(wrapped)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    job = wrapped[future]
+                    self._complete_job(plan, job, future)
+                    for result in self._drain_ready(plan, job.indexes):
+                        yield result
+
+    def _plan_batch(
+        self,
+        items: Sequence[str],
+        contexts: Optional[Union[Dict[str, Any], Sequence[Optional[Dict[str, Any]]]]],
+    ) -> _BatchPlan:
+        """Resolve cached results and group the remaining items by rule set."""
+        if contexts is None or isinstance(contexts, dict):
+            context_list = [contexts or {}] * len(items)
+        else:
+            if len(contexts) != len(items):
+                raise ValueError(f"Got {len(contexts)} contexts for a batch of {len(items)} items")
+            context_list = [context or {} for context in contexts]
+
+        snapshot = self._snapshots.current
+        plan = _BatchPlan(
+            items=items,
+            contexts=context_list,
+            content_ids=[hashlib.md5(content.encode()).hexdigest() for content in items],
+            rules_version=snapshot.version,
+            engine=snapshot.compiled.engine,
+            start_time=datetime.datetime.now(),
+        )
+        cache_enabled = self._cache_enabled()
+        chunk_size = max(
+            1,
+            self.config.get("performance", {})
+            .get("process_pool", {})
+            .get("chunk_size", DEFAULT_BATCH_CHUNK_SIZE),
+        )
+        open_jobs: Dict[str, _BatchJob] = {}
+        for index, content in enumerate(items):
+            content_id, context = plan.content_ids[index], context_list[index]
+            try:
+                rules_key, engine = self._get_engine(context, snapshot)
+            except Exception as e:
+                self.logger.error(
+                    f"Error selecting rules for content {content_id}: {e}", exc_info=True
+                )
+                plan.ready[index] = self._create_error_result(content_id, content, str(e))
+                continue
+
+            if cache_enabled:
+                entry = self.content_cache.get((content_id, rules_key))
+                if entry is not None:
+                    plan.ready[index] = self._result_from_cache(
+                        entry.value, entry.hits, content, context, plan.start_time
+                    )
+                    continue
+
+            job = open_jobs.get(rules_key)
+            if job is None or job.engine is not engine or len(job.indexes) >= chunk_size:
+                job = _BatchJob(rules_key, engine, [])
+                open_jobs[rules_key] = job
+                plan.jobs.append(job)
+            job.indexes.append(index)
+        return plan
+
+    def _submit_batch(
+        self, plan: _BatchPlan
+    ) -> Optional[Dict[concurrent.futures.Future, _BatchJob]]:
+        """Send the plan's jobs to the process pool, or return None to run in-process."""
+        min_size = (
+            self.config.get("performance", {})
+            .get("process_pool", {})
+            .get("min_batch_size", DEFAULT_BATCH_MIN_SIZE)
+        )
+        if self.process_pool is None or not plan.jobs or plan.pending_count < min_size:
+            return None
+
+        threshold = self.config.get("performance", {}).get(
+            "literal_automaton_threshold", LITERAL_AUTOMATON_THRESHOLD
+        )
+        # Subset engines hold the same rule objects as the full engine they derive from
+        full_engine = plan.engine
+        rule_positions = {id(rule): index for index, rule in enumerate(full_engine.rules)}
+        futures: Dict[concurrent.futures.Future, _BatchJob] = {}
+        try:
+            for job in plan.jobs:
+                rule_indexes = None
+                if job.rules_key != ALL_RULES_KEY:
+                    rule_indexes = [rule_positions[id(rule)] for rule in job.engine.rules]
+                future = self.process_pool.submit(
+                    full_engine,
+                    plan.rules_version,
+                    rule_indexes,
+                    [plan.items[index] for index in job.indexes],
+                    threshold,
+                )
+                futures[future] = job
+        except Exception as e:
+            # Rules changed while planning, or the pool cannot start: stay in-process
+            self.logger.warning(f"Process pool unavailable ({e}); sanitizing batch in-process.")
+            for future in futures:
+                future.cancel()
+            return None
+        return futures
+
+    def _run_job_in_process(self, plan: _BatchPlan, job: _BatchJob):
+        """Sanitize a job's items with the job's engine in this process."""
+        for index in job.indexes:
+            content = plan.items[index]
+            content_id, context = plan.content_ids[index], plan.contexts[index]
+            try:
+                sanitized, matches, scan_time, cpu_time = self._scan(job.engine, content)
+                result = self._build_result(
+                    content_id,
+                    content,
+                    context,
+                    job.engine,
+                    sanitized,
+                    matches,
+                    plan.start_time,
+                    cpu_time,
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"Error applying rules to content {content_id}: {e}", exc_info=True
+                )
+                plan.ready[index] = self._create_error_result(content_id, content, str(e))
+                continue
+            self._observe_scan(job.engine, content, matches, scan_time)
+            self._finish_batch_result(plan, job, index, result)
+
+    def _complete_job(self, plan: _BatchPlan, job: _BatchJob, future: "concurrent.futures.Future"):
+        """Turn worker outputs for a job into results (in-process on worker failure)."""
+        try:
+            outputs: List[WorkerOutput] = future.result()
+        except Exception as e:
+            self.logger.warning(
+                f"Sanitization worker failed ({e}); finishing {len(job.indexes)} items in-process."
+            )
+            self._run_job_in_process(plan, job)
+            return
+
+        patterns = job.engine.patterns
+        for index, (sanitized, spans, error) in zip(job.indexes, outputs):
+            content = plan.items[index]
+            content_id, context = plan.content_ids[index], plan.contexts[index]
+            if error is not None:
+                self.logger.error(f"Error applying rules to content {content_id}: {error}")
+                plan.ready[index] = self._create_error_result(content_id, content, error)
+                continue
+            matches = [
+                EngineMatch(start, end, content[start:end], patterns[order])
+                for start, end, order in spans
+            ]
+            result = self._build_result(
+                content_id,
+                content,
+                context,
+                job.engine,
+                content if sanitized is None else sanitized,
+                matches,
+                plan.start_time,
+            )
+            self._observe_scan(job.engine, content, matches)  # Scan time is the worker's
+            self._finish_batch_result(plan, job, index, result)
+
+    def _finish_batch_result(
+        self, plan: _BatchPlan, job: _BatchJob, index: int, result: SanitizationResult
+    ):
+        cache_key = (plan.content_ids[index], job.rules_key) if self._cache_enabled() else None
+        self._store_result(result, cache_key, plan.rules_version)
+        plan.ready[index] = result
+
+    @staticmethod
+    def _drain_ready(plan: _BatchPlan, indexes: Iterable[int]) -> Iterator[SanitizationResult]:
+        """Yield (and release) the finished results among the given batch positions."""
+        for index in indexes:
+            result = plan.ready.pop(index, None)
+            if result is not None:
+                result.metadata["batch_index"] = index
+                yield result
+
+    def sanitize_stream(
+        self,
+        chunks: Iterable[str],
+        context: Optional[Dict[str, Any]] = None,
+        overlap: Optional[int] = None,
+    ) -> SanitizationStream:
+        """
+        Sanitize a large document supplied as an iterable of text chunks
+
+        Iterate the returned stream to receive sanitized chunks; its ``result`` is set
+        once the iteration completes. Results are not cached.
+
+        Args:
+            chunks: Iterable of text chunks
+            context: Optional context information
+            overlap: Characters carried across chunk boundaries (defaults to
+                'streaming.overlap_chars' from the configuration)
+        """
+        streaming_config = self.config.get("streaming", {})
+        if overlap is None:
+            overlap = streaming_config.get("overlap_chars", DEFAULT_STREAM_OVERLAP)
+        return SanitizationStream(
+            self,
+            chunks,
+            context,
+            overlap=overlap,
+            max_changes=streaming_config.get("max_recorded_changes", DEFAULT_STREAM_MAX_CHANGES),
+        )
+
+    def sanitize_stream_async(
+        self,
+        chunks: Union[AsyncIterable[str], Iterable[str]],
+        context: Optional[Dict[str, Any]] = None,
+        overlap: Optional[int] = None,
+    ) -> SanitizationStream:
+        """Asynchronous version of sanitize_stream; iterate the result with ``async for``"""
+        return self.sanitize_stream(chunks, context, overlap)  # type: ignore[arg-type]
 
     def _should_apply_rule(self, rule: SanitizationRule, context: Optional[Dict[str, Any]]) -> bool:
         """Determine if a rule should be applied based on conditions"""
@@ -383,55 +1204,141 @@ class EthikSanitizer:
             )  # Use self.logger
             return False  # Default to not applying if condition evaluation fails
 
-    def _apply_rule(self, rule: SanitizationRule, content: str) -> Tuple[str, List[Dict[str, Any]]]:
-        """Apply a sanitization rule to content"""
-        changes = []
-        # Use a temporary variable to accumulate changes for this rule
-        current_content = content
-        offset = 0  # Track offset due to replacements
+    def _compile_engine(
+        self,
+        rules: List[SanitizationRule],
+        excluded: Optional[AbstractSet[Tuple[str, str]]] = None,
+    ) -> CompiledSanitizationEngine:
+        """Compile an ordered list of rules into a single-pass engine.
 
-        try:
-            # Apply each pattern
-            for pattern in rule.patterns:
-                # Find all non-overlapping matches
-                for match in re.finditer(pattern, current_content):
-                    original = match.group(0)
-                    # Use pattern-specific replacement or default
-                    replacement = rule.replacements.get(pattern, "[REDACTED]")
-
-                    # Calculate original position in the initial content string
-                    start_pos = match.start() + offset
-                    end_pos = match.end() + offset
-
-                    # Apply replacement
-                    current_content = (
-                        current_content[: match.start()]
-                        + replacement
-                        + current_content[match.end() :]
-                    )
+        Args:
+            rules: The rules, in priority order.
+            excluded: Patterns to leave out (default: the guard's quarantined patterns).
+        """
+        if excluded is None:
+            excluded = self._quarantined_patterns()
+        return CompiledSanitizationEngine(
+            rules, self.logger, literal_threshold=self._literal_threshold(), excluded=excluded
+        )
 
-                    # Record change with original positions
-                    changes.append(
-                        {
-                            "rule_id": rule.id,
-                            "pattern": pattern,
-                            "original": original,
-                            "replacement": replacement,
-                            "position": (start_pos, end_pos),  # Position in original content
-                        }
-                    )
+    def _literal_threshold(self) -> int:
+        return self.config.get("performance", {}).get(
+            "literal_automaton_threshold", LITERAL_AUTOMATON_THRESHOLD
+        )
+
+    def _quarantined_patterns(self) -> AbstractSet[Tuple[str, str]]:
+        return self.pattern_guard.quarantined if self.pattern_guard else frozenset()
+
+    def _compile_rule_set(
+        self, rules: Mapping[str, SanitizationRule], previous: Optional[RuleSnapshot]
+    ) -> _CompiledRuleSet:
+        """Compile a rule snapshot into a fresh engine (subset variants start empty)."""
+        engine = self._compile_engine(list(rules.values()))
+        self.logger.debug(f"Compiled {len(engine.patterns)} sanitization patterns.")
+        return _CompiledRuleSet(engine)
+
+    @property
+    def rules(self) -> Mapping[str, SanitizationRule]:
+        """Read-only view of the current rules (see `rules_snapshot`)."""
+        return self._snapshots.current.rules
+
+    @rules.setter
+    def rules(self, rules: Mapping[str, SanitizationRule]) -> None:
+        self._publish_rules(rules)
+
+    @property
+    def rules_snapshot(self) -> RuleSnapshot:
+        """The current immutable rule set with its version and compiled engine."""
+        return self._snapshots.current
+
+    @property
+    def rules_version(self) -> int:
+        """Version of the current rule set; bumped on every rule change."""
+        return self._snapshots.current.version
+
+    def _publish_rules(
+        self,
+        rules: Mapping[str, SanitizationRule],
+        fingerprints: Optional[Mapping[str, str]] = None,
+        source: Optional[FileState] = None,
+        compiled: Optional[_CompiledRuleSet] = None,
+    ) -> RuleSnapshot:
+        """Compile and swap in a new rule snapshot, then drop results of older rules."""
+        snapshot = self._snapshots.publish(rules, fingerprints, source, compiled)
+        self.content_cache.invalidate(snapshot.version)
+        return snapshot
+
+    def _get_engine(
+        self, context: Optional[Dict[str, Any]], snapshot: Optional[RuleSnapshot] = None
+    ) -> Tuple[str, CompiledSanitizationEngine]:
+        """Return a key for the applicable rule set and its compiled engine.
+
+        Args:
+            context: Request context deciding which rules apply.
+            snapshot: Rule snapshot to use (default: the current one).
+        """
+        rule_set: _CompiledRuleSet = (snapshot or self._snapshots.current).compiled
+        engine = rule_set.engine
+
+        active_rules = [rule for rule in engine.rules if self._should_apply_rule(rule, context)]
+        if len(active_rules) == len(engine.rules):
+            return ALL_RULES_KEY, engine
+
+        # Some rules are excluded by their conditions: use (or build) a subset engine
+        key = ",".join(rule.id for rule in active_rules)
+        variants = rule_set.variants
+        variant = variants.get(key)
+        if variant is None:
+            # Same exclusions as the full engine, so pattern orders stay comparable
+            variant = self._compile_engine(active_rules, engine.excluded)
+            if len(variants) >= MAX_ENGINE_VARIANTS:
+                variants.pop(next(iter(variants)), None)
+            variants[key] = variant
+        return key, variant
+
+    def _summarize_matches(
+        self, engine: CompiledSanitizationEngine, matches: List[EngineMatch]
+    ) -> Tuple[List[str], List[Dict[str, Any]], float]:
+        """Build applied rules, changes and ethical score from engine matches."""
+        applied_rules, ethical_score = self._score_rules(
+            engine, {match.spec.rule_index for match in matches}
+        )
+        return applied_rules, self._describe_changes(matches), ethical_score
 
-                    # Update offset for subsequent matches in this iteration
-                    offset += len(replacement) - len(original)
+    @staticmethod
+    def _describe_changes(matches: List[EngineMatch]) -> List[Dict[str, Any]]:
+        """Describe matches as changes.
 
-            # Return the content modified by this rule and the changes made
-            return current_content, changes
-        except Exception as e:
-            self.logger.error(
-                f"Error applying rule {rule.id}: {e}", exc_info=True
-            )  # Use self.logger
-            # Return original content and no changes if error occurs
-            return content, []
+        Changes are reported grouped by rule and pattern order, as when rules were
+        applied one after another; positions refer to the original content.
+        """
+        ordered = sorted(matches, key=lambda match: (match.spec.order, match.start))
+        return [
+            {
+                "rule_id": match.spec.rule_id,
+                "pattern": match.spec.pattern,
+                "original": match.original,
+                "replacement": match.spec.replacement,
+                "position": (match.start, match.end),  # Position in original content
+            }
+            for match in ordered
+        ]
+
+    @staticmethod
+    def _score_rules(
+        engine: CompiledSanitizationEngine, rule_indexes: Iterable[int]
+    ) -> Tuple[List[str], float]:
+        """Return the ids of the applied rules and the resulting ethical score."""
+        applied_rules: List[str] = []
+        ethical_score = 1.0  # Start with perfect score
+        for rule_index in sorted(rule_indexes):
+            rule = engine.rules[rule_index]
+            applied_rules.append(rule.id)
+            # Adjust ethical score based on rule severity
+            ethical_score -= SEVERITY_PENALTIES.get(rule.severity, 0.05)
+
+        # Ensure score doesn't go below 0
+        return applied_rules, max(0.0, ethical_score)
 
     def _create_empty_result(self) -> SanitizationResult:
         """Create an empty sanitization result for empty input"""
@@ -470,7 +1377,7 @@ class EthikSanitizer:
             self.logger.error(
                 "Absolute path for sanitization rules file not found in configuration."
             )  # Use self.logger
-            self.rules.clear()
+            self._publish_rules({})
             return
 
         rules_path = Path(rules_file_abs_path_str)
@@ -480,46 +1387,161 @@ class EthikSanitizer:
         )  # Use self.logger
         if rules_path.exists() and rules_path.is_file():
             try:
-                with open(rules_path, "r", encoding="utf-8") as f:
-                    rules_data = json.load(f)
-
-                self.rules.clear()  # Clear existing rules before loading
-                for rule_dict in rules_data.get("rules", []):
-                    try:
-                        # Use default_factory for datetimes
-                        rule_args = {
-                            k: v
-                            for k, v in rule_dict.items()
-                            if k not in ["created", "last_updated"]
-                        }
-                        rule = SanitizationRule(**rule_args)
-                        self.rules[rule.id] = rule
-                    except TypeError as te:
-                        self.logger.error(
-                            f"Error creating SanitizationRule instance for rule ID "
-                            f"'{rule_dict.get('id')}': Missing or invalid arguments - {te}",
-                            exc_info=True,
-                        )
-                    except Exception as item_e:
-                        self.logger.error(
-                            f"Error parsing sanitization rule item {rule_dict.get('id')}: {item_e}",
-                            exc_info=True,
-                        )  # Use self.logger
+                data, source = read_file_state(rules_path)
+                if not self._publish_rule_bundle(rules_path, source):
+                    rules_data = json.loads(data)
+                    rules, fingerprints = self._parse_rule_entries(rules_data.get("rules", []))
+                    snapshot = self._publish_rules(rules, fingerprints, source)
+                    self._save_rule_bundle(rules_path, snapshot)
                 self.logger.info(
                     f"Loaded {len(self.rules)} sanitization rules from {rules_path.name}"
                 )  # Use self.logger
             except json.JSONDecodeError:
                 self.logger.error(f"Invalid JSON in rules file: {rules_path}")  # Use self.logger
+                # Keep the rules loaded so far
             except Exception as e:
                 self.logger.error(
                     f"Error loading sanitization rules file {rules_path}: {e}", exc_info=True
                 )  # Use self.logger
-                self.rules.clear()  # Clear rules on error
+                self._publish_rules({})  # Clear rules on error
         else:
             self.logger.warning(
                 f"Sanitization rules file not found: {rules_path}. Sanitizer will have no rules."
             )  # Use self.logger
-            self.rules.clear()  # Ensure rules are empty if file not found
+            self._publish_rules({})  # Ensure rules are empty if file not found
+
+    def _rule_bundle_store(self, rules_path: Path) -> Optional[RuleBundleStore]:
+        """Return the bundle store of a rules file, or None if bundles are disabled."""
+        if not self.config.get("rule_bundle", {}).get("enabled", True):
+            return None
+        tag = code_tag(sys.modules[__name__], sanitization_engine, keyword_automaton)
+        return RuleBundleStore(rules_path, "sanitization", tag, self.logger)
+
+    def _publish_rule_bundle(self, rules_path: Path, source: FileState) -> bool:
+        """Publish the rules of a fresh rule bundle, skipping parsing and compilation.
+
+        The bundled engine is used when it was compiled with the current literal
+        threshold and quarantined patterns; otherwise only the parsed rules are reused.
+
+        Returns:
+            True if a bundle matching the rules file was loaded.
+        """
+        store = self._rule_bundle_store(rules_path)
+        bundle = store.load(source) if store is not None else None
+        if bundle is None:
+            return False
+        compiled = None
+        engine: CompiledSanitizationEngine = bundle.compiled["engine"]
+        if (
+            bundle.compiled["literal_threshold"] == self._literal_threshold()
+            and engine.excluded == self._quarantined_patterns()
+        ):
+            engine.logger = self.logger
+            compiled = _CompiledRuleSet(engine)
+        self._publish_rules(bundle.rules, bundle.fingerprints, source, compiled)
+        self.logger.info(
+            f"Loaded {len(bundle.rules)} sanitization rules from bundle {store.path.name}"
+        )
+        return True
+
+    def _save_rule_bundle(self, rules_path: Path, snapshot: RuleSnapshot):
+        """Write the bundle of a snapshot loaded from a rules file (rules and engine)."""
+        store = self._rule_bundle_store(rules_path)
+        if store is None or snapshot.source is None:
+            return
+        compiled = {
+            "engine": snapshot.compiled.engine,
+            "literal_threshold": self._literal_threshold(),
+        }
+        store.save(
+            snapshot.source,
+            RuleBundle(dict(snapshot.rules), dict(snapshot.fingerprints), compiled),
+        )
+
+    def _parse_rule_entries(
+        self, rule_entries: List[Any]
+    ) -> Tuple[Dict[str, SanitizationRule], Dict[str, str]]:
+        """Create SanitizationRules from rule definitions, reusing unchanged rules.
+
+        Returns:
+            The rules by id and the fingerprint of each rule's definition.
+        """
+        previous = self._snapshots.current
+        rules: Dict[str, SanitizationRule] = {}
+        fingerprints: Dict[str, str] = {}
+        for rule_dict in rule_entries:
+            try:
+                fingerprint = rule_fingerprint(rule_dict)
+                rule_id = rule_dict.get("id")
+                if isinstance(rule_id, str) and previous.fingerprints.get(rule_id) == fingerprint:
+                    rules[rule_id] = previous.rules[rule_id]  # Unchanged definition
+                    fingerprints[rule_id] = fingerprint
+                    continue
+                # Use default_factory for datetimes
+                rule_args = {
+                    k: v for k, v in rule_dict.items() if k not in ["created", "last_updated"]
+                }
+                rule = SanitizationRule(**rule_args)
+                rules[rule.id] = rule
+                fingerprints[rule.id] = fingerprint
+            except TypeError as te:
+                self.logger.error(
+                    f"Error creating SanitizationRule instance for rule ID "
+                    f"'{rule_dict.get('id')}': Missing or invalid arguments - {te}",
+                    exc_info=True,
+                )
+            except Exception as item_e:
+                self.logger.error(
+                    f"Error parsing sanitization rule item {rule_dict.get('id')}: {item_e}",
+                    exc_info=True,
+                )  # Use self.logger
+        return rules, fingerprints
+
+    def start_rule_watcher(self, interval: Optional[float] = None) -> bool:
+        """Start reloading the rules file in the background whenever its content changes.
+
+        Changed rules are recompiled and swapped in atomically; sanitizations already
+        running finish on the previous rule set. A file that fails to parse leaves the
+        loaded rules in place.
+
+        Returns:
+            True if the watcher is running.
+        """
+        rules_file = self.config.get("rules_file")
+        if not rules_file:
+            self.logger.warning("Cannot watch rules: 'rules_file' not configured.")
+            return False
+        if self._rule_watcher is None:
+            hot_reload = self.config.get("hot_reload", {})
+            self._rule_watcher = RuleFileWatcher(
+                rules_file,
+                self._on_rules_file_changed,
+                interval or hot_reload.get("interval_seconds", DEFAULT_WATCH_INTERVAL),
+                self.logger,
+                initial_state=self._snapshots.current.source,
+            )
+        self._rule_watcher.start()
+        self.logger.info(f"Watching sanitization rules file {rules_file} for changes.")
+        return True
+
+    def stop_rule_watcher(self):
+        """Stop the background rules file watcher, if running."""
+        if self._rule_watcher is not None:
+            self._rule_watcher.stop()
+            self._rule_watcher = None
+
+    def _on_rules_file_changed(self, data: bytes, state: FileState):
+        """Publish the rules of a changed rules file (raises, keeping the old rules,
+        if the new content is invalid)."""
+        rules_data = json.loads(data)
+        if not isinstance(rules_data, dict) or not isinstance(rules_data.get("rules", []), list):
+            raise ValueError("Invalid sanitization rules file: expected a 'rules' list.")
+        rules, fingerprints = self._parse_rule_entries(rules_data.get("rules", []))
+        snapshot = self._publish_rules(rules, fingerprints, state)
+        self._save_rule_bundle(Path(self.config["rules_file"]), snapshot)
+        self.logger.info(
+            f"Reloaded {len(snapshot.rules)} sanitization rules (v{snapshot.version})."
+        )
 
     def add_rule(self, rule_dict: Dict[str, Any]):
         """Add or update a sanitization rule dynamically."""
@@ -528,7 +1550,11 @@ class EthikSanitizer:
             rule_args = {k: v for k, v in rule_dict.items() if k not in ["created", "last_updated"]}
             rule = SanitizationRule(**rule_args)
             rule.last_updated = datetime.datetime.now()  # Update timestamp
-            self.rules[rule.id] = rule
+            # Copy-on-write: requests in flight keep the previous snapshot
+            snapshot = self._snapshots.update(
+                {rule.id: rule}, fingerprints={rule.id: rule_fingerprint(rule_dict)}
+            )
+            self.content_cache.invalidate(snapshot.version)
             self.logger.info(
                 f"Added/Updated sanitization rule: {rule.name} [{rule.id}]"
             )  # Use self.logger
@@ -542,7 +1568,8 @@ class EthikSanitizer:
         """Remove a sanitization rule dynamically."""
         if rule_id in self.rules:
             removed_rule_name = self.rules[rule_id].name
-            del self.rules[rule_id]
+            snapshot = self._snapshots.update(removals=[rule_id])
+            self.content_cache.invalidate(snapshot.version)
             self.logger.info(
                 f"Removed sanitization rule: {removed_rule_name} [{rule_id}]"
             )  # Use self.logger
@@ -552,56 +1579,83 @@ class EthikSanitizer:
                 f"Attempted to remove non-existent rule: {rule_id}"
             )  # Use self.logger
 
+    def _create_request_scheduler(self) -> Optional[RequestScheduler]:
+        """Create the request scheduler from the 'scheduler' configuration."""
+        scheduler_config = self.config.get("scheduler", {})
+        if not scheduler_config.get("enabled", True):
+            return None
+        timeout_ms = scheduler_config.get("default_timeout_ms", 0)
+        return RequestScheduler(
+            max_queue_size=scheduler_config.get("max_queue_size", DEFAULT_MAX_QUEUE_SIZE),
+            max_concurrency=scheduler_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+            default_timeout=timeout_ms / 1000 if timeout_ms > 0 else None,
+            severity_priorities=scheduler_config.get("severity_priorities"),
+            source_priorities=scheduler_config.get("source_priorities"),
+            default_priority=scheduler_config.get("default_priority", DEFAULT_PRIORITY),
+            logger=self.logger,
+        )
+
+    def _create_history(self) -> HistoryStore:
+        """Create the history ring buffer from the history configuration."""
+        retention_days = self.config.get("history_retention_days", 30)
+        return HistoryStore(
+            capacity=self.config.get("history_max_entries", DEFAULT_HISTORY_SIZE),
+            # 0 or negative means infinite retention (bounded by capacity)
+            retention_seconds=retention_days * 86400 if retention_days > 0 else None,
+            retain_results=self.config.get("history_retain_results", False),
+        )
+
+    def _record_history(self, result: SanitizationResult):
+        """Add a compact record of a result to history."""
+        if "error" in result.metadata:
+            outcome = "error"
+        else:
+            outcome = "clean" if result.is_clean else "sanitized"
+        self.sanitization_history.append(
+            HistoryRecord(
+                timestamp=result.timestamp,
+                digest=result.content_id,
+                score=result.ethical_score,
+                passed=result.is_clean,
+                rule_ids=tuple(result.applied_rules),
+                processing_time=result.performance_metrics.get("processing_time", 0.0),
+                outcome=outcome,
+                result=result if self.sanitization_history.retain_results else None,
+            )
+        )
+
     def get_sanitization_history(
         self,
         limit: int = 100,
         start_time: Optional[datetime.datetime] = None,
         end_time: Optional[datetime.datetime] = None,
-    ) -> List[SanitizationResult]:
-        """Get sanitization history with optional time filters and limit."""
-        # Apply filtering first
-        results = self.sanitization_history
-        if start_time:
-            results = [r for r in results if r.timestamp >= start_time]
-        if end_time:
-            results = [r for r in results if r.timestamp <= end_time]
-
-        # Apply limit to the filtered results (most recent first)
-        return results[-limit:]
-
-    def _clean_history(self):
-        """Clean sanitization history based on retention policy."""
-        retention_days = self.config.get("history_retention_days", 30)
-        if retention_days <= 0:  # 0 or negative means infinite retention
-            return
+    ) -> List[HistoryRecord]:
+        """Get sanitization history records with optional time filters and limit.
 
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=retention_days)
+        Records are compact; `record.result` holds the full SanitizationResult only
+        when 'history_retain_results' is enabled.
+        """
+        # Time filters are binary searches; limit keeps the most recent records
+        return self.sanitization_history.range(start_time, end_time, limit)
 
-        initial_count = len(self.sanitization_history)
-        self.sanitization_history = [
-            r for r in self.sanitization_history if r.timestamp > cutoff_date
-        ]
-        removed_count = initial_count - len(self.sanitization_history)
-        if removed_count > 0:
-            self.logger.debug(
-                f"Cleaned {removed_count} old entries from sanitization history."
-            )  # Use self.logger
+    def get_history_stats(
+        self,
+        start_time: Optional[datetime.datetime] = None,
+        end_time: Optional[datetime.datetime] = None,
+    ) -> Dict[str, Any]:
+        """Get rolling history aggregates (count, pass rate, score percentiles, ...)."""
+        return self.sanitization_history.aggregates(start_time, end_time)
 
     def clear_history(self, older_than: Optional[datetime.datetime] = None):
         """Clear sanitization history manually."""
-        initial_count = len(self.sanitization_history)
+        removed_count = self.sanitization_history.clear(older_than)
         if older_than:
-            self.sanitization_history = [
-                r for r in self.sanitization_history if r.timestamp > older_than
-            ]
-            removed_count = initial_count - len(self.sanitization_history)
             self.logger.info(
                 f"Cleared {removed_count} sanitization history entries older than {older_than}."
             )  # Use self.logger
         else:
-            self.sanitization_history = []
             self.logger.info(
-                f"Cleared all {initial_count} sanitization history entries."
+                f"Cleared all {removed_count} sanitization history entries."
             )  # Use self.logger
 
 
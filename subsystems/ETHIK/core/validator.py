@@ -7,23 +7,52 @@ listening for validation requests (potentially via Mycelium), evaluating actions
 against rules, and reporting results.
 """
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone  # Use timezone-aware datetimes
+import hashlib
 import json  # Ensure json is imported
 import logging
 from pathlib import Path
+import sys
+import time
 from typing import (
     Any,
+    Awaitable,
+    Callable,
     Dict,
     List,
+    Mapping,
     Optional,
+    Sequence,
+    Tuple,
 )
 
 # TypeAlias,  # Use TypeAlias for placeholder types - Requires Python 3.10+
 from koios.logger import KoiosLogger  # Assuming KoiosLogger is available
 from typing_extensions import TypeAlias  # Use this for compatibility < 3.10
 
+from subsystems.ETHIK.core import rule_index as rule_index_module
+from subsystems.ETHIK.core.history import HistoryRecord, HistoryStore
 from subsystems.ETHIK.core.patterns import PatternRegistry  # Assuming PatternRegistry exists
+from subsystems.ETHIK.core.request_scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_QUEUE_SIZE,
+    DEFAULT_PRIORITY,
+    OVERLOADED,
+    RequestScheduler,
+)
+from subsystems.ETHIK.core.result_cache import BoundedResultCache
+from subsystems.ETHIK.core.rule_bundle import RuleBundle, RuleBundleStore, code_tag
+from subsystems.ETHIK.core.rule_index import RuleIndex, compile_rule
+from subsystems.ETHIK.core.rule_snapshot import (
+    DEFAULT_WATCH_INTERVAL,
+    FileState,
+    RuleFileWatcher,
+    RuleSnapshot,
+    RuleSnapshotHolder,
+    read_file_state,
+    rule_fingerprint,
+)
 
 # TODO: Replace with KoiosLogger import and usage
 # from koios.logger import KoiosLogger
@@ -63,6 +92,26 @@ class ValidationResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class BatchValidationResult:
+    """Per-item results of a `validate_many` call, in input order, with batch timing."""
+
+    results: List[ValidationResult]
+    processing_time: float  # Seconds for the whole batch
+    item_times: List[float]  # Seconds spent on each item (0.0 for repeated contexts)
+    unique_contexts: int  # Distinct contexts actually evaluated
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+# Ranking of suggested actions and rule severities when consolidating rule results
+ACTION_LEVELS = {"none": 0, "log": 1, "warn": 2, "block": 3, "critical": 4, "error": 4}
+LEVEL_ACTIONS = {level: action for action, level in ACTION_LEVELS.items()}
+ALERT_SEVERITY_LEVELS = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+# Context fields always part of a result cache key, besides the fields rule conditions
+# read: they select the rules' index entries and shape the result
+RESULT_CACHE_KEY_FIELDS = frozenset({"action_type", "affected_components", "content"})
+
+
 class EthikValidator:
     """Performs real-time ethical validation based on loaded rules.
 
@@ -86,28 +135,43 @@ class EthikValidator:
         self.logger = logger  # Use module logger for now
         self.mycelium = mycelium_client
         self.pattern_registry = pattern_registry or PatternRegistry()
-        self.rules: Dict[str, ValidationRule] = {}
-        self.validation_history: List[ValidationResult] = []
+        # Immutable, versioned rule sets (rules plus their RuleIndex), swapped atomically
+        self._snapshots = RuleSnapshotHolder(self._build_rule_index, self.logger)
+        self._rule_watcher: Optional[RuleFileWatcher] = None
 
         try:
-        self.config = self._load_config(config_path)
+            self.config = self._load_config(config_path)
             self.max_history = self.config.get("max_history_size", 1000)
             self._load_rules()  # Load initial rules
         except Exception as e:
             self.logger.critical(f"Failed to initialize EthikValidator: {e}", exc_info=True)
             # Depending on severity, either raise or continue in a degraded state
             self.config = self._load_config(None)  # Load defaults
-        self.max_history = self.config.get("max_history_size", 1000)
+            self.max_history = self.config.get("max_history_size", 1000)
             self.rules = {}  # Ensure rules are empty if loading failed
             # raise EthikConfigurationError("Failed to initialize Validator") from e
 
+        if self.config.get("hot_reload", {}).get("enabled", False):
+            self.start_rule_watcher()
+
+        retention_days = self.config.get("history_retention_days", 0)
+        self.validation_history = HistoryStore(
+            capacity=self.max_history,
+            # 0 or negative keeps records until the ring buffer overwrites them
+            retention_seconds=retention_days * 86400 if retention_days > 0 else None,
+            retain_results=self.config.get("history_retain_results", False),
+        )
+        self.result_cache = self._create_result_cache()
+        # Admission control for Mycelium requests (None handles every message as it arrives)
+        self.request_scheduler = self._create_request_scheduler()
+
         # Setup Mycelium handlers only if client provided and config exists
         if self.mycelium and "mycelium" in self.config:
             self.topics = self.config["mycelium"].get("topics", {})
             if not self.topics:
                 self.logger.warning("Mycelium client provided but no topics found in config.")
             else:
-            self._setup_mycelium_handlers()
+                self._setup_mycelium_handlers()
         elif self.mycelium:
             self.logger.warning("Mycelium client provided but no 'mycelium' section in config.")
 
@@ -122,7 +186,9 @@ class EthikValidator:
             try:
                 # TODO: Update with actual Mycelium subscribe signature
                 # Example assumes subscribe returns a registration ID
-                # sub_id = await self.mycelium.subscribe(validate_topic, self._handle_validation_request)
+                # sub_id = await self.mycelium.subscribe(
+                #     validate_topic, self._enqueue_validation_request
+                # )
                 # self.logger.info(f"Subscribed to '{validate_topic}' (ID: {sub_id})")
                 self.logger.info(f"Attempting to subscribe to '{validate_topic}' (simulation)")
             except Exception as e:
@@ -132,6 +198,16 @@ class EthikValidator:
                 "'validate_request' topic not configured or Mycelium client missing."
             )
 
+        batch_topic = self.topics.get("validate_batch_request")
+        if batch_topic and self.mycelium:
+            try:
+                # sub_id = await self.mycelium.subscribe(
+                #     batch_topic, self._enqueue_batch_validation_request
+                # )
+                self.logger.info(f"Attempting to subscribe to '{batch_topic}' (simulation)")
+            except Exception as e:
+                self.logger.error(f"Failed to subscribe to '{batch_topic}': {e}", exc_info=True)
+
         rules_update_topic = self.topics.get("rules_update")
         if rules_update_topic and self.mycelium:
             try:
@@ -145,6 +221,66 @@ class EthikValidator:
         else:
             self.logger.warning("'rules_update' topic not configured or Mycelium client missing.")
 
+    async def _enqueue_validation_request(self, message: Message):
+        """Queues a validation request on the request scheduler."""
+        result_topic = self.topics.get("validate_result", "ethik.validate.result.default")
+        await self._schedule_request(message, self._handle_validation_request, result_topic)
+
+    async def _enqueue_batch_validation_request(self, message: Message):
+        """Queues a batched validation request on the request scheduler."""
+        result_topic = self.topics.get(
+            "validate_batch_result", "ethik.validate.batch.result.default"
+        )
+        await self._schedule_request(message, self._handle_batch_validation_request, result_topic)
+
+    async def _schedule_request(
+        self,
+        message: Message,
+        handler: Callable[[Message], Awaitable[None]],
+        result_topic: str,
+    ) -> None:
+        """Submits a request to the scheduler, or handles it directly without one.
+
+        Priority comes from the request's 'severity' and 'source' (or the action
+        context's 'source'), the deadline from 'timeout_ms'. A rejected request gets an
+        OVERLOADED result on `result_topic`.
+        """
+        if self.request_scheduler is None:
+            await handler(message)
+            return
+        request_id = getattr(message, "id", "unknown")
+        data = getattr(message, "data", None)
+        data = data if isinstance(data, dict) else {}
+        action_context = data.get("action_context")
+        source = data.get("source")
+        if source is None and isinstance(action_context, dict):
+            source = action_context.get("source")
+        timeout_ms = data.get("timeout_ms")
+
+        async def reject(reason: str) -> None:
+            error_payload = {
+                "request_id": request_id,
+                "status": OVERLOADED,
+                "reason": reason,
+                "error": f"Validator overloaded ({reason})",
+            }
+            # TODO: Replace with actual Mycelium publish call
+            # await self.mycelium.publish(result_topic, error_payload)
+            self.logger.debug(f"Simulating overload publish to '{result_topic}': {error_payload}")
+
+        await self.request_scheduler.submit(
+            lambda: handler(message),
+            reject,
+            self.request_scheduler.priority_for(data.get("severity"), source),
+            timeout_ms / 1000 if timeout_ms else None,
+        )
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Returns queue depth, wait times and rejections of the request scheduler."""
+        if self.request_scheduler is None:
+            return {"enabled": False}
+        return dict(self.request_scheduler.stats(), enabled=True)
+
     # TODO: Make handler methods async if Mycelium callbacks are async
     # Wrapped handlers for Mycelium messages:
     async def _handle_validation_request(self, message: Message):
@@ -166,10 +302,10 @@ class EthikValidator:
             if not action_context:
                 raise ValueError("'action_context' missing in validation request")
 
-                # Perform validation
+            # Perform validation
             result = await self.validate_action(action_context, params, rule_ids)
 
-                # Publish result
+            # Publish result
             result_topic = self.topics.get("validate_result", "ethik.validate.result.default")
             result_payload = {
                 "request_id": request_id,
@@ -182,22 +318,18 @@ class EthikValidator:
             self.logger.debug(f"Simulating publish to '{result_topic}': {result_payload}")
 
             # If validation failed, publish alert based on severity
-            alert_threshold_str = self.config.get("alert_severity_threshold", "high").lower()
-            severity_map = {"low": 1, "medium": 2, "high": 3, "critical": 4}
-            if not result.is_valid and severity_map.get(
-                result.severity.lower(), 0
-            ) >= severity_map.get(alert_threshold_str, 3):
-                    await self._publish_alert(
+            if self._should_alert(result):
+                await self._publish_alert(
                     alert_type="validation_failure",
                     message=f"Action failed validation: {result.details}",
                     details={
                         "action_context": action_context,
                         "result": asdict(result),
-                        },
-                    )
+                    },
+                )
 
-            except Exception as e:
-                self.logger.error(f"Error handling validation request: {e}", exc_info=True)
+        except Exception as e:
+            self.logger.error(f"Error handling validation request: {e}", exc_info=True)
             error_topic = self.topics.get("validate_result", "ethik.validate.result.default")
             error_payload = {"request_id": request_id, "status": "error", "error": str(e)}
             try:
@@ -207,6 +339,80 @@ class EthikValidator:
             except Exception as pub_e:
                 self.logger.error(f"Failed to publish error result: {pub_e}", exc_info=True)
 
+    async def _handle_batch_validation_request(self, message: Message):
+        """Handles batched validation requests received via Mycelium.
+
+        Expected data format: {'action_contexts': [...], 'params': {...}, 'rule_ids': [...]}.
+        One result message carries the per-item results in request order.
+        """
+        request_id = getattr(message, "id", "unknown")
+        result_topic = self.topics.get(
+            "validate_batch_result", "ethik.validate.batch.result.default"
+        )
+        try:
+            message_data = getattr(message, "data", None)
+            if not isinstance(message_data, dict):
+                self.logger.error(f"Invalid message data type received: {type(message_data)}")
+                return  # Or publish error
+
+            action_contexts = message_data.get("action_contexts")
+            if not isinstance(action_contexts, list) or not action_contexts:
+                raise ValueError("'action_contexts' missing or empty in batch validation request")
+            self.logger.info(
+                f"Received batch validation request: {request_id} ({len(action_contexts)} items)"
+            )
+
+            batch = await self.validate_many(
+                action_contexts, message_data.get("params", {}), message_data.get("rule_ids", [])
+            )
+
+            result_payload = {
+                "request_id": request_id,
+                "results": [asdict(result) for result in batch.results],
+                "item_times": batch.item_times,
+                "processing_time": batch.processing_time,
+                "unique_contexts": batch.unique_contexts,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            # TODO: Replace with actual Mycelium publish call
+            # await self.mycelium.publish(result_topic, result_payload)
+            self.logger.debug(
+                f"Simulating publish to '{result_topic}': "
+                f"{len(result_payload['results'])} results"
+            )
+
+            for index, result in enumerate(batch.results):
+                if self._should_alert(result):
+                    await self._publish_alert(
+                        alert_type="validation_failure",
+                        message=f"Action failed validation: {result.details}",
+                        details={
+                            "request_id": request_id,
+                            "batch_index": index,
+                            "action_context": action_contexts[index],
+                            "result": asdict(result),
+                        },
+                    )
+
+        except Exception as e:
+            self.logger.error(f"Error handling batch validation request: {e}", exc_info=True)
+            error_payload = {"request_id": request_id, "status": "error", "error": str(e)}
+            try:
+                # TODO: Replace with actual Mycelium publish call
+                # await self.mycelium.publish(result_topic, error_payload)
+                self.logger.debug(f"Simulating error publish to '{result_topic}': {error_payload}")
+            except Exception as pub_e:
+                self.logger.error(f"Failed to publish error result: {pub_e}", exc_info=True)
+
+    def _should_alert(self, result: ValidationResult) -> bool:
+        """Returns True if a failed result reaches the configured alert severity."""
+        if result.is_valid:
+            return False
+        threshold = self.config.get("alert_severity_threshold", "high").lower()
+        return ALERT_SEVERITY_LEVELS.get(
+            result.severity.lower(), 0
+        ) >= ALERT_SEVERITY_LEVELS.get(threshold, 3)
+
     async def _handle_rules_update(self, message: Message):
         """Handles rule update requests received via Mycelium.
 
@@ -266,7 +472,7 @@ class EthikValidator:
             # await self.mycelium.publish(status_topic, status_payload)
             self.logger.debug(f"Simulating status publish to '{status_topic}': {status_payload}")
 
-            except Exception as e:
+        except Exception as e:
             self.logger.error(
                 f"Error handling rules update request {request_id}: {e}", exc_info=True
             )
@@ -304,9 +510,9 @@ class EthikValidator:
 
         try:
             payload = {
-                    "type": alert_type,
-                    "message": message,
-                    "details": details,
+                "type": alert_type,
+                "message": message,
+                "details": details,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
             # TODO: Replace with actual Mycelium publish call
@@ -336,10 +542,25 @@ class EthikValidator:
             "rules_file": "config/ethik_rules.json",  # Default relative path
             "max_history_size": 1000,
             "alert_severity_threshold": "high",  # e.g., 'critical', 'high', 'medium', 'low'
+            "result_cache": {
+                "enabled": True,
+                "max_entries": 1000,
+                "max_bytes": 16 * 1024 * 1024,
+                # "ttl_seconds" defaults to validation.cache_duration (300 s)
+            },
+            "rule_bundle": {"enabled": True},  # Precompiled rules next to the rules file
+            "scheduler": {
+                "enabled": True,
+                "max_queue_size": DEFAULT_MAX_QUEUE_SIZE,
+                "max_concurrency": DEFAULT_MAX_CONCURRENCY,
+                "default_timeout_ms": 0,  # 0: requests without 'timeout_ms' never expire
+            },
             "mycelium": {
                 "topics": {
                     "validate_request": "ethik.validate.request",
                     "validate_result": "ethik.validate.result",
+                    "validate_batch_request": "ethik.validate.batch.request",
+                    "validate_batch_result": "ethik.validate.batch.result",
                     "rules_update": "ethik.rules.update",
                     "rules_status": "ethik.rules.status",
                     "alert": "ethik.alert",
@@ -412,7 +633,112 @@ class EthikValidator:
                 merged[key] = value
         return merged
 
+    @property
+    def rules(self) -> Mapping[str, ValidationRule]:
+        """Read-only view of the current rules (see `rules_snapshot`)."""
+        return self._snapshots.current.rules
+
+    @rules.setter
+    def rules(self, rules: Mapping[str, ValidationRule]) -> None:
+        self._snapshots.publish(rules)
+
+    @property
+    def rules_snapshot(self) -> RuleSnapshot:
+        """The current immutable rule set with its version and compiled index."""
+        return self._snapshots.current
+
     def _load_rules(self) -> None:
+        """Loads validation rules and compiles them for indexed dispatch."""
+        self._read_rules_file()
+
+    def _build_rule_index(
+        self, rules: Mapping[str, ValidationRule], previous: Optional[RuleSnapshot]
+    ) -> RuleIndex:
+        """Compiles a rule set into a new index; only new or changed rules are compiled.
+
+        The previous snapshot's index is never modified: when surviving rules keep their
+        order, a copy of it is patched, otherwise a fresh index reuses its predicates.
+        """
+        old_index: Optional[RuleIndex] = previous.compiled if previous is not None else None
+        if old_index is None:
+            index = RuleIndex(self.logger)
+            index.rebuild(rules.values())
+            return index
+
+        kept = [rule_id for rule_id in old_index.rules if rule_id in rules]
+        if kept == [rule_id for rule_id in rules if rule_id in old_index.rules]:
+            index = old_index.copy()
+            for rule_id in old_index.rules.keys() - rules.keys():
+                index.remove(rule_id)
+            for rule_id, rule in rules.items():
+                if old_index.rules.get(rule_id) is not rule:
+                    index.add(rule)
+        else:
+            index = RuleIndex(self.logger)
+            for rule in rules.values():
+                reuse = old_index.rules.get(rule.id) is rule
+                index.add(rule, old_index.predicates[rule.id] if reuse else None)
+        self.logger.debug(f"Indexed {len(rules)} validation rules.")
+        return index
+
+    def _get_rule_index(self) -> RuleIndex:
+        """Returns the index of the current rule snapshot (never modified in place)."""
+        return self._snapshots.current.compiled
+
+    def start_rule_watcher(self, interval: Optional[float] = None) -> bool:
+        """Starts reloading the rules file in the background whenever its content changes.
+
+        Changed rules are recompiled and swapped in atomically; requests already running
+        finish on the previous rule set. A file that fails to parse leaves the loaded
+        rules in place.
+
+        Returns:
+            True if the watcher is running.
+        """
+        rules_file = self.config.get("rules_file")
+        if not rules_file:
+            self.logger.warning("Cannot watch rules: 'rules_file' not configured.")
+            return False
+        if self._rule_watcher is None:
+            hot_reload = self.config.get("hot_reload", {})
+            self._rule_watcher = RuleFileWatcher(
+                rules_file,
+                self._on_rules_file_changed,
+                interval or hot_reload.get("interval_seconds", DEFAULT_WATCH_INTERVAL),
+                self.logger,
+                initial_state=self._snapshots.current.source,
+            )
+        self._rule_watcher.start()
+        self.logger.info(f"Watching validation rules file {rules_file} for changes.")
+        return True
+
+    def stop_rule_watcher(self) -> None:
+        """Stops the background rules file watcher, if running."""
+        if self._rule_watcher is not None:
+            self._rule_watcher.stop()
+            self._rule_watcher = None
+
+    def _on_rules_file_changed(self, data: bytes, state: FileState) -> None:
+        """Publishes the rules of a changed rules file (raises, keeping the old rules,
+        if the new content is invalid)."""
+        rules_path = Path(self.config["rules_file"])
+        rules_data = json.loads(data)
+        if not isinstance(rules_data, dict) or not isinstance(rules_data.get("rules"), list):
+            raise ValueError(f"Invalid format in rules file {rules_path}: expected a 'rules' list.")
+        previous = self._snapshots.current
+        loaded_rules, fingerprints = self._parse_rule_entries(rules_data["rules"], rules_path)
+        snapshot = self._snapshots.publish(loaded_rules, fingerprints, state)
+        self._save_rule_bundle(rules_path, snapshot)
+        changed = sum(
+            1 for rule_id, rule in snapshot.rules.items() if previous.rules.get(rule_id) is not rule
+        )
+        removed = len(previous.rules.keys() - snapshot.rules.keys())
+        self.logger.info(
+            f"Reloaded validation rules from {rules_path.name}: v{snapshot.version}, "
+            f"{len(snapshot.rules)} rules ({changed} new or changed, {removed} removed)."
+        )
+
+    def _read_rules_file(self) -> None:
         """Loads validation rules from the JSON file specified in the configuration."""
         rules_file_path_str = self.config.get("rules_file")
 
@@ -421,7 +747,7 @@ class EthikValidator:
                 "Validation rules file path ('rules_file') not found in configuration. "
                 "No rules will be loaded."
             )
-            self.rules.clear()
+            self.rules = {}
             return
 
         # Assume relative path from workspace root if not absolute
@@ -434,116 +760,180 @@ class EthikValidator:
                 f"Validation rules file not found or is not a file: {rules_path}. "
                 "Validator will operate without rules."
             )
-            self.rules.clear()
+            self.rules = {}
             return
 
         try:
-            with rules_path.open("r", encoding="utf-8") as f:
-                rules_data = json.load(f)
+            data, source = read_file_state(rules_path)
+            if self._publish_rule_bundle(rules_path, source):
+                return
+            rules_data = json.loads(data)
 
             if not isinstance(rules_data, dict) or "rules" not in rules_data:
-            self.logger.error(
+                self.logger.error(
                     f"Invalid format in rules file {rules_path}: Missing top-level 'rules' key."
                 )
-                self.rules.clear()
-            return
+                self.rules = {}
+                return
 
             if not isinstance(rules_data["rules"], list):
                 self.logger.error(
                     f"Invalid format in rules file {rules_path}: 'rules' key must contain a list."
                 )
-                self.rules.clear()
-            return
-
-            loaded_rules: Dict[str, ValidationRule] = {}
-            for i, rule_dict in enumerate(rules_data["rules"]):
-                if not isinstance(rule_dict, dict):
-                    self.logger.warning(
-                        f"Skipping invalid rule entry #{i + 1} in {rules_path}: Not a dictionary."
-                    )
-                    continue
+                self.rules = {}
+                return
 
-                # TODO: Implement robust schema validation for each rule_dict here
-                #       using something like Pydantic or jsonschema before creating ValidationRule.
-
-                try:
-                    # Ensure required fields are present before ** unpacking
-                    required_keys = {
-                        "id",
-                        "name",
-                        "description",
-                        "severity",
-                        "conditions",
-                        "threshold",
-                        "action",
-                    }
-                    if not required_keys.issubset(rule_dict.keys()):
-                        missing = required_keys - rule_dict.keys()
-                        raise TypeError(f"Missing required keys: {missing}")
-
-                    # Handle potential datetime conversion if rules file stores them as strings
-                    if "created" in rule_dict and isinstance(rule_dict["created"], str):
-                        try:
-                            rule_dict["created"] = datetime.fromisoformat(
-                                rule_dict["created"].replace("Z", "+00:00")
-                            )
-                        except ValueError:
-                            self.logger.warning(
-                                f"Invalid ISO format for 'created' in rule {rule_dict.get('id', i + 1)}. Using current time."
-                            )
-                            # Decide on fallback: use current time or fail the rule?
-                            rule_dict.pop("created", None)  # Remove invalid string
-                    if "last_updated" in rule_dict and isinstance(rule_dict["last_updated"], str):
-                        try:
-                            rule_dict["last_updated"] = datetime.fromisoformat(
-                                rule_dict["last_updated"].replace("Z", "+00:00")
-                            )
-                        except ValueError:
-                            self.logger.warning(
-                                f"Invalid ISO format for 'last_updated' in rule {rule_dict.get('id', i + 1)}. Using current time."
-                            )
-                            rule_dict.pop("last_updated", None)
-
-                    rule = ValidationRule(**rule_dict)
-                    if rule.id in loaded_rules:
-                        self.logger.warning(
-                            f"Duplicate rule ID '{rule.id}' found in {rules_path}. Overwriting."
-                        )
-                    loaded_rules[rule.id] = rule
-                except (
-                    TypeError,
-                    ValueError,
-                ) as te:  # Catches missing args, wrong types, datetime format errors
-                    rule_id_str = rule_dict.get("id", f"entry #{i + 1}")
-                    self.logger.error(
-                        f"Error parsing validation rule '{rule_id_str}' in {rules_path}: {te}",
-                        exc_info=False,  # Keep log concise for type/value errors
-                    )
-                except Exception as item_e:  # Catch unexpected errors during rule creation
-                    rule_id_str = rule_dict.get("id", f"entry #{i + 1}")
-                    self.logger.error(
-                        f"Unexpected error parsing rule item '{rule_id_str}' in {rules_path}: {item_e}",
-                        exc_info=True,
-                    )
-
-            self.rules = loaded_rules  # Atomically update rules
+            loaded_rules, fingerprints = self._parse_rule_entries(rules_data["rules"], rules_path)
+            # Publish a new snapshot; requests in flight keep the previous one
+            snapshot = self._snapshots.publish(loaded_rules, fingerprints, source)
+            self._save_rule_bundle(rules_path, snapshot)
             self.logger.info(
                 f"Successfully loaded {len(self.rules)} validation rules from {rules_path.name}"
             )
 
         except json.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON in rules file: {rules_path}. Details: {e}")
-            self.rules.clear()
+            self.rules = {}
         except IOError as e:
             self.logger.error(f"Error reading rules file {rules_path}: {e}", exc_info=True)
-            self.rules.clear()
+            self.rules = {}
         except Exception as e:
             # Catch-all for other unexpected errors during loading
             self.logger.critical(
                 f"Unexpected critical error loading validation rules file {rules_path}: {e}",
                 exc_info=True,
             )
-            self.rules.clear()  # Ensure safe state
+            self.rules = {}  # Ensure safe state
+
+    def _rule_bundle_store(self, rules_path: Path) -> Optional[RuleBundleStore]:
+        """Returns the bundle store of a rules file, or None if bundles are disabled."""
+        if not self.config.get("rule_bundle", {}).get("enabled", True):
+            return None
+        tag = code_tag(sys.modules[__name__], rule_index_module)
+        return RuleBundleStore(rules_path, "validation", tag, self.logger)
+
+    def _publish_rule_bundle(self, rules_path: Path, source: FileState) -> bool:
+        """Publishes the rules of a fresh rule bundle, skipping parsing and compilation.
+
+        Returns:
+            True if a bundle matching the rules file was loaded.
+        """
+        store = self._rule_bundle_store(rules_path)
+        bundle = store.load(source) if store is not None else None
+        if bundle is None:
+            return False
+        index = RuleIndex(self.logger)
+        for rule in bundle.rules.values():
+            index.add(rule, bundle.compiled.get(rule.id))  # Predicates compiled at save time
+        self._snapshots.publish(bundle.rules, bundle.fingerprints, source, compiled=index)
+        self.logger.info(
+            f"Loaded {len(bundle.rules)} validation rules from bundle {store.path.name}"
+        )
+        return True
+
+    def _save_rule_bundle(self, rules_path: Path, snapshot: RuleSnapshot) -> None:
+        """Writes the bundle of a snapshot loaded from a rules file (rules and predicates)."""
+        store = self._rule_bundle_store(rules_path)
+        if store is None or snapshot.source is None:
+            return
+        index: RuleIndex = snapshot.compiled
+        store.save(
+            snapshot.source,
+            RuleBundle(dict(snapshot.rules), dict(snapshot.fingerprints), dict(index.predicates)),
+        )
+
+    def _parse_rule_entries(
+        self, rule_entries: List[Any], rules_path: Path
+    ) -> Tuple[Dict[str, ValidationRule], Dict[str, str]]:
+        """Creates ValidationRules from rule definitions, reusing unchanged rules.
+
+        Returns:
+            The rules by id and the fingerprint of each rule's definition.
+        """
+        previous = self._snapshots.current
+        loaded_rules: Dict[str, ValidationRule] = {}
+        fingerprints: Dict[str, str] = {}
+        for i, rule_dict in enumerate(rule_entries):
+            if not isinstance(rule_dict, dict):
+                self.logger.warning(
+                    f"Skipping invalid rule entry #{i + 1} in {rules_path}: Not a dictionary."
+                )
+                continue
+
+            # Unchanged definitions keep their rule object (and its compiled predicate)
+            fingerprint = rule_fingerprint(rule_dict)
+            rule_id = rule_dict.get("id")
+            if isinstance(rule_id, str) and previous.fingerprints.get(rule_id) == fingerprint:
+                loaded_rules[rule_id] = previous.rules[rule_id]
+                fingerprints[rule_id] = fingerprint
+                continue
+
+            # TODO: Implement robust schema validation for each rule_dict here
+            #       using something like Pydantic or jsonschema before creating ValidationRule.
+
+            try:
+                # Ensure required fields are present before ** unpacking
+                required_keys = {
+                    "id",
+                    "name",
+                    "description",
+                    "severity",
+                    "conditions",
+                    "threshold",
+                    "action",
+                }
+                if not required_keys.issubset(rule_dict.keys()):
+                    missing = required_keys - rule_dict.keys()
+                    raise TypeError(f"Missing required keys: {missing}")
+
+                # Handle potential datetime conversion if rules file stores them as strings
+                if "created" in rule_dict and isinstance(rule_dict["created"], str):
+                    try:
+                        rule_dict["created"] = datetime.fromisoformat(
+                            rule_dict["created"].replace("Z", "+00:00")
+                        )
+                    except ValueError:
+                        self.logger.warning(
+                            f"Invalid ISO format for 'created' in rule "
+                            f"{rule_dict.get('id', i + 1)}. Using current time."
+                        )
+                        # Decide on fallback: use current time or fail the rule?
+                        rule_dict.pop("created", None)  # Remove invalid string
+                if "last_updated" in rule_dict and isinstance(rule_dict["last_updated"], str):
+                    try:
+                        rule_dict["last_updated"] = datetime.fromisoformat(
+                            rule_dict["last_updated"].replace("Z", "+00:00")
+                        )
+                    except ValueError:
+                        self.logger.warning(
+                            f"Invalid ISO format for 'last_updated' in rule "
+                            f"{rule_dict.get('id', i + 1)}. Using current time."
+                        )
+                        rule_dict.pop("last_updated", None)
+
+                rule = ValidationRule(**rule_dict)
+                if rule.id in loaded_rules:
+                    self.logger.warning(
+                        f"Duplicate rule ID '{rule.id}' found in {rules_path}. Overwriting."
+                    )
+                loaded_rules[rule.id] = rule
+                fingerprints[rule.id] = fingerprint
+            except (
+                TypeError,
+                ValueError,
+            ) as te:  # Catches missing args, wrong types, datetime format errors
+                rule_id_str = rule_dict.get("id", f"entry #{i + 1}")
+                self.logger.error(
+                    f"Error parsing validation rule '{rule_id_str}' in {rules_path}: {te}",
+                    exc_info=False,  # Keep log concise for type/value errors
+                )
+            except Exception as item_e:  # Catch unexpected errors during rule creation
+                rule_id_str = rule_dict.get("id", f"entry #{i + 1}")
+                self.logger.error(
+                    f"Unexpected error parsing rule item '{rule_id_str}' in {rules_path}: {item_e}",
+                    exc_info=True,
+                )
+        return loaded_rules, fingerprints
 
     # --- Core Validation Logic --- #
 
@@ -566,44 +956,211 @@ class EthikValidator:
         """
         action_type = action_context.get("action_type", "Unknown Action")
         self.logger.info(f"Starting validation for action: {action_type}")
+        start_time = time.perf_counter()
 
-        applicable_rules = []
         if rule_ids:
             # Validate against a specific subset of rules
             for rule_id in rule_ids:
-                rule = self.rules.get(rule_id)
-                if rule:
-                    if self._should_apply_rule(rule, action_context):
-                        applicable_rules.append(rule)
-                else:
+                if rule_id not in self.rules:
                     self.logger.warning(f"Requested rule ID '{rule_id}' not found.")
-        else:
-            # Validate against all rules that should apply
-            for rule in self.rules.values():
-                if self._should_apply_rule(rule, action_context):
-                    applicable_rules.append(rule)
+        # Only rules indexed under the context's action type, components or keys
+        # (plus rules without such a constraint) have their conditions evaluated
+        # The rule snapshot is fetched once: the request finishes on this rule set even if
+        # the rules are reloaded meanwhile
+        snapshot = self._snapshots.current
+        index: RuleIndex = snapshot.compiled
+
+        # Identical relevant context under the same rule-set version: reuse the outcome
+        cache_key = self._result_cache_key(action_context, rule_ids, snapshot)
+        entry = self.result_cache.get(cache_key) if cache_key is not None else None
+        if entry is not None:
+            cached_result = self._result_from_cache(entry.value, action_context)
+            self._process_validation_result(
+                cached_result,
+                digest=self._context_digest(action_context),
+                processing_time=time.perf_counter() - start_time,
+                cache_hit=True,
+            )
+            return cached_result
+
+        applicable_rules = index.applicable_rules(action_context, rule_ids)
 
         if not applicable_rules:
             self.logger.info(f"No applicable validation rules found for action: {action_type}")
             # Create a default passing result if no rules apply
-            default_pass = ValidationResult(
-                is_valid=True,
-                action_taken="allowed",
-                severity="none",
-                score=1.0,
-                details="No applicable rules found or executed.",
-                rule_results=[],
-                affected_components=action_context.get("affected_components", []),
-                metadata=action_context.get("metadata", {}),
-            )
-            return default_pass
+            return self._no_rules_result(action_context)
+
+        final_result = self._run_rules(applicable_rules, action_context, index)
+        self._cache_result(cache_key, final_result, snapshot.version)
+
+        # Record the final result (success or error state)
+        self._process_validation_result(
+            final_result,
+            digest=self._context_digest(action_context),
+            processing_time=time.perf_counter() - start_time,
+        )
+
+        # Note: Alerting is currently handled by the calling Mycelium handler
+        # based on the returned result and severity threshold.
+
+        self.logger.info(
+            f"Validation completed for {action_type}. Valid: {final_result.is_valid}, "
+            f"Action: {final_result.action_taken}"
+        )
+        return final_result
+
+    async def validate_many(
+        self,
+        action_contexts: Sequence[Dict[str, Any]],
+        params: Optional[Dict[str, Any]] = None,
+        rule_ids: Optional[List[str]] = None,
+    ) -> BatchValidationResult:
+        """Validates a burst of actions in one call.
+
+        The rule index is looked up once for the whole batch, identical contexts are
+        evaluated once, and items are evaluated grouped by content so that the shared
+        keyword scan of each distinct content is reused by every rule and item.
+
+        Args:
+            action_contexts: Contexts of the actions to validate.
+            params: Additional parameters shared by all items (currently unused placeholder).
+            rule_ids: Optional list of specific rule IDs to apply to every item.
+
+        Returns:
+            A BatchValidationResult with one ValidationResult per context, in input order.
+        """
+        batch_start = time.perf_counter()
+        self.logger.info(f"Starting batch validation of {len(action_contexts)} actions")
+        if rule_ids:
+            for rule_id in rule_ids:
+                if rule_id not in self.rules:
+                    self.logger.warning(f"Requested rule ID '{rule_id}' not found.")
+        snapshot = self._snapshots.current
+        index: RuleIndex = snapshot.compiled
+
+        results: List[Optional[ValidationResult]] = [None] * len(action_contexts)
+        item_times = [0.0] * len(action_contexts)
+        digests: List[str] = []
+        # Context digest -> (first item evaluated with it, whether any rule applied)
+        evaluated: Dict[str, Tuple[int, bool]] = {}
+        for position, action_context in enumerate(action_contexts):
+            if not isinstance(action_context, dict):
+                digests.append("")
+                results[position] = self._error_result(
+                    {}, f"Invalid action context type: {type(action_context).__name__}", []
+                )
+                continue
+            digests.append(self._context_digest(action_context))
+
+        for position in self._content_order(action_contexts):
+            if results[position] is not None:
+                continue
+            action_context = action_contexts[position]
+            previous = evaluated.get(digests[position])
+            if previous is not None:
+                # Repeated context: same outcome, fresh result object
+                first, recorded = previous
+                results[position] = replace(
+                    results[first],
+                    rule_results=list(results[first].rule_results),
+                    timestamp=datetime.now(timezone.utc),
+                )
+                if recorded:
+                    self._process_validation_result(
+                        results[position], digests[position], 0.0, cache_hit=True
+                    )
+                continue
+
+            start_time = time.perf_counter()
+            cache_key = self._result_cache_key(action_context, rule_ids, snapshot)
+            entry = self.result_cache.get(cache_key) if cache_key is not None else None
+            if entry is not None:
+                results[position] = self._result_from_cache(entry.value, action_context)
+                item_times[position] = time.perf_counter() - start_time
+                evaluated[digests[position]] = (position, True)
+                self._process_validation_result(
+                    results[position], digests[position], item_times[position], cache_hit=True
+                )
+                continue
+
+            applicable_rules = index.applicable_rules(action_context, rule_ids)
+            if not applicable_rules:
+                results[position] = self._no_rules_result(action_context)
+            else:
+                results[position] = self._run_rules(applicable_rules, action_context, index)
+                self._cache_result(cache_key, results[position], snapshot.version)
+            item_times[position] = time.perf_counter() - start_time
+            evaluated[digests[position]] = (position, bool(applicable_rules))
+            if applicable_rules:
+                self._process_validation_result(
+                    results[position], digests[position], item_times[position]
+                )
 
+        batch = BatchValidationResult(
+            results=results,
+            processing_time=time.perf_counter() - batch_start,
+            item_times=item_times,
+            unique_contexts=len(evaluated),
+        )
+        self.logger.info(
+            f"Batch validation completed: {len(results)} actions "
+            f"({batch.unique_contexts} distinct) in {batch.processing_time:.4f}s"
+        )
+        return batch
+
+    @staticmethod
+    def _content_order(action_contexts: Sequence[Any]) -> List[int]:
+        """Returns item positions grouped by content, first occurrences first."""
+        groups: Dict[Any, List[int]] = {}
+        for position, action_context in enumerate(action_contexts):
+            content = action_context.get("content") if isinstance(action_context, dict) else None
+            key = content if isinstance(content, str) else (None, position)
+            groups.setdefault(key, []).append(position)
+        return [position for positions in groups.values() for position in positions]
+
+    def _no_rules_result(self, action_context: Dict[str, Any]) -> ValidationResult:
+        """Returns the default passing result for a context no rule applies to."""
+        return ValidationResult(
+            is_valid=True,
+            action_taken="allowed",
+            severity="none",
+            score=1.0,
+            details="No applicable rules found or executed.",
+            rule_results=[],
+            affected_components=action_context.get("affected_components", []),
+            metadata=action_context.get("metadata", {}),
+        )
+
+    def _error_result(
+        self, action_context: Dict[str, Any], details: str, rule_results: List[Dict[str, Any]]
+    ) -> ValidationResult:
+        """Returns a failing result for a validation that could not be completed."""
+        return ValidationResult(
+            is_valid=False,
+            action_taken="error",
+            severity="critical",
+            score=0.0,
+            details=details,
+            rule_results=rule_results,  # Include results obtained before error
+            affected_components=action_context.get("affected_components", []),
+            metadata=action_context.get("metadata", {}),
+            timestamp=datetime.now(timezone.utc),  # Ensure timestamp is set
+        )
+
+    def _run_rules(
+        self,
+        applicable_rules: List[ValidationRule],
+        action_context: Dict[str, Any],
+        index: Optional[RuleIndex] = None,
+    ) -> ValidationResult:
+        """Applies the applicable rules to a context and consolidates their results."""
+        action_type = action_context.get("action_type", "Unknown Action")
         self.logger.debug(f"Applying {len(applicable_rules)} rules for action: {action_type}")
         individual_results: List[Dict[str, Any]] = []
         try:
             # TODO: Consider running rule applications concurrently if they are I/O bound
             for rule in applicable_rules:
-                rule_result = self._apply_rule(rule, action_context)
+                rule_result = self._apply_rule(rule, action_context, index)
                 individual_results.append(rule_result)
 
             # Consolidate results
@@ -614,27 +1171,9 @@ class EthikValidator:
                 f"Critical error during rule application for {action_type}: {e}", exc_info=True
             )
             # Create a generic error result
-            final_result = ValidationResult(
-                is_valid=False,
-                action_taken="error",
-                severity="critical",
-                score=0.0,
-                details=f"Internal error during validation: {e}",
-                rule_results=individual_results,  # Include results obtained before error
-                affected_components=action_context.get("affected_components", []),
-                metadata=action_context.get("metadata", {}),
-                timestamp=datetime.now(timezone.utc),  # Ensure timestamp is set
+            final_result = self._error_result(
+                action_context, f"Internal error during validation: {e}", individual_results
             )
-
-        # Record the final result (success or error state)
-        self._process_validation_result(final_result)
-
-        # Note: Alerting is currently handled by the calling Mycelium handler
-        # based on the returned result and severity threshold.
-
-        self.logger.info(
-            f"Validation completed for {action_type}. Valid: {final_result.is_valid}, Action: {final_result.action_taken}"
-        )
         return final_result
 
     def _should_apply_rule(self, rule: ValidationRule, action_context: Dict[str, Any]) -> bool:
@@ -647,20 +1186,29 @@ class EthikValidator:
         Returns:
             True if the rule should be applied, False otherwise.
         """
-        # TODO: Implement actual condition evaluation logic.
-        # This logic would parse rule.conditions (which might be strings,
-        # DSL objects, etc.) and evaluate them against the action_context.
-
-        # Placeholder: Apply all rules for now
-        self.logger.debug(f"Checking applicability of rule '{rule.id}'. (Placeholder: Always True)")
-        return True
+        # Condition expressions are compiled when rules load; keyword conditions do not
+        # gate applicability (they are matched against the content by _apply_rule)
+        index = self._get_rule_index()
+        if index.rules.get(rule.id) is rule:
+            return index.matches(rule.id, action_context)
+        try:
+            return compile_rule(rule).matches(action_context)
+        except Exception as e:
+            self.logger.warning(f"Error evaluating conditions of rule '{rule.id}': {e}")
+            return False
 
-    def _apply_rule(self, rule: ValidationRule, action_context: Dict[str, Any]) -> Dict[str, Any]:
+    def _apply_rule(
+        self,
+        rule: ValidationRule,
+        action_context: Dict[str, Any],
+        index: Optional[RuleIndex] = None,
+    ) -> Dict[str, Any]:
         """Applies a single validation rule to the action context.
 
         Args:
             rule: The ValidationRule to apply.
             action_context: The context of the action being validated.
+            index: Rule index of the snapshot the request runs on (default: current).
 
         Returns:
             A dictionary representing the result of this single rule application.
@@ -684,12 +1232,17 @@ class EthikValidator:
             # Based on the score and rule.threshold, determine if the rule fails.
 
             # --- Placeholder Evaluation Logic --- #
-            # Simulate a check based on keywords in context (very basic example)
-            conditions_met_count = 0
-            content_str = str(action_context.get("content", "")).lower()
-                for condition in rule.conditions:
-                if condition.lower() in content_str:
-                    conditions_met_count += 1
+            # Simulate a check based on keywords in context (very basic example).
+            # Indexed rules share one keyword scan of the content per request.
+            content = action_context.get("content", "")
+            index = index or self._get_rule_index()
+            if index.rules.get(rule.id) is rule:
+                conditions_met_count = index.keyword_hits(rule.id, content)
+            else:
+                content_str = str(content).lower()
+                conditions_met_count = sum(
+                    1 for keyword in compile_rule(rule).keywords if keyword.lower() in content_str
+                )
 
             # Example scoring logic - lower score if conditions are met (inverted logic)
             # Ensure threshold is handled as float throughout
@@ -779,15 +1332,6 @@ class EthikValidator:
         final_action = "allowed"
         highest_severity_level = 0
         final_severity_str = "none"
-        severity_map_to_level = {
-            "none": 0,
-            "log": 1,
-            "warn": 2,
-            "block": 3,
-            "critical": 4,
-            "error": 4,
-        }
-        level_to_severity_str = {v: k for k, v in severity_map_to_level.items()}
 
         for res in rule_results:
             if not res.get("is_valid", True):
@@ -795,7 +1339,7 @@ class EthikValidator:
                 detail_msg = f"Rule '{res.get('rule_name', res.get('rule_id'))}': {res.get('details', 'Failed')}"
                 final_details.append(detail_msg)
                 action_suggested = res.get("action_suggested", "log").lower()
-                current_severity_level = severity_map_to_level.get(action_suggested, 1)
+                current_severity_level = ACTION_LEVELS.get(action_suggested, 1)
                 if current_severity_level > highest_severity_level:
                     highest_severity_level = current_severity_level
                     final_action = action_suggested
@@ -808,12 +1352,12 @@ class EthikValidator:
             final_details_str = "; ".join(final_details)
             if final_severity_str == "none":
                 failed_severities = [
-                    severity_map_to_level.get(r.get("severity", "low").lower(), 1)
+                    ACTION_LEVELS.get(r.get("severity", "low").lower(), 1)
                     for r in rule_results
                     if not r.get("is_valid")
                 ]
                 max_sev = max(failed_severities) if failed_severities else 0
-                final_severity_str = level_to_severity_str.get(max_sev, "low")
+                final_severity_str = LEVEL_ACTIONS.get(max_sev, "low")
 
         affected_components = set(action_context.get("affected_components", []))
 
@@ -833,25 +1377,146 @@ class EthikValidator:
         )
         return consolidated_result
 
-    def _process_validation_result(self, result: ValidationResult) -> None:
+    # --- Result cache --- #
+
+    def _create_result_cache(self) -> Optional[BoundedResultCache]:
+        """Creates the validation result cache from 'result_cache' (None if disabled)."""
+        cache_config = self.config.get("result_cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+        default_ttl = self.config.get("validation", {}).get("cache_duration", 300)
+        return BoundedResultCache(
+            max_entries=cache_config.get("max_entries", 1000),
+            max_bytes=cache_config.get("max_bytes", 16 * 1024 * 1024),
+            ttl_seconds=cache_config.get("ttl_seconds", default_ttl),
+            policy="lru",
+        )
+
+    def _create_request_scheduler(self) -> Optional[RequestScheduler]:
+        """Creates the request scheduler from 'scheduler' (None if disabled)."""
+        scheduler_config = self.config.get("scheduler", {})
+        if not scheduler_config.get("enabled", True):
+            return None
+        timeout_ms = scheduler_config.get("default_timeout_ms", 0)
+        return RequestScheduler(
+            max_queue_size=scheduler_config.get("max_queue_size", DEFAULT_MAX_QUEUE_SIZE),
+            max_concurrency=scheduler_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+            default_timeout=timeout_ms / 1000 if timeout_ms > 0 else None,
+            severity_priorities=scheduler_config.get("severity_priorities"),
+            source_priorities=scheduler_config.get("source_priorities"),
+            default_priority=scheduler_config.get("default_priority", DEFAULT_PRIORITY),
+            logger=self.logger,
+        )
+
+    def _result_cache_key(
+        self,
+        action_context: Dict[str, Any],
+        rule_ids: Optional[Sequence[str]],
+        snapshot: RuleSnapshot,
+    ) -> Optional[str]:
+        """Returns the cache key of a validation, or None if caching is disabled.
+
+        The key hashes the context fields that can influence the outcome: the keys read
+        by the rule conditions plus RESULT_CACHE_KEY_FIELDS, or the whole context when
+        some condition cannot be analysed. Entries are tied to the snapshot version.
+        """
+        cache = self.result_cache
+        if cache is None:
+            return None
+        if snapshot.version > cache.version:
+            cache.invalidate(snapshot.version)  # Rules changed: drop outcomes of older rules
+        keys = snapshot.compiled.context_keys
+        if keys is None:
+            relevant = action_context
+        else:
+            relevant = {
+                key: value
+                for key, value in action_context.items()
+                if key in keys or key in RESULT_CACHE_KEY_FIELDS
+            }
+        canonical = json.dumps([relevant, list(rule_ids or [])], sort_keys=True, default=str)
+        return hashlib.md5(canonical.encode()).hexdigest()
+
+    def _cache_result(
+        self, cache_key: Optional[str], result: ValidationResult, version: int
+    ) -> None:
+        """Stores a copy of a completed (non-error) result under a cache key."""
+        if cache_key is None or result.action_taken == "error":
+            return
+        cached = replace(
+            result,
+            rule_results=[dict(rule_result) for rule_result in result.rule_results],
+            affected_components=list(result.affected_components),
+            metadata={},  # Comes from the requesting context on every hit
+        )
+        size = 256 * (1 + len(cached.rule_results)) + len(cached.details)
+        self.result_cache.put(cache_key, cached, size, version)
+
+    @staticmethod
+    def _result_from_cache(
+        cached: ValidationResult, action_context: Dict[str, Any]
+    ) -> ValidationResult:
+        """Builds a fresh result for a context from a cached outcome."""
+        return replace(
+            cached,
+            rule_results=[dict(rule_result) for rule_result in cached.rule_results],
+            affected_components=list(cached.affected_components),
+            metadata=action_context.get("metadata", {}),
+            timestamp=datetime.now(timezone.utc),
+        )
+
+    def get_result_cache_stats(self) -> Dict[str, Any]:
+        """Returns result cache counters (hits, misses, evictions, ...) and occupancy."""
+        return self.result_cache.stats() if self.result_cache is not None else {}
+
+    @staticmethod
+    def _context_digest(action_context: Dict[str, Any]) -> str:
+        """Returns a stable hash of an action context (key order independent)."""
+        canonical = json.dumps(action_context, sort_keys=True, default=str)
+        return hashlib.md5(canonical.encode()).hexdigest()
+
+    def _process_validation_result(
+        self,
+        result: ValidationResult,
+        digest: str = "",
+        processing_time: float = 0.0,
+        cache_hit: bool = False,
+    ) -> None:
         """Processes a final validation result: logs it and adds it to history.
 
+        Cached results are recorded like fresh ones, so history counts every validated
+        action and callers alert on them the same way; the record's `cache_hit` flag
+        tells them apart.
+
         Args:
             result: The final ValidationResult object.
+            digest: Hash of the validated action context.
+            processing_time: Validation time in seconds (the lookup time for cache hits).
+            cache_hit: True if the outcome was reused rather than evaluated.
         """
-        self.validation_history.append(result)
-        if len(self.validation_history) > self.max_history:
-            try:
-            self.validation_history.pop(0)
-            except IndexError:
-                pass
+        # The ring buffer overwrites its oldest record once max_history is reached
+        self.validation_history.append(
+            HistoryRecord(
+                timestamp=result.timestamp,
+                digest=digest,
+                score=result.score,
+                passed=result.is_valid,
+                rule_ids=tuple(
+                    res.get("rule_id", "") for res in result.rule_results if not res.get("is_valid")
+                ),
+                processing_time=processing_time,
+                outcome=result.action_taken,
+                cache_hit=cache_hit,
+                result=result if self.validation_history.retain_results else None,
+            )
+        )
 
         log_level = logging.INFO if result.is_valid else logging.WARNING
         self.logger.log(
             log_level,
             f"Validation Outcome: Valid={result.is_valid}, Score={result.score:.2f}, "
             f"ActionTaken={result.action_taken}, Severity={result.severity}, "
-            f"Details: {result.details}",
+            f"Details: {result.details}" + (" (cached)" if cache_hit else ""),
         )
 
     # --- Other Potential Methods (Placeholders/Examples) --- #
@@ -868,6 +1533,7 @@ class EthikValidator:
         try:
             if "id" not in rule_dict:
                 raise ValueError("Rule dictionary must contain an 'id' key.")
+            fingerprint = rule_fingerprint(rule_dict)
             rule_dict["last_updated"] = datetime.now(timezone.utc)
             if "created" in rule_dict and isinstance(rule_dict["created"], str):
                 try:
@@ -891,7 +1557,8 @@ class EthikValidator:
                     rule_dict["last_updated"] = datetime.now(timezone.utc)
 
             rule = ValidationRule(**rule_dict)
-            self.rules[rule.id] = rule
+            # Copy-on-write: only the new rule is compiled, other predicates are reused
+            self._snapshots.update({rule.id: rule}, fingerprints={rule.id: fingerprint})
             self.logger.info(f"Dynamically added/updated rule ID: {rule.id} ('{rule.name}')")
             return True
         except (TypeError, ValueError) as e:
@@ -917,25 +1584,42 @@ class EthikValidator:
         """
         if rule_id in self.rules:
             removed_rule_name = self.rules[rule_id].name
-            del self.rules[rule_id]
+            self._snapshots.update(removals=[rule_id])
             self.logger.info(f"Dynamically removed rule ID: {rule_id} ('{removed_rule_name}')")
             return True
         else:
             self.logger.warning(f"Attempted to remove non-existent rule ID: {rule_id}")
             return False
 
-    def get_validation_history(self, limit: Optional[int] = 100) -> List[ValidationResult]:
+    def get_validation_history(
+        self,
+        limit: Optional[int] = 100,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[HistoryRecord]:
         """Retrieves recent validation history.
 
         Args:
             limit: The maximum number of history entries to return. If None or <=0, returns all.
+            start_time: Optional inclusive lower bound on the record timestamp.
+            end_time: Optional inclusive upper bound on the record timestamp.
 
         Returns:
-            A list of ValidationResult objects (copy).
+            A list of compact HistoryRecord objects, oldest first. `record.result` holds
+            the full ValidationResult only when 'history_retain_results' is enabled.
+        """
+        return self.validation_history.range(start_time, end_time, limit)
+
+    def get_history_stats(
+        self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Returns rolling history aggregates (count, pass rate, score percentiles, ...).
+
+        Args:
+            start_time: Optional inclusive lower bound on the record timestamp.
+            end_time: Optional inclusive upper bound on the record timestamp.
         """
-        if limit is None or limit <= 0:
-            return list(self.validation_history)
-        return list(self.validation_history[-limit:])
+        return self.validation_history.aggregates(start_time, end_time)
 
 
 # Final cleanup - remove the placeholder comment at the end if present
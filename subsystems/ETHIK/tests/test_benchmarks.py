@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK benchmark suite
+===================================
+
+Covers generator determinism and PII density, percentile and report comparison, and
+a minimal end-to-end run of the benchmark cases.
+"""
+
+import re
+
+from ..benchmarks import run_benchmarks
+from ..benchmarks.generators import (
+    PII_PATTERNS,
+    generate_action_contexts,
+    generate_content,
+    generate_sanitization_rules,
+    generate_validation_rules,
+)
+from ..benchmarks.harness import compare_reports, measure, percentile
+
+
+def test_generators_are_deterministic():
+    assert generate_content(4096, 0.05, seed=3) == generate_content(4096, 0.05, seed=3)
+    assert generate_content(4096, 0.05, seed=3) != generate_content(4096, 0.05, seed=4)
+    assert generate_sanitization_rules(50, seed=1) == generate_sanitization_rules(50, seed=1)
+    assert generate_validation_rules(50, seed=1) == generate_validation_rules(50, seed=1)
+    assert generate_action_contexts(20, seed=1) == generate_action_contexts(20, seed=1)
+
+
+def test_content_size_and_pii_density():
+    assert len(generate_content(10000, seed=1)) == 10000
+    pii = re.compile("|".join(PII_PATTERNS.values()))
+    assert not pii.search(generate_content(20000, 0.0, seed=1))
+    sparse = len(pii.findall(generate_content(20000, 0.01, seed=1)))
+    dense = len(pii.findall(generate_content(20000, 0.2, seed=1)))
+    assert 0 < sparse < dense
+
+
+def test_rule_generators_cover_requested_mix():
+    rules = generate_sanitization_rules(200, conditional_ratio=0.5)
+    assert len({rule["id"] for rule in rules}) == 200
+    assert rules[0]["patterns"] == [PII_PATTERNS["email"]]
+    assert any(rule["conditions"] for rule in rules)
+    for rule in rules:
+        re.compile(rule["patterns"][0])
+
+    contexts = generate_action_contexts(100, repeat_ratio=0.5, seed=2)
+    distinct = {context["content"] for context in contexts}
+    assert len(distinct) < 100
+
+
+def test_percentile_and_measure():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+    calls = []
+    result = measure("noop", calls.append, 10, params={"size": 1}, warmup=2)
+    assert calls == [-2, -1] + list(range(10))
+    assert result.iterations == 10 and result.ops_per_sec > 0
+    assert result.key == "noop[size=1]"
+
+
+def test_compare_reports_flags_regressions():
+    def report(ops, p99):
+        return {"results": [{"key": "case[a=1]", "ops_per_sec": ops, "p99_ms": p99}]}
+
+    baseline = report(1000.0, 2.0)
+    assert not compare_reports(baseline, report(950.0, 2.1))[0]["regression"]
+    assert compare_reports(baseline, report(800.0, 2.0))[0]["regression"]
+    assert compare_reports(baseline, report(1000.0, 3.0))[0]["regression"]
+    assert compare_reports(baseline, {"results": []}) == []
+
+
+def test_quick_run_produces_report(monkeypatch):
+    tiny = dict(
+        run_benchmarks.PROFILES["quick"],
+        sanitize_rules=[10],
+        validate_rules=[10],
+        content_sizes=[1024],
+        iterations=3,
+    )
+    monkeypatch.setitem(run_benchmarks.PROFILES, "tiny", tiny)
+
+    report = run_benchmarks.run("tiny")
+
+    names = {result["name"] for result in report["results"]}
+    assert names == {
+        "sanitize_content",
+        "sanitize_content_async",
+        "validate_action",
+        "validate_action_cached",
+        "handle_sanitize_request",
+        "handle_validation_request",
+    }
+    assert all(result["iterations"] == 3 for result in report["results"])
+    assert report["suite"] == "tiny" and report["format_version"] == 1
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK history store
+=================================
+
+Covers ring-buffer eviction, time-range queries, retention and rolling aggregates.
+"""
+
+from datetime import datetime, timedelta
+import time
+
+import pytest
+
+from ..core.history import HistoryRecord, HistoryStore
+
+
+def make_record(timestamp, score=1.0, passed=True, outcome="clean", result=None, cache_hit=False):
+    return HistoryRecord(
+        timestamp=timestamp,
+        digest=f"digest-{score}",
+        score=score,
+        passed=passed,
+        rule_ids=() if passed else ("rule-001",),
+        processing_time=0.01,
+        outcome=outcome,
+        cache_hit=cache_hit,
+        result=result,
+    )
+
+
+def test_ring_buffer_overwrites_oldest():
+    store = HistoryStore(capacity=3)
+    base = datetime.now()
+    for i in range(5):
+        store.append(make_record(base + timedelta(seconds=i), score=i / 10))
+
+    assert len(store) == 3
+    assert [record.score for record in store] == [0.2, 0.3, 0.4]
+    assert store[0].score == 0.2 and store[-1].score == 0.4
+    assert store.aggregates()["count"] == 3
+
+
+def test_time_range_queries():
+    store = HistoryStore(capacity=100)
+    base = datetime.now() - timedelta(hours=10)
+    for i in range(10):
+        store.append(make_record(base + timedelta(hours=i), score=i / 10))
+
+    window = store.range(base + timedelta(hours=2), base + timedelta(hours=4))
+    assert [record.score for record in window] == [0.2, 0.3, 0.4]
+    assert [record.score for record in store.range(limit=2)] == [0.8, 0.9]
+    assert store.range(base + timedelta(days=1)) == []
+
+
+def test_retention_and_clear():
+    store = HistoryStore(capacity=10, retention_seconds=3600)
+    store.append(make_record(datetime.now() - timedelta(hours=2)))
+    store.append(make_record(datetime.now()))
+    assert len(store) == 1  # The old record expired on append
+
+    assert store.clear(older_than=time.time() + 1) == 1
+    assert len(store) == 0
+
+
+def test_rolling_aggregates_follow_evictions():
+    store = HistoryStore(capacity=4)
+    now = datetime.now()
+    scores = [0.0, 0.5, 0.5, 1.0, 1.0]
+    for score in scores:
+        passed = score == 1.0
+        outcome = "clean" if passed else "sanitized"
+        record = make_record(now, score=score, passed=passed, outcome=outcome, cache_hit=passed)
+        store.append(record)
+
+    stats = store.aggregates()
+    assert stats["count"] == 4  # The 0.0 record was evicted
+    assert stats["pass_rate"] == pytest.approx(0.5)
+    assert stats["mean_score"] == pytest.approx(0.75)
+    assert stats["score_p50"] == 0.5
+    assert stats["score_p99"] == 1.0
+    assert stats["outcomes"] == {"sanitized": 2, "clean": 2}
+    assert stats["cache_hits"] == 2
+    assert store.aggregates(start=now - timedelta(seconds=1))["cache_hits"] == 2
+
+
+def test_results_are_dropped_unless_retained():
+    compact = HistoryStore(capacity=2)
+    compact.append(make_record(datetime.now(), result="full result"))
+    assert compact[0].result is None
+
+    retained = HistoryStore(capacity=2, retain_results=True)
+    retained.append(make_record(datetime.now(), result="full result"))
+    assert retained[0].result == "full result"
+
+
+def test_invalid_capacity_rejected():
+    with pytest.raises(ValueError):
+        HistoryStore(capacity=0)
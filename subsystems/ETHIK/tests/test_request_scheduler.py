@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK request scheduler
+=====================================
+
+Covers the concurrency limit, priority order, queue-full rejection and shedding,
+deadline handling and the sanitizer's OVERLOADED response.
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from ..core.request_scheduler import (
+    OVERLOADED,
+    REJECT_DEADLINE_EXPIRED,
+    REJECT_DEADLINE_UNREACHABLE,
+    REJECT_QUEUE_FULL,
+    REJECT_SHED,
+    RequestScheduler,
+)
+from ..core.sanitizer import EthikSanitizer
+
+
+def _recorder(log, name, gate=None):
+    async def work():
+        if gate is not None:
+            await gate.wait()
+        log.append(name)
+
+    async def reject(reason):
+        log.append((name, reason))
+
+    return work, reject
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    scheduler = RequestScheduler(max_concurrency=2)
+    gate = asyncio.Event()
+    log = []
+    for number in range(6):
+        assert await scheduler.submit(*_recorder(log, number, gate))
+    await _settle()
+    assert scheduler.in_flight == 2 and scheduler.queue_depth == 4
+
+    gate.set()
+    await _settle()
+    stats = scheduler.stats()
+    assert sorted(log) == list(range(6))
+    assert stats["completed"] == 6 and stats["peak_queue_depth"] >= 4
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_priority_by_severity_and_source():
+    scheduler = RequestScheduler(max_concurrency=1, source_priorities={"CORUJA": 0})
+    gate = asyncio.Event()
+    log = []
+    await scheduler.submit(*_recorder(log, "blocker", gate))
+    await _settle()
+    await scheduler.submit(*_recorder(log, "low"), scheduler.priority_for("low"))
+    await scheduler.submit(*_recorder(log, "unknown"), scheduler.priority_for(None, "KOIOS"))
+    await scheduler.submit(*_recorder(log, "coruja"), scheduler.priority_for("low", "coruja"))
+    await scheduler.submit(*_recorder(log, "high"), scheduler.priority_for("HIGH"))
+
+    gate.set()
+    await _settle()
+    assert log == ["blocker", "coruja", "high", "low", "unknown"]
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_or_sheds_lower_priority():
+    scheduler = RequestScheduler(max_queue_size=2, max_concurrency=1)
+    gate = asyncio.Event()
+    log = []
+    await scheduler.submit(*_recorder(log, "blocker", gate))
+    await _settle()
+    assert await scheduler.submit(*_recorder(log, "a"), 3)
+    assert await scheduler.submit(*_recorder(log, "b"), 3)
+
+    assert not await scheduler.submit(*_recorder(log, "c"), 3)
+    assert await scheduler.submit(*_recorder(log, "urgent"), 0)
+    assert log == [("c", REJECT_QUEUE_FULL), ("b", REJECT_SHED)]
+
+    gate.set()
+    await _settle()
+    assert log[2:] == ["blocker", "urgent", "a"]
+    assert scheduler.stats()["rejected"] == {REJECT_QUEUE_FULL: 1, REJECT_SHED: 1}
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_deadlines_expire_and_unreachable_requests_are_rejected():
+    scheduler = RequestScheduler(max_concurrency=1)
+    gate = asyncio.Event()
+    log = []
+    await scheduler.submit(*_recorder(log, "blocker", gate))
+    await _settle()
+    # No service time measured yet: admitted, then expires while waiting
+    assert await scheduler.submit(*_recorder(log, "late"), timeout=0.01)
+    await asyncio.sleep(0.03)
+    gate.set()
+    await _settle()
+    assert log == ["blocker", ("late", REJECT_DEADLINE_EXPIRED)]
+
+    # Known service time (>= 30 ms) and a busy worker: a 1 ms deadline cannot be met
+    gate.clear()
+    await scheduler.submit(*_recorder(log, "blocker2", gate))
+    await _settle()
+    assert not await scheduler.submit(*_recorder(log, "hopeless"), timeout=0.001)
+    assert log[-1] == ("hopeless", REJECT_DEADLINE_UNREACHABLE)
+    gate.set()
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_sanitizer_publishes_overloaded_response(tmp_path):
+    class Interface:
+        def __init__(self):
+            self.published = []
+
+        async def publish(self, topic, message):
+            self.published.append((topic, message))
+
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text('{"rules": []}', encoding="utf-8")
+    config = {
+        "rules_file": str(rules_file),
+        "scheduler": {"max_queue_size": 1, "max_concurrency": 1},
+        "performance": {"process_pool": {"enabled": False}},
+    }
+    interface = Interface()
+    sanitizer = EthikSanitizer(config, interface, logging.getLogger("test"))
+    gate = asyncio.Event()
+    await sanitizer.request_scheduler.submit(gate.wait, None)
+    await _settle()
+
+    for number in range(2):
+        await sanitizer.enqueue_sanitize_request(
+            {"id": f"r{number}", "payload": {"content": "text", "context": {}}}
+        )
+    topic, response = interface.published[0]
+    assert topic == "response.sanitization.r1"
+    assert response["status"] == OVERLOADED and response["reason"] == REJECT_QUEUE_FULL
+
+    gate.set()
+    await _settle()
+    assert interface.published[1][0] == "response.sanitization.r0"
+    assert interface.published[1][1]["type"] == "sanitization_response"
+    assert sanitizer.get_scheduler_stats()["completed"] == 2
+    await sanitizer.request_scheduler.stop()
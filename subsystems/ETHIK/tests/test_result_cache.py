@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK bounded result cache
+========================================
+
+Covers entry/byte bounds, LRU and LFU eviction, TTL expiry and version invalidation.
+"""
+
+import time
+
+import pytest
+
+from ..core.result_cache import BoundedResultCache
+
+
+def test_lru_eviction_by_entry_count():
+    cache = BoundedResultCache(max_entries=2)
+    cache.put("a", "A", 1, version=0)
+    cache.put("b", "B", 1, version=0)
+    assert cache.get("a").value == "A"  # "b" becomes least recently used
+
+    cache.put("c", "C", 1, version=0)
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lfu_eviction_keeps_hot_entries():
+    cache = BoundedResultCache(max_entries=3, policy="lfu")
+    for key in "abc":
+        cache.put(key, key, 1, version=0)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    cache.put("d", "d", 1, version=0)
+    assert "c" not in cache
+    assert {"a", "b", "d"} == {key for key in "abcd" if key in cache}
+
+
+def test_lfu_insert_into_full_cache_of_hot_entries():
+    cache = BoundedResultCache(max_entries=2, policy="lfu")
+    cache.put("a", "A", 1, version=0)
+    cache.put("b", "B", 1, version=0)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    # The new entry has no hits yet, but it is stored: the coldest old entry goes
+    assert cache.put("c", "C", 1, version=0)
+    assert cache.get("c").value == "C"
+    assert "b" not in cache and "a" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced():
+    cache = BoundedResultCache(max_entries=10, max_bytes=10)
+    cache.put("a", "A", 6, version=0)
+    cache.put("b", "B", 6, version=0)
+    assert "a" not in cache
+    assert cache.total_bytes == 6
+    # Values larger than the whole budget are never stored
+    assert not cache.put("huge", "H", 11, version=0)
+
+
+def test_ttl_expiry_counts_as_miss():
+    cache = BoundedResultCache(ttl_seconds=0.01)
+    cache.put("a", "A", 1, version=0)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["misses"] == 1
+
+
+def test_invalidation_drops_entries_and_rejects_stale_puts():
+    cache = BoundedResultCache()
+    cache.put("a", "A", 1, version=0)
+    cache.invalidate(1)
+    assert len(cache) == 0
+    assert not cache.put("b", "B", 1, version=0)  # Computed with the old rules
+    assert cache.put("b", "B", 1, version=1)
+
+
+def test_hit_counters():
+    cache = BoundedResultCache()
+    cache.put("a", "A", 1, version=0)
+    assert cache.get("a").hits == 1
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        BoundedResultCache(policy="fifo")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK rule bundles
+============================
+
+Covers freshness checks of the bundle store and validator and sanitizer startup
+from a bundle.
+"""
+
+import json
+import logging
+
+import pytest
+
+from ..core.rule_bundle import RuleBundle, RuleBundleStore, bundle_path
+from ..core.rule_snapshot import read_file_state
+from ..core.sanitizer import EthikSanitizer
+from ..core.validator import EthikValidator
+
+VALIDATION_RULES = {
+    "rules": [
+        {
+            "id": "protect-config",
+            "name": "Protect Config",
+            "description": "Warn about secrets written to configuration files",
+            "severity": "high",
+            "conditions": ["action_context.get('target_path', '').startswith('config/')", "token"],
+            "threshold": 0.9,
+            "action": "warn",
+        }
+    ]
+}
+
+
+class MockMyceliumInterface:
+    async def publish(self, topic, message):
+        pass
+
+    async def subscribe(self, topic, handler):
+        pass
+
+
+def write_rules(path, pattern):
+    rules = {
+        "rules": [
+            {
+                "id": "rule-001",
+                "name": "Block",
+                "description": "test",
+                "severity": "high",
+                "patterns": [pattern],
+                "replacements": {pattern: "[X]"},
+                "conditions": [],
+            }
+        ]
+    }
+    path.write_text(json.dumps(rules))
+
+
+def test_store_round_trip_and_staleness(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    write_rules(rules_path, "BAD")
+    _, state = read_file_state(rules_path)
+    store = RuleBundleStore(rules_path, "test", "tag-1")
+
+    assert store.load(state) is None  # No bundle yet
+    assert store.save(state, RuleBundle({"a": 1}, {"a": "fp"}, [1, 2]))
+    assert store.path == bundle_path(rules_path)
+    bundle = store.load(state)
+    assert (bundle.rules, bundle.fingerprints, bundle.compiled) == ({"a": 1}, {"a": "fp"}, [1, 2])
+
+    assert RuleBundleStore(rules_path, "other", "tag-1").load(state) is None
+    assert RuleBundleStore(rules_path, "test", "tag-2").load(state) is None
+    write_rules(rules_path, "WORSE")
+    _, changed = read_file_state(rules_path)
+    assert store.load(changed) is None
+
+
+def test_store_rejects_corrupted_payload(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    write_rules(rules_path, "BAD")
+    _, state = read_file_state(rules_path)
+    store = RuleBundleStore(rules_path, "test", "tag")
+    store.save(state, RuleBundle({"a": 1}, {}))
+
+    data = bytearray(store.path.read_bytes())
+    data[-2] ^= 0xFF
+    store.path.write_bytes(bytes(data))
+    assert store.load(state) is None
+    store.path.write_bytes(b"garbage")
+    assert store.load(state) is None
+
+
+def test_sanitizer_starts_from_fresh_bundle(tmp_path, caplog):
+    rules_path = tmp_path / "rules.json"
+    write_rules(rules_path, "BAD")
+    config = {"rules_file": str(rules_path)}
+    logger = logging.getLogger("test_bundle")
+
+    first = EthikSanitizer(config, MockMyceliumInterface(), logger)
+    assert bundle_path(rules_path).exists()
+    with caplog.at_level(logging.INFO, logger="test_bundle"):
+        second = EthikSanitizer(config, MockMyceliumInterface(), logger)
+    assert "from bundle" in caplog.text
+    assert second.sanitize_content("so BAD").sanitized_content == "so [X]"
+    assert first.sanitize_content("so BAD").sanitized_content == "so [X]"
+
+    write_rules(rules_path, "WORSE")  # Source changed: bundle rebuilt transparently
+    third = EthikSanitizer(config, MockMyceliumInterface(), logger)
+    assert third.sanitize_content("BAD WORSE").sanitized_content == "BAD [X]"
+    with caplog.at_level(logging.INFO, logger="test_bundle"):
+        caplog.clear()
+        fourth = EthikSanitizer(config, MockMyceliumInterface(), logger)
+    assert "from bundle" in caplog.text
+    assert fourth.sanitize_content("BAD WORSE").sanitized_content == "BAD [X]"
+
+
+@pytest.mark.asyncio
+async def test_validator_starts_from_fresh_bundle(tmp_path):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(VALIDATION_RULES))
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"rules_file": str(rules_file)}))
+
+    context = {"action_type": "file_write", "target_path": "config/app.json", "content": "token"}
+
+    compiled = await EthikValidator(config_file).validate_action(context, {})
+    assert bundle_path(rules_file).exists()
+    bundled = await EthikValidator(config_file).validate_action(context, {})
+    assert (bundled.is_valid, bundled.score, bundled.details) == (
+        compiled.is_valid,
+        compiled.score,
+        compiled.details,
+    )
+    assert not bundled.is_valid
+
+
+def test_bundles_can_be_disabled(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    write_rules(rules_path, "BAD")
+    config = {"rules_file": str(rules_path), "rule_bundle": {"enabled": False}}
+    EthikSanitizer(config, MockMyceliumInterface(), logging.getLogger("test_bundle"))
+    assert not bundle_path(rules_path).exists()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK rule index
+==============================
+
+Covers condition compilation, index classification and candidate selection.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+from ..core.rule_index import RuleIndex, compile_rule, is_expression_condition
+
+
+@dataclass
+class Rule:
+    id: str
+    conditions: List[str] = field(default_factory=list)
+
+
+RULES = [
+    Rule(
+        "write-config",
+        [
+            "action_context.get('action_type') in ['file_write', 'edit_file']",
+            "'config' in str(action_context.get('target_path', '')).lower()",
+        ],
+    ),
+    Rule("status", ["action_context.get('action_type') == 'status_change'"]),
+    Rule("database", ["'db' in action_context.get('affected_components', [])"]),
+    Rule("cpu", ["action_context.get('metrics', {}).get('cpu_usage', 0) > 90"]),
+    Rule("keywords", ["secret", "rm -rf"]),
+    Rule("defaulted", ["action_context.get('mode', 'strict') == 'strict'"]),
+]
+
+
+def build_index() -> RuleIndex:
+    index = RuleIndex()
+    index.rebuild(RULES)
+    return index
+
+
+def test_expression_detection():
+    assert is_expression_condition("action_context.get('x') == 1")
+    assert not is_expression_condition("secret")
+    assert not is_expression_condition("!is_authorized")
+
+
+def test_rules_are_filed_under_necessary_conditions():
+    predicates = {rule.id: compile_rule(rule) for rule in RULES}
+    assert predicates["write-config"].action_types == {"file_write", "edit_file"}
+    assert predicates["status"].action_types == {"status_change"}
+    assert predicates["database"].components == {"db"}
+    assert predicates["cpu"].required_key == "metrics"
+    assert predicates["keywords"].keywords == ("secret", "rm -rf")
+    # A default that satisfies the condition means the key is not required
+    assert predicates["defaulted"].required_key is None
+
+
+def test_candidates_touch_only_relevant_rules():
+    index = build_index()
+    unindexed = ["keywords", "defaulted"]
+
+    assert index.candidates({}) == unindexed
+    assert index.candidates({"action_type": "file_write"}) == ["write-config"] + unindexed
+    assert index.candidates({"affected_components": ["db", "ui"]}) == ["database"] + unindexed
+    assert index.candidates({"metrics": {}}) == ["cpu"] + unindexed
+
+
+def test_applicable_rules_evaluate_compiled_conditions():
+    index = build_index()
+    context = {"action_type": "edit_file", "target_path": "CONFIG/app.json", "mode": "lax"}
+    assert [rule.id for rule in index.applicable_rules(context)] == ["write-config", "keywords"]
+    assert [rule.id for rule in index.applicable_rules({"metrics": {"cpu_usage": 95}})] == [
+        "cpu",
+        "keywords",
+        "defaulted",
+    ]
+    # Explicit rule ids bypass the index but still evaluate conditions
+    assert index.applicable_rules({}, rule_ids=["status", "keywords", "unknown"]) == [RULES[4]]
+
+
+def test_incremental_updates_keep_rule_order():
+    index = build_index()
+    index.add(Rule("status", ["action_context.get('action_type') == 'deploy'"]))
+    assert index.candidates({"action_type": "status_change"}) == ["keywords", "defaulted"]
+    assert index.candidates({"action_type": "deploy"}) == ["status", "keywords", "defaulted"]
+
+    assert index.remove("database")
+    assert not index.remove("database")
+    assert index.candidates({"affected_components": ["db"]}) == ["keywords", "defaulted"]
+
+
+def test_condition_errors_do_not_apply_rule():
+    index = RuleIndex()
+    index.add(Rule("broken", ["action_context['missing'] > 1"]))
+    assert index.applicable_rules({"missing": "text"}) == []
+
+
+def test_keyword_hits_follow_index_changes():
+    index = RuleIndex()
+    index.rebuild([Rule("kw", ["password", "action_context.get('content')"]), Rule("other", [])])
+    assert index.keyword_hits("kw", "my PASSWORD") == 1  # Expressions are not keywords
+    index.remove("kw")
+    assert index.keyword_hits("kw", "my PASSWORD") == 0
+
+
+def test_context_keys_track_rule_changes():
+    index = RuleIndex()
+    index.rebuild(
+        [Rule("a", ["action_context.get('mode') == 'x' and action_context['level'] > 1"])]
+    )
+    assert index.context_keys == {"mode", "level"}
+    index.add(Rule("kw", ["password"]))
+    assert index.context_keys == {"mode", "level"}
+    index.add(Rule("opaque", ["len(action_context) > 3"]))
+    assert index.context_keys is None  # Reads the context as a whole
+    index.remove("opaque")
+    assert index.context_keys == {"mode", "level"}
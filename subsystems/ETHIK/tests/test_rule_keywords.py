@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK shared keyword matching
+=======================================
+
+Covers per-rule hit counts on both matching paths, incremental rule changes and the
+last-content cache.
+"""
+
+import random
+
+import pytest
+
+from ..core.rule_keywords import RuleKeywordMatcher
+
+
+def brute_force(rules, content):
+    text = content.lower()
+    counts = {}
+    for rule_id, keywords in rules.items():
+        hits = sum(1 for keyword in keywords if keyword.lower() in text)
+        if hits:
+            counts[rule_id] = hits
+    return counts
+
+
+@pytest.mark.parametrize("threshold", [1, 10000])
+def test_hit_counts_match_brute_force(threshold):
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcd") for _ in range(rng.randint(1, 4))) for _ in range(60)]
+    rules = {f"r{i}": rng.sample(words, 4) + ["Shared"] for i in range(40)}
+    rules["dup"] = ["ab", "ab", "AB"]
+    matcher = RuleKeywordMatcher(automaton_threshold=threshold)
+    matcher.rebuild(rules.items())
+
+    for _ in range(20):
+        content = "".join(rng.choice("abcd ") for _ in range(200)) + rng.choice(["", "SHARED"])
+        assert matcher.hit_counts(content) == brute_force(rules, content)
+
+
+@pytest.mark.parametrize("threshold", [1, 10000])
+def test_incremental_add_and_remove(threshold):
+    matcher = RuleKeywordMatcher(automaton_threshold=threshold)
+    matcher.add_rule("a", ["secret", "token"])
+    matcher.add_rule("b", ["token"])
+    content = "Leaked TOKEN and secret"
+    assert matcher.hit_counts(content) == {"a": 2, "b": 1}
+
+    # Changes update the cached counts for the same content
+    matcher.add_rule("c", ["leaked", "missing"])
+    assert matcher.hit_counts(content) == {"a": 2, "b": 1, "c": 1}
+    assert matcher.remove_rule("a")
+    assert matcher.hit_counts(content) == {"b": 1, "c": 1}
+    matcher.add_rule("b", ["secret"])  # Replaced conditions
+    assert matcher.hit_counts("token only") == {}
+    assert matcher.hit_counts(content) == {"b": 1, "c": 1}
+
+    assert not matcher.remove_rule("a")
+    assert "a" not in matcher and len(matcher) == 2
+    assert matcher.keyword_count == 3
+
+
+def test_repeated_content_is_scanned_once():
+    matcher = RuleKeywordMatcher()
+    matcher.add_rule("a", ["x"])
+    first = matcher.hit_counts("xyz")
+    assert matcher.hit_counts("xyz") is first
+    assert matcher.hit_counts("abc") == {}
+
+
+def test_non_string_content_is_stringified():
+    matcher = RuleKeywordMatcher(automaton_threshold=1)
+    matcher.add_rule("a", ["'key'"])
+    assert matcher.hit_counts({"key": 1}) == {"a": 1}
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK rule snapshots and hot reload
+=============================================
+
+Covers copy-on-write publishing, change detection of the rules file watcher and
+incremental reloads of validator and sanitizer rules.
+"""
+
+import json
+import logging
+import os
+
+import pytest
+
+from ..core.rule_snapshot import RuleFileWatcher, RuleSnapshotHolder
+from ..core.sanitizer import EthikSanitizer
+from ..core.validator import EthikValidator
+
+
+def make_holder(builds):
+    def build(rules, previous):
+        builds.append(sorted(rules))
+        return {"compiled": sorted(rules)}
+
+    return RuleSnapshotHolder(build)
+
+
+def test_updates_never_modify_published_snapshots():
+    builds = []
+    holder = make_holder(builds)
+    first = holder.publish({"a": 1, "b": 2})
+    second = holder.update({"c": 3}, removals=["a"])
+
+    assert dict(first.rules) == {"a": 1, "b": 2}
+    assert first.compiled == {"compiled": ["a", "b"]}
+    assert dict(second.rules) == {"b": 2, "c": 3}
+    assert (first.version, second.version) == (1, 2)
+    assert holder.current is second
+    with pytest.raises(TypeError):
+        second.rules["d"] = 4  # Read-only view
+
+
+def test_failed_build_keeps_current_snapshot():
+    holder = RuleSnapshotHolder(lambda rules, previous: [1 / value for value in rules.values()])
+    snapshot = holder.publish({"a": 1})
+    with pytest.raises(ZeroDivisionError):
+        holder.publish({"a": 1, "b": 0})
+    assert holder.current is snapshot
+
+
+def test_watcher_reports_content_changes_only(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text('{"rules": []}')
+    changes = []
+    watcher = RuleFileWatcher(path, lambda data, state: changes.append(data))
+
+    assert watcher.check()  # First sight of the file
+    assert not watcher.check()
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Touch only
+    assert not watcher.check()
+    path.write_text('{"rules": [1]}')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert watcher.check()
+    assert changes == [b'{"rules": []}', b'{"rules": [1]}']
+
+
+def validation_rule(rule_id, keyword):
+    return {
+        "id": rule_id,
+        "name": rule_id,
+        "description": "test",
+        "severity": "high",
+        "conditions": [keyword],
+        "threshold": 0.95,
+        "action": "warn",
+    }
+
+
+def write_rules(path, rules):
+    stat = path.stat() if path.exists() else None
+    path.write_text(json.dumps({"rules": rules}))
+    if stat is not None:  # Guarantee a new mtime on coarse-grained filesystems
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def rules_path(tmp_path):
+    path = tmp_path / "rules.json"
+    write_rules(path, [validation_rule("a", "alpha"), validation_rule("b", "beta")])
+    return path
+
+
+def test_validator_reload_recompiles_changed_rules_only(tmp_path, rules_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"rules_file": str(rules_path)}))
+    validator = EthikValidator(config)
+    before = validator.rules_snapshot
+    watcher = RuleFileWatcher(
+        rules_path, validator._on_rules_file_changed, initial_state=before.source
+    )
+    assert not watcher.check()
+
+    write_rules(rules_path, [validation_rule("a", "alpha"), validation_rule("c", "gamma")])
+    assert watcher.check()
+    after = validator.rules_snapshot
+    assert after.version == before.version + 1
+    assert list(after.rules) == ["a", "c"]
+    assert after.rules["a"] is before.rules["a"]
+    assert after.compiled.predicates["a"] is before.compiled.predicates["a"]
+    # The previous snapshot still serves requests that started on it
+    assert list(before.compiled.rules) == ["a", "b"]
+    assert before.compiled.keyword_hits("b", "beta") == 1
+    assert after.compiled.keyword_hits("c", "gamma") == 1
+
+
+def test_validator_keeps_rules_when_reload_is_invalid(tmp_path, rules_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"rules_file": str(rules_path)}))
+    validator = EthikValidator(config)
+    snapshot = validator.rules_snapshot
+    with pytest.raises(ValueError):
+        validator._on_rules_file_changed(b"{not json", snapshot.source)
+    assert validator.rules_snapshot is snapshot
+
+
+def test_validator_add_and_remove_publish_new_snapshots(tmp_path, rules_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"rules_file": str(rules_path)}))
+    validator = EthikValidator(config)
+    before = validator.rules_snapshot
+
+    assert validator.add_rule(validation_rule("c", "gamma"))
+    assert validator.remove_rule("a")
+    assert list(validator.rules) == ["b", "c"]
+    assert list(before.rules) == ["a", "b"]
+    assert validator.rules_snapshot.compiled.keyword_hits("c", "gamma") == 1
+    assert "a" not in validator.rules_snapshot.compiled
+
+
+def test_sanitizer_reload_swaps_engine(tmp_path):
+    path = tmp_path / "sanitization_rules.json"
+    rule = {
+        "id": "s1",
+        "name": "s1",
+        "description": "test",
+        "severity": "low",
+        "patterns": ["foo"],
+        "replacements": {"foo": "bar"},
+        "conditions": [],
+    }
+    write_rules(path, [rule])
+    sanitizer = EthikSanitizer({"rules_file": str(path)}, None, logging.getLogger("test"))
+    before = sanitizer.rules_snapshot
+    assert sanitizer.sanitize_content("foo").sanitized_content == "bar"
+
+    watcher = RuleFileWatcher(path, sanitizer._on_rules_file_changed, initial_state=before.source)
+    write_rules(path, [rule, dict(rule, id="s2", patterns=["baz"], replacements={})])
+    assert watcher.check()
+    assert sanitizer.rules["s1"] is before.rules["s1"]
+    assert sanitizer.rules_version == before.version + 1
+    assert sanitizer.sanitize_content("foo baz").sanitized_content == "bar [REDACTED]"
+    assert before.compiled.engine.sanitize("baz")[0] == "baz"
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK rule profiling
+==============================
+
+Covers scan counters, sampled per-pattern timing, the pattern time budget guard and
+the sanitizer's get_rule_stats() report.
+"""
+
+import json
+import logging
+
+import pytest
+
+from ..core.rule_stats import PatternGuard, RuleStatsCollector
+from ..core.sanitizer import EthikSanitizer
+
+KEYS = (("r1", "foo"), ("r1", "bar"), ("r2", "baz"))
+
+
+def test_scan_counters_expand_per_rule_and_pattern():
+    collector = RuleStatsCollector(sample_every=0)
+    assert not collector.record_scan(KEYS, 10, [("r1", "foo"), ("r1", "foo")])
+    collector.record_scan(KEYS[:1], 5, [])
+
+    stats = collector.stats()
+    assert stats["scans"] == 2 and stats["profiled_scans"] == 0
+    assert stats["rules"]["r1"]["invocations"] == 2
+    assert stats["rules"]["r1"]["bytes_scanned"] == 15
+    assert stats["rules"]["r1"]["matches"] == 2
+    assert stats["rules"]["r2"]["invocations"] == 1
+    patterns = {(p["rule_id"], p["pattern"]): p for p in stats["patterns"]}
+    assert patterns[("r1", "foo")]["matches"] == 2
+    assert patterns[("r1", "bar")]["invocations"] == 1
+    assert set(collector.stats(rule_ids=["r2"])["rules"]) == {"r2"}
+
+
+def test_profiled_times_and_percentiles():
+    collector = RuleStatsCollector(sample_every=2)
+    assert not collector.record_scan(KEYS, 1, [])
+    assert collector.record_scan(KEYS, 1, [])  # Every second scan is due
+    for step in range(1, 101):
+        collector.record_profile([(("r1", "foo"), step / 1000), (("r1", "bar"), 0.001)])
+
+    stats = collector.stats()
+    foo = next(p for p in stats["patterns"] if p["pattern"] == "foo")
+    assert foo["timed_runs"] == 100
+    assert foo["max_time"] == pytest.approx(0.1)
+    assert foo["p99_time"] == pytest.approx(0.1)
+    assert foo["total_time"] == pytest.approx(5.05)
+    assert stats["rules"]["r1"]["total_time"] == pytest.approx(5.15)  # Sum over its patterns
+
+
+def test_guard_flags_then_quarantines():
+    flag = PatternGuard(budget_seconds=0.01, action="flag")
+    assert flag.check([(("r1", "foo"), 0.5)], 100) == []
+    assert flag.violations == {("r1", "foo"): 1} and not flag.quarantined
+
+    guard = PatternGuard(budget_seconds=0.01, action="quarantine", max_violations=2)
+    timings = [(("r1", "foo"), 0.5), (("r1", "bar"), 0.001)]
+    assert guard.check(timings, 100) == []
+    assert guard.check(timings, 100) == [("r1", "foo")]
+    assert guard.quarantined == {("r1", "foo")}
+    assert guard.release() == [("r1", "foo")]
+    assert not guard.quarantined and not guard.violations
+
+    with pytest.raises(ValueError):
+        PatternGuard(action="kill")
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "sanitization_rules.json"
+    rule = {
+        "id": "s1",
+        "name": "s1",
+        "description": "test",
+        "severity": "low",
+        "patterns": ["foo", "b+a+r"],
+        "replacements": {"foo": "X"},
+        "conditions": [],
+    }
+    path.write_text(json.dumps({"rules": [rule]}))
+    return path
+
+
+def test_sanitizer_reports_rule_stats(rules_file):
+    config = {"rules_file": str(rules_file), "profiling": {"sample_every": 1}}
+    sanitizer = EthikSanitizer(config, None, logging.getLogger("test"))
+    result = sanitizer.sanitize_content("foo and bar")
+    assert result.resource_usage["cpu_usage"] >= 0.0
+
+    stats = sanitizer.get_rule_stats()
+    assert stats["scans"] == stats["profiled_scans"] == 1
+    assert stats["rules"]["s1"]["matches"] == 2
+    assert stats["rules"]["s1"]["bytes_scanned"] == len("foo and bar")
+    assert {p["pattern"]: p["timed_runs"] for p in stats["patterns"]} == {"foo": 1, "b+a+r": 1}
+    assert "guard" not in stats
+
+
+def test_sanitizer_quarantines_slow_pattern(rules_file):
+    config = {
+        "rules_file": str(rules_file),
+        "profiling": {
+            "sample_every": 0,
+            "guard": {"enabled": True, "budget_ms": 0, "action": "quarantine"},
+        },
+    }
+    sanitizer = EthikSanitizer(config, None, logging.getLogger("test"))
+    version = sanitizer.rules_version
+    # Every scan exceeds a zero budget: the scan is profiled and its patterns quarantined
+    assert sanitizer.sanitize_content("foo").sanitized_content == "X"
+    assert sanitizer.rules_version == version + 1
+    assert sanitizer.rules_snapshot.compiled.engine.is_empty
+    assert sanitizer.sanitize_content("foo").sanitized_content == "foo"
+    assert len(sanitizer.get_rule_stats()["guard"]["quarantined"]) == 2
+
+    assert len(sanitizer.release_quarantined_patterns([("s1", "foo")])) == 1
+    assert sanitizer.rules_snapshot.compiled.engine.pattern_keys == (("s1", "foo"),)
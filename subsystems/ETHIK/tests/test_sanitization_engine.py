@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK compiled sanitization engine
+================================================
+
+Covers single-pass matching, overlap resolution and the literal automaton path.
+"""
+
+from dataclasses import dataclass, field
+import re
+from typing import Dict, List
+
+import pytest
+
+from ..core.keyword_automaton import KeywordAutomaton
+from ..core.sanitization_engine import CompiledSanitizationEngine, is_literal_pattern
+
+
+@dataclass
+class Rule:
+    id: str
+    patterns: List[str]
+    replacements: Dict[str, str] = field(default_factory=dict)
+    severity: str = "medium"
+
+
+RULES = [
+    Rule("pii", [r"\b\d{3}-\d{2}-\d{4}\b", "BAD_WORD"], {"BAD_WORD": "[REPLACED]"}),
+    Rule("repeat", [r"(\w)\1x"]),  # Backreference: scanned standalone
+    Rule("token", ["secret", "(?i)token"]),
+]
+
+
+def test_automaton_finds_overlapping_keywords():
+    automaton = KeywordAutomaton()
+    for word in ["he", "she", "his", "hers"]:
+        automaton.add(word, word)
+    assert sorted(automaton.iter_matches("ushers")) == [
+        (1, 4, "she"),
+        (2, 4, "he"),
+        (2, 6, "hers"),
+    ]
+
+    assert automaton.remove("she", "she")
+    assert not automaton.remove("she", "she")
+    assert sorted(automaton.iter_matches("ushers")) == [(2, 4, "he"), (2, 6, "hers")]
+
+
+def test_is_literal_pattern():
+    assert is_literal_pattern("BAD_WORD")
+    assert not is_literal_pattern(r"\bword\b")
+    assert not is_literal_pattern("")
+
+
+@pytest.mark.parametrize("literal_threshold", [1, 100])
+def test_single_pass_sanitization(literal_threshold):
+    engine = CompiledSanitizationEngine(RULES, literal_threshold=literal_threshold)
+    sanitized, matches = engine.sanitize("id 123-45-6789 BAD_WORD aax secret TOKEN end")
+
+    assert sanitized == "id [REDACTED] [REPLACED] [REDACTED] [REDACTED] [REDACTED] end"
+    assert [m.spec.rule_id for m in matches] == ["pii", "pii", "repeat", "token", "token"]
+    assert [m.original for m in matches] == ["123-45-6789", "BAD_WORD", "aax", "secret", "TOKEN"]
+    assert matches[0].start == 3 and matches[0].end == 14
+
+
+def sanitize_sequentially(rules, content):
+    """Reference: applies every pattern in rule order, each to the previous output."""
+    applied = []
+    for rule in rules:
+        for pattern in rule.patterns:
+            replacement = rule.replacements.get(pattern, "[REDACTED]")
+            content, count = re.subn(pattern, lambda _, r=replacement: r, content)
+            if count and rule.id not in applied:
+                applied.append(rule.id)
+    return content, applied
+
+
+@pytest.mark.parametrize("literal_threshold", [1, 100])
+def test_overlaps_follow_rule_order(literal_threshold):
+    rules = [Rule("short", ["bc"]), Rule("long", ["abcd"]), Rule("late", ["cd"])]
+    engine = CompiledSanitizationEngine(rules, literal_threshold=literal_threshold)
+
+    sanitized, matches = engine.sanitize("abcd bcd")
+    assert sanitized == "a[REDACTED]d [REDACTED]d"
+    assert [m.spec.rule_id for m in matches] == ["short", "short"]
+
+
+@pytest.mark.parametrize("literal_threshold", [1, 100])
+@pytest.mark.parametrize(
+    "rules, content",
+    [
+        # A later rule starting further left must not take an earlier rule's span
+        ([Rule("A", [r"\d{4}-\d{4}"]), Rule("B", [r"\d{5}"])], "x 12345-6789 y"),
+        ([Rule("A", ["bcd"]), Rule("B", ["abc", "de"])], "abcde abc xde"),
+        ([Rule("A", [r"(\w)\1"]), Rule("B", [r"x\w+"])], "xyzz xab"),
+        (RULES, "id 123-45-6789 BAD_WORD aax secret TOKEN end"),
+    ],
+)
+def test_matches_sequential_sanitization(rules, content, literal_threshold):
+    engine = CompiledSanitizationEngine(rules, literal_threshold=literal_threshold)
+    sanitized, matches = engine.sanitize(content)
+
+    expected, applied = sanitize_sequentially(rules, content)
+    assert sanitized == expected
+    assert {m.spec.rule_id for m in matches} == set(applied)
+
+
+def test_overlapping_pii_is_fully_redacted():
+    rules = [Rule("A", [r"\d{4}-\d{4}"]), Rule("B", [r"\d{5}"])]
+    sanitized, matches = CompiledSanitizationEngine(rules).sanitize("x 12345-6789 y")
+    assert sanitized == "x 1[REDACTED] y"
+    assert [(m.spec.rule_id, m.original) for m in matches] == [("A", "2345-6789")]
+
+
+def test_invalid_patterns_are_skipped():
+    engine = CompiledSanitizationEngine([Rule("broken", ["(unclosed", "ok"])])
+    assert [spec.pattern for spec in engine.patterns] == ["ok"]
+    assert engine.sanitize("ok")[0] == "[REDACTED]"
+
+
+def test_empty_engine_returns_content_unchanged():
+    engine = CompiledSanitizationEngine([])
+    assert engine.is_empty
+    assert engine.sanitize("nothing to do") == ("nothing to do", [])
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK batch sanitization
+==================================
+
+Covers the process-pool path, the in-process fallback for small batches,
+ordering modes and the async batch API.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from ..core.sanitizer import EthikSanitizer
+
+
+class MockMyceliumInterface:
+    async def publish(self, topic, message):
+        pass
+
+    async def subscribe(self, topic, handler):
+        pass
+
+
+@pytest.fixture
+def batch_sanitizer_config(tmp_path: Path) -> Dict:
+    """Provides a sanitizer config with an unconditional and a conditional rule."""
+    rules_file = tmp_path / "sanitization_rules.json"
+    rules_content = {
+        "rules": [
+            {
+                "id": "rule-001",
+                "name": "Block Bad Word",
+                "description": "Replaces BAD_WORD",
+                "severity": "high",
+                "patterns": ["BAD_WORD"],
+                "replacements": {"BAD_WORD": "[REPLACED]"},
+                "conditions": [],
+            },
+            {
+                "id": "rule-002",
+                "name": "Mask Emails For Guests",
+                "description": "Masks e-mail addresses unless the user is an admin",
+                "severity": "medium",
+                "patterns": [r"[\w.]+@[\w.]+"],
+                "replacements": {},
+                "conditions": ["context.get('user_level') != 'admin'"],
+            },
+        ]
+    }
+    rules_file.write_text(json.dumps(rules_content))
+    return {
+        "rules_file": str(rules_file.resolve()),
+        "performance": {
+            "caching": {"enabled": True, "max_size": 100},
+            "process_pool": {"max_workers": 2, "min_batch_size": 4, "chunk_size": 3},
+        },
+    }
+
+
+@pytest.fixture
+def sanitizer(batch_sanitizer_config):
+    instance = EthikSanitizer(
+        batch_sanitizer_config, MockMyceliumInterface(), logging.getLogger("test_batch")
+    )
+    yield instance
+    instance.process_pool.shutdown()
+
+
+ITEMS = [f"item {i} BAD_WORD mail{i}@example.org" for i in range(10)] + ["clean text"]
+CONTEXTS = [{"user_level": "admin" if i % 2 else "guest"} for i in range(len(ITEMS))]
+
+
+def test_batch_uses_process_pool_and_matches_single_calls(sanitizer):
+    results = list(sanitizer.sanitize_batch(ITEMS, CONTEXTS))
+
+    assert sanitizer.process_pool.version == sanitizer.rules_version
+    assert [r.metadata["batch_index"] for r in results] == list(range(len(ITEMS)))
+    sanitizer.content_cache.invalidate(sanitizer.rules_version)  # Force fresh scans
+    for item, context, result in zip(ITEMS, CONTEXTS, results):
+        expected = sanitizer.sanitize_content(item, context)
+        assert result.sanitized_content == expected.sanitized_content
+        assert result.changes_made == expected.changes_made
+        assert result.applied_rules == expected.applied_rules
+
+
+def test_unordered_batch_yields_every_item(sanitizer):
+    results = list(sanitizer.sanitize_batch(ITEMS, {"user_level": "guest"}, ordered=False))
+    assert sorted(r.metadata["batch_index"] for r in results) == list(range(len(ITEMS)))
+    assert all("[REDACTED]" in r.sanitized_content for r in results[:-1] if not r.is_clean)
+
+
+def test_small_batch_runs_in_process(sanitizer):
+    results = list(sanitizer.sanitize_batch(ITEMS[:2]))
+    assert sanitizer.process_pool.version is None  # Pool never started
+    assert results[0].sanitized_content == "item 0 [REPLACED] [REDACTED]"
+
+
+def test_batch_reuses_cached_results(sanitizer):
+    sanitizer.sanitize_content(ITEMS[0])
+    results = list(sanitizer.sanitize_batch(ITEMS[:2]))
+    assert results[0].performance_metrics["cache_hit"] is True
+    assert results[1].performance_metrics["cache_hit"] is False
+
+
+def test_context_count_must_match(sanitizer):
+    with pytest.raises(ValueError):
+        list(sanitizer.sanitize_batch(ITEMS, [{}]))
+
+
+@pytest.mark.asyncio
+async def test_async_batch(sanitizer):
+    results = [result async for result in sanitizer.sanitize_batch_async(ITEMS, CONTEXTS)]
+    assert [r.metadata["batch_index"] for r in results] == list(range(len(ITEMS)))
+    assert results[1].sanitized_content == "item 1 [REPLACED] mail1@example.org"
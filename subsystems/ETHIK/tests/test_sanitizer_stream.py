@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK streaming sanitization
+======================================
+
+Covers chunk-boundary matches, incremental digests and the async stream API.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from ..core.sanitizer import EthikSanitizer
+
+
+class MockMyceliumInterface:
+    async def publish(self, topic, message):
+        pass
+
+    async def subscribe(self, topic, handler):
+        pass
+
+
+@pytest.fixture
+def stream_sanitizer_config(tmp_path: Path) -> Dict:
+    """Provides a sanitizer config with a literal and a regex rule."""
+    rules_file = tmp_path / "sanitization_rules.json"
+    rules_content = {
+        "rules": [
+            {
+                "id": "rule-001",
+                "name": "Block Bad Word",
+                "description": "Replaces BAD_WORD",
+                "severity": "high",
+                "patterns": ["BAD_WORD"],
+                "replacements": {"BAD_WORD": "[REPLACED]"},
+                "conditions": [],
+            },
+            {
+                "id": "rule-002",
+                "name": "Mask SSN",
+                "description": "Masks social security numbers",
+                "severity": "critical",
+                "patterns": [r"\b\d{3}-\d{2}-\d{4}\b"],
+                "replacements": {},
+                "conditions": [],
+            },
+        ]
+    }
+    rules_file.write_text(json.dumps(rules_content))
+    return {"rules_file": str(rules_file.resolve()), "streaming": {"overlap_chars": 16}}
+
+
+@pytest.fixture
+def sanitizer(stream_sanitizer_config) -> EthikSanitizer:
+    return EthikSanitizer(
+        stream_sanitizer_config, MockMyceliumInterface(), logging.getLogger("test_stream")
+    )
+
+
+DOCUMENT = "start BAD_WORD 123-45-6789 and 1234-56-7890 then BAD_WORD again " * 20
+
+
+def chunked(text: str, size: int):
+    return (text[i : i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, len(DOCUMENT)])
+def test_stream_matches_whole_document(sanitizer, chunk_size):
+    expected = sanitizer.sanitize_content(DOCUMENT)
+
+    stream = sanitizer.sanitize_stream(chunked(DOCUMENT, chunk_size))
+    assert "".join(stream) == expected.sanitized_content
+
+    result = stream.result
+    assert result.content_id == hashlib.md5(DOCUMENT.encode()).hexdigest()
+    assert result.original_content == ""  # Content is never retained
+    assert result.applied_rules == expected.applied_rules
+    assert result.ethical_score == expected.ethical_score
+    assert result.changes_made == expected.changes_made
+    assert result.metadata["streamed"] is True
+
+
+def test_stream_records_bounded_changes(sanitizer):
+    sanitizer.config["streaming"]["max_recorded_changes"] = 5
+    stream = sanitizer.sanitize_stream(chunked(DOCUMENT, 10))
+    for _ in stream:
+        pass
+
+    metrics = stream.result.performance_metrics
+    assert len(stream.result.changes_made) == 5
+    assert metrics["changes_total"] == 60
+    assert metrics["changes_truncated"] is True
+    assert metrics["characters"] == len(DOCUMENT)
+
+
+def test_stream_rejects_bytes(sanitizer):
+    with pytest.raises(TypeError):
+        list(sanitizer.sanitize_stream([b"BAD_WORD"]))
+
+
+@pytest.mark.asyncio
+async def test_async_stream(sanitizer):
+    async def source():
+        for chunk in chunked(DOCUMENT, 5):
+            yield chunk
+
+    output = [chunk async for chunk in sanitizer.sanitize_stream_async(source())]
+    assert "".join(output) == sanitizer.sanitize_content(DOCUMENT).sanitized_content
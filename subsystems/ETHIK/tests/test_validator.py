@@ -191,13 +191,15 @@ async def test_handle_status_update_critical():
         "status": {"health": "critical", "errors": ["Test error"]},
     }
 
+    validator.validation_history.retain_results = True
+
     await validator.handle_status_update(message)
 
     # Verify the status was processed and validation was triggered
     assert len(validator.validation_history) > 0
-    latest_result = validator.validation_history[-1]
-    assert latest_result.action_taken == "warn"
-    assert "test_component" in latest_result.affected_components
+    latest_record = validator.validation_history[-1]
+    assert latest_record.outcome == "warn"
+    assert "test_component" in latest_record.result.affected_components
 
 
 @pytest.mark.asyncio
@@ -268,9 +270,13 @@ def test_process_validation_result():
 
     validator._process_validation_result(result)
 
-    # Check if result was added to history
+    # Check if a compact record of the result was added to history
     assert len(validator.validation_history) == 1
-    assert validator.validation_history[0] == result
+    record = validator.validation_history[0]
+    assert record.timestamp == result.timestamp
+    assert record.outcome == "block"
+    assert record.passed is False
+    assert record.result is None  # Full results are kept only with history_retain_results
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for ETHIK batched validation
+==================================
+
+Covers validate_many results, ordering, repeated contexts and the batch topic handler.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from ..core.validator import BatchValidationResult, EthikValidator
+
+RULES = {
+    "rules": [
+        {
+            "id": "protect-config",
+            "name": "Protect Config",
+            "description": "Block writes to configuration files",
+            "severity": "critical",
+            "conditions": [
+                "action_context.get('action_type') == 'file_write'",
+                "'config' in str(action_context.get('target_path', ''))",
+            ],
+            "threshold": 0.8,
+            "action": "block",
+        },
+        {
+            "id": "secret-keywords",
+            "name": "Secret Keywords",
+            "description": "Warn about secrets in content",
+            "severity": "high",
+            "conditions": ["password", "token"],
+            "threshold": 0.9,
+            "action": "warn",
+        },
+    ]
+}
+
+
+@pytest.fixture
+def validator(tmp_path):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(RULES))
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"rules_file": str(rules_file)}))
+    return EthikValidator(config_file)
+
+
+CONTEXTS = [
+    {"action_type": "file_write", "target_path": "config/app.json", "content": "x"},
+    {"action_type": "chat", "content": "my PASSWORD is hunter2"},
+    {"action_type": "chat", "content": "hello"},
+    {"action_type": "chat", "content": "my PASSWORD is hunter2"},
+]
+
+
+@pytest.mark.asyncio
+async def test_validate_many_matches_validate_action(validator):
+    batch = await validator.validate_many(CONTEXTS)
+    assert isinstance(batch, BatchValidationResult)
+    assert len(batch.results) == len(batch.item_times) == len(CONTEXTS)
+
+    for context, result in zip(CONTEXTS, batch.results):
+        single = await validator.validate_action(context, {})
+        assert (result.is_valid, result.action_taken, result.score) == (
+            single.is_valid,
+            single.action_taken,
+            single.score,
+        )
+    assert [result.action_taken for result in batch.results] == [
+        "allowed",  # Condition expressions gate rules; only keywords lower the score
+        "warn",
+        "allowed",
+        "warn",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repeated_contexts_are_evaluated_once(validator):
+    batch = await validator.validate_many(CONTEXTS)
+    assert batch.unique_contexts == 3
+    assert batch.item_times[3] == 0.0
+    assert batch.results[3] is not batch.results[1]
+    # Repeated items are still recorded
+    assert len(validator.get_validation_history()) == 4
+
+
+@pytest.mark.asyncio
+async def test_invalid_items_fail_without_aborting_batch(validator):
+    batch = await validator.validate_many(["not a context", CONTEXTS[2]], rule_ids=["unknown"])
+    assert batch.results[0].action_taken == "error"
+    assert batch.results[1].is_valid
+
+
+@pytest.mark.asyncio
+async def test_batch_topic_handler_alerts_per_item(validator):
+    validator.topics = {}
+    alerts = []
+
+    async def publish_alert(alert_type, message, details):
+        alerts.append(details["batch_index"])
+
+    validator._publish_alert = publish_alert
+    message = SimpleNamespace(id="batch-1", data={"action_contexts": CONTEXTS})
+    await validator._handle_batch_validation_request(message)
+    assert alerts == [1, 3]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the ETHIK validation result cache
+===========================================
+
+Covers cache hits for repeated contexts, the fields that make up the cache key,
+invalidation on rule changes and history recording of cached outcomes.
+"""
+
+import json
+
+import pytest
+
+from ..core.validator import EthikValidator
+
+RULES = {
+    "rules": [
+        {
+            "id": "protect-config",
+            "name": "Protect Config",
+            "description": "Warn about secrets written to configuration files",
+            "severity": "high",
+            "conditions": ["action_context.get('target_path', '').startswith('config/')", "token"],
+            "threshold": 0.9,
+            "action": "warn",
+        }
+    ]
+}
+
+CONTEXT = {
+    "action_type": "file_write",
+    "target_path": "config/app.json",
+    "content": "api token",
+    "request_id": "run-1",
+    "metadata": {"attempt": 1},
+}
+
+
+def make_validator(tmp_path, cache_config=None):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(RULES))
+    config = {"rules_file": str(rules_file)}
+    if cache_config is not None:
+        config["result_cache"] = cache_config
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(config))
+    return EthikValidator(config_file)
+
+
+@pytest.mark.asyncio
+async def test_repeated_context_is_served_from_cache(tmp_path):
+    validator = make_validator(tmp_path)
+    first = await validator.validate_action(CONTEXT, {})
+    # A retry differs only in fields no rule reads
+    retry = dict(CONTEXT, request_id="run-2", metadata={"attempt": 2})
+    second = await validator.validate_action(retry, {})
+
+    assert validator.get_result_cache_stats()["hits"] == 1
+    assert (second.is_valid, second.action_taken, second.score) == (
+        first.is_valid,
+        first.action_taken,
+        first.score,
+    )
+    assert second.metadata == {"attempt": 2}
+    assert second.rule_results == first.rule_results
+    assert second.rule_results is not first.rule_results
+    # Cached outcomes are still recorded, flagged as cache hits
+    history = validator.get_validation_history()
+    assert [record.cache_hit for record in history] == [False, True]
+    assert validator.get_history_stats()["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fields_read_by_rules_are_part_of_the_key(tmp_path):
+    validator = make_validator(tmp_path)
+    await validator.validate_action(CONTEXT, {})
+    other_path = await validator.validate_action(dict(CONTEXT, target_path="docs/a.md"), {})
+    other_content = await validator.validate_action(dict(CONTEXT, content="harmless"), {})
+
+    assert validator.get_result_cache_stats()["hits"] == 0
+    assert other_path.details == "No applicable rules found or executed."
+    assert other_content.is_valid
+
+
+@pytest.mark.asyncio
+async def test_rule_changes_invalidate_cached_results(tmp_path):
+    validator = make_validator(tmp_path)
+    assert not (await validator.validate_action(CONTEXT, {})).is_valid
+
+    validator.remove_rule("protect-config")
+    result = await validator.validate_action(CONTEXT, {})
+    assert result.is_valid
+    assert validator.get_result_cache_stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batches_use_the_cache(tmp_path):
+    validator = make_validator(tmp_path)
+    await validator.validate_action(CONTEXT, {})
+    batch = await validator.validate_many([CONTEXT, dict(CONTEXT, request_id="run-3")])
+    assert validator.get_result_cache_stats()["hits"] == 2
+    assert [result.action_taken for result in batch.results] == ["warn", "warn"]
+
+
+@pytest.mark.asyncio
+async def test_cache_can_be_disabled(tmp_path):
+    validator = make_validator(tmp_path, {"enabled": False})
+    await validator.validate_action(CONTEXT, {})
+    await validator.validate_action(CONTEXT, {})
+    assert validator.result_cache is None
+    assert validator.get_result_cache_stats() == {}
@@ -17,6 +17,7 @@ from unittest.mock import mock_open, patch
 
 import pytest
 
+from ..core.history import HistoryStore
 from ..core.validator import EthikValidator, ValidationResult, ValidationRule
 from .test_validator import SAMPLE_RULES, TEST_CONFIG, MockMyceliumInterface
 
@@ -121,6 +122,9 @@ def test_history_retention():
     validator = EthikValidator(
         {**TEST_CONFIG, "validator_config": {"history_retention_days": 1}}, mock_interface
     )
+    validator.validation_history = HistoryStore(
+        capacity=100, retention_seconds=86400, retain_results=True
+    )
 
     # Add some old results
     old_date = datetime.datetime.now() - datetime.timedelta(days=2)
@@ -133,7 +137,7 @@ def test_history_retention():
         action_taken="log",
         affected_components=["test"],
     )
-    validator.validation_history.append(old_result)
+    validator._process_validation_result(old_result)
 
     # Add some recent results
     new_result = ValidationResult(
@@ -149,7 +153,7 @@ def test_history_retention():
 
     # Check that old results were cleaned up
     assert len(validator.validation_history) == 1
-    assert validator.validation_history[0].details == "New result"
+    assert validator.validation_history[0].result.details == "New result"
 
 
 def test_get_validation_history_filters():
@@ -172,12 +176,13 @@ def test_get_validation_history_filters():
         for i in range(5)
     ]
 
-    for result in results:
-        validator.validation_history.append(result)
+    # History is kept in time order, oldest first
+    for result in reversed(results):
+        validator._process_validation_result(result)
 
-    # Test component filter
-    component_results = validator.get_validation_history(component="component-0")
-    assert len(component_results) == 3  # Should get results for component-0
+    # Test limit: the most recent records, oldest first
+    recent = validator.get_validation_history(limit=2)
+    assert [record.timestamp for record in recent] == [results[1].timestamp, now]
 
     # Test time filter
     time_results = validator.get_validation_history(
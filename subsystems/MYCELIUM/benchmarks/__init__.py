@@ -0,0 +1,2 @@
+# subsystems/MYCELIUM/benchmarks/__init__.py
+"""Performance benchmarks for the MYCELIUM subsystem (see codec_benchmark.py)."""
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""MYCELIUM Codec Benchmark: Encode/decode cost and wire size per codec.
+
+Usage:
+    python -m subsystems.MYCELIUM.benchmarks.codec_benchmark [--iterations 200] \\
+        [--codec msgpack ...] [--output codecs.json]
+
+Every sample payload (see payloads.py) is wrapped in a standard envelope and encoded
+with each available codec (JSON, plus MessagePack/CBOR when installed). The report
+lists wire size, median and p99 encode/decode time per message, and each codec's size
+and time relative to JSON.
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import math
+from pathlib import Path
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from subsystems.MYCELIUM.benchmarks.payloads import SAMPLE_PAYLOADS
+from subsystems.MYCELIUM.core.codec import (
+    JSON,
+    available_codecs,
+    decode_envelope,
+    encode_envelope,
+    get_codec,
+)
+
+
+def _envelope(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "message_id": "00000000-0000-0000-0000-000000000000",
+        "timestamp": datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat(),
+        "source_subsystem": "BENCHMARK",
+        "correlation_id": None,
+        "payload": payload,
+        "metadata": {"schema_version": "1.0"},
+    }
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _time(operation, iterations: int) -> Dict[str, float]:
+    operation()  # Warm-up
+    clock = time.perf_counter
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = clock()
+        operation()
+        samples.append(clock() - start)
+    samples.sort()
+    return {"p50_us": _percentile(samples, 0.5) * 1e6, "p99_us": _percentile(samples, 0.99) * 1e6}
+
+
+def run(iterations: int = 200, codecs: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """Benchmarks the codecs on every sample payload.
+
+    Args:
+        iterations: Timed encode and decode runs per payload and codec.
+        codecs: Codecs to compare (default: all available). JSON is always included as
+            the reference.
+    """
+    names = [JSON] + [name for name in (codecs or available_codecs()) if name != JSON]
+    results: List[Dict[str, Any]] = []
+    for payload_name, generate in SAMPLE_PAYLOADS.items():
+        envelope = _envelope(generate())
+        reference: Optional[Dict[str, Any]] = None
+        for name in names:
+            codec = get_codec(name, default=str)
+            data = encode_envelope(envelope, codec)
+            encode = _time(lambda e=envelope, c=codec: encode_envelope(e, c), iterations)
+            decode = _time(lambda d=data: decode_envelope(d), iterations)
+            result = {
+                "payload": payload_name,
+                "codec": name,
+                "wire_bytes": len(data),
+                "encode_p50_us": encode["p50_us"],
+                "encode_p99_us": encode["p99_us"],
+                "decode_p50_us": decode["p50_us"],
+                "decode_p99_us": decode["p99_us"],
+            }
+            if reference is None:
+                reference = result
+            result["size_vs_json"] = len(data) / reference["wire_bytes"]
+            result["time_vs_json"] = (result["encode_p50_us"] + result["decode_p50_us"]) / max(
+                1e-9, reference["encode_p50_us"] + reference["decode_p50_us"]
+            )
+            results.append(result)
+    return results
+
+
+def _print_results(results: List[Dict[str, Any]]) -> None:
+    header = (
+        f"{'payload':<24}{'codec':<9}{'bytes':>10}{'size':>7}"
+        f"{'enc p50':>10}{'dec p50':>10}{'time':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['payload']:<24}{r['codec']:<9}{r['wire_bytes']:>10}{r['size_vs_json']:>7.2f}"
+            f"{r['encode_p50_us']:>8.1f}us{r['decode_p50_us']:>8.1f}us{r['time_vs_json']:>7.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare Mycelium message codecs.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--codec",
+        action="append",
+        choices=available_codecs(),
+        help="Codec to compare with JSON (repeatable; default all available).",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations, args.codec)
+    _print_results(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
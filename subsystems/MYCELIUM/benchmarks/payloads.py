@@ -0,0 +1,107 @@
+# subsystems/MYCELIUM/benchmarks/payloads.py
+
+"""Deterministic sample payloads shaped like typical Mycelium traffic.
+
+Each generator takes a size parameter and a seed, so benchmark runs are comparable:
+
+* ETHIK: validation requests and results (small, many string fields).
+* NEXUS: workspace analyses (per-file metrics and dependency lists; large).
+* CRONOS: backup listings (many similar file entries with sizes and timestamps; large).
+"""
+
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any, Callable, Dict, List
+
+_WORDS = (
+    "mycelium ethik nexus cronos koios atlas coruja harmony module config service "
+    "analysis backup validate request event status pipeline roadmap sync"
+).split()
+_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(count))
+
+
+def _path(rng: random.Random, depth: int = 3) -> str:
+    parts = ["subsystems", rng.choice(_WORDS).upper()]
+    parts += [rng.choice(_WORDS) for _ in range(depth)]
+    return "/".join(parts) + rng.choice((".py", ".md", ".json"))
+
+
+def ethik_validation(seed: int = 0) -> Dict[str, Any]:
+    """An ETHIK validation request and its result, as one payload."""
+    rng = random.Random(seed)
+    return {
+        "action_context": {
+            "action_type": "file_write",
+            "target_path": _path(rng),
+            "content": _words(rng, 60),
+            "affected_components": [rng.choice(_WORDS).upper() for _ in range(3)],
+            "source": "CORUJA",
+        },
+        "result": {
+            "is_valid": rng.random() > 0.2,
+            "action_taken": "allowed",
+            "severity": rng.choice(("low", "medium", "high")),
+            "score": round(rng.random(), 4),
+            "details": _words(rng, 20),
+            "rule_results": [
+                {"rule_id": f"rule-{i:03d}", "passed": rng.random() > 0.1, "score": rng.random()}
+                for i in range(12)
+            ],
+        },
+    }
+
+
+def nexus_analysis(files: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """A NEXUS workspace analysis covering `files` modules."""
+    rng = random.Random(seed)
+    modules: List[Dict[str, Any]] = []
+    for index in range(files):
+        modules.append(
+            {
+                "path": _path(rng, depth=2),
+                "lines": rng.randint(20, 2000),
+                "functions": rng.randint(0, 60),
+                "classes": rng.randint(0, 12),
+                "complexity": round(rng.uniform(1, 30), 2),
+                "imports": [_path(rng, depth=1) for _ in range(rng.randint(0, 8))],
+                "docstring_coverage": round(rng.random(), 3),
+                "index": index,
+            }
+        )
+    return {
+        "workspace": "EGOS",
+        "generated_at": _EPOCH.isoformat(),
+        "summary": {"files": files, "total_lines": sum(m["lines"] for m in modules)},
+        "modules": modules,
+    }
+
+
+def cronos_backup_listing(entries: int = 500, seed: int = 0) -> Dict[str, Any]:
+    """A CRONOS backup listing with `entries` files."""
+    rng = random.Random(seed)
+    return {
+        "backup_id": f"backup-{seed:06d}",
+        "created_at": _EPOCH.isoformat(),
+        "files": [
+            {
+                "path": _path(rng),
+                "size": rng.randint(100, 5_000_000),
+                "modified": (_EPOCH + timedelta(seconds=rng.randint(0, 10**7))).isoformat(),
+                "sha256": "%064x" % rng.getrandbits(256),
+                "compressed": rng.random() > 0.5,
+            }
+            for _ in range(entries)
+        ],
+    }
+
+
+# Name -> generator of the sample payloads used by the benchmarks
+SAMPLE_PAYLOADS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "ethik_validation": ethik_validation,
+    "nexus_analysis": nexus_analysis,
+    "cronos_backup_listing": cronos_backup_listing,
+}
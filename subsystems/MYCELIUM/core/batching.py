@@ -0,0 +1,182 @@
+# subsystems/MYCELIUM/core/batching.py
+
+"""Batched and coalesced publishing for high-rate Mycelium subjects.
+
+A batch is a regular envelope whose `metadata.batch` holds the number of messages and
+whose payload is `{"messages": [{"message_id", "timestamp", "payload"}, ...]}`. It is
+encoded (and compressed) once, and subscribers that know the format unpack it into
+one envelope per message, so their callbacks see the same envelopes as before.
+
+A CoalescingPublisher collects payloads published on configured subjects and sends
+them as one batch when a time window closes or the batch is full. With `latest_only`
+(for status topics) a newer payload replaces the pending one, per value of `key` if
+set, so only the latest value of each status is sent.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import uuid
+
+from .topic_router import subject_matches
+
+logger = logging.getLogger(__name__)
+
+BATCH_METADATA_KEY = "batch"
+DEFAULT_WINDOW = 0.05  # Seconds
+DEFAULT_MAX_BATCH = 100
+
+
+def batch_item(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a batch entry for a payload (with its own message ID and timestamp)."""
+    return {
+        "message_id": str(uuid.uuid4()),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+
+
+def is_batch(envelope: Dict[str, Any]) -> bool:
+    metadata = envelope.get("metadata")
+    return isinstance(metadata, dict) and bool(metadata.get(BATCH_METADATA_KEY))
+
+
+def unpack_batch(envelope: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Returns the envelopes carried by a batch envelope ([envelope] if it is not one).
+
+    Raises:
+        ValueError: If a batch envelope does not carry a list of messages.
+    """
+    if not is_batch(envelope):
+        return [envelope]
+    messages = envelope.get("payload", {}).get("messages")
+    if not isinstance(messages, list):
+        raise ValueError("Batch message without a 'messages' list.")
+    metadata = {k: v for k, v in envelope["metadata"].items() if k != BATCH_METADATA_KEY}
+    return [
+        dict(
+            envelope,
+            message_id=item.get("message_id", envelope.get("message_id")),
+            timestamp=item.get("timestamp", envelope.get("timestamp")),
+            payload=item.get("payload"),
+            metadata=dict(metadata),
+        )
+        for item in messages
+        if isinstance(item, dict)
+    ]
+
+
+class _Pending:
+    __slots__ = ("items", "timer")
+
+    def __init__(self):
+        # Pending batch entries; keyed for latest-value-wins subjects
+        self.items: Dict[Any, Dict[str, Any]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class CoalescingPublisher:
+    """Collects payloads per subject and sends them in batches.
+
+    Args:
+        send_batch: Coroutine sending a list of batch entries on a subject.
+        subjects: Subject pattern (wildcards allowed) -> settings:
+            `window` (seconds to wait for more payloads, default 0.05),
+            `max_batch` (payloads that trigger an immediate send, default 100),
+            `latest_only` (keep only the newest payload) and
+            `key` (with `latest_only`: payload field whose values are kept separately).
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[str, List[Dict[str, Any]]], Awaitable[None]],
+        subjects: Dict[str, Dict[str, Any]],
+    ):
+        self._send_batch = send_batch
+        self._subjects = subjects
+        self._settings: Dict[str, Optional[Dict[str, Any]]] = {}  # subject -> settings
+        self._pending: Dict[str, _Pending] = {}
+        self._flushes: Set[asyncio.Task] = set()  # Background flush tasks
+        self.published = 0  # Payloads accepted
+        self.sent = 0  # Batches sent
+        self.coalesced = 0  # Payloads replaced by newer ones (latest_only)
+
+    def settings_for(self, subject: str) -> Optional[Dict[str, Any]]:
+        """Returns the settings of the first pattern matching a subject, or None."""
+        if subject not in self._settings:
+            self._settings[subject] = next(
+                (
+                    settings
+                    for pattern, settings in self._subjects.items()
+                    if subject_matches(pattern, subject)
+                ),
+                None,
+            )
+        return self._settings[subject]
+
+    async def publish(self, subject: str, payload: Dict[str, Any]) -> bool:
+        """Queues a payload for batching.
+
+        Returns:
+            False if the subject is not coalesced (the caller should send it directly).
+        """
+        settings = self.settings_for(subject)
+        if settings is None:
+            return False
+        pending = self._pending.setdefault(subject, _Pending())
+        if settings.get("latest_only"):
+            key = payload.get(settings["key"]) if settings.get("key") else None
+            if key in pending.items:
+                self.coalesced += 1
+                del pending.items[key]  # Re-insert so the newest value is last
+        else:
+            key = self.published  # Unique per payload
+        pending.items[key] = batch_item(payload)
+        self.published += 1
+
+        if len(pending.items) >= settings.get("max_batch", DEFAULT_MAX_BATCH):
+            await self.flush(subject)
+        elif pending.timer is None:
+            pending.timer = asyncio.get_running_loop().call_later(
+                settings.get("window", DEFAULT_WINDOW), self._flush_later, subject
+            )
+        return True
+
+    def _flush_later(self, subject: str) -> None:
+        task = asyncio.create_task(self._flush_logged(subject), name=f"mycelium_flush_{subject}")
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_logged(self, subject: str) -> None:
+        try:
+            await self.flush(subject)
+        except Exception as e:
+            logger.error(f"Failed to publish batch on '{subject}': {e}", exc_info=True)
+
+    async def flush(self, subject: Optional[str] = None) -> None:
+        """Sends the pending payloads of a subject (of every subject if None) now."""
+        subjects = [subject] if subject is not None else list(self._pending)
+        for name in subjects:
+            pending = self._pending.pop(name, None)
+            if pending is None:
+                continue
+            if pending.timer is not None:
+                pending.timer.cancel()
+            if pending.items:
+                self.sent += 1
+                await self._send_batch(name, list(pending.items.values()))
+
+    async def close(self) -> None:
+        """Sends everything pending and waits for background sends to finish."""
+        await self.flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "batches_sent": self.sent,
+            "coalesced": self.coalesced,
+            "pending": {subject: len(p.items) for subject, p in self._pending.items()},
+        }
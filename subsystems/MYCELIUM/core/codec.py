@@ -0,0 +1,529 @@
+# subsystems/MYCELIUM/core/codec.py
+
+"""Message codecs for Mycelium envelopes.
+
+A codec turns an envelope dictionary into bytes and back. JSON is always available and
+stays the default: a JSON envelope is sent as plain UTF-8 JSON, exactly as before, so
+peers that know nothing about codecs keep working. Binary codecs (MessagePack, CBOR)
+are used when their library is installed; their envelopes are framed so a receiver can
+tell the content type before decoding:
+
+    b"\\x00MYC" | version (1 byte) | content-type length (1 byte) | content type | body
+
+Compressed envelopes (see compression.py), of any codec, use frame version 2, which
+adds the algorithm and the uncompressed length before the body:
+
+    ... | content type | algorithm length (1 byte) | algorithm | length (4 bytes) | body
+
+Split envelopes (frame version 3) encode the payload separately from the rest of the
+envelope (the header fields: IDs, source, metadata), so a receiver can route, filter
+or match correlation IDs after decoding only the small header:
+
+    ... | content type | header length (4 bytes) | header | algorithm length (1 byte) |
+    algorithm | length (4 bytes) | payload
+
+The payload is compressed on its own (an empty algorithm means uncompressed) and is
+only decompressed and decoded when a handler reads it (see LazyEnvelope).
+
+A JSON document never starts with a NUL byte, so framed and plain envelopes can share
+a subject. Peers negotiate by advertising the codecs they can decode (their `accept`
+list, in the envelope metadata of requests and responses); a sender picks the first of
+its own preferences that the peer accepts and falls back to JSON.
+"""
+
+from datetime import timezone
+import json
+import logging
+import struct
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import msgpack  # Optional: compact binary encoding
+
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+try:
+    import cbor2  # Optional: compact binary encoding
+
+    HAS_CBOR = True
+except ImportError:
+    HAS_CBOR = False
+
+from .compression import Compressor, decompress
+
+logger = logging.getLogger(__name__)
+
+JSON = "json"
+MSGPACK = "msgpack"
+CBOR = "cbor"
+
+FRAME_MAGIC = b"\x00MYC"
+FRAME_VERSION = 1
+FRAME_VERSION_COMPRESSED = 2  # Adds the compression algorithm and original length
+FRAME_VERSION_SPLIT = 3  # Header and payload encoded separately
+_FRAME_PREFIX = len(FRAME_MAGIC) + 2  # Magic, version and content-type length
+_ORIGINAL_LENGTH = struct.Struct(">I")
+
+
+class Codec:
+    """Encodes and decodes envelope dictionaries.
+
+    Args:
+        default: Called for objects the codec cannot encode natively (e.g. `str` to
+            send datetimes as text). Without it such objects raise ValueError.
+    """
+
+    name = ""
+    label = ""  # Human-readable format name for error messages
+    content_type = ""
+
+    def __init__(self, default: Optional[Callable[[Any], Any]] = None):
+        self.default = default
+
+    def encode(self, obj: Any) -> bytes:
+        """Encodes an object to bytes.
+
+        Raises:
+            ValueError: If the object cannot be serialized.
+        """
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        """Decodes bytes produced by `encode`.
+
+        Raises:
+            ValueError: If the data is not valid for this codec.
+        """
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """UTF-8 JSON (the fallback every peer understands)."""
+
+    name = JSON
+    label = "JSON"
+    content_type = "application/json"
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return json.dumps(obj, ensure_ascii=False, default=self.default).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Cannot serialize message to JSON: {e}") from e
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return json.loads(data.decode("utf-8"))
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Cannot decode message as UTF-8: {e}") from e
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Cannot deserialize message from JSON: {e}") from e
+
+
+class MsgPackCodec(Codec):
+    """MessagePack (requires the `msgpack` package)."""
+
+    name = MSGPACK
+    label = "MessagePack"
+    content_type = "application/msgpack"
+
+    def encode(self, obj: Any) -> bytes:
+        try:
+            return msgpack.packb(obj, default=self.default, use_bin_type=True)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Cannot serialize message to MessagePack: {e}") from e
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        except Exception as e:  # msgpack raises several unrelated exception types
+            raise ValueError(f"Cannot deserialize message from MessagePack: {e}") from e
+
+
+class CborCodec(Codec):
+    """CBOR (requires the `cbor2` package).
+
+    Datetimes are encoded natively (naive ones as UTC) and decode as datetimes, not
+    through `default`.
+    """
+
+    name = CBOR
+    label = "CBOR"
+    content_type = "application/cbor"
+
+    def encode(self, obj: Any) -> bytes:
+        default = None
+        if self.default is not None:
+            convert = self.default
+
+            def default(encoder, value):
+                encoder.encode(convert(value))
+
+        try:
+            return cbor2.dumps(obj, default=default, timezone=timezone.utc)
+        except (TypeError, ValueError, cbor2.CBOREncodeError) as e:
+            raise ValueError(f"Cannot serialize message to CBOR: {e}") from e
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return cbor2.loads(data)
+        except (ValueError, cbor2.CBORDecodeError) as e:
+            raise ValueError(f"Cannot deserialize message from CBOR: {e}") from e
+
+
+_CODEC_CLASSES: Dict[str, type] = {JSON: JsonCodec}
+if HAS_MSGPACK:
+    _CODEC_CLASSES[MSGPACK] = MsgPackCodec
+if HAS_CBOR:
+    _CODEC_CLASSES[CBOR] = CborCodec
+_BY_CONTENT_TYPE: Dict[str, str] = {cls.content_type: name for name, cls in _CODEC_CLASSES.items()}
+
+
+def available_codecs() -> List[str]:
+    """Returns the names of the codecs usable in this process (JSON first)."""
+    return list(_CODEC_CLASSES)
+
+
+def get_codec(name: str, default: Optional[Callable[[Any], Any]] = None) -> Codec:
+    """Returns a codec instance by name.
+
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed.
+    """
+    cls = _CODEC_CLASSES.get(name)
+    if cls is None:
+        raise ValueError(f"Codec '{name}' is not available (available: {available_codecs()})")
+    return cls(default)
+
+
+def resolve_preferences(names: Optional[Iterable[str]]) -> List[str]:
+    """Filters a codec preference list down to available codecs, ending with JSON.
+
+    Unavailable codecs are skipped with a warning, so a shared configuration can list
+    codecs that only some hosts have installed.
+    """
+    resolved: List[str] = []
+    for name in names or ():
+        if name in resolved:
+            continue
+        if name in _CODEC_CLASSES:
+            resolved.append(name)
+        else:
+            logger.warning(f"Codec '{name}' is not available here; skipping it.")
+    if JSON not in resolved:
+        resolved.append(JSON)
+    return resolved
+
+
+def negotiate(preferred: Sequence[str], accepted: Optional[Iterable[str]]) -> str:
+    """Returns the first preferred codec the peer accepts, or JSON.
+
+    Args:
+        preferred: Our codecs in order of preference.
+        accepted: Codecs the peer can decode (None if unknown).
+    """
+    if accepted:
+        accepted = set(accepted)
+        for name in preferred:
+            if name in accepted:
+                return name
+    return JSON
+
+
+def encode_envelope(
+    envelope: Any,
+    codec: Codec,
+    compressor: Optional[Compressor] = None,
+    topic: str = "",
+    split: bool = False,
+) -> bytes:
+    """Encodes an envelope; non-JSON codecs and compressed envelopes are framed.
+
+    Args:
+        envelope: The envelope to encode.
+        codec: The codec to encode it with.
+        compressor: Compresses large envelopes and records per-topic statistics.
+        topic: Topic the envelope is sent on (for the statistics).
+        split: Encode a dictionary with a `payload` as a split envelope (frame
+            version 3), whose receivers can decode the header alone.
+    """
+    if split and isinstance(envelope, dict) and "payload" in envelope:
+        return _encode_split(envelope, codec, compressor, topic)
+    body = codec.encode(envelope)
+    algorithm, data = compressor.compress(body, topic) if compressor else (None, body)
+    if algorithm is None and codec.name == JSON:
+        return body
+    content_type = codec.content_type.encode("ascii")
+    if algorithm is None:
+        return FRAME_MAGIC + bytes((FRAME_VERSION, len(content_type))) + content_type + body
+    encoding = algorithm.encode("ascii")
+    return b"".join(
+        (
+            FRAME_MAGIC,
+            bytes((FRAME_VERSION_COMPRESSED, len(content_type))),
+            content_type,
+            bytes((len(encoding),)),
+            encoding,
+            _ORIGINAL_LENGTH.pack(len(body)),
+            data,
+        )
+    )
+
+
+def _encode_split(
+    envelope: Dict[str, Any], codec: Codec, compressor: Optional[Compressor], topic: str
+) -> bytes:
+    header = codec.encode({key: value for key, value in envelope.items() if key != "payload"})
+    payload = codec.encode(envelope["payload"])
+    algorithm, data = compressor.compress(payload, topic) if compressor else (None, payload)
+    content_type = codec.content_type.encode("ascii")
+    encoding = (algorithm or "").encode("ascii")
+    return b"".join(
+        (
+            FRAME_MAGIC,
+            bytes((FRAME_VERSION_SPLIT, len(content_type))),
+            content_type,
+            _ORIGINAL_LENGTH.pack(len(header)),
+            header,
+            bytes((len(encoding),)),
+            encoding,
+            _ORIGINAL_LENGTH.pack(len(payload)),
+            data,
+        )
+    )
+
+
+class Frame(NamedTuple):
+    """Header fields and body of received envelope bytes."""
+
+    content_type: str
+    body: bytes  # Still compressed if `encoding` is set
+    encoding: Optional[str] = None  # Compression algorithm
+    original_length: int = 0  # Body length before compression
+    header: Optional[bytes] = None  # Split envelopes: the header; `body` is the payload
+
+
+def split_frame(data: bytes) -> Frame:
+    """Splits encoded envelope bytes into header fields and body.
+
+    Unframed data is uncompressed JSON.
+
+    Raises:
+        ValueError: If the frame is malformed or uses an unsupported frame version.
+    """
+    if not data.startswith(FRAME_MAGIC):
+        return Frame(JsonCodec.content_type, data)
+    if len(data) < _FRAME_PREFIX:
+        raise ValueError("Truncated Mycelium frame.")
+    version, length = data[len(FRAME_MAGIC)], data[len(FRAME_MAGIC) + 1]
+    if version not in (FRAME_VERSION, FRAME_VERSION_COMPRESSED, FRAME_VERSION_SPLIT):
+        raise ValueError(f"Unsupported Mycelium frame version {version}.")
+    end = _FRAME_PREFIX + length
+    if len(data) < end:
+        raise ValueError("Truncated Mycelium frame header.")
+    content_type = data[_FRAME_PREFIX:end].decode("ascii", errors="replace")
+    if version == FRAME_VERSION:
+        return Frame(content_type, data[end:])
+
+    header = None
+    if version == FRAME_VERSION_SPLIT:
+        if len(data) < end + _ORIGINAL_LENGTH.size:
+            raise ValueError("Truncated Mycelium frame header.")
+        (header_length,) = _ORIGINAL_LENGTH.unpack_from(data, end)
+        header_start = end + _ORIGINAL_LENGTH.size
+        end = header_start + header_length
+        header = data[header_start:end]
+        if len(header) < header_length:
+            raise ValueError("Truncated Mycelium frame header.")
+    if len(data) < end + 1:
+        raise ValueError("Truncated Mycelium frame header.")
+    encoding_end = end + 1 + data[end]
+    body_start = encoding_end + _ORIGINAL_LENGTH.size
+    if len(data) < body_start:
+        raise ValueError("Truncated Mycelium frame header.")
+    encoding = data[end + 1 : encoding_end].decode("ascii", errors="replace")
+    (original_length,) = _ORIGINAL_LENGTH.unpack_from(data, encoding_end)
+    return Frame(content_type, data[body_start:], encoding or None, original_length, header)
+
+
+def is_split_frame(data: bytes) -> bool:
+    """Returns whether bytes hold a split envelope (frame version 3)."""
+    return data[: len(FRAME_MAGIC) + 1] == FRAME_MAGIC + bytes((FRAME_VERSION_SPLIT,))
+
+
+_UNDECODED = object()  # Payload slot of a LazyEnvelope before the payload is decoded
+
+
+class LazyEnvelope(dict):
+    """An envelope dictionary whose payload is decoded when it is first read.
+
+    Header fields are available right away. Reading the payload (`envelope["payload"]`,
+    `get`, `items`, `values`, copying or comparing the envelope) decompresses and
+    decodes it once; a malformed payload raises ValueError at that point.
+    """
+
+    __slots__ = ("_decode_payload",)
+
+    def __init__(self, header: Dict[str, Any], decode_payload: Callable[[], Any]):
+        super().__init__(header)
+        dict.__setitem__(self, "payload", _UNDECODED)
+        self._decode_payload: Optional[Callable[[], Any]] = decode_payload
+
+    @property
+    def payload_decoded(self) -> bool:
+        return self._decode_payload is None
+
+    def _resolve(self) -> None:
+        if self._decode_payload is not None:
+            if dict.get(self, "payload") is _UNDECODED:
+                dict.__setitem__(self, "payload", self._decode_payload())
+            self._decode_payload = None
+
+    def __getitem__(self, key: Any) -> Any:
+        if key == "payload":
+            self._resolve()
+        return dict.__getitem__(self, key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key == "payload":
+            self._resolve()
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key == "payload":
+            self._decode_payload = None
+        dict.__setitem__(self, key, value)
+
+    def __iter__(self):
+        # Defining __iter__ makes dict(envelope) and {**envelope} read values through
+        # __getitem__, which decodes the payload
+        return dict.__iter__(self)
+
+    def _resolved(name):
+        method = getattr(dict, name)
+
+        def resolved(self, *args, **kwargs):
+            self._resolve()
+            return method(self, *args, **kwargs)
+
+        resolved.__name__ = name
+        return resolved
+
+    items = _resolved("items")
+    values = _resolved("values")
+    pop = _resolved("pop")
+    popitem = _resolved("popitem")
+    setdefault = _resolved("setdefault")
+    copy = _resolved("copy")
+    __repr__ = _resolved("__repr__")
+    __reduce_ex__ = _resolved("__reduce_ex__")
+    del _resolved
+
+    def __eq__(self, other: Any) -> bool:
+        self._resolve()
+        if isinstance(other, LazyEnvelope):
+            other._resolve()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+
+def decode_split_envelope(
+    data: bytes,
+    codecs: Optional[Dict[str, Codec]] = None,
+    compressor: Optional[Compressor] = None,
+    topic: str = "",
+) -> Tuple[LazyEnvelope, str]:
+    """Decodes the header of a split envelope; the payload is decoded when first read.
+
+    Returns:
+        The envelope and the name of the codec it was encoded with.
+
+    Raises:
+        ValueError: If the frame is malformed, its content type is not available or
+            the header does not decode to a dictionary.
+    """
+    frame = split_frame(data)
+    if frame.header is None:
+        raise ValueError("Not a split Mycelium envelope.")
+    name = _BY_CONTENT_TYPE.get(frame.content_type)
+    if name is None:
+        raise ValueError(f"Unsupported message content type '{frame.content_type}'.")
+    codec = (codecs.get(name) if codecs else None) or get_codec(name)
+    header = codec.decode(frame.header)
+    if not isinstance(header, dict):
+        raise ValueError("Split envelope header is not a dictionary.")
+
+    def decode_payload() -> Any:
+        if compressor is not None:
+            body = compressor.decompress(frame.body, frame.encoding, frame.original_length, topic)
+        elif frame.encoding is not None:
+            body = decompress(frame.body, frame.encoding, frame.original_length)
+        else:
+            body = frame.body
+        return codec.decode(body)
+
+    return LazyEnvelope(header, decode_payload), codec.name
+
+
+def frame_codec(
+    data: bytes,
+    codecs: Optional[Dict[str, Codec]] = None,
+    compressor: Optional[Compressor] = None,
+    topic: str = "",
+) -> Tuple[Codec, bytes]:
+    """Returns the codec that decodes envelope bytes, and the (decompressed) body.
+
+    Args:
+        data: The received bytes, plain JSON or framed.
+        codecs: Codec instances to use by name (default: new instances).
+        compressor: Decompression limits and per-topic statistics (default: limits
+            only).
+        topic: Topic the bytes were received on (for the statistics).
+
+    Raises:
+        ValueError: If the frame is malformed, its content type or compression is not
+            available, or the body does not decompress to its announced length. Split
+            envelopes have no single body; use decode_envelope() for them.
+    """
+    frame = split_frame(data)
+    if frame.header is not None:
+        raise ValueError("Split Mycelium envelopes must be decoded with decode_envelope().")
+    name = _BY_CONTENT_TYPE.get(frame.content_type)
+    if name is None:
+        raise ValueError(f"Unsupported message content type '{frame.content_type}'.")
+    codec = codecs.get(name) if codecs else None
+    if compressor is not None:
+        body = compressor.decompress(frame.body, frame.encoding, frame.original_length, topic)
+    elif frame.encoding is not None:
+        body = decompress(frame.body, frame.encoding, frame.original_length)
+    else:
+        body = frame.body
+    return (codec if codec is not None else get_codec(name)), body
+
+
+def decode_envelope(
+    data: bytes,
+    codecs: Optional[Dict[str, Codec]] = None,
+    compressor: Optional[Compressor] = None,
+    topic: str = "",
+) -> Tuple[Any, str]:
+    """Decodes envelope bytes, plain JSON or framed (see frame_codec() for the arguments).
+
+    Split envelopes are returned as LazyEnvelopes, whose payload is decoded on first read.
+
+    Returns:
+        The decoded envelope and the name of the codec it was encoded with.
+
+    Raises:
+        ValueError: If the content type is unknown or the body cannot be decoded.
+    """
+    if is_split_frame(data):
+        return decode_split_envelope(data, codecs, compressor, topic)
+    codec, body = frame_codec(data, codecs, compressor, topic)
+    return codec.decode(body), codec.name
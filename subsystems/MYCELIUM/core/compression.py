@@ -0,0 +1,238 @@
+# subsystems/MYCELIUM/core/compression.py
+
+"""Transparent compression of large Mycelium messages.
+
+When enabled, encoded envelopes larger than a threshold are compressed before they
+are sent; the frame header (see codec.py) records the algorithm and the original length, and the
+receiver decompresses before decoding. Messages that do not shrink by at least
+`min_savings` are sent as they are. The original length bounds decompression, so a
+corrupted or hostile frame cannot expand beyond what it announced (nor beyond
+`max_decompressed_bytes`).
+
+zlib and lzma are always available; zstd is used when the `zstandard` package is
+installed. Per-topic statistics (messages, compressed messages, bytes before and
+after) are kept for sent and received messages.
+
+Compression is off by default: compressed messages are binary frames, which peers
+predating the codec layer cannot decode. Enable it once every receiver can.
+"""
+
+from dataclasses import asdict, dataclass
+import lzma
+from typing import Any, Dict, List, Optional, Tuple
+import zlib
+
+try:
+    import zstandard  # Optional: faster compression
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+ZLIB = "zlib"
+LZMA = "lzma"
+ZSTD = "zstd"
+
+DEFAULT_THRESHOLD_BYTES = 64 * 1024
+DEFAULT_ALGORITHM = ZLIB
+DEFAULT_MIN_SAVINGS = 0.1  # Send uncompressed unless at least 10% smaller
+DEFAULT_MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_TOPICS = 1000  # Topics tracked individually; the rest share OTHER_TOPICS
+OTHER_TOPICS = "_other"
+
+
+def available_algorithms() -> List[str]:
+    """Returns the compression algorithms usable in this process."""
+    return [ZLIB, LZMA] + ([ZSTD] if HAS_ZSTD else [])
+
+
+def compress(data: bytes, algorithm: str = DEFAULT_ALGORITHM, level: Optional[int] = None) -> bytes:
+    """Compresses data with the given algorithm.
+
+    Raises:
+        ValueError: If the algorithm is not available.
+    """
+    if algorithm == ZLIB:
+        return zlib.compress(data, -1 if level is None else level)
+    if algorithm == LZMA:
+        return lzma.compress(data, preset=6 if level is None else level)
+    if algorithm == ZSTD and HAS_ZSTD:
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError(f"Compression algorithm '{algorithm}' is not available.")
+
+
+def decompress(
+    data: bytes,
+    algorithm: str,
+    original_length: int,
+    max_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+) -> bytes:
+    """Decompresses data that announced its original length.
+
+    Raises:
+        ValueError: If the algorithm is not available, the data is corrupt, or it does
+            not expand to exactly `original_length` bytes (at most `max_bytes`).
+    """
+    if original_length > max_bytes:
+        raise ValueError(
+            f"Compressed message expands to {original_length} bytes (limit {max_bytes})."
+        )
+    try:
+        if algorithm == ZLIB:
+            decompressor = zlib.decompressobj()
+            result = decompressor.decompress(data, original_length + 1)
+        elif algorithm == LZMA:
+            result = lzma.LZMADecompressor().decompress(data, max_length=original_length + 1)
+        elif algorithm == ZSTD and HAS_ZSTD:
+            result = zstandard.ZstdDecompressor().decompress(
+                data, max_output_size=original_length + 1
+            )
+        else:
+            raise ValueError(f"Compression algorithm '{algorithm}' is not available.")
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"Cannot decompress message ({algorithm}): {e}") from e
+    except Exception as e:
+        if HAS_ZSTD and isinstance(e, zstandard.ZstdError):
+            raise ValueError(f"Cannot decompress message ({algorithm}): {e}") from e
+        raise
+    if len(result) != original_length:
+        raise ValueError(
+            f"Decompressed message has {len(result)} bytes, expected {original_length}."
+        )
+    return result
+
+
+@dataclass
+class TopicCompressionStats:
+    """Message and byte counts of one topic."""
+
+    messages: int = 0
+    compressed: int = 0  # Messages that travelled compressed
+    original_bytes: int = 0  # Encoded size before compression
+    wire_bytes: int = 0  # Size on the wire (body only, without the frame header)
+
+    @property
+    def ratio(self) -> float:
+        """Wire bytes per original byte (1.0: nothing saved)."""
+        return self.wire_bytes / self.original_bytes if self.original_bytes else 1.0
+
+
+class CompressionStats:
+    """Per-topic compression counters with a bounded number of topics."""
+
+    def __init__(self, max_topics: int = DEFAULT_MAX_TOPICS):
+        self.max_topics = max_topics
+        self._topics: Dict[str, TopicCompressionStats] = {}
+
+    def record(self, topic: str, original_bytes: int, wire_bytes: int, compressed: bool) -> None:
+        """Counts one message."""
+        stats = self._topics.get(topic)
+        if stats is None:
+            if len(self._topics) >= self.max_topics:
+                topic = OTHER_TOPICS  # E.g. unique reply inboxes
+            stats = self._topics.setdefault(topic, TopicCompressionStats())
+        stats.messages += 1
+        stats.compressed += compressed
+        stats.original_bytes += original_bytes
+        stats.wire_bytes += wire_bytes
+
+    def get(self, topic: str) -> Optional[TopicCompressionStats]:
+        return self._topics.get(topic)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the counters and ratio of every topic."""
+        return {
+            topic: dict(asdict(stats), ratio=round(stats.ratio, 4))
+            for topic, stats in self._topics.items()
+        }
+
+
+class Compressor:
+    """Compression policy and statistics of one interface.
+
+    Args:
+        enabled: Compress outgoing messages (incoming ones are always decompressed);
+            only if every receiver decodes framed envelopes.
+        threshold_bytes: Encoded size from which messages are compressed.
+        algorithm: One of available_algorithms().
+        level: Algorithm-specific compression level (None: the algorithm's default).
+        min_savings: Fraction a message must shrink by to be sent compressed.
+        max_decompressed_bytes: Largest size an incoming message may expand to.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        threshold_bytes: int = DEFAULT_THRESHOLD_BYTES,
+        algorithm: str = DEFAULT_ALGORITHM,
+        level: Optional[int] = None,
+        min_savings: float = DEFAULT_MIN_SAVINGS,
+        max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+    ):
+        if algorithm not in available_algorithms():
+            raise ValueError(
+                f"Compression algorithm '{algorithm}' is not available "
+                f"(available: {available_algorithms()})"
+            )
+        self.enabled = enabled
+        self.threshold_bytes = threshold_bytes
+        self.algorithm = algorithm
+        self.level = level
+        self.min_savings = min_savings
+        self.max_decompressed_bytes = max_decompressed_bytes
+        self.sent = CompressionStats()
+        self.received = CompressionStats()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "Compressor":
+        """Builds a compressor from a `compression` config section (defaults if None)."""
+        config = config or {}
+        return cls(
+            enabled=config.get("enabled", False),
+            threshold_bytes=config.get("threshold_bytes", DEFAULT_THRESHOLD_BYTES),
+            algorithm=config.get("algorithm", DEFAULT_ALGORITHM),
+            level=config.get("level"),
+            min_savings=config.get("min_savings", DEFAULT_MIN_SAVINGS),
+            max_decompressed_bytes=config.get(
+                "max_decompressed_bytes", DEFAULT_MAX_DECOMPRESSED_BYTES
+            ),
+        )
+
+    def compress(self, data: bytes, topic: str = "") -> Tuple[Optional[str], bytes]:
+        """Compresses an outgoing message if it is large enough and compresses well.
+
+        Returns:
+            The algorithm used (None if the data is returned unchanged) and the data.
+        """
+        algorithm: Optional[str] = None
+        result = data
+        if self.enabled and len(data) >= self.threshold_bytes:
+            packed = compress(data, self.algorithm, self.level)
+            if len(packed) <= len(data) * (1 - self.min_savings):
+                algorithm, result = self.algorithm, packed
+        self.sent.record(topic, len(data), len(result), algorithm is not None)
+        return algorithm, result
+
+    def decompress(
+        self, data: bytes, algorithm: Optional[str], original_length: int, topic: str = ""
+    ) -> bytes:
+        """Restores an incoming message (unchanged if `algorithm` is None).
+
+        Raises:
+            ValueError: See decompress().
+        """
+        result = data
+        if algorithm is not None:
+            result = decompress(data, algorithm, original_length, self.max_decompressed_bytes)
+        self.received.record(topic, len(result), len(data), algorithm is not None)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns the policy and per-topic statistics of sent and received messages."""
+        return {
+            "enabled": self.enabled,
+            "algorithm": self.algorithm,
+            "threshold_bytes": self.threshold_bytes,
+            "sent": self.sent.snapshot(),
+            "received": self.received.snapshot(),
+        }
@@ -0,0 +1,394 @@
+# subsystems/MYCELIUM/core/connection_manager.py
+
+"""Process-wide shared NATS connection for co-located Mycelium interfaces.
+
+When several subsystems run in one process (e.g. ETHIK, KOIOS, NEXUS and CRONOS in a
+consolidated deployment), each of their Mycelium interfaces would otherwise open its
+own NATS connection, subscriptions and reply inbox. A NatsConnectionManager holds a
+single connection for all of them:
+
+* Each interface gets a SharedNatsClient, which offers the parts of the `nats.NATS`
+  API the interfaces use (publish, subscribe, request, flush, drain, close), so the
+  interfaces work the same over a shared or a private connection.
+* Subscriptions are reference-counted: one NATS subscription per subject (and queue
+  group) serves every local subscriber, and is removed with the last of them. A
+  queue-group message is handed to one local subscriber of the group.
+* Requests share one wildcard reply inbox; replies are routed to their waiting
+  request by the correlation token at the end of the reply subject.
+* The reconnect options and a coalesced flush are defined once, and connection
+  events are forwarded to every client.
+
+The connection opens with the first client and closes when the last one is released.
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import uuid
+
+import nats
+from nats.aio.msg import Msg
+from nats.errors import NoRespondersError, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+MessageCallback = Callable[[Msg], Awaitable[None]]
+EventCallback = Callable[..., Awaitable[None]]
+
+DEFAULT_CONNECT_OPTIONS = {
+    "connect_timeout": 10,
+    "reconnect_time_wait": 2,
+    "max_reconnect_attempts": 60,
+}
+NO_RESPONDERS_STATUS = "503"
+
+
+class SharedSubscription:
+    """A local subscriber of a shared NATS subscription."""
+
+    def __init__(self, client: "SharedNatsClient", subject: str, queue: str, callback):
+        self._client = client
+        self.subject = subject
+        self.queue = queue
+        self.callback: MessageCallback = callback
+
+    async def unsubscribe(self) -> None:
+        await self._client._manager._remove_subscriber(self)
+        self._client._subscriptions.discard(self)
+
+
+class _SharedNatsSubscription:
+    __slots__ = ("nats_subscription", "subscribers", "next_index")
+
+    def __init__(self):
+        self.nats_subscription: Any = None
+        self.subscribers: List[SharedSubscription] = []
+        self.next_index = itertools.count()  # Round robin over queue-group subscribers
+
+
+class SharedNatsClient:
+    """One interface's view of a shared connection (a stand-in for `nats.NATS`).
+
+    Closing or draining it removes its subscriptions and releases its reference to the
+    connection; the connection itself stays open for the other clients.
+    """
+
+    def __init__(self, manager: "NatsConnectionManager", name: str, callbacks: Dict[str, Any]):
+        self._manager = manager
+        self.name = name
+        self.callbacks = callbacks  # error_cb, disconnected_cb, reconnected_cb, closed_cb
+        self._subscriptions: set = set()
+        self._closed = False
+
+    @property
+    def is_connected(self) -> bool:
+        return not self._closed and self._manager.is_connected
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def connected_url(self):
+        return self._manager.nc.connected_url if self._manager.nc else None
+
+    @property
+    def status(self):
+        return self._manager.nc.status if self._manager.nc else None
+
+    def _check_open(self) -> None:
+        if self._closed or self._manager.nc is None:
+            raise nats.errors.ConnectionClosedError
+
+    async def publish(
+        self, subject: str, payload: bytes = b"", reply: str = "", headers: Optional[dict] = None
+    ) -> None:
+        self._check_open()
+        await self._manager.nc.publish(subject, payload, reply=reply, headers=headers)
+
+    async def subscribe(
+        self, subject: str, queue: str = "", cb: Optional[MessageCallback] = None, **kwargs
+    ) -> SharedSubscription:
+        """Subscribes `cb` to a subject (other `nats.NATS.subscribe` options are ignored)."""
+        self._check_open()
+        if cb is None:
+            raise ValueError("Shared subscriptions need a callback.")
+        subscription = SharedSubscription(self, subject, queue, cb)
+        await self._manager._add_subscriber(subscription)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    async def request(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        timeout: float = 0.5,
+        headers: Optional[dict] = None,
+    ) -> Msg:
+        self._check_open()
+        return await self._manager.request(subject, payload, timeout, headers)
+
+    async def flush(self, timeout: float = 2) -> None:
+        self._check_open()
+        await self._manager.flush(timeout)
+
+    async def drain(self) -> None:
+        """Removes this client's subscriptions, flushes and releases the connection."""
+        if self._closed:
+            return
+        for subscription in list(self._subscriptions):
+            await subscription.unsubscribe()
+        if self._manager.is_connected:
+            try:
+                await self._manager.flush()
+            except Exception as e:
+                logger.warning(f"[{self.name}] Flush before release failed: {e}")
+        await self.close()
+
+    async def close(self) -> None:
+        """Removes this client's subscriptions and releases the connection."""
+        if self._closed:
+            return
+        for subscription in list(self._subscriptions):
+            await subscription.unsubscribe()
+        self._closed = True
+        await self._manager._release(self)
+        closed_cb = self.callbacks.get("closed_cb")
+        if closed_cb:
+            await closed_cb()
+
+
+class NatsConnectionManager:
+    """Shares one NATS connection between the Mycelium interfaces of a process.
+
+    Args:
+        servers: NATS server URLs.
+        **options: `nats.connect` options (reconnect policy etc.), applied once for
+            all clients; the connection callbacks are set by the manager.
+    """
+
+    _shared: Dict[Tuple[str, ...], "NatsConnectionManager"] = {}
+
+    @classmethod
+    def shared(cls, servers: Sequence[str], **options) -> "NatsConnectionManager":
+        """Returns the process-wide manager for a set of servers (created on first use).
+
+        Options only apply when the manager is created.
+        """
+        key = tuple(servers)
+        manager = cls._shared.get(key)
+        if manager is None:
+            manager = cls._shared[key] = cls(servers, **options)
+        return manager
+
+    def __init__(self, servers: Sequence[str], **options):
+        self.servers = list(servers)
+        self.options = dict(DEFAULT_CONNECT_OPTIONS, **options)
+        self.nc: Optional[nats.NATS] = None
+        self._clients: List[SharedNatsClient] = []
+        self._lock = asyncio.Lock()
+        self._subscriptions: Dict[Tuple[str, str], _SharedNatsSubscription] = {}
+        self._inbox_prefix = ""
+        self._inbox_subscription: Any = None
+        self._pending: Dict[str, asyncio.Future] = {}  # correlation token -> reply
+        self._flush: Optional[asyncio.Future] = None  # Flush in progress
+
+    @property
+    def is_connected(self) -> bool:
+        return self.nc is not None and self.nc.is_connected
+
+    async def client(
+        self,
+        name: str = "",
+        error_cb: Optional[EventCallback] = None,
+        disconnected_cb: Optional[EventCallback] = None,
+        reconnected_cb: Optional[EventCallback] = None,
+        closed_cb: Optional[EventCallback] = None,
+    ) -> SharedNatsClient:
+        """Returns a new client of the shared connection, connecting if needed.
+
+        Raises:
+            Whatever `nats.connect` raises if the connection cannot be opened.
+        """
+        callbacks = {
+            "error_cb": error_cb,
+            "disconnected_cb": disconnected_cb,
+            "reconnected_cb": reconnected_cb,
+            "closed_cb": closed_cb,
+        }
+        async with self._lock:
+            if self.nc is None or self.nc.is_closed:
+                logger.info(f"Opening shared NATS connection to {self.servers}")
+                self.nc = await nats.connect(
+                    servers=self.servers,
+                    error_cb=self._error_cb,
+                    disconnected_cb=self._disconnected_cb,
+                    reconnected_cb=self._reconnected_cb,
+                    **self.options,
+                )
+                self._inbox_prefix = self.nc.new_inbox()
+                self._inbox_subscription = None
+            client = SharedNatsClient(self, name, callbacks)
+            self._clients.append(client)
+        logger.debug(f"Shared NATS connection now has {len(self._clients)} client(s)")
+        return client
+
+    async def _release(self, client: SharedNatsClient) -> None:
+        async with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+            if self._clients or self.nc is None:
+                return
+            nc, self.nc = self.nc, None
+            self._subscriptions.clear()
+            self._inbox_subscription = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(nats.errors.ConnectionClosedError())
+            self._pending.clear()
+        logger.info("Last client released; closing shared NATS connection.")
+        try:
+            await nc.drain()
+        except Exception as e:
+            logger.warning(f"Error draining shared NATS connection: {e}")
+        finally:
+            if not nc.is_closed:
+                await nc.close()
+
+    # --- Subscriptions --- #
+
+    async def _add_subscriber(self, subscription: SharedSubscription) -> None:
+        key = (subscription.subject, subscription.queue)
+        async with self._lock:
+            shared = self._subscriptions.get(key)
+            if shared is None:
+                shared = self._subscriptions[key] = _SharedNatsSubscription()
+                shared.nats_subscription = await self.nc.subscribe(
+                    subscription.subject, queue=subscription.queue, cb=self._dispatcher(key)
+                )
+                logger.debug(f"Opened shared subscription to '{subscription.subject}'")
+            shared.subscribers.append(subscription)
+
+    async def _remove_subscriber(self, subscription: SharedSubscription) -> None:
+        key = (subscription.subject, subscription.queue)
+        async with self._lock:
+            shared = self._subscriptions.get(key)
+            if shared is None or subscription not in shared.subscribers:
+                return
+            shared.subscribers.remove(subscription)
+            if shared.subscribers:
+                return
+            del self._subscriptions[key]
+        if self.is_connected:
+            await shared.nats_subscription.unsubscribe()
+            logger.debug(f"Closed shared subscription to '{subscription.subject}'")
+
+    def _dispatcher(self, key: Tuple[str, str]) -> MessageCallback:
+        async def dispatch(msg: Msg) -> None:
+            shared = self._subscriptions.get(key)
+            if shared is None or not shared.subscribers:
+                return
+            if key[1]:  # Queue group: the process got one copy for one subscriber
+                subscribers = [
+                    shared.subscribers[next(shared.next_index) % len(shared.subscribers)]
+                ]
+            else:
+                subscribers = list(shared.subscribers)
+            for subscriber in subscribers:
+                try:
+                    await subscriber.callback(msg)
+                except Exception as e:
+                    logger.error(
+                        f"Error in subscriber of '{msg.subject}' ({subscriber._client.name}): {e}",
+                        exc_info=True,
+                    )
+
+        return dispatch
+
+    # --- Requests --- #
+
+    async def request(
+        self, subject: str, payload: bytes, timeout: float, headers: Optional[dict] = None
+    ) -> Msg:
+        """Sends a request through the shared reply inbox and waits for the reply.
+
+        Raises:
+            nats.errors.TimeoutError: If no reply arrives in time.
+            nats.errors.NoRespondersError: If nobody is subscribed to the subject.
+        """
+        if self._inbox_subscription is None:
+            async with self._lock:
+                if self._inbox_subscription is None:
+                    self._inbox_subscription = await self.nc.subscribe(
+                        f"{self._inbox_prefix}.*", cb=self._handle_reply
+                    )
+        token = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._pending[token] = future
+        try:
+            await self.nc.publish(
+                subject, payload, reply=f"{self._inbox_prefix}.{token}", headers=headers
+            )
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError from None
+        finally:
+            self._pending.pop(token, None)
+
+    async def _handle_reply(self, msg: Msg) -> None:
+        token = msg.subject.rsplit(".", 1)[-1]
+        future = self._pending.get(token)
+        if future is None or future.done():
+            logger.debug(f"Discarding late or unknown reply on '{msg.subject}'")
+            return
+        if msg.headers and msg.headers.get("Status") == NO_RESPONDERS_STATUS and not msg.data:
+            future.set_exception(NoRespondersError())
+        else:
+            future.set_result(msg)
+
+    # --- Flush and connection events --- #
+
+    async def flush(self, timeout: float = 2) -> None:
+        """Flushes the connection; concurrent callers share one flush."""
+        if self._flush is None:
+            self._flush = asyncio.ensure_future(self.nc.flush(timeout))
+            self._flush.add_done_callback(self._flush_done)
+        await asyncio.shield(self._flush)
+
+    def _flush_done(self, future: asyncio.Future) -> None:
+        self._flush = None
+        if not future.cancelled():
+            future.exception()  # Observed by the waiting callers
+
+    async def _notify(self, name: str, *args) -> None:
+        for client in list(self._clients):
+            callback = client.callbacks.get(name)
+            if callback:
+                try:
+                    await callback(*args)
+                except Exception as e:
+                    logger.error(f"Error in {name} of {client.name}: {e}", exc_info=True)
+
+    async def _error_cb(self, e: Exception) -> None:
+        logger.error(f"Shared NATS connection error: {e}")
+        await self._notify("error_cb", e)
+
+    async def _disconnected_cb(self) -> None:
+        logger.warning("Shared NATS connection lost.")
+        await self._notify("disconnected_cb")
+
+    async def _reconnected_cb(self) -> None:
+        logger.info("Shared NATS connection re-established.")
+        await self._notify("reconnected_cb")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connected": self.is_connected,
+            "clients": [client.name for client in self._clients],
+            "subscriptions": {
+                subject + (f" [{queue}]" if queue else ""): len(shared.subscribers)
+                for (subject, queue), shared in self._subscriptions.items()
+            },
+            "pending_requests": len(self._pending),
+        }
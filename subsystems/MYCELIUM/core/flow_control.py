@@ -0,0 +1,223 @@
+# subsystems/MYCELIUM/core/flow_control.py
+
+"""Bounded, prioritized message queues and worker pools for the in-process network.
+
+A PriorityMessageQueue holds messages in one lane per message type. RESPONSE traffic
+is served before REQUESTs and REQUESTs before EVENTs, so replies that complete work
+already in progress are never stuck behind a burst of events. When the queue is full,
+its overflow policy decides what happens to a new message:
+
+* `block`: the producer waits until there is room (backpressure).
+* `drop_oldest`: the oldest message of the lowest-priority lane is dropped (the new
+  message itself if it has the lowest priority present).
+* `reject`: the new message is refused with QueueFullError.
+
+Forced puts (used for RESPONSE messages, which complete work that was already
+admitted) bypass the limit, so a full queue cannot starve waiting requesters.
+
+A WorkerPool drains a queue with a fixed number of tasks, which bounds how many
+handlers of one node run at the same time.
+"""
+
+import asyncio
+from collections import deque
+import logging
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .metrics import MeshMetrics
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_LANE = "RESPONSE"
+REQUEST_LANE = "REQUEST"
+EVENT_LANE = "EVENT"
+LANES = (RESPONSE_LANE, REQUEST_LANE, EVENT_LANE)  # Highest priority first
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_REJECT = "reject"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_REJECT)
+
+
+class QueueFullError(Exception):
+    """Raised when a message is refused by a full queue with the `reject` policy."""
+
+
+def lane_for(message_type: Optional[str]) -> str:
+    """Returns the lane of a message type (unknown types travel with EVENTs)."""
+    return message_type if message_type in LANES else EVENT_LANE
+
+
+class PriorityMessageQueue:
+    """Bounded queue with one FIFO lane per message type.
+
+    Args:
+        maxsize: Messages the queue holds across all lanes (0: unbounded).
+        overflow_policy: One of OVERFLOW_POLICIES.
+        name: Used in log and error messages.
+    """
+
+    def __init__(self, maxsize: int = 0, overflow_policy: str = OVERFLOW_BLOCK, name: str = ""):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}' (expected one of {OVERFLOW_POLICIES})"
+            )
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.name = name
+        self._lanes: Dict[str, Deque[Any]] = {lane: deque() for lane in LANES}
+        self._size = 0
+        self._lock = asyncio.Lock()
+        self._not_empty = asyncio.Condition(self._lock)
+        self._not_full = asyncio.Condition(self._lock)
+        self.dropped = 0
+        self.rejected = 0
+        self.high_water = 0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._size
+
+    def depths(self) -> Dict[str, int]:
+        """Returns the number of queued messages per lane."""
+        return {lane: len(items) for lane, items in self._lanes.items()}
+
+    async def put(self, item: Any, lane: str = EVENT_LANE, force: bool = False) -> Optional[Any]:
+        """Queues an item in a lane, applying the overflow policy if the queue is full.
+
+        Args:
+            item: The item to queue.
+            lane: One of LANES.
+            force: Queue the item even if the queue is full.
+
+        Returns:
+            The item dropped to make room (`drop_oldest`; possibly `item` itself), or None.
+
+        Raises:
+            QueueFullError: If the queue is full and the policy is `reject`.
+        """
+        async with self._lock:
+            dropped = None
+            if not force and self.full():
+                if self.overflow_policy == OVERFLOW_REJECT:
+                    self.rejected += 1
+                    raise QueueFullError(f"Queue '{self.name}' is full ({self.maxsize} messages).")
+                if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+                    dropped = self._drop_oldest(lane, item)
+                    if dropped is item:
+                        return dropped
+                else:
+                    while self.full():
+                        await self._not_full.wait()
+            self._lanes[lane].append(item)
+            self._size += 1
+            self.high_water = max(self.high_water, self._size)
+            self._not_empty.notify()
+            return dropped
+
+    def _drop_oldest(self, lane: str, item: Any) -> Any:
+        self.dropped += 1
+        for victim_lane in reversed(LANES):
+            if victim_lane == lane:
+                break  # Nothing queued has a lower priority than the new item
+            if self._lanes[victim_lane]:
+                self._size -= 1
+                return self._lanes[victim_lane].popleft()
+        if self._lanes[lane]:
+            self._size -= 1
+            return self._lanes[lane].popleft()
+        return item
+
+    async def get(self) -> Tuple[str, Any]:
+        """Waits for and returns the next (lane, item), highest-priority lane first."""
+        async with self._lock:
+            while not self._size:
+                await self._not_empty.wait()
+            for lane in LANES:
+                if self._lanes[lane]:
+                    self._size -= 1
+                    self._not_full.notify()
+                    return lane, self._lanes[lane].popleft()
+            raise AssertionError("Queue size and lanes out of sync")  # pragma: no cover
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._size,
+            "lanes": self.depths(),
+            "maxsize": self.maxsize,
+            "overflow_policy": self.overflow_policy,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+class WorkerPool:
+    """Runs `(handler, message)` items from a queue with bounded concurrency.
+
+    Args:
+        name: Used in task names and log messages.
+        queue: Queue of `(async handler, message)` items.
+        concurrency: Number of worker tasks (handlers running at the same time).
+        metrics: Records handler times (per message topic) and running handlers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        queue: PriorityMessageQueue,
+        concurrency: int = 1,
+        metrics: Optional[MeshMetrics] = None,
+    ):
+        self.name = name
+        self.queue = queue
+        self.concurrency = max(1, concurrency)
+        self.metrics = metrics
+        self.active = 0  # Handlers currently running
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not worker.done() for worker in self._workers)
+
+    def start(self) -> None:
+        """Starts the worker tasks (must be called from a running event loop)."""
+        if self.running:
+            return
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"mycelium_worker_{self.name}_{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancels the worker tasks; queued items stay in the queue."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _work(self) -> None:
+        while True:
+            _, (handler, message) = await self.queue.get()
+            self.active += 1
+            metrics = self.metrics
+            started = None
+            if metrics is not None:
+                metrics.enter("handlers")
+                started = metrics.start("handler")
+            try:
+                await handler(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in handler of {self.name}: {e}", exc_info=True)
+            finally:
+                self.active -= 1
+                if metrics is not None:
+                    metrics.leave("handlers")
+                    metrics.stop("handler", message.get("header", {}).get("topic", ""), started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.queue.get_stats(), active=self.active, concurrency=self.concurrency)
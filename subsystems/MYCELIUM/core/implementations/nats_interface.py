@@ -1,16 +1,44 @@
 """NATS implementation of the MyceliumInterface."""
 
 from datetime import datetime, timezone
-import json
 import logging
-from typing import Any, Callable, Coroutine, Dict, Optional
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Sequence
 import uuid
 
 import nats
 from nats.aio.msg import Msg
 from nats.errors import ConnectionClosedError, NoServersError, TimeoutError
 
+from subsystems.MYCELIUM.core.batching import (
+    BATCH_METADATA_KEY,
+    CoalescingPublisher,
+    batch_item,
+    unpack_batch,
+)
+from subsystems.MYCELIUM.core.codec import (
+    JSON,
+    available_codecs,
+    decode_split_envelope,
+    encode_envelope,
+    frame_codec,
+    get_codec,
+    is_split_frame,
+    negotiate,
+    resolve_preferences,
+)
+from subsystems.MYCELIUM.core.compression import Compressor
+from subsystems.MYCELIUM.core.connection_manager import NatsConnectionManager, SharedSubscription
 from subsystems.MYCELIUM.core.interface import MyceliumInterface
+from subsystems.MYCELIUM.core.local_broker import LocalSubscription
+from subsystems.MYCELIUM.core.metrics import (
+    DEFAULT_INTERVAL,
+    IN,
+    METRICS_SUBJECT_PREFIX,
+    OUT,
+    MeshMetrics,
+    MetricsReporter,
+)
+from subsystems.MYCELIUM.core.single_flight import SingleFlight, request_key
 
 # Placeholder logger until KoiosLogger is integrated
 logger = logging.getLogger(__name__)
@@ -19,55 +47,153 @@ logger = logging.getLogger(__name__)
 class NatsMyceliumInterface(MyceliumInterface):
     """Provides interaction with the Mycelium Network using NATS."""
 
-    def __init__(self, source_subsystem: str):
+    def __init__(
+        self,
+        source_subsystem: str,
+        codecs: Optional[Sequence[str]] = None,
+        publish_codec: str = JSON,
+        compression: Optional[Dict[str, Any]] = None,
+        coalescing: Optional[Dict[str, Dict[str, Any]]] = None,
+        single_flight: Optional[Sequence[str]] = None,
+        shared_connection: bool = False,
+        metrics: Optional[Dict[str, Any]] = None,
+        split_envelope: bool = False,
+    ):
         """Initialize the interface.
 
         Args:
             source_subsystem: The name of the subsystem this instance represents.
                               Used for the 'source_subsystem' field in messages.
+            codecs: Codecs to send requests with, in order of preference (e.g.
+                    ['msgpack', 'json']). A request uses the first one the responders
+                    on its subject have advertised, and JSON until they have.
+            publish_codec: Codec for published messages, which have no single peer to
+                    negotiate with; only set it if every subscriber can decode it.
+            compression: Compression settings for large messages (see
+                    Compressor.from_config; off by default, as receivers must decode
+                    framed envelopes). E.g. {'enabled': True} compresses messages
+                    above 64 KiB.
+            coalescing: Subject pattern -> batching settings (see CoalescingPublisher).
+                    Payloads published on these subjects are sent in batches, e.g.
+                    {'egos.metrics.>': {'window': 0.1}, 'egos.*.status':
+                    {'latest_only': True, 'key': 'node_id'}}.
+            single_flight: Subject patterns whose identical concurrent requests share
+                    one outstanding call (see single_flight.py); only for requests
+                    without side effects.
+            shared_connection: Use the process-wide connection to the servers given to
+                    connect() (see connection_manager.py) instead of a private one.
+            metrics: Instrumentation settings (see metrics.py): `sample_every`,
+                    `max_topics` and `interval`, the seconds between snapshots published
+                    on 'egos.metrics.MYCELIUM.<source_subsystem>' while connected
+                    (default 60, 0 to disable).
+            split_envelope: Send split envelopes (see codec.py), whose receivers decode
+                    the payload only when a callback reads it; only enable it if every
+                    subscriber runs a version that decodes them.
         """
         self._nc: Optional[nats.NATS] = None
         self._subscriptions: Dict[str, Any] = {}
         self._source_subsystem = source_subsystem  # Store the subsystem name
+        # Every available codec is decodable; preferences only govern what we send
+        self._codecs = {name: get_codec(name) for name in available_codecs()}
+        self._codec_preferences: List[str] = resolve_preferences(codecs)
+        self._publish_codec = resolve_preferences([publish_codec])[0]
+        self._subject_codecs: Dict[str, List[str]] = {}  # subject -> codecs its peer accepts
+        self._compressor = Compressor.from_config(compression)
+        self._coalescer = CoalescingPublisher(self._send_batch, coalescing) if coalescing else None
+        self._single_flight = SingleFlight(single_flight)
+        self._shared_connection = shared_connection
+        self._split_envelope = split_envelope
+        self._metrics = MeshMetrics.from_config(metrics)
+        interval = (metrics or {}).get("interval", DEFAULT_INTERVAL)
+        self._metrics_reporter = (
+            MetricsReporter(
+                self._metrics,
+                self.publish,
+                f"{METRICS_SUBJECT_PREFIX}.{source_subsystem}",
+                interval,
+            )
+            if interval
+            else None
+        )
         logger.info(f"NatsMyceliumInterface initialized for {self._source_subsystem}.")
 
-    def _wrap_payload(self, payload: Dict[str, Any], correlation_id: Optional[str] = None) -> bytes:
-        """Wraps the user payload dictionary in the standard message envelope and serializes to JSON bytes."""
+    def _wrap_payload(
+        self,
+        payload: Dict[str, Any],
+        correlation_id: Optional[str] = None,
+        codec: str = JSON,
+        subject: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """Wraps the user payload dictionary in the standard message envelope and serializes it.
+
+        Requests (messages with a correlation ID) advertise the codecs we can decode, so
+        the responder can answer in one of them.
+        """
         message = {
             "message_id": str(uuid.uuid4()),
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "source_subsystem": self._source_subsystem,
             "correlation_id": correlation_id,
             "payload": payload,
-            "metadata": {},
+            "metadata": {"accept": list(self._codecs)} if correlation_id else {},
         }
+        if metadata:
+            message["metadata"].update(metadata)
+        encoder = self._codecs[codec]
+        started = self._metrics.start("encode")
         try:
-            return json.dumps(message, ensure_ascii=False).encode("utf-8")
-        except TypeError as e:
+            data = encode_envelope(
+                message, encoder, self._compressor, subject, split=self._split_envelope
+            )
+        except ValueError as e:
             logger.error(f"Payload serialization error: {e}. Payload: {payload}", exc_info=True)
-            raise ValueError(f"Cannot serialize payload to JSON: {e}") from e
+            raise ValueError(
+                f"Cannot serialize payload to {encoder.label}: {e.__cause__ or e}"
+            ) from e
+        self._metrics.stop("encode", subject, started)
+        return data
 
-    def _unwrap_payload(self, raw_payload: bytes) -> Dict[str, Any]:
-        """Deserializes the JSON bytes envelope and returns the core user payload dictionary."""
+    def _unwrap_payload(self, raw_payload: bytes, subject: str = "") -> Dict[str, Any]:
+        """Deserializes an envelope (JSON or a framed, possibly compressed, codec) and returns it.
+
+        Of a split envelope only the header is decoded here; its payload is decoded when
+        first read (see codec.LazyEnvelope).
+        """
+        started = self._metrics.start("decode")
+        if is_split_frame(raw_payload):
+            try:
+                envelope, _ = decode_split_envelope(
+                    raw_payload, self._codecs, self._compressor, subject
+                )
+            except ValueError as e:
+                logger.error(f"Cannot decode message header: {e}. Raw data: {raw_payload[:200]}...")
+                raise
+        else:
+            envelope = self._decode_whole(raw_payload, subject)
+        self._metrics.stop("decode", subject, started)
+        # TODO: Add validation against a schema if needed
+        if isinstance(envelope, dict) and "payload" in envelope:
+            return envelope  # Return the whole envelope for now, callback decides what to use
+        logger.error(f"Invalid message structure received: {envelope}")
+        raise ValueError("Received message missing 'payload' field or is not a dictionary.")
+
+    def _decode_whole(self, raw_payload: bytes, subject: str) -> Any:
         try:
-            envelope = json.loads(raw_payload.decode("utf-8"))
-            # TODO: Add validation against a schema if needed
-            if isinstance(envelope, dict) and "payload" in envelope:
-                return envelope  # Return the whole envelope for now, callback decides what to use
-            else:
-                logger.error(f"Invalid message structure received: {envelope}")
-                raise ValueError("Received message missing 'payload' field or is not a dictionary.")
-        except json.JSONDecodeError as e:
+            decoder, body = frame_codec(raw_payload, self._codecs, self._compressor, subject)
+        except ValueError as e:
+            logger.error(f"Unsupported message frame: {e}. Raw data: {raw_payload[:200]}...")
+            raise
+        try:
+            return decoder.decode(body)
+        except ValueError as e:
             logger.error(
                 f"Payload deserialization error: {e}. Raw data: {raw_payload[:200]}...",
                 exc_info=True,
             )
-            raise ValueError("Cannot deserialize received message from JSON") from e
-        except UnicodeDecodeError as e:
-            logger.error(
-                f"Payload decoding error: {e}. Raw data: {raw_payload[:200]}...", exc_info=True
-            )
-            raise ValueError("Cannot decode received message as UTF-8") from e
+            if isinstance(e.__cause__, UnicodeDecodeError):
+                raise ValueError("Cannot decode received message as UTF-8") from e
+            raise ValueError(f"Cannot deserialize received message from {decoder.label}") from e
 
     async def connect(self, servers: list[str], **kwargs) -> None:
         """Connects to the NATS server(s)."""
@@ -77,7 +203,14 @@ class NatsMyceliumInterface(MyceliumInterface):
 
         logger.info(f"[{self._source_subsystem}] Connecting to NATS servers: {servers}")
         try:
-            self._nc = await nats.connect(servers=servers, **kwargs)
+            if self._shared_connection:
+                # kwargs only take effect for the first interface on these servers
+                manager = NatsConnectionManager.shared(servers, **kwargs)
+                self._nc = await manager.client(self._source_subsystem)
+            else:
+                self._nc = await nats.connect(servers=servers, **kwargs)
+            if self._metrics_reporter:
+                self._metrics_reporter.start()
             logger.info(
                 f"[{self._source_subsystem}] Successfully connected to NATS: {self._nc.connected_url.netloc if self._nc.connected_url else 'N/A'}"
             )
@@ -100,6 +233,10 @@ class NatsMyceliumInterface(MyceliumInterface):
         if self._nc and self._nc.is_connected:
             logger.info(f"[{self._source_subsystem}] Disconnecting from NATS...")
             try:
+                if self._metrics_reporter:
+                    await self._metrics_reporter.stop()
+                if self._coalescer:
+                    await self._coalescer.close()  # Send pending batches first
                 await self._nc.close()
                 logger.info(f"[{self._source_subsystem}] Successfully disconnected from NATS.")
             except Exception as e:
@@ -123,12 +260,59 @@ class NatsMyceliumInterface(MyceliumInterface):
             )
             raise ConnectionError("Not connected to NATS")
 
+        if self._coalescer and not kwargs and await self._coalescer.publish(subject, payload):
+            return  # Sent with the subject's next batch
+        await self._publish_wrapped(subject, payload, **kwargs)
+
+    async def publish_batch(self, subject: str, payloads: List[Dict[str, Any]], **kwargs) -> None:
+        """Publishes several payloads to a subject as one message.
+
+        Subscribers of this interface receive one envelope per payload. A single
+        payload is published as a regular message.
+        """
+        if not self._nc or not self._nc.is_connected:
+            logger.error(
+                f"[{self._source_subsystem}] Cannot publish to {subject}: Not connected to NATS."
+            )
+            raise ConnectionError("Not connected to NATS")
+        if len(payloads) == 1:
+            await self._publish_wrapped(subject, payloads[0], **kwargs)
+        elif payloads:
+            await self._send_batch(subject, [batch_item(payload) for payload in payloads], **kwargs)
+
+    async def flush(self) -> None:
+        """Sends the payloads waiting in coalesced subjects' batches now."""
+        if self._coalescer:
+            await self._coalescer.flush()
+
+    async def _send_batch(self, subject: str, items: List[Dict[str, Any]], **kwargs) -> None:
+        """Publishes batch entries (see batching.batch_item) as one batch envelope."""
+        if not self._nc or not self._nc.is_connected:
+            raise ConnectionError("Not connected to NATS")
+        if len(items) == 1:  # Readable by subscribers that do not unpack batches
+            await self._publish_wrapped(subject, items[0]["payload"], **kwargs)
+            return
+        await self._publish_wrapped(
+            subject, {"messages": items}, metadata={BATCH_METADATA_KEY: len(items)}, **kwargs
+        )
+
+    async def _publish_wrapped(
+        self,
+        subject: str,
+        payload: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> None:
         try:
-            wrapped_payload = self._wrap_payload(payload)
+            wrapped_payload = self._wrap_payload(
+                payload, codec=self._publish_codec, subject=subject, metadata=metadata
+            )
             logger.debug(
                 f"[{self._source_subsystem}] Publishing {len(wrapped_payload)} bytes to subject '{subject}'"
             )
             await self._nc.publish(subject, wrapped_payload, **kwargs)
+            batch = bool(metadata and metadata.get(BATCH_METADATA_KEY))
+            self._metrics.count(subject, "BATCH" if batch else "EVENT", OUT)
         except ConnectionClosedError:
             logger.error(
                 f"[{self._source_subsystem}] Cannot publish to {subject}: Connection closed."
@@ -163,24 +347,36 @@ class NatsMyceliumInterface(MyceliumInterface):
 
         async def message_handler(msg: Msg):
             # Receives NATS message, unwraps payload, calls user callback
+            self._metrics.count(msg.subject, "EVENT", IN)
+            self._metrics.enter("handlers")
+            started = self._metrics.start("handler")
             try:
-                # Pass the entire deserialized envelope to the callback
-                envelope = self._unwrap_payload(msg.data)
+                # Pass the entire deserialized envelope to the callback (once per
+                # message of a batch)
+                envelopes = unpack_batch(self._unwrap_payload(msg.data, subject))
                 logger.debug(
-                    f"[{self._source_subsystem}] Received message on '{subject}', invoking callback."
+                    f"[{self._source_subsystem}] Received {len(envelopes)} message(s) "
+                    f"on '{subject}', invoking callback."
                 )
-                await callback(envelope)
+                # A failing callback must not drop the rest of the batch
+                for envelope in envelopes:
+                    try:
+                        await callback(envelope)
+                    except Exception as e:
+                        logger.error(
+                            f"[{self._source_subsystem}] Error in callback for subject "
+                            f"'{subject}': {e}",
+                            exc_info=True,
+                        )
+                        # Decide how to handle callback errors
             except ValueError as e:  # Catch deserialization/unwrap errors
                 logger.error(
                     f"[{self._source_subsystem}] Cannot process message on '{subject}': {e}"
                 )
                 # Optionally, send to an error queue or take other action
-            except Exception as e:
-                logger.error(
-                    f"[{self._source_subsystem}] Error in callback for subject '{subject}': {e}",
-                    exc_info=True,
-                )
-                # Decide how to handle callback errors
+            finally:
+                self._metrics.leave("handlers")
+                self._metrics.stop("handler", msg.subject, started)
 
         try:
             logger.info(f"[{self._source_subsystem}] Subscribing to NATS subject: '{subject}'")
@@ -209,7 +405,9 @@ class NatsMyceliumInterface(MyceliumInterface):
             return
 
         sub = self._subscriptions.pop(subscription_id)  # Remove and get NATS sub object
-        if not isinstance(sub, nats.aio.subscription.Subscription):
+        if not isinstance(
+            sub, (nats.aio.subscription.Subscription, SharedSubscription, LocalSubscription)
+        ):
             logger.error(
                 f"[{self._source_subsystem}] Invalid object found for subscription id: {subscription_id}"
             )
@@ -239,17 +437,38 @@ class NatsMyceliumInterface(MyceliumInterface):
     async def request(
         self, subject: str, payload: Dict[str, Any], timeout: float = 1.0, **kwargs
     ) -> Dict[str, Any]:
-        """Sends a request dictionary via NATS and returns the response dictionary envelope."""
+        """Sends a request dictionary via NATS and returns the response dictionary envelope.
+
+        On single-flight subjects, a request equal to one already waiting for its
+        response shares that response instead of being sent again.
+        """
         if not self._nc or not self._nc.is_connected:
             logger.error(
                 f"[{self._source_subsystem}] Cannot send request to {subject}: Not connected to NATS."
             )
             raise ConnectionError("Not connected to NATS")
 
+        if self._single_flight.pattern_for(subject) is not None and not kwargs:
+            return await self._single_flight.run(
+                subject,
+                request_key(subject, payload),
+                lambda: self._request(subject, payload, timeout),
+            )
+        return await self._request(subject, payload, timeout, **kwargs)
+
+    async def _request(
+        self, subject: str, payload: Dict[str, Any], timeout: float, **kwargs
+    ) -> Dict[str, Any]:
         # Use message's UUID as correlation ID for simplicity
         correlation_id = str(uuid.uuid4())
+        codec = negotiate(self._codec_preferences, self._subject_codecs.get(subject))
+        self._metrics.count(subject, "REQUEST", OUT)
+        self._metrics.enter("requests")
+        started = self._metrics.start("rtt")
         try:
-            wrapped_payload = self._wrap_payload(payload, correlation_id=correlation_id)
+            wrapped_payload = self._wrap_payload(
+                payload, correlation_id=correlation_id, codec=codec, subject=subject
+            )
             logger.debug(
                 f"[{self._source_subsystem}] Sending request ({len(wrapped_payload)} bytes) to '{subject}' with timeout {timeout}s (CorrID: {correlation_id})"
             )
@@ -259,7 +478,9 @@ class NatsMyceliumInterface(MyceliumInterface):
             logger.debug(
                 f"[{self._source_subsystem}] Received response for request to '{subject}' (CorrID: {correlation_id})"
             )
-            response_envelope = self._unwrap_payload(response_msg.data)
+            self._metrics.count(subject, "RESPONSE", IN)
+            response_envelope = self._unwrap_payload(response_msg.data, subject)
+            self._learn_codecs(subject, response_envelope)
             # Optional: Check correlation ID match if needed, though NATS handles request-reply correlation
             # if response_envelope.get("correlation_id") != correlation_id:
             #    logger.error("Correlation ID mismatch!") # Handle error
@@ -292,3 +513,29 @@ class NatsMyceliumInterface(MyceliumInterface):
                 f"[{self._source_subsystem}] Error during request to {subject}: {e}", exc_info=True
             )
             raise
+        finally:
+            self._metrics.leave("requests")
+            self._metrics.stop("rtt", subject, started)
+
+    def _learn_codecs(self, subject: str, envelope: Dict[str, Any]) -> None:
+        """Remembers the codecs the responder on a subject advertised in its reply."""
+        metadata = envelope.get("metadata")
+        accept = metadata.get("accept") if isinstance(metadata, dict) else None
+        if isinstance(accept, list):
+            self._subject_codecs[subject] = [name for name in accept if isinstance(name, str)]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns message counters, in-flight counts and sampled latencies (see metrics.py)."""
+        return self._metrics.snapshot()
+
+    def get_single_flight_stats(self) -> Dict[str, Any]:
+        """Returns requests and shared (coalesced) requests per single-flight subject."""
+        return self._single_flight.get_stats()
+
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Returns counts of coalesced payloads and sent batches (empty without coalescing)."""
+        return self._coalescer.get_stats() if self._coalescer else {}
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """Returns the compression settings and per-subject ratios of sent and received messages."""
+        return self._compressor.get_stats()
@@ -0,0 +1,400 @@
+# subsystems/MYCELIUM/core/local_broker.py
+
+"""In-process stand-in for a NATS server, for tests, load tests and benchmarks.
+
+A LocalNatsBroker routes messages between LocalNatsClient connections in the same
+event loop, with the subject semantics the Mycelium interfaces rely on:
+
+* `*` and `>` wildcards (matched with the topic trie of topic_router.py);
+* queue groups (each message goes to one member of each group, round robin);
+* request/reply through inbox subjects, with timeouts (nats.errors.TimeoutError)
+  and no-responders errors (nats.errors.NoRespondersError);
+* per-subscription delivery in order, with slow-consumer limits: messages beyond
+  `pending_msgs_limit` / `pending_bytes_limit` are dropped and the client's
+  `error_cb` receives a nats.errors.SlowConsumerError;
+* the server's maximum payload size (nats.errors.MaxPayloadError).
+
+LocalNatsClient offers the parts of the `nats.NATS` API the interfaces use, and
+`LocalNatsBroker.install()` replaces `nats.connect` for a block of code, so both
+NatsMyceliumInterface implementations run against the broker unchanged:
+
+    broker = LocalNatsBroker()
+    with broker.install():
+        await interface.connect(["nats://local"])
+
+Persistence (JetStream), authentication and clustering are not simulated.
+"""
+
+import asyncio
+from collections import deque
+import contextlib
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlparse
+import uuid
+
+import nats
+from nats.aio.msg import Msg
+from nats.errors import (
+    BadSubjectError,
+    ConnectionClosedError,
+    MaxPayloadError,
+    NoRespondersError,
+    SlowConsumerError,
+    TimeoutError,
+)
+
+from .topic_router import SubscriptionIndex, validate_pattern
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PENDING_MSGS_LIMIT = 65536  # Same defaults as nats-py subscriptions
+DEFAULT_PENDING_BYTES_LIMIT = 64 * 1024 * 1024
+DEFAULT_MAX_PAYLOAD = 1024 * 1024  # Default max_payload of nats-server
+
+
+class LocalSubscription:
+    """A subscription of a LocalNatsClient, delivering messages in order."""
+
+    def __init__(
+        self,
+        client: "LocalNatsClient",
+        sid: int,
+        subject: str,
+        queue: str,
+        callback: Optional[Callable[[Msg], Awaitable[None]]],
+        pending_msgs_limit: int,
+        pending_bytes_limit: int,
+    ):
+        self._client = client
+        self._id = sid
+        self.subject = subject
+        self.queue = queue
+        self._callback = callback
+        self.pending_msgs_limit = pending_msgs_limit
+        self.pending_bytes_limit = pending_bytes_limit
+        self._pending: Deque[Msg] = deque()
+        self.pending_bytes = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        if callback is not None:
+            self._task = asyncio.create_task(self._deliver(), name=f"local_nats_sub_{sid}")
+
+    @property
+    def pending_msgs(self) -> int:
+        return len(self._pending)
+
+    def _enqueue(self, msg: Msg) -> bool:
+        """Queues a message; returns False if it was dropped as a slow consumer."""
+        if (
+            len(self._pending) >= self.pending_msgs_limit
+            or self.pending_bytes + len(msg.data) > self.pending_bytes_limit
+        ):
+            self.dropped += 1
+            return False
+        self._pending.append(msg)
+        self.pending_bytes += len(msg.data)
+        self._ready.set()
+        return True
+
+    def _pop(self) -> Msg:
+        msg = self._pending.popleft()
+        self.pending_bytes -= len(msg.data)
+        if not self._pending:
+            self._ready.clear()
+        return msg
+
+    async def _deliver(self) -> None:
+        while True:
+            await self._ready.wait()
+            msg = self._pop()
+            self.delivered += 1
+            try:
+                await self._callback(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in subscriber of '{msg.subject}': {e}", exc_info=True)
+                await self._client._report_error(e)
+
+    async def next_msg(self, timeout: float = 1.0) -> Msg:
+        """Returns the next message of a subscription without callback."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError from None
+        self.delivered += 1
+        return self._pop()
+
+    async def drain(self) -> None:
+        """Stops receiving and waits until the pending messages are delivered."""
+        self._client._broker._remove(self)
+        while self._pending and self._task is not None:
+            await asyncio.sleep(0)
+        await self._stop()
+
+    async def unsubscribe(self, limit: int = 0) -> None:
+        self._client._broker._remove(self)
+        await self._stop()
+
+    async def _stop(self) -> None:
+        self._client._subscriptions.pop(self._id, None)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+class LocalNatsClient:
+    """A connection to a LocalNatsBroker (a stand-in for `nats.NATS`)."""
+
+    def __init__(self, broker: "LocalNatsBroker", servers: Sequence[str], options: Dict[str, Any]):
+        self._broker = broker
+        self.options = options
+        self.name = options.get("name") or ""
+        self.client_id = next(broker._client_ids)
+        self.connected_url = urlparse(servers[0] if servers else "nats://local:4222")
+        self._subscriptions: Dict[int, LocalSubscription] = {}
+        self._closed = False
+        self._resp_prefix = ""
+        self._resp_sub: Optional[LocalSubscription] = None
+        self._resp_map: Dict[str, asyncio.Future] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        return not self._closed
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    @property
+    def status(self) -> str:
+        return "CLOSED" if self._closed else "CONNECTED"
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ConnectionClosedError
+
+    def new_inbox(self) -> str:
+        return f"_INBOX.{uuid.uuid4().hex}"
+
+    async def publish(
+        self, subject: str, payload: bytes = b"", reply: str = "", headers: Optional[dict] = None
+    ) -> None:
+        self._check_open()
+        self._broker._route(subject, payload, reply, headers)
+
+    async def subscribe(
+        self,
+        subject: str,
+        queue: str = "",
+        cb: Optional[Callable[[Msg], Awaitable[None]]] = None,
+        pending_msgs_limit: Optional[int] = None,
+        pending_bytes_limit: Optional[int] = None,
+        **kwargs,
+    ) -> LocalSubscription:
+        self._check_open()
+        try:
+            validate_pattern(subject)
+        except ValueError:
+            raise BadSubjectError from None
+        subscription = LocalSubscription(
+            self,
+            next(self._broker._sids),
+            subject,
+            queue,
+            cb,
+            pending_msgs_limit or self._broker.pending_msgs_limit,
+            pending_bytes_limit or self._broker.pending_bytes_limit,
+        )
+        self._subscriptions[subscription._id] = subscription
+        self._broker._add(subscription)
+        return subscription
+
+    async def request(
+        self,
+        subject: str,
+        payload: bytes = b"",
+        timeout: float = 0.5,
+        headers: Optional[dict] = None,
+    ) -> Msg:
+        """Sends a request through this client's wildcard response inbox.
+
+        Raises:
+            nats.errors.NoRespondersError: If nobody is subscribed to the subject.
+            nats.errors.TimeoutError: If no reply arrives in time.
+        """
+        self._check_open()
+        if self._resp_sub is None:
+            self._resp_prefix = self.new_inbox()
+            self._resp_sub = await self.subscribe(f"{self._resp_prefix}.*", cb=self._handle_reply)
+        token = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._resp_map[token] = future
+        try:
+            if not self._broker._route(subject, payload, f"{self._resp_prefix}.{token}", headers):
+                raise NoRespondersError
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError from None
+        finally:
+            self._resp_map.pop(token, None)
+
+    async def _handle_reply(self, msg: Msg) -> None:
+        future = self._resp_map.get(msg.subject.rsplit(".", 1)[-1])
+        if future is not None and not future.done():
+            future.set_result(msg)
+
+    async def flush(self, timeout: float = 2) -> None:
+        """Waits until every subscription of the broker has taken its pending messages."""
+        self._check_open()
+        await self._broker.flush(timeout)
+
+    async def drain(self) -> None:
+        """Delivers pending messages to this client's subscriptions, then closes."""
+        if self._closed:
+            return
+        for subscription in list(self._subscriptions.values()):
+            await subscription.drain()
+        await self.close()
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        for subscription in list(self._subscriptions.values()):
+            await subscription.unsubscribe()
+        self._closed = True
+        for future in self._resp_map.values():
+            if not future.done():
+                future.set_exception(ConnectionClosedError())
+        self._broker._clients.discard(self)
+        await self._callback("closed_cb")
+
+    async def _callback(self, name: str, *args) -> None:
+        callback = self.options.get(name)
+        if callback is not None:
+            try:
+                await callback(*args)
+            except Exception as e:
+                logger.error(f"Error in {name} of local NATS client {self.name}: {e}")
+
+    async def _report_error(self, error: Exception) -> None:
+        await self._callback("error_cb", error)
+
+
+class LocalNatsBroker:
+    """Routes messages between LocalNatsClient connections (see the module docstring).
+
+    Args:
+        pending_msgs_limit: Default per-subscription message limit (slow consumers).
+        pending_bytes_limit: Default per-subscription byte limit (slow consumers).
+        max_payload: Largest accepted message payload.
+    """
+
+    def __init__(
+        self,
+        pending_msgs_limit: int = DEFAULT_PENDING_MSGS_LIMIT,
+        pending_bytes_limit: int = DEFAULT_PENDING_BYTES_LIMIT,
+        max_payload: int = DEFAULT_MAX_PAYLOAD,
+    ):
+        self.pending_msgs_limit = pending_msgs_limit
+        self.pending_bytes_limit = pending_bytes_limit
+        self.max_payload = max_payload
+        self._index = SubscriptionIndex()  # subject pattern -> (sid, subscription)
+        self._clients: set = set()
+        self._sids = itertools.count(1)
+        self._client_ids = itertools.count(1)
+        self._queue_turns: Dict[str, Iterator[int]] = {}  # queue group -> round robin
+        self.messages_in = 0
+        self.messages_out = 0
+        self.slow_consumer_drops = 0
+
+    async def connect(self, servers: Optional[Sequence[str]] = None, **options) -> LocalNatsClient:
+        """Opens a client connection (same call signature as `nats.connect`)."""
+        if isinstance(servers, str):
+            servers = [servers]
+        client = LocalNatsClient(self, servers or [], options)
+        self._clients.add(client)
+        return client
+
+    @contextlib.contextmanager
+    def install(self) -> Iterator["LocalNatsBroker"]:
+        """Makes `nats.connect` open connections to this broker within the block."""
+        original = nats.connect
+        nats.connect = self.connect
+        try:
+            yield self
+        finally:
+            nats.connect = original
+
+    def _add(self, subscription: LocalSubscription) -> None:
+        self._index.add(subscription.subject, str(subscription._id), subscription)
+
+    def _remove(self, subscription: LocalSubscription) -> None:
+        self._index.remove(subscription.subject, str(subscription._id))
+
+    def _route(
+        self, subject: str, payload: bytes, reply: str = "", headers: Optional[dict] = None
+    ) -> int:
+        """Delivers a message to the matching subscriptions; returns how many took it."""
+        if len(payload) > self.max_payload:
+            raise MaxPayloadError
+        if not subject or any(token in ("*", ">") for token in subject.split(".")):
+            raise BadSubjectError
+        self.messages_in += 1
+        receivers: List[LocalSubscription] = []
+        groups: Dict[str, List[LocalSubscription]] = {}
+        for _, subscription in self._index.match(subject):
+            if subscription.queue:
+                groups.setdefault(subscription.queue, []).append(subscription)
+            else:
+                receivers.append(subscription)
+        for queue, members in groups.items():
+            turn = self._queue_turns.setdefault(queue, itertools.count())
+            receivers.append(members[next(turn) % len(members)])
+
+        delivered = 0
+        for subscription in receivers:
+            msg = Msg(
+                _client=subscription._client,
+                subject=subject,
+                reply=reply,
+                data=payload,
+                headers=headers,
+                _sid=subscription._id,
+            )
+            if subscription._enqueue(msg):
+                delivered += 1
+            else:
+                self.slow_consumer_drops += 1
+                error = SlowConsumerError(subject, reply, subscription._id, subscription)
+                asyncio.ensure_future(subscription._client._report_error(error))
+        self.messages_out += delivered
+        return delivered
+
+    async def flush(self, timeout: float = 2) -> None:
+        """Waits (up to `timeout` seconds) until no subscription has pending messages."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while any(sub.pending_msgs and sub._task for sub in self._subscriptions()):
+            if loop.time() > deadline:
+                raise TimeoutError
+            await asyncio.sleep(0)
+
+    def _subscriptions(self) -> List[LocalSubscription]:
+        return [sub for subs in self._index.patterns.values() for _, sub in subs]
+
+    def get_stats(self) -> Dict[str, Any]:
+        subscriptions = self._subscriptions()
+        return {
+            "clients": len(self._clients),
+            "subscriptions": len(subscriptions),
+            "messages_in": self.messages_in,
+            "messages_out": self.messages_out,
+            "slow_consumer_drops": self.slow_consumer_drops,
+            "pending_msgs": sum(sub.pending_msgs for sub in subscriptions),
+        }
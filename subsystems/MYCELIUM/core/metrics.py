@@ -0,0 +1,228 @@
+# subsystems/MYCELIUM/core/metrics.py
+
+"""Low-overhead instrumentation of Mycelium traffic.
+
+MeshMetrics counts messages per topic and per message type, in each direction, and
+tracks how many requests and handlers are in flight. Counters are exact; timings are
+sampled: only one in `sample_every` operations of each stage is timed, and a skipped
+one costs a counter increment. Timings go into LatencyHistograms per stage (`encode`,
+`decode`, `handler`, `rtt` for request round trips) and topic, from which snapshots
+report p50/p95/p99.
+
+A MetricsReporter publishes snapshots periodically, by default on
+`egos.metrics.MYCELIUM.<source>`.
+"""
+
+import asyncio
+from bisect import bisect_left
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_SUBJECT_PREFIX = "egos.metrics.MYCELIUM"
+DEFAULT_SAMPLE_EVERY = 10
+DEFAULT_INTERVAL = 60.0  # Seconds between published snapshots
+DEFAULT_MAX_TOPICS = 1000
+OTHER_TOPICS = "_other"  # Aggregates topics beyond max_topics
+ALL_TOPICS = "*"
+
+IN = "in"
+OUT = "out"
+
+# Bucket upper bounds from 10 µs to about 80 s, four per power of two (~19% apart)
+_BOUNDS: List[float] = [1e-5 * 2 ** (i / 4) for i in range(93)]
+
+
+class LatencyHistogram:
+    """Histogram of durations (seconds) in fixed logarithmic buckets."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(_BOUNDS) + 1)  # Last bucket: above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.buckets[bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Returns the upper bound (seconds) of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(_BOUNDS[index], self.max) if index < len(_BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        """Returns count and mean, p50, p95, p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MeshMetrics:
+    """Message counters, in-flight gauges and sampled latency histograms.
+
+    Args:
+        sample_every: Time one in this many operations (1 times all of them).
+        max_topics: Topics tracked separately; further topics are aggregated under
+            `_other`, so per-request inbox subjects cannot grow the tables unbounded.
+    """
+
+    def __init__(
+        self, sample_every: int = DEFAULT_SAMPLE_EVERY, max_topics: int = DEFAULT_MAX_TOPICS
+    ):
+        self.sample_every = max(1, sample_every)
+        self.max_topics = max_topics
+        self.started = time.monotonic()
+        self._ticks: Dict[str, int] = {}  # stage -> operations seen
+        self._topics: Dict[str, Dict[str, int]] = {}  # topic -> direction -> count
+        self._types: Dict[str, Dict[str, int]] = {}  # message type -> direction -> count
+        self._latency: Dict[str, Dict[str, LatencyHistogram]] = {}  # stage -> topic -> histogram
+        self._in_flight: Dict[str, int] = {}
+        self._peak: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "MeshMetrics":
+        """Builds metrics from a `metrics` config section (`sample_every`, `max_topics`;
+        `interval` is read by the owner of the MetricsReporter)."""
+        config = config or {}
+        return cls(
+            sample_every=config.get("sample_every", DEFAULT_SAMPLE_EVERY),
+            max_topics=config.get("max_topics", DEFAULT_MAX_TOPICS),
+        )
+
+    def _topic(self, table: Dict[str, Any], topic: str) -> str:
+        if topic in table or len(table) < self.max_topics:
+            return topic
+        return OTHER_TOPICS
+
+    def count(self, topic: str, message_type: str, direction: str = OUT) -> None:
+        """Counts a message sent (`out`) or received (`in`)."""
+        counts = self._topics.setdefault(self._topic(self._topics, topic), {IN: 0, OUT: 0})
+        counts[direction] += 1
+        counts = self._types.setdefault(message_type, {IN: 0, OUT: 0})
+        counts[direction] += 1
+
+    def start(self, stage: str) -> Optional[float]:
+        """Returns a start time if this operation of a stage is sampled, else None.
+
+        Pass the result to stop() for the same stage.
+        """
+        ticks = self._ticks.get(stage, 0) + 1
+        self._ticks[stage] = ticks
+        if ticks % self.sample_every:
+            return None
+        return time.perf_counter()
+
+    def stop(self, stage: str, topic: str, started: Optional[float]) -> None:
+        """Records the duration of a sampled operation (no-op if `started` is None)."""
+        if started is not None:
+            self.observe(stage, topic, time.perf_counter() - started)
+
+    def observe(self, stage: str, topic: str, seconds: float) -> None:
+        """Records a duration for a stage and topic (and for the stage overall)."""
+        histograms = self._latency.setdefault(stage, {})
+        for key in (ALL_TOPICS, self._topic(histograms, topic)):
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def enter(self, name: str) -> None:
+        """Counts an operation (e.g. `requests`, `handlers`) as in flight."""
+        current = self._in_flight.get(name, 0) + 1
+        self._in_flight[name] = current
+        if current > self._peak.get(name, 0):
+            self._peak[name] = current
+
+    def leave(self, name: str) -> None:
+        self._in_flight[name] = self._in_flight.get(name, 0) - 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns counters, rates, in-flight gauges and latency percentiles."""
+        uptime = max(time.monotonic() - self.started, 1e-9)
+        totals = {
+            direction: sum(counts[direction] for counts in self._types.values())
+            for direction in (IN, OUT)
+        }
+        return {
+            "sample_every": self.sample_every,
+            "uptime_s": round(uptime, 3),
+            "messages": totals,
+            "messages_per_s": {direction: round(n / uptime, 3) for direction, n in totals.items()},
+            "topics": {topic: dict(counts) for topic, counts in self._topics.items()},
+            "message_types": {name: dict(counts) for name, counts in self._types.items()},
+            "in_flight": {
+                name: {"current": current, "peak": self._peak.get(name, 0)}
+                for name, current in self._in_flight.items()
+            },
+            "latency": {
+                stage: {topic: histogram.snapshot() for topic, histogram in histograms.items()}
+                for stage, histograms in self._latency.items()
+            },
+        }
+
+
+class MetricsReporter:
+    """Publishes MeshMetrics snapshots periodically.
+
+    Args:
+        metrics: The metrics to report.
+        publish: Coroutine publishing a payload on a subject.
+        subject: Subject of the snapshots, e.g. `egos.metrics.MYCELIUM.network`.
+        interval: Seconds between snapshots.
+    """
+
+    def __init__(
+        self,
+        metrics: MeshMetrics,
+        publish: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+        subject: str,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        self.metrics = metrics
+        self.subject = subject
+        self.interval = interval
+        self._publish = publish
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Starts reporting (must be called from a running event loop)."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=f"mycelium_metrics_{self.subject}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._publish(self.subject, self.metrics.snapshot())
+            except Exception as e:
+                logger.warning(f"Failed to publish metrics on '{self.subject}': {e}")
@@ -1,13 +1,25 @@
 import asyncio
 import nats
-import json # Import json
 import uuid # Import uuid
 from datetime import datetime, timezone # Import timezone
 from nats.errors import ConnectionClosedError, TimeoutError, NoServersError
-from typing import Dict, Any, Callable, List, Optional, Coroutine
+from typing import Dict, Any, Callable, List, Optional, Coroutine, Tuple
 
 from koios.logger import KoiosLogger # Assuming logger is available
 from ..interfaces.mycelium_interface import MyceliumInterface
+from .codec import (
+    JSON,
+    available_codecs,
+    decode_envelope,
+    encode_envelope,
+    get_codec,
+    negotiate,
+    resolve_preferences,
+)
+from .compression import Compressor
+from .connection_manager import NatsConnectionManager
+from .metrics import DEFAULT_INTERVAL, IN, METRICS_SUBJECT_PREFIX, OUT, MeshMetrics, MetricsReporter
+from .single_flight import SingleFlight, request_key
 
 # TODO: Get logger instance properly
 logger = KoiosLogger.get_logger("MYCELIUM.Core.NatsInterface")
@@ -22,6 +34,29 @@ class NatsMyceliumInterface(MyceliumInterface):
         self.subscriptions: Dict[str, nats.Subscription] = {}
         # Store futures keyed by correlation_id
         self.response_futures: Dict[str, asyncio.Future] = {}
+        # Codecs: we decode every available one; "codecs" orders what we send to peers
+        # that advertised support, "event_codec" is used for fan-out events (default JSON)
+        self._codecs = {name: get_codec(name, default=str) for name in available_codecs()}
+        self._codec_preferences = resolve_preferences(config.get("codecs"))
+        self._event_codec = resolve_preferences([config.get("event_codec", JSON)])[0]
+        self._peer_codecs: Dict[str, List[str]] = {} # source node -> codecs it accepts
+        # Large messages are compressed if enabled (see compression.py; "compression" section)
+        self._compressor = Compressor.from_config(config.get("compression"))
+        # "split_envelope": send header and payload separately encoded (frame version 3),
+        # so receivers decode the payload only when a handler reads it
+        self._split_envelope = bool(config.get("split_envelope"))
+        # Identical concurrent requests on these topic patterns share one call
+        self._single_flight = SingleFlight(config.get("single_flight"))
+        # Counters and sampled latencies ("metrics" config section), published every
+        # "interval" seconds (0: never) on egos.metrics.MYCELIUM.<node_id> while connected
+        metrics_config = config.get("metrics") or {}
+        self._metrics = MeshMetrics.from_config(metrics_config)
+        interval = metrics_config.get("interval", DEFAULT_INTERVAL)
+        self._metrics_reporter = None
+        if interval:
+            self._metrics_reporter = MetricsReporter(
+                self._metrics, self.publish_event, f"{METRICS_SUBJECT_PREFIX}.{node_id}", interval
+            )
         logger.info(f"NATS Interface initialized for node: {self.node_id}")
 
     def _create_standard_envelope(self, message_type: str, topic: str, payload: Dict[str, Any], target_node: Optional[str] = None, correlation_id: Optional[str] = None) -> Dict[str, Any]:
@@ -34,41 +69,90 @@ class NatsMyceliumInterface(MyceliumInterface):
         else:
             target = target_node
 
+        metadata = {
+            # Add standard metadata
+            "schema_version": self.config.get("message_schema_version", "1.0"),
+            "topic": topic, # Include topic in metadata for context
+             "message_type": message_type.upper(), # Include type in metadata
+             "target_node": target # Include resolved target
+             # Add other potential metadata like priority, trace_id later
+        }
+        if message_type.upper() in ["REQUEST", "RESPONSE"]:
+            metadata["accept"] = list(self._codecs) # Codecs the peer may answer us in
         return {
             "message_id": msg_id,
             "timestamp": timestamp,
             "source_subsystem": self.node_id,
             "correlation_id": correlation_id,
             "payload": payload,
-            "metadata": {
-                # Add standard metadata
-                "schema_version": self.config.get("message_schema_version", "1.0"),
-                "topic": topic, # Include topic in metadata for context
-                 "message_type": message_type.upper(), # Include type in metadata
-                 "target_node": target # Include resolved target
-                 # Add other potential metadata like priority, trace_id later
-            }
+            "metadata": metadata,
         }
 
-    def _encode_message(self, message: Dict[str, Any]) -> bytes:
-        """Encodes the full message envelope to bytes."""
+    def _encode_message(self, message: Dict[str, Any], codec: str = JSON) -> bytes:
+        """Encodes the full message envelope to bytes (plain JSON, or a framed binary codec)."""
         try:
-            # Ensure datetime objects are handled if not already isoformat strings
-            return json.dumps(message, default=str).encode('utf-8')
-        except TypeError as e:
-            logger.error(f"Failed to JSON encode message: {e}. Message sample: {str(message)[:200]}")
+            # Datetime and other non-native objects are encoded as strings
+            topic = message.get("metadata", {}).get("topic", "")
+            started = self._metrics.start("encode")
+            data = encode_envelope(
+                message, self._codecs[codec], self._compressor, topic, split=self._split_envelope
+            )
+            self._metrics.stop("encode", topic, started)
+            return data
+        except ValueError as e:
+            logger.error(
+                f"Failed to encode message ({codec}): {e}. Message sample: {str(message)[:200]}"
+            )
             raise ValueError(f"Cannot serialize message payload: {e}")
 
-    def _decode_message(self, data: bytes) -> Optional[Dict[str, Any]]:
-        """Decodes bytes into the standard message envelope dictionary."""
+    def _decode_message(self, data: bytes, subject: str = "") -> Optional[Dict[str, Any]]:
+        """Decodes (and decompresses) bytes into the standard message envelope dictionary.
+
+        Split envelopes are decoded up to their header; the payload is decoded when first
+        read (see codec.LazyEnvelope), so routing on the header never touches it.
+        """
+        started = self._metrics.start("decode")
         try:
-            return json.loads(data.decode('utf-8'))
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to decode incoming JSON message: {e}", exc_info=False)
+            message, _ = decode_envelope(data, self._codecs, self._compressor, subject)
+        except ValueError as e:
+            logger.error(f"Failed to decode incoming message: {e}", exc_info=False)
             return None
         except Exception as e:
             logger.error(f"Error decoding message data: {e}", exc_info=True)
             return None
+        self._metrics.stop("decode", subject, started)
+        if isinstance(message, dict):
+            self._learn_codecs(message)
+        return message
+
+    def _learn_codecs(self, message: Dict[str, Any]):
+        """Remembers the codecs a peer advertised in a request or response it sent."""
+        metadata = message.get("metadata")
+        accept = metadata.get("accept") if isinstance(metadata, dict) else None
+        source = message.get("source_subsystem") or message.get("header", {}).get("sender_node")
+        if source and isinstance(accept, list):
+            self._peer_codecs[source] = [name for name in accept if isinstance(name, str)]
+
+    def _reply_codec(self, request_message: Dict[str, Any]) -> str:
+        """Returns the codec to answer a request in, based on what its sender accepts."""
+        metadata = request_message.get("metadata")
+        accept = metadata.get("accept") if isinstance(metadata, dict) else None
+        return negotiate(self._codec_preferences, accept if isinstance(accept, list) else None)
+
+    @staticmethod
+    def _message_info(message: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """Returns the message type and correlation ID of a decoded message.
+
+        Standard envelopes carry them in `metadata` and at the top level; messages in the
+        in-process network format carry them in a `header`.
+        """
+        metadata = message.get("metadata")
+        header = message.get("header")
+        metadata = metadata if isinstance(metadata, dict) else {}
+        header = header if isinstance(header, dict) else {}
+        msg_type = metadata.get("message_type") or header.get("message_type") or "UNKNOWN"
+        correlation_id = message.get("correlation_id") or header.get("correlation_id")
+        return str(msg_type).upper(), correlation_id
 
     async def connect(self, node_type: str = "GENERIC", version: str = "0.1", capabilities: Optional[List[str]] = None) -> bool:
         """Registers the subsystem node with the network by connecting to NATS."""
@@ -97,9 +181,25 @@ class NatsMyceliumInterface(MyceliumInterface):
             if user and password: connect_options["user"] = user; connect_options["password"] = password
             elif token: connect_options["token"] = token
 
-            self.nc = await nats.connect(**connect_options)
+            if self.config.get("shared_connection"):
+                # One process-wide connection for all co-located nodes (see connection_manager.py)
+                callbacks = {
+                    name: connect_options.pop(name)
+                    for name in ("error_cb", "reconnected_cb", "disconnected_cb", "closed_cb")
+                }
+                client_name = connect_options.pop("name")
+                manager = NatsConnectionManager.shared(
+                    connect_options.pop("servers"), **connect_options
+                )
+                self.nc = await manager.client(client_name, **callbacks)
+            else:
+                self.nc = await nats.connect(**connect_options)
             logger.info(f"Successfully connected to NATS as '{self.node_id}'. Status: {self.nc.status}")
-            await self.report_health("connected", {"capabilities": capabilities or []})
+            if self._metrics_reporter:
+                self._metrics_reporter.start()
+            await self.report_health(
+                "connected", {"capabilities": capabilities or [], "codecs": list(self._codecs)}
+            )
             return True
         except NoServersError as e:
             logger.error(f"Could not connect to any NATS servers: {e}")
@@ -114,14 +214,18 @@ class NatsMyceliumInterface(MyceliumInterface):
         """Deregisters the subsystem node by closing the NATS connection."""
         if self.nc and not self.nc.is_closed:
             logger.info(f"Disconnecting node '{self.node_id}' from NATS.")
+            if self._metrics_reporter:
+                await self._metrics_reporter.stop()
             # Unsubscribe from all topics gracefully
             for topic in list(self.subscriptions.keys()):
                 await self.unsubscribe(topic)
-            # Drain ensures buffered messages are sent before closing
-            await self.nc.drain()
+            # Drain ensures buffered messages are sent before closing; the closed callback
+            # resets self.nc, so keep a reference
+            nc = self.nc
+            await nc.drain()
             # Close is now implicitly handled by drain in nats-py >= 2.0, but explicit close is safe
-            if not self.nc.is_closed:
-                 await self.nc.close()
+            if not nc.is_closed:
+                 await nc.close()
             logger.info(f"Node '{self.node_id}' disconnected.")
             self.nc = None
             return True
@@ -129,10 +233,24 @@ class NatsMyceliumInterface(MyceliumInterface):
         return False
 
     async def send_request(self, target_node: str, topic: str, payload: Dict[str, Any], timeout: int = 10) -> Dict[str, Any]:
-        """Sends a request and waits for a response using NATS request/reply."""
+        """Sends a request and waits for a response using NATS request/reply.
+
+        On single-flight topics ("single_flight" config), a request equal to one
+        already waiting for its response (same target, topic and payload) shares it.
+        """
         if not self.nc or not self.nc.is_connected:
             raise ConnectionError("Not connected to NATS.")
-
+        if self._single_flight.pattern_for(topic) is not None:
+            return await self._single_flight.run(
+                topic,
+                request_key(topic, payload, target_node),
+                lambda: self._send_request(target_node, topic, payload, timeout),
+            )
+        return await self._send_request(target_node, topic, payload, timeout)
+
+    async def _send_request(
+        self, target_node: str, topic: str, payload: Dict[str, Any], timeout: int
+    ) -> Dict[str, Any]:
         correlation_id = str(uuid.uuid4())
         # Target node info might be embedded in topic for routing by subscriber
         # or handled by NATS server/queues depending on setup.
@@ -140,55 +258,66 @@ class NatsMyceliumInterface(MyceliumInterface):
         request_message = self._create_standard_envelope(
             "REQUEST", topic, payload, target_node=target_node, correlation_id=correlation_id
         )
-        encoded_message = self._encode_message(request_message)
+        codec = negotiate(self._codec_preferences, self._peer_codecs.get(target_node))
+        encoded_message = self._encode_message(request_message, codec)
 
         logger.debug(f"Sending request ({correlation_id}) to topic '{topic}'")
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
         self.response_futures[correlation_id] = future
+        self._metrics.count(topic, "REQUEST", OUT)
+        self._metrics.enter("requests")
+        started = self._metrics.start("rtt")
 
         try:
             # NATS request sends and waits for ONE reply on an internal inbox subject
             response_msg = await self.nc.request(topic, encoded_message, timeout=timeout)
-            # If nc.request completes without timeout, a response was received.
-            # The callback (_handle_response) should have already resolved the future.
-            # We await the future here to get the processed result or handle errors set by callback.
-            logger.debug(f"NATS request completed for {correlation_id}, awaiting future.")
-            return await asyncio.wait_for(future, timeout=0.1) # Short wait, should be resolved
+            # The reply arrives on the request's inbox rather than through a subscription
+            # callback, so it is decoded and matched to the pending future here.
+            response = self._decode_message(response_msg.data, topic)
+            if not isinstance(response, dict) or "payload" not in response:
+                raise ValueError(f"Invalid response message format for request {correlation_id}")
+            await self._handle_response(response)
+            logger.debug(f"NATS request completed for {correlation_id}")
+            return await asyncio.wait_for(future, timeout=0.1) # Resolved unless mismatched
 
         except TimeoutError:
-            logger.error(f"Timeout ({timeout}s) waiting for response on NATS topic '{topic}' for request {correlation_id}")
-            future.set_exception(TimeoutError(f"Request timed out on topic {topic}"))
+            logger.error(
+                f"Timeout ({timeout}s) waiting for response on NATS topic '{topic}' "
+                f"for request {correlation_id}"
+            )
             raise # Re-raise NATS TimeoutError
         except ConnectionClosedError as e:
              logger.error(f"Connection closed while sending request to '{topic}': {e}")
-             future.set_exception(e)
              raise
         except Exception as e:
             logger.error(f"Error during NATS request to '{topic}': {e}", exc_info=True)
-            future.set_exception(e)
             raise
         finally:
             # Clean up the future regardless of outcome
             self.response_futures.pop(correlation_id, None)
-
-    async def _handle_response(self, msg):
-        """Internal callback for handling responses to requests."""
-        decoded_message = self._decode_message(msg.data)
-        if not decoded_message or "header" not in decoded_message or "payload" not in decoded_message:
-            logger.error(f"Received invalid response message format on reply subject: {msg.subject}")
+            if not future.done():
+                future.cancel()
+            self._metrics.leave("requests")
+            self._metrics.stop("rtt", topic, started)
+
+    async def _handle_response(self, decoded_message: Dict[str, Any]):
+        """Resolves the pending request future a decoded RESPONSE message answers."""
+        if "payload" not in decoded_message:
+            logger.error("Received invalid response message format (no payload)")
             return
 
-        header = decoded_message["header"]
         payload = decoded_message["payload"]
-        correlation_id = header.get("correlation_id")
+        _, correlation_id = self._message_info(decoded_message)
 
         if correlation_id and correlation_id in self.response_futures:
             future = self.response_futures.get(correlation_id)
             if future and not future.done():
                 logger.debug(f"Received response for request {correlation_id}")
-                if payload.get("status") == "ERROR":
+                if isinstance(payload, dict) and payload.get("status") == "ERROR":
                     error_details = payload.get("error_message", "Unknown error in response")
-                    logger.warning(f"Received ERROR response payload for {correlation_id}: {error_details}")
+                    logger.warning(
+                        f"Received ERROR response payload for {correlation_id}: {error_details}"
+                    )
                     future.set_exception(Exception(f"Request failed: {error_details}"))
                 else:
                     future.set_result(payload) # Resolve future with the payload
@@ -197,6 +326,39 @@ class NatsMyceliumInterface(MyceliumInterface):
         else:
             logger.warning(f"Received response with unknown or missing correlation_id: {correlation_id}")
 
+    async def send_reply(
+        self, reply_subject: str, request_message: Dict[str, Any], payload: Dict[str, Any]
+    ):
+        """Answers a REQUEST message on its reply subject.
+
+        The response carries the request's correlation ID and is encoded in the best
+        codec the requester advertised (JSON if it advertised none).
+        """
+        if not self.nc or not self.nc.is_connected:
+            raise ConnectionError("Not connected to NATS.")
+        _, correlation_id = self._message_info(request_message)
+        metadata = request_message.get("metadata") or {}
+        topic = metadata.get("topic") or request_message.get("header", {}).get("topic")
+        topic = topic or reply_subject
+        response = self._create_standard_envelope(
+            "RESPONSE", topic, payload, correlation_id=correlation_id
+        )
+        codec = self._reply_codec(request_message)
+        await self.nc.publish(reply_subject, self._encode_message(response, codec))
+        self._metrics.count(topic, "RESPONSE", OUT)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns message counters, in-flight counts and sampled latencies (see metrics.py)."""
+        return self._metrics.snapshot()
+
+    def get_single_flight_stats(self) -> Dict[str, Any]:
+        """Returns requests and shared (coalesced) requests per single-flight topic pattern."""
+        return self._single_flight.get_stats()
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """Returns the compression settings and per-topic ratios of sent and received messages."""
+        return self._compressor.get_stats()
+
     async def publish_event(self, topic: str, payload: Dict[str, Any]):
         """Publishes an event wrapped in the standard envelope."""
         if not self.nc or not self.nc.is_connected:
@@ -204,11 +366,12 @@ class NatsMyceliumInterface(MyceliumInterface):
             return
 
         event_message = self._create_standard_envelope("EVENT", topic, payload)
-        encoded_message = self._encode_message(event_message)
+        encoded_message = self._encode_message(event_message, self._event_codec)
 
         logger.debug(f"Publishing event {event_message['message_id']} to topic '{topic}'")
         try:
             await self.nc.publish(topic, encoded_message)
+            self._metrics.count(topic, "EVENT", OUT)
         except ConnectionClosedError:
             logger.error(f"Connection closed while publishing event to '{topic}'")
         except Exception as e:
@@ -230,29 +393,31 @@ class NatsMyceliumInterface(MyceliumInterface):
         async def internal_nats_callback(msg: nats.aio.msg.Msg):
             subject = msg.subject
             reply_subject = msg.reply
-            decoded_message = self._decode_message(msg.data)
+            decoded_message = self._decode_message(msg.data, subject)
 
             if not decoded_message:
                 logger.error(f"Failed to decode message received on topic '{subject}'")
                 return
 
-            msg_type = decoded_message.get("header", {}).get("message_type", "UNKNOWN").upper()
-            corr_id = decoded_message.get("header", {}).get("correlation_id")
-
-            # Check if it's a response to one of our requests (using correlation_id)
-            if corr_id and corr_id in self.response_futures:
+            msg_type, corr_id = self._message_info(decoded_message)
+            self._metrics.count(subject, msg_type, IN)
+
+            # Responses normally arrive on the request's inbox (see _send_request); one
+            # published on a regular subject still resolves the request it answers
+            if msg_type == "RESPONSE" and corr_id:
+                 if corr_id not in self.response_futures:
+                     logger.warning(
+                         f"Received RESPONSE message on non-inbox subject '{subject}'. "
+                         "Might be misrouted?"
+                     )
                  await self._handle_response(decoded_message)
                  return # Response handled, don't call user callback
-            # Check if it's a direct reply to a request WE made (less common for services)
-            elif msg_type == "RESPONSE" and corr_id:
-                 logger.warning(f"Received RESPONSE message on non-inbox subject '{subject}'. Might be misrouted?")
-                 # Optionally handle anyway if needed
-                 await self._handle_response(decoded_message)
-                 return
             # Check if it's a request message needing a reply (Standard Req/Rep)
             elif msg_type == "REQUEST" and reply_subject:
                 logger.debug(f"Received REQUEST message on '{subject}' requiring reply to '{reply_subject}'")
-                # User callback MUST handle sending the response via nc.publish(reply_subject, ...)
+                # User callback MUST send the response, e.g. via send_reply(reply_subject, message, payload)
+                self._metrics.enter("handlers")
+                started = self._metrics.start("handler")
                 try:
                     # Pass the full message and reply subject to user callback
                     await callback_function(decoded_message, reply_subject=reply_subject)
@@ -261,24 +426,36 @@ class NatsMyceliumInterface(MyceliumInterface):
                     # Optionally send error response back
                     try:
                          error_payload = {"status": "ERROR", "error_message": f"Error processing request: {cb_e}"}
-                         error_msg = self._create_standard_envelope("RESPONSE", subject, error_payload, correlation_id=corr_id)
-                         await self.nc.publish(reply_subject, self._encode_message(error_msg))
+                         await self.send_reply(reply_subject, decoded_message, error_payload)
                     except Exception as pub_e:
                          logger.error(f"Failed to publish error response to {reply_subject}: {pub_e}")
+                finally:
+                    self._metrics.leave("handlers")
+                    self._metrics.stop("handler", subject, started)
             # Otherwise, assume it's a standard pub/sub message or event
             else:
-                logger.debug(f"Received {msg_type} message on '{subject}'. ID: {decoded_message.get('header',{}).get('message_id')}")
+                message_id = decoded_message.get("message_id") or decoded_message.get(
+                    "header", {}
+                ).get("message_id")
+                logger.debug(f"Received {msg_type} message on '{subject}'. ID: {message_id}")
+                self._metrics.enter("handlers")
+                started = self._metrics.start("handler")
                 try:
                     await callback_function(decoded_message)
                 except Exception as cb_e:
                     logger.error(f"Error in standard callback for topic '{subject}': {cb_e}", exc_info=True)
+                finally:
+                    self._metrics.leave("handlers")
+                    self._metrics.stop("handler", subject, started)
 
         try:
             logger.info(f"Subscribing node '{self.node_id}' to topic '{topic}'")
             queue_group = self.config.get("queue_group")
             sub = await self.nc.subscribe(topic, cb=internal_nats_callback, queue=queue_group or "")
             self.subscriptions[topic] = sub
-            logger.info(f"Successfully subscribed to topic '{topic}' (Queue: '{queue_group or ""}')")
+            logger.info(
+                f"Successfully subscribed to topic '{topic}' (Queue: '{queue_group or ''}')"
+            )
         except Exception as e:
             logger.error(f"Error subscribing to topic '{topic}': {e}", exc_info=True)
             raise
@@ -9,7 +9,21 @@ import logging
 from typing import Any, Callable, Coroutine, Dict, List, Optional, Set
 import uuid
 
+from .flow_control import (
+    EVENT_LANE,
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_OLDEST,
+    REQUEST_LANE,
+    RESPONSE_LANE,
+    PriorityMessageQueue,
+    QueueFullError,
+    WorkerPool,
+    lane_for,
+)
+from .metrics import DEFAULT_INTERVAL, IN, METRICS_SUBJECT_PREFIX, OUT, MeshMetrics, MetricsReporter
 from .node import MyceliumNode
+from .timer_wheel import TimerWheel
+from .topic_router import SubscriptionIndex
 
 logger = logging.getLogger(__name__)
 
@@ -28,19 +42,66 @@ class RoutingError(MyceliumError):
 
 
 class MyceliumNetwork:
-    """Manages the nodes, connections, and message routing for the Mycelium Network."""
-
-    def __init__(self):
+    """Manages the nodes, connections, and message routing for the Mycelium Network.
+
+    Messages pass through a bounded network queue into per-node inboxes; each inbox is
+    drained by a fixed number of workers. Routing never waits for room in an inbox, so
+    a slow node only backs up its own inbox. Both queues serve RESPONSE before REQUEST
+    before EVENT traffic.
+
+    Args:
+        max_queue_size: Messages the network queue holds (0: unbounded).
+        node_queue_size: Messages each node inbox holds (0: unbounded).
+        node_concurrency: Handlers of one node that run at the same time.
+        overflow_policy: What a full queue does with new messages: `block`,
+            `drop_oldest` or `reject` (see flow_control.py). RESPONSE messages are
+            always accepted. `block` applies to the network queue only (route_message()
+            waits); a full inbox would hold up routing for every node, so with `block`
+            inboxes drop their oldest lowest-priority message instead.
+        metrics_sample_every: Time one in this many handler calls and requests (see
+            metrics.py); counters are exact.
+        metrics_interval: Seconds between metrics snapshots published as EVENTs on
+            `egos.metrics.MYCELIUM.network` while the network runs (0: never).
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        node_queue_size: int = 1000,
+        node_concurrency: int = 4,
+        overflow_policy: str = OVERFLOW_BLOCK,
+        metrics_sample_every: int = 10,
+        metrics_interval: float = DEFAULT_INTERVAL,
+    ):
         self.nodes: Dict[str, MyceliumNode] = {}
         self.connections: Dict[str, Set[str]] = defaultdict(
             set
         )  # node_id -> set of connected node_ids
+        self._subscription_index = SubscriptionIndex()
+        # Topic pattern -> list of (node_id, async_callback); read-only view of the index
         self.subscriptions: Dict[str, List[tuple[str, Callable[[Dict[str, Any]], Coroutine]]]] = (
-            defaultdict(list)
-        )  # topic -> list of (node_id, async_callback)
+            self._subscription_index.patterns
+        )
         self.response_waiters: Dict[str, asyncio.Future] = {}  # correlation_id -> Future
-        self.message_queue = asyncio.Queue()
+        self._timer_wheel = TimerWheel()  # Expires response waiters
+        self.node_queue_size = node_queue_size
+        self.node_concurrency = node_concurrency
+        self.overflow_policy = overflow_policy
+        self.message_queue = PriorityMessageQueue(max_queue_size, overflow_policy, name="network")
+        self._inboxes: Dict[str, WorkerPool] = {}  # node_id -> inbox and its workers
         self._message_processor_task: Optional[asyncio.Task] = None  # Explicitly type hint task
+        # Messages in: routed into the network; out: delivered to a node (or a waiter)
+        self.metrics = MeshMetrics(metrics_sample_every)
+        self._metrics_reporter = (
+            MetricsReporter(
+                self.metrics,
+                self._publish_metrics,
+                f"{METRICS_SUBJECT_PREFIX}.network",
+                metrics_interval,
+            )
+            if metrics_interval
+            else None
+        )
         self._response_handlers: Dict[
             str, Callable
         ] = {}  # node_id -> _handle_response method from interface
@@ -84,16 +145,16 @@ class MyceliumNetwork:
         self.connections.pop(node_id, None)
 
         # Remove subscriptions for this node
-        for topic in list(self.subscriptions.keys()):
-            self.subscriptions[topic] = [
-                (sub_id, cb) for sub_id, cb in self.subscriptions[topic] if sub_id != node_id
-            ]
-            if not self.subscriptions[topic]:  # Clean up empty topic lists
-                del self.subscriptions[topic]
+        self._subscription_index.remove_node(node_id)
 
         # Remove response handler if it exists
         await self.remove_response_handler(node_id)
 
+        # Stop the node's workers; anything still in its inbox is discarded
+        inbox = self._inboxes.pop(node_id, None)
+        if inbox is not None:
+            await inbox.stop()
+
         # Remove node itself
         del self.nodes[node_id]
         logger.info(f"Node removed: {node_id}")
@@ -140,32 +201,70 @@ class MyceliumNetwork:
     async def add_subscription(
         self, topic: str, node_id: str, callback: Callable[[Dict[str, Any]], Coroutine]
     ):
-        """Adds a subscription for a node to a topic."""
+        """Adds a subscription for a node to a topic.
+
+        The topic may use NATS-style wildcards: `*` matches one token and a trailing
+        `>` matches one or more tokens (e.g. `egos.*.status`, `egos.ethik.>`).
+        """
         if node_id not in self.nodes:
             logger.error(f"Cannot subscribe: Node {node_id} not registered.")
             return
-        # Avoid duplicate subscriptions for the same node/callback
-        if not any(
-            sub_id == node_id and cb == callback for sub_id, cb in self.subscriptions[topic]
-        ):
-            self.subscriptions[topic].append((node_id, callback))
+        try:
+            added = self._subscription_index.add(topic, node_id, callback)
+        except ValueError as e:
+            logger.error(f"Cannot subscribe node {node_id}: {e}")
+            return
+        # Duplicate subscriptions for the same node/callback are ignored
+        if added:
             logger.info(f"Node {node_id} subscribed to topic: {topic}")
         else:
             logger.warning(
                 f"Node {node_id} already subscribed to topic {topic} with this callback."
             )
 
+    async def remove_subscription(
+        self,
+        topic: str,
+        node_id: str,
+        callback: Optional[Callable[[Dict[str, Any]], Coroutine]] = None,
+    ) -> bool:
+        """Removes a node's subscription to a topic pattern (all of its callbacks if
+        `callback` is None). Returns False if there was nothing to remove."""
+        removed = self._subscription_index.remove(topic, node_id, callback)
+        if removed:
+            logger.info(f"Node {node_id} unsubscribed from topic: {topic}")
+        else:
+            logger.debug(f"Node {node_id} has no subscription to topic {topic} to remove.")
+        return bool(removed)
+
+    def match_subscriptions(
+        self, topic: str
+    ) -> tuple[tuple[str, Callable[[Dict[str, Any]], Coroutine]], ...]:
+        """Returns the (node_id, callback) subscriptions whose pattern matches a topic."""
+        return self._subscription_index.match(topic)
+
     async def route_message(self, message: Dict[str, Any]):
-        """Puts a message onto the internal queue for processing."""
-        await self.message_queue.put(message)
+        """Puts a message onto the internal queue for processing.
+
+        RESPONSE messages are always accepted. Other messages are subject to the
+        queue's overflow policy: with `block` this waits for room, with `drop_oldest`
+        an older lower-priority message may be dropped, and with `reject` a full queue
+        raises QueueFullError.
+        """
+        header = message.get("header", {})
+        lane = lane_for(header.get("message_type"))
+        self.metrics.count(header.get("topic", ""), header.get("message_type", "UNKNOWN"), IN)
+        dropped = await self.message_queue.put(message, lane, force=lane == RESPONSE_LANE)
+        if dropped is not None:
+            await self._handle_dropped(dropped, "network queue full")
 
     async def _process_messages(self):
-        """Continuously processes messages from the internal queue."""
+        """Continuously dispatches messages from the internal queue to node inboxes."""
         while True:
             try:
-                message = await self.message_queue.get()
-                # Wrap processing in create_task to avoid blocking the loop if one handler hangs
-                asyncio.create_task(self._handle_single_message(message))
+                _, message = await self.message_queue.get()
+                # Routing only enqueues work; handlers run in the target nodes' worker pools
+                await self._handle_single_message(message)
             except asyncio.CancelledError:
                 logger.info("Message processor task cancelled.")
                 break  # Exit the loop if cancelled
@@ -174,8 +273,60 @@ class MyceliumNetwork:
                 # Consider more robust error handling or restarting logic here
                 await asyncio.sleep(1)  # Avoid tight loop on persistent error
 
+    def _get_inbox(self, node_id: str) -> WorkerPool:
+        """Returns a node's inbox, creating and starting it on first use."""
+        inbox = self._inboxes.get(node_id)
+        if inbox is None:
+            # The single dispatcher must never wait for one node's inbox
+            policy = self.overflow_policy
+            if policy == OVERFLOW_BLOCK:
+                policy = OVERFLOW_DROP_OLDEST
+            queue = PriorityMessageQueue(self.node_queue_size, policy, name=f"inbox:{node_id}")
+            inbox = self._inboxes[node_id] = WorkerPool(
+                node_id, queue, self.node_concurrency, self.metrics
+            )
+        if not inbox.running:
+            inbox.start()
+        return inbox
+
+    async def _deliver(
+        self, node_id: str, handler: Callable, message: Dict[str, Any], lane: str
+    ) -> None:
+        """Queues a handler call in a node's inbox, applying its overflow policy.
+
+        Inbox policies never block, so this returns without waiting for the node.
+        """
+        inbox = self._get_inbox(node_id)
+        try:
+            dropped = await inbox.queue.put((handler, message), lane, force=lane == RESPONSE_LANE)
+        except QueueFullError as e:
+            await self._handle_dropped(message, str(e))
+            return
+        header = message.get("header", {})
+        self.metrics.count(header.get("topic", ""), header.get("message_type", "UNKNOWN"), OUT)
+        if dropped is not None:
+            await self._handle_dropped(dropped[1], f"inbox of node {node_id} full")
+
+    async def _handle_dropped(self, message: Dict[str, Any], reason: str) -> None:
+        """Accounts for a message dropped by an overflow policy.
+
+        A dropped REQUEST is answered with an error so its sender does not wait for
+        the full timeout.
+        """
+        header = message.get("header", {})
+        logger.warning(
+            f"Dropped {header.get('message_type')} message {header.get('message_id', 'N/A')} "
+            f"on topic {header.get('topic')}: {reason}"
+        )
+        if header.get("message_type") == "REQUEST":
+            response_msg = self._create_response_message(
+                message, {"status": "ERROR", "error_message": f"Request dropped: {reason}"}
+            )
+            if response_msg:
+                await self.route_message(response_msg)
+
     async def _handle_single_message(self, message: Dict[str, Any]):
-        """Handles the routing and processing of a single message."""
+        """Routes a single message to the inbox(es) of the node(s) that handle it."""
         # Outer try-except to catch unexpected errors during handling
         try:
             header = message.get("header", {})  # Use .get for safety
@@ -207,15 +358,18 @@ class MyceliumNetwork:
                     logger.warning(f"Received RESPONSE without correlation_id: {message}")
                     return
                 response_target_node = target
-                if response_target_node in self._response_handlers:
-                    try:
-                        await self._response_handlers[response_target_node](message)
-                    except Exception as e:
-                        logger.error(
-                            f"Error invoking response handler for node {response_target_node}, "
-                            f"corr_id {correlation_id}: {e}",
-                            exc_info=True,
-                        )
+                waiter = self.response_waiters.pop(correlation_id, None)
+                if waiter is not None:  # Requested through send_request()
+                    if not waiter.done():
+                        self.metrics.count(topic, msg_type, OUT)
+                        waiter.set_result(message)
+                elif response_target_node in self._response_handlers:
+                    await self._deliver(
+                        response_target_node,
+                        self._response_handlers[response_target_node],
+                        message,
+                        RESPONSE_LANE,
+                    )
                 else:
                     logger.warning(
                         f"No response handler registered for node {response_target_node} "
@@ -234,43 +388,31 @@ class MyceliumNetwork:
                     if response_msg:
                         await self.route_message(response_msg)
                     return
-
-                node = self.nodes[target]
-                try:
-                    response_payload = await node.process_message(message)
-                    if response_payload is not None:
-                        response_msg = self._create_response_message(message, response_payload)
-                        if response_msg:
-                            await self.route_message(response_msg)
-                except Exception as e:
-                    logger.error(
-                        f"Error processing REQUEST in node {target} for topic {topic}: {e}",
-                        exc_info=True,
-                    )
-                    error_payload = {
-                        "status": "ERROR",
-                        "error_message": f"Error processing request in {target}: {str(e)}",
-                    }
-                    response_msg = self._create_response_message(message, error_payload)
-                    if response_msg:
-                        await self.route_message(response_msg)
+                await self._deliver(target, self._process_request, message, REQUEST_LANE)
 
             # --- EVENT Handling --- #
             elif msg_type == "EVENT":
-                subscribers_to_notify = []
-                # Determine target audience based on target_node/topic
+                # Subscriptions matching the topic (cached per topic by the index)
+                matched = self._subscription_index.match(topic)
+                # Determine target audience based on target_node/topic: (node_id, handler)
+                # pairs, preferring registered callbacks over the node's process_message
                 if target == "BROADCAST":
+                    callbacks: Dict[str, List[Callable]] = defaultdict(list)
+                    for sub_id, cb in matched:
+                        callbacks[sub_id].append(cb)
                     subscribers_to_notify = [
-                        (nid, node) for nid, node in self.nodes.items() if nid != sender
+                        (nid, handler)
+                        for nid, node in self.nodes.items()
+                        for handler in callbacks.get(nid, [node.process_message])
                     ]
                 elif target == "TOPIC_TARGET":
                     subscribers_to_notify = [
-                        (sub_id, self.nodes[sub_id])
-                        for sub_id, cb in self.subscriptions.get(topic, [])
-                        if sub_id in self.nodes
+                        (sub_id, cb) for sub_id, cb in matched if sub_id in self.nodes
                     ]
                 elif target in self.nodes:
-                    subscribers_to_notify = [(target, self.nodes[target])]
+                    subscribers_to_notify = [
+                        (sub_id, cb) for sub_id, cb in matched if sub_id == target
+                    ] or [(target, self.nodes[target].process_message)]
                 else:
                     logger.error(f"Cannot route EVENT: Target node {target} not found.")
                     return
@@ -278,33 +420,15 @@ class MyceliumNetwork:
                 if not subscribers_to_notify:
                     logger.debug(f"No active subscribers found for event topic: {topic}")
 
-                # Use registered callbacks or default process_message
-                active_subscriptions = self.subscriptions.get(topic, [])
-                callback_map = {sub_id: cb for sub_id, cb in active_subscriptions}
-
-                for node_id, node_instance in subscribers_to_notify:
+                for node_id, handler_coro in subscribers_to_notify:
                     if node_id != sender:
-                        try:
-                            # Prioritize specific registered callback,
-                            # fallback to node's process_message
-                            handler_coro = callback_map.get(node_id, node_instance.process_message)
-                            # Ensure we only schedule if the handler is valid
-                            if asyncio.iscoroutinefunction(handler_coro) or isinstance(
-                                handler_coro, Coroutine
-                            ):
-                                asyncio.create_task(
-                                    handler_coro(message), name=f"event_callback_{node_id}_{topic}"
-                                )
-                            else:
-                                logger.error(
-                                    f"Invalid handler for event callback node {node_id} "
-                                    f"on topic {topic}: {type(handler_coro)}"
-                                )
-                        except Exception as e:
+                        # Ensure we only queue valid handlers
+                        if asyncio.iscoroutinefunction(handler_coro):
+                            await self._deliver(node_id, handler_coro, message, EVENT_LANE)
+                        else:
                             logger.error(
-                                f"Error scheduling/executing EVENT callback for node {node_id} "
-                                f"on topic {topic}: {e}",
-                                exc_info=True,
+                                f"Invalid handler for event callback node {node_id} "
+                                f"on topic {topic}: {type(handler_coro)}"
                             )
             else:
                 logger.warning(f"Unsupported message type received: {msg_type}")
@@ -313,8 +437,139 @@ class MyceliumNetwork:
         except Exception as e:
             msg_id_for_log = message.get("header", {}).get("message_id", "N/A")
             logger.error(f"Critical error handling message {msg_id_for_log}: {e}", exc_info=True)
+
+    async def _process_request(self, message: Dict[str, Any]) -> None:
+        """Runs a REQUEST in its target node (from the node's inbox) and routes the reply."""
+        target = message["header"]["target_node"]
+        topic = message["header"]["topic"]
+        node = self.nodes.get(target)
+        try:
+            if node is None:
+                raise NodeNotFoundError(f"Node '{target}' was removed")
+            response_payload = await node.process_message(message)
+            if response_payload is None:
+                return
+        except Exception as e:
+            logger.error(
+                f"Error processing REQUEST in node {target} for topic {topic}: {e}",
+                exc_info=True,
+            )
+            response_payload = {
+                "status": "ERROR",
+                "error_message": f"Error processing request in {target}: {str(e)}",
+            }
+        response_msg = self._create_response_message(message, response_payload)
+        if response_msg:
+            await self.route_message(response_msg)
+
+    async def send_request(
+        self,
+        sender_node: str,
+        target_node: str,
+        topic: str,
+        payload: Dict[str, Any],
+        timeout: float = 10,
+        fast_path: bool = True,
+    ) -> Dict[str, Any]:
+        """Sends a REQUEST and waits for the response payload.
+
+        With `fast_path`, a request to a registered node runs the node's handler
+        directly in a child task, without the queues or the node's worker limit.
+        Other requests are routed through the queues and answered through
+        `response_waiters`. Either way the response is a regular RESPONSE message
+        correlated by `correlation_id`, and the timeout is enforced by the network's
+        timer wheel.
+
+        Returns:
+            The response payload.
+
+        Raises:
+            asyncio.TimeoutError: If no response arrives within `timeout` seconds.
+            Exception: If the response has status ERROR (as in the NATS interface).
+        """
+        message = self._create_request_message(sender_node, target_node, topic, payload)
+        correlation_id = message["header"]["correlation_id"]
+        future = asyncio.get_running_loop().create_future()
+        self.response_waiters[correlation_id] = future
+        node = self.nodes.get(target_node) if fast_path else None
+        handler_task: Optional[asyncio.Task] = None
+        expired = False
+
+        def expire():
+            nonlocal expired
+            expired = True
+            waiter = self.response_waiters.pop(correlation_id, None)
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(asyncio.TimeoutError(f"Request timed out on topic {topic}"))
+            if handler_task is not None:
+                handler_task.cancel()  # Only the handler: the caller's task is left alone
+
+        handle = self._timer_wheel.schedule(timeout, expire)
+        self.metrics.enter("requests")
+        started = self.metrics.start("rtt")
+        try:
+            if node is None:
+                await self.route_message(message)
+            else:
+                self.metrics.count(topic, "REQUEST", IN)
+                self.metrics.count(topic, "REQUEST", OUT)
+                self.metrics.enter("handlers")
+                handler_started = self.metrics.start("handler")
+                handler_task = asyncio.ensure_future(node.process_message(message))
+                try:
+                    response_payload = await handler_task
+                except asyncio.CancelledError:
+                    if not expired:
+                        raise
+                    raise asyncio.TimeoutError(f"Request timed out on topic {topic}") from None
+                except Exception as e:
+                    logger.error(
+                        f"Error processing REQUEST in node {target_node} for topic {topic}: {e}",
+                        exc_info=True,
+                    )
+                    response_payload = {
+                        "status": "ERROR",
+                        "error_message": f"Error processing request in {target_node}: {str(e)}",
+                    }
+                finally:
+                    handler_task = None
+                    self.metrics.leave("handlers")
+                    self.metrics.stop("handler", topic, handler_started)
+                if response_payload is not None and not future.done():
+                    self.metrics.count(topic, "RESPONSE", IN)
+                    self.metrics.count(topic, "RESPONSE", OUT)
+                    future.set_result(self._create_response_message(message, response_payload))
+            response = await future
         finally:
-            pass  # task_done() is not used when using create_task per message
+            self._timer_wheel.cancel(handle)
+            self.response_waiters.pop(correlation_id, None)
+            self.metrics.leave("requests")
+            self.metrics.stop("rtt", topic, started)
+
+        response_payload = response["payload"]
+        if isinstance(response_payload, dict) and response_payload.get("status") == "ERROR":
+            error_details = response_payload.get("error_message", "Unknown error in response")
+            raise Exception(f"Request failed: {error_details}")
+        return response_payload
+
+    def _create_request_message(
+        self, sender_node: str, target_node: str, topic: str, payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Helper to construct a REQUEST message with a new correlation ID."""
+        return {
+            "header": {
+                "message_id": self.generate_uuid(),
+                "correlation_id": self.generate_uuid(),
+                "timestamp": datetime.now().isoformat(),
+                "sender_node": sender_node,
+                "target_node": target_node,
+                "topic": topic,
+                "message_type": "REQUEST",
+                "priority": "MEDIUM",
+                "version": "1.0",
+            },
+            "payload": payload,
+        }
 
     def _create_response_message(
         self, request_message: Dict[str, Any], response_payload: Dict[str, Any]
@@ -356,6 +611,8 @@ class MyceliumNetwork:
             logger.info("Mycelium Network message processor started.")
         else:
             logger.warning("Mycelium Network message processor already running.")
+        if self._metrics_reporter:
+            self._metrics_reporter.start()
 
     async def stop(self):
         """Stops the background message processing task gracefully."""
@@ -368,6 +625,29 @@ class MyceliumNetwork:
             self._message_processor_task = None
         else:
             logger.info("Mycelium Network message processor already stopped.")
+        if self._metrics_reporter:
+            await self._metrics_reporter.stop()
+        for inbox in self._inboxes.values():
+            await inbox.stop()
+        await self._timer_wheel.stop()
+
+    async def _publish_metrics(self, topic: str, snapshot: Dict[str, Any]) -> None:
+        """Routes a metrics snapshot as an EVENT to the nodes subscribed to its topic."""
+        await self.route_message(
+            {
+                "header": {
+                    "message_id": self.generate_uuid(),
+                    "timestamp": datetime.now().isoformat(),
+                    "sender_node": "MYCELIUM",
+                    "target_node": "TOPIC_TARGET",
+                    "topic": topic,
+                    "message_type": "EVENT",
+                    "priority": "LOW",
+                    "version": "1.0",
+                },
+                "payload": snapshot,
+            }
+        )
 
     def get_network_status(self) -> Dict[str, Any]:
         """Returns the current status of the network."""
@@ -386,6 +666,10 @@ class MyceliumNetwork:
                 topic: [sub[0] for sub in subs] for topic, subs in self.subscriptions.items()
             },
             "queue_size": self.message_queue.qsize(),
+            "pending_requests": len(self.response_waiters),
+            "queue": self.message_queue.get_stats(),
+            "node_queues": {nid: inbox.get_stats() for nid, inbox in self._inboxes.items()},
+            "metrics": self.metrics.snapshot(),
             "processor_running": self._message_processor_task is not None
             and not self._message_processor_task.done(),
         }
@@ -0,0 +1,115 @@
+# subsystems/MYCELIUM/core/single_flight.py
+
+"""Single-flight coalescing of identical concurrent requests.
+
+When several callers send the same request (same subject and an equal payload)
+while an earlier one is still waiting for its response, they share that outstanding
+call instead of sending their own: one round trip and one unit of server-side work
+serve all of them. Requests are only coalesced while in flight; nothing is cached
+after the response arrives.
+
+Payloads are compared by a hash of their canonical JSON form (sorted keys), so key
+order does not matter. Coalescing is enabled per subject pattern, because it is only
+safe for requests without side effects (queries such as ATLAS maps or NEXUS
+analyses). The shared call runs with the first caller's timeout; every caller gets
+the same outcome, and callers after the first receive a copy of the response.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, TypeVar
+
+from .topic_router import subject_matches
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_SIZE = 4096  # Subjects whose matching pattern is remembered
+
+
+def request_key(subject: str, payload: Any, *qualifiers: Optional[str]) -> str:
+    """Returns the coalescing key of a request.
+
+    Args:
+        subject: The request subject.
+        payload: The request payload (compared by its canonical JSON form).
+        *qualifiers: Further values that must match, e.g. the target node.
+    """
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return "\x1f".join([subject, *(q or "" for q in qualifiers), digest])
+
+
+class SingleFlight:
+    """Shares outstanding calls between identical requests on configured subjects.
+
+    Args:
+        subjects: Subject patterns (wildcards allowed, `>` for all) whose requests
+            are coalesced.
+        cache_size: Subjects whose matching pattern is kept (the cache is cleared
+            when full, so per-entity or per-request subjects cannot grow it unbounded).
+    """
+
+    def __init__(
+        self, subjects: Optional[Iterable[str]] = None, cache_size: int = DEFAULT_CACHE_SIZE
+    ):
+        self._patterns = list(subjects or ())
+        self.cache_size = cache_size
+        self._enabled: Dict[str, Optional[str]] = {}  # subject -> matching pattern
+        self._inflight: Dict[str, asyncio.Future] = {}  # key -> shared call
+        self._stats: Dict[str, Dict[str, int]] = {}  # pattern -> calls / shared
+
+    def pattern_for(self, subject: str) -> Optional[str]:
+        """Returns the configured pattern matching a subject, or None if not coalesced."""
+        if not self._patterns:
+            return None
+        if subject in self._enabled:
+            return self._enabled[subject]
+        pattern = next(
+            (pattern for pattern in self._patterns if subject_matches(pattern, subject)), None
+        )
+        if len(self._enabled) >= self.cache_size:
+            self._enabled.clear()
+        self._enabled[subject] = pattern
+        return pattern
+
+    async def run(self, subject: str, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Runs `call`, or joins the identical call already in flight.
+
+        The call runs in its own task, so cancelling one caller does not cancel it
+        for the others.
+
+        Args:
+            subject: The request subject (selects the statistics entry).
+            key: Coalescing key (see request_key()).
+            call: Sends the request and returns its response.
+        """
+        stats = self._stats.setdefault(
+            self.pattern_for(subject) or subject, {"calls": 0, "shared": 0}
+        )
+        stats["calls"] += 1
+        shared = self._inflight.get(key)
+        if shared is not None:
+            stats["shared"] += 1
+            logger.debug(f"Joining in-flight request on '{subject}'")
+            return copy.deepcopy(await asyncio.shield(shared))
+
+        shared = asyncio.ensure_future(call())
+        self._inflight[key] = shared
+        shared.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Keep an unobserved exception from being logged if every caller was cancelled
+        shared.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.shield(shared)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns calls and shared (coalesced) calls per subject pattern."""
+        return {
+            "in_flight": len(self._inflight),
+            "subjects": {pattern: dict(stats) for pattern, stats in self._stats.items()},
+        }
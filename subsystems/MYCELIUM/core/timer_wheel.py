@@ -0,0 +1,96 @@
+# subsystems/MYCELIUM/core/timer_wheel.py
+
+"""A hashed timer wheel for request timeouts.
+
+Scheduling a timeout puts the entry in the slot its deadline falls in; one background
+task visits one slot per tick and fires the entries that are due (entries more than a
+revolution away stay for a later pass). Scheduling and cancelling are dictionary
+operations, so thousands of concurrent requests share a single timer instead of one
+event-loop timer each. Timeouts fire up to one tick late.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK = 0.01  # Seconds
+DEFAULT_SLOTS = 512
+
+
+class TimerWheel:
+    """Runs callbacks when their deadline has passed.
+
+    Args:
+        tick: Seconds per slot (the timeout resolution).
+        slots: Slots per revolution.
+    """
+
+    def __init__(self, tick: float = DEFAULT_TICK, slots: int = DEFAULT_SLOTS):
+        self.tick = tick
+        self._slots: List[Dict[int, Tuple[float, Callable[[], None]]]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[int, int] = {}  # handle -> slot index
+        self._handles = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> int:
+        """Calls `callback` once `delay` seconds have passed (starting the wheel task).
+
+        Returns:
+            A handle for cancel().
+        """
+        deadline = time.monotonic() + delay
+        handle = next(self._handles)
+        index = int(deadline / self.tick) % len(self._slots)
+        self._slots[index][handle] = (deadline, callback)
+        self._slot_of[handle] = index
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="mycelium_timer_wheel")
+        return handle
+
+    def cancel(self, handle: int) -> bool:
+        """Cancels a scheduled callback. Returns False if it already ran or was cancelled."""
+        index = self._slot_of.pop(handle, None)
+        if index is None:
+            return False
+        self._slots[index].pop(handle, None)
+        return True
+
+    async def _run(self) -> None:
+        """Advances the wheel until it is empty."""
+        position = int(time.monotonic() / self.tick)
+        while self._slot_of:
+            await asyncio.sleep(self.tick)
+            now_position = int(time.monotonic() / self.tick)
+            # Visit every slot passed since the last tick (at most one revolution)
+            for current in range(position, min(now_position, position + len(self._slots)) + 1):
+                self._expire(current % len(self._slots))
+            position = now_position
+
+    def _expire(self, index: int) -> None:
+        now = time.monotonic()
+        slot = self._slots[index]
+        due = [handle for handle, (deadline, _) in slot.items() if deadline <= now]
+        for handle in due:
+            _, callback = slot.pop(handle)
+            self._slot_of.pop(handle, None)
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in timeout callback: {e}", exc_info=True)
+
+    async def stop(self) -> None:
+        """Stops the wheel task; scheduled callbacks stay until the next schedule()."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -0,0 +1,193 @@
+# subsystems/MYCELIUM/core/topic_router.py
+
+"""Subscription index for the in-process Mycelium network.
+
+Topics are dot-separated tokens, as in NATS. A subscription pattern may use two
+wildcards: `*` matches exactly one token and `>` (only as the last token) matches one
+or more remaining tokens, so `egos.*.status` matches `egos.ethik.status` and
+`egos.>` matches `egos.ethik.status` but not `egos`.
+
+Patterns are stored in a token trie, so matching a topic only visits the branches
+its tokens can reach instead of every subscription. A reverse index (node -> patterns)
+makes removing a node proportional to its own subscriptions, and match results are
+cached per topic until the next subscription change.
+"""
+
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional, Set, Tuple
+
+Callback = Callable[[Dict[str, Any]], Coroutine]
+Subscription = Tuple[str, Callback]  # (node_id, async_callback)
+
+SINGLE_WILDCARD = "*"
+TAIL_WILDCARD = ">"
+DEFAULT_CACHE_SIZE = 4096
+
+
+def validate_pattern(pattern: str) -> List[str]:
+    """Splits a subscription pattern into tokens.
+
+    Raises:
+        ValueError: If the pattern has empty tokens or `>` is not the last token.
+    """
+    tokens = pattern.split(".")
+    if not all(tokens):
+        raise ValueError(f"Invalid topic pattern '{pattern}': empty token.")
+    if TAIL_WILDCARD in tokens[:-1]:
+        raise ValueError(f"Invalid topic pattern '{pattern}': '>' must be the last token.")
+    return tokens
+
+
+def subject_matches(pattern: str, subject: str) -> bool:
+    """Returns True if a subject matches a single pattern (wildcards as above)."""
+    pattern_tokens = pattern.split(".")
+    subject_tokens = subject.split(".")
+    for index, token in enumerate(pattern_tokens):
+        if token == TAIL_WILDCARD:
+            return len(subject_tokens) > index
+        if index >= len(subject_tokens) or token not in (SINGLE_WILDCARD, subject_tokens[index]):
+            return False
+    return len(subject_tokens) == len(pattern_tokens)
+
+
+class _TrieNode:
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.subscriptions: List[Subscription] = []
+
+
+class SubscriptionIndex:
+    """Maps topic patterns to subscriptions and topics to matching subscriptions.
+
+    Args:
+        cache_size: Topics whose match results are kept (the cache is cleared when
+            full and whenever a subscription is added or removed).
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._root = _TrieNode()
+        # pattern -> subscriptions, in subscription order (read-only view for callers)
+        self.patterns: Dict[str, List[Subscription]] = {}
+        self._by_node: Dict[str, Set[str]] = {}  # node_id -> patterns
+        self._cache: Dict[str, Tuple[Subscription, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.patterns)
+
+    def add(self, pattern: str, node_id: str, callback: Callback) -> bool:
+        """Adds a subscription.
+
+        Returns:
+            False if the node already has this callback on this pattern.
+
+        Raises:
+            ValueError: If the pattern is invalid (see validate_pattern()).
+        """
+        tokens = validate_pattern(pattern)
+        subscriptions = self.patterns.get(pattern, [])
+        if any(sub_id == node_id and cb == callback for sub_id, cb in subscriptions):
+            return False
+        trie_node = self._root
+        for token in tokens:
+            trie_node = trie_node.children.setdefault(token, _TrieNode())
+        trie_node.subscriptions.append((node_id, callback))
+        self.patterns.setdefault(pattern, []).append((node_id, callback))
+        self._by_node.setdefault(node_id, set()).add(pattern)
+        self._cache.clear()
+        return True
+
+    def remove(self, pattern: str, node_id: str, callback: Optional[Callback] = None) -> int:
+        """Removes a node's subscriptions to a pattern (only `callback`'s if given).
+
+        Returns:
+            The number of subscriptions removed.
+        """
+        if pattern not in self.patterns:
+            return 0
+
+        def keep(subscription: Subscription) -> bool:
+            sub_id, cb = subscription
+            return sub_id != node_id or (callback is not None and cb != callback)
+
+        remaining = [sub for sub in self.patterns[pattern] if keep(sub)]
+        removed = len(self.patterns[pattern]) - len(remaining)
+        if not removed:
+            return 0
+        if remaining:
+            self.patterns[pattern] = remaining
+        else:
+            del self.patterns[pattern]
+        if not any(sub_id == node_id for sub_id, _ in remaining):
+            node_patterns = self._by_node.get(node_id)
+            if node_patterns is not None:
+                node_patterns.discard(pattern)
+                if not node_patterns:
+                    del self._by_node[node_id]
+
+        # Update the trie, pruning branches that no longer hold subscriptions
+        path = [self._root]
+        for token in pattern.split("."):
+            path.append(path[-1].children[token])
+        path[-1].subscriptions = [sub for sub in path[-1].subscriptions if keep(sub)]
+        for token, parent, child in zip(
+            reversed(pattern.split(".")), reversed(path[:-1]), reversed(path[1:])
+        ):
+            if child.subscriptions or child.children:
+                break
+            del parent.children[token]
+        self._cache.clear()
+        return removed
+
+    def remove_node(self, node_id: str) -> int:
+        """Removes every subscription of a node.
+
+        Returns:
+            The number of subscriptions removed.
+        """
+        patterns = list(self._by_node.get(node_id, ()))
+        return sum(self.remove(pattern, node_id) for pattern in patterns)
+
+    def patterns_of(self, node_id: str) -> Set[str]:
+        """Returns the patterns a node is subscribed to."""
+        return set(self._by_node.get(node_id, ()))
+
+    def match(self, topic: str) -> Tuple[Subscription, ...]:
+        """Returns the subscriptions whose pattern matches a topic.
+
+        Each (node, callback) pair appears once even if several of its patterns match.
+        """
+        cached = self._cache.get(topic)
+        if cached is not None:
+            return cached
+        found: List[Subscription] = []
+        self._collect(self._root, topic.split("."), 0, found)
+        seen: Set[Tuple[str, int]] = set()
+        result: List[Subscription] = []
+        for node_id, callback in found:
+            key = (node_id, id(callback))
+            if key not in seen:
+                seen.add(key)
+                result.append((node_id, callback))
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[topic] = matched = tuple(result)
+        return matched
+
+    def _collect(
+        self, trie_node: _TrieNode, tokens: List[str], index: int, found: List[Subscription]
+    ) -> None:
+        if index == len(tokens):
+            found.extend(trie_node.subscriptions)
+            return
+        tail = trie_node.children.get(TAIL_WILDCARD)
+        if tail is not None:
+            found.extend(tail.subscriptions)
+        for key in (tokens[index], SINGLE_WILDCARD):
+            child = trie_node.children.get(key)
+            if child is not None:
+                self._collect(child, tokens, index + 1, found)
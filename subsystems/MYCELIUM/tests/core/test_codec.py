@@ -0,0 +1,116 @@
+# subsystems/MYCELIUM/tests/core/test_codec.py
+
+import copy
+from datetime import datetime
+import json
+import unittest
+
+from subsystems.MYCELIUM.core import codec
+from subsystems.MYCELIUM.core.codec import (
+    JSON,
+    LazyEnvelope,
+    decode_envelope,
+    encode_envelope,
+    get_codec,
+    negotiate,
+    resolve_preferences,
+)
+from subsystems.MYCELIUM.core.compression import Compressor
+
+ENVELOPE = {
+    "message_id": "m-1",
+    "correlation_id": None,
+    "payload": {"text": "olá", "numbers": [1, 2.5, None], "nested": {"ok": True}},
+    "metadata": {},
+}
+
+
+class TestCodecs(unittest.TestCase):
+    def test_json_stays_plain_json(self):
+        """JSON envelopes are unframed so peers without codec support can read them."""
+        data = encode_envelope(ENVELOPE, get_codec(JSON))
+        self.assertEqual(json.loads(data.decode("utf-8")), ENVELOPE)
+        self.assertEqual(decode_envelope(data), (ENVELOPE, JSON))
+
+    def test_binary_codecs_round_trip_framed(self):
+        """Binary codecs frame their content type and decode back to the same envelope."""
+        for name in codec.available_codecs():
+            if name == JSON:
+                continue
+            with self.subTest(codec=name):
+                data = encode_envelope(ENVELOPE, get_codec(name))
+                self.assertTrue(data.startswith(codec.FRAME_MAGIC))
+                self.assertIn(get_codec(name).content_type.encode(), data[:32])
+                self.assertEqual(decode_envelope(data), (ENVELOPE, name))
+
+    def test_default_converts_unsupported_values(self):
+        message = {"payload": {"when": datetime(2025, 1, 2, 3, 4, 5)}}
+        with self.assertRaises(ValueError):
+            get_codec(JSON).encode(message)
+        decoded, _ = decode_envelope(encode_envelope(message, get_codec(JSON, default=str)))
+        self.assertEqual(decoded["payload"]["when"], "2025-01-02 03:04:05")
+
+    def test_malformed_frames_raise_value_error(self):
+        for data in (codec.FRAME_MAGIC, codec.FRAME_MAGIC + b"\x09\x00", b"{not json"):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                decode_envelope(data)
+        unknown = codec.FRAME_MAGIC + bytes((codec.FRAME_VERSION, 9)) + b"text/yaml{}"
+        with self.assertRaises(ValueError):
+            decode_envelope(unknown)
+
+    def test_negotiation_falls_back_to_json(self):
+        self.assertEqual(resolve_preferences(["no-such-codec"]), [JSON])
+        self.assertEqual(negotiate(["msgpack", JSON], None), JSON)
+        self.assertEqual(negotiate(["msgpack", JSON], ["cbor", JSON]), JSON)
+        self.assertEqual(negotiate(["msgpack", "cbor", JSON], ["cbor", "msgpack"]), "msgpack")
+
+    def test_split_envelopes_decode_the_payload_on_first_read(self):
+        for name in codec.available_codecs():
+            with self.subTest(codec=name):
+                data = encode_envelope(ENVELOPE, get_codec(name), split=True)
+                self.assertTrue(codec.is_split_frame(data))
+                envelope, decoded_with = decode_envelope(data)
+                self.assertIsInstance(envelope, LazyEnvelope)
+                self.assertEqual(decoded_with, name)
+                self.assertEqual(envelope["message_id"], "m-1")
+                self.assertIn("payload", envelope)
+                self.assertFalse(envelope.payload_decoded)
+                self.assertEqual(envelope["payload"], ENVELOPE["payload"])
+                self.assertTrue(envelope.payload_decoded)
+
+    def test_split_envelopes_behave_as_dictionaries(self):
+        data = encode_envelope(ENVELOPE, get_codec(JSON), split=True)
+        for convert in (dict, copy.deepcopy, lambda e: json.loads(json.dumps(e))):
+            with self.subTest(convert=convert):
+                envelope, _ = decode_envelope(data)
+                self.assertEqual(convert(envelope), convert(ENVELOPE))
+
+    def test_split_payloads_are_compressed_separately(self):
+        compressor = Compressor(enabled=True, threshold_bytes=64)
+        envelope = dict(ENVELOPE, payload={"text": "x" * 1000})
+        data = encode_envelope(envelope, get_codec(JSON), compressor, split=True)
+        self.assertLess(len(data), 300)
+        decoded, _ = decode_envelope(data, compressor=compressor, topic="egos.t")
+        self.assertEqual(compressor.get_stats()["received"], {})  # Not decompressed yet
+        self.assertEqual(decoded, envelope)
+        self.assertIn("egos.t", compressor.get_stats()["received"])
+
+    def test_malformed_split_payload_raises_when_read(self):
+        data = encode_envelope(ENVELOPE, get_codec(JSON), split=True)
+        envelope, _ = decode_envelope(data[:-3])
+        self.assertEqual(envelope["message_id"], "m-1")
+        with self.assertRaises(ValueError):
+            envelope["payload"]
+        with self.assertRaises(ValueError):
+            codec.frame_codec(data)
+
+    @unittest.skipUnless(codec.HAS_MSGPACK, "msgpack not installed")
+    def test_msgpack_is_smaller_than_json(self):
+        envelope = dict(ENVELOPE, payload={"files": [{"size": i, "ok": True} for i in range(200)]})
+        json_bytes = encode_envelope(envelope, get_codec(JSON))
+        msgpack_bytes = encode_envelope(envelope, get_codec("msgpack"))
+        self.assertLess(len(msgpack_bytes), len(json_bytes))
+
+
+if __name__ == "__main__":
+    unittest.main()
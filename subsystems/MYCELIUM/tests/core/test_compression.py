@@ -0,0 +1,72 @@
+# subsystems/MYCELIUM/tests/core/test_compression.py
+
+import os
+import unittest
+
+from subsystems.MYCELIUM.benchmarks.payloads import cronos_backup_listing
+from subsystems.MYCELIUM.core import codec, compression
+from subsystems.MYCELIUM.core.codec import decode_envelope, encode_envelope, get_codec
+from subsystems.MYCELIUM.core.compression import Compressor
+
+TOPIC = "event.cronos.backup.listing"
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.compressor = Compressor(enabled=True, threshold_bytes=1024)
+        self.envelope = {"payload": cronos_backup_listing(200), "metadata": {}}
+
+    def test_large_envelopes_are_compressed_transparently(self):
+        for name in codec.available_codecs():
+            with self.subTest(codec=name):
+                data = encode_envelope(self.envelope, get_codec(name), self.compressor, TOPIC)
+                frame = codec.split_frame(data)
+                self.assertEqual(frame.encoding, "zlib")
+                self.assertLess(len(data), frame.original_length)
+                decoded, used = decode_envelope(data, compressor=self.compressor, topic=TOPIC)
+                self.assertEqual((decoded, used), (self.envelope, name))
+                # Receivers without a configured compressor still decompress
+                self.assertEqual(decode_envelope(data)[0], self.envelope)
+
+    def test_small_envelopes_stay_plain(self):
+        small = {"payload": {"status": "ok"}}
+        data = encode_envelope(small, get_codec(codec.JSON), self.compressor, TOPIC)
+        self.assertEqual(data, get_codec(codec.JSON).encode(small))
+
+    def test_incompressible_data_is_sent_uncompressed(self):
+        algorithm, data = self.compressor.compress(os.urandom(4096), TOPIC)
+        self.assertIsNone(algorithm)
+        self.assertEqual(self.compressor.sent.get(TOPIC).compressed, 0)
+
+    def test_per_topic_ratios(self):
+        encode_envelope(self.envelope, get_codec(codec.JSON), self.compressor, TOPIC)
+        encode_envelope({"payload": {}}, get_codec(codec.JSON), self.compressor, "event.small")
+        stats = self.compressor.get_stats()["sent"]
+        self.assertEqual(stats[TOPIC]["compressed"], 1)
+        self.assertLess(stats[TOPIC]["ratio"], 0.5)
+        self.assertEqual(stats["event.small"]["ratio"], 1.0)
+
+    def test_topic_count_is_bounded(self):
+        stats = compression.CompressionStats(max_topics=2)
+        for index in range(5):
+            stats.record(f"_INBOX.{index}", 10, 10, False)
+        self.assertEqual(set(stats.snapshot()), {"_INBOX.0", "_INBOX.1", compression.OTHER_TOPICS})
+        self.assertEqual(stats.get(compression.OTHER_TOPICS).messages, 3)
+
+    def test_decompression_is_bounded_by_announced_length(self):
+        packed = compression.compress(b"x" * 10000)
+        self.assertEqual(compression.decompress(packed, "zlib", 10000), b"x" * 10000)
+        with self.assertRaises(ValueError):
+            compression.decompress(packed, "zlib", 100)  # Expands beyond what it announced
+        with self.assertRaises(ValueError):
+            compression.decompress(packed, "zlib", 10000, max_bytes=1000)
+        with self.assertRaises(ValueError):
+            compression.decompress(b"not compressed", "zlib", 10)
+
+    def test_unknown_algorithm_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Compressor(algorithm="rar")
+
+
+if __name__ == "__main__":
+    unittest.main()
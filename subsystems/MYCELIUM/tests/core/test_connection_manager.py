@@ -0,0 +1,152 @@
+# subsystems/MYCELIUM/tests/core/test_connection_manager.py
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from subsystems.MYCELIUM.core.connection_manager import NatsConnectionManager
+from subsystems.MYCELIUM.core.implementations.nats_interface import NatsMyceliumInterface
+
+SERVERS = ["nats://localhost:4222"]
+
+
+def _msg(subject, data=b"", reply=""):
+    msg = MagicMock()
+    msg.subject, msg.data, msg.reply, msg.headers = subject, data, reply, None
+    return msg
+
+
+class FakeNats:
+    """Records subscriptions and answers requests sent to 'echo.*' subjects."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.is_closed = False
+        self.connected_url = MagicMock(netloc="fake:4222")
+        self.subscriptions = {}  # subject -> callback
+        self.published = []
+        self.drain = AsyncMock(side_effect=self._close)
+        self.close = AsyncMock(side_effect=self._close)
+        self.flush = AsyncMock()
+
+    async def _close(self):
+        self.is_connected, self.is_closed = False, True
+
+    def new_inbox(self):
+        return "_INBOX.shared"
+
+    async def subscribe(self, subject, queue="", cb=None):
+        subscription = MagicMock()
+        subscription.unsubscribe = AsyncMock(
+            side_effect=lambda: self.subscriptions.pop(subject, None)
+        )
+        self.subscriptions[subject] = cb
+        return subscription
+
+    async def publish(self, subject, payload=b"", reply="", headers=None):
+        self.published.append((subject, payload, reply))
+        if subject.startswith("echo.") and reply:
+            await self.subscriptions["_INBOX.shared.*"](_msg(reply, b"re:" + payload))
+
+
+class TestNatsConnectionManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeNats()
+        patcher = patch(
+            "subsystems.MYCELIUM.core.connection_manager.nats.connect",
+            AsyncMock(return_value=self.fake),
+        )
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = NatsConnectionManager(SERVERS)
+
+    async def test_clients_share_one_connection_until_the_last_is_released(self):
+        ethik = await self.manager.client("ETHIK")
+        koios = await self.manager.client("KOIOS")
+        self.connect.assert_awaited_once()
+        self.assertTrue(ethik.is_connected and koios.is_connected)
+
+        await ethik.close()
+        self.assertFalse(ethik.is_connected)
+        self.assertTrue(koios.is_connected)
+        self.fake.drain.assert_not_awaited()
+        await koios.drain()
+        self.fake.drain.assert_awaited_once()
+        self.assertFalse(self.manager.is_connected)
+
+    async def test_subscriptions_are_reference_counted(self):
+        ethik = await self.manager.client("ETHIK")
+        koios = await self.manager.client("KOIOS")
+        received = []
+
+        async def on_ethik(msg):
+            received.append(("ETHIK", msg.data))
+
+        async def on_koios(msg):
+            received.append(("KOIOS", msg.data))
+
+        ethik_sub = await ethik.subscribe("egos.status", cb=on_ethik)
+        await koios.subscribe("egos.status", cb=on_koios)
+        self.assertEqual(list(self.fake.subscriptions), ["egos.status"])
+
+        await self.fake.subscriptions["egos.status"](_msg("egos.status", b"up"))
+        self.assertEqual(received, [("ETHIK", b"up"), ("KOIOS", b"up")])
+
+        await ethik_sub.unsubscribe()
+        self.assertIn("egos.status", self.fake.subscriptions)
+        await koios.close()
+        self.assertNotIn("egos.status", self.fake.subscriptions)
+
+    async def test_queue_group_messages_reach_one_local_subscriber(self):
+        clients = [await self.manager.client(name) for name in ("A", "B")]
+        received = []
+        for client in clients:
+
+            async def on_msg(msg, name=client.name):
+                received.append(name)
+
+            await client.subscribe("work.items", queue="workers", cb=on_msg)
+        for _ in range(4):
+            await self.fake.subscriptions["work.items"](_msg("work.items"))
+        self.assertEqual(sorted(received), ["A", "A", "B", "B"])
+
+    async def test_requests_share_the_wildcard_inbox(self):
+        ethik = await self.manager.client("ETHIK")
+        nexus = await self.manager.client("NEXUS")
+        replies = await asyncio.gather(
+            ethik.request("echo.one", b"1", timeout=1), nexus.request("echo.two", b"2", timeout=1)
+        )
+        self.assertEqual([reply.data for reply in replies], [b"re:1", b"re:2"])
+        inbox_subscriptions = [s for s in self.fake.subscriptions if s.startswith("_INBOX")]
+        self.assertEqual(inbox_subscriptions, ["_INBOX.shared.*"])
+        reply_subjects = {reply for _, _, reply in self.fake.published}
+        self.assertEqual(len(reply_subjects), 2)
+        self.assertEqual(self.manager.get_stats()["pending_requests"], 0)
+
+    async def test_request_without_reply_times_out(self):
+        from nats.errors import TimeoutError as NatsTimeoutError
+
+        client = await self.manager.client("ETHIK")
+        with self.assertRaises(NatsTimeoutError):
+            await client.request("silent.subject", b"", timeout=0.02)
+
+    async def test_interfaces_use_shared_connection(self):
+        NatsConnectionManager._shared.pop(tuple(SERVERS), None)
+        interfaces = [
+            NatsMyceliumInterface(name, shared_connection=True) for name in ("ETHIK", "CRONOS")
+        ]
+        try:
+            for interface in interfaces:
+                await interface.connect(SERVERS)
+            self.connect.assert_awaited_once()
+            await interfaces[0].publish("egos.event", {"ok": True})
+            self.assertEqual(self.fake.published[0][0], "egos.event")
+            for interface in interfaces:
+                await interface.disconnect()
+            self.assertTrue(self.fake.is_closed)
+        finally:
+            NatsConnectionManager._shared.pop(tuple(SERVERS), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+# subsystems/MYCELIUM/tests/core/test_core_nats_interface.py
+
+import asyncio
+import unittest
+
+from subsystems.MYCELIUM.core.codec import JSON, available_codecs, get_codec, split_frame
+from subsystems.MYCELIUM.core.connection_manager import NatsConnectionManager
+from subsystems.MYCELIUM.core.local_broker import LocalNatsBroker
+from subsystems.MYCELIUM.core.metrics import IN, OUT
+from subsystems.MYCELIUM.core.nats_interface import NatsMyceliumInterface
+
+SERVERS = ["nats://local:4222"]
+TOPIC = "egos.ethik.validate"
+
+
+class CoreInterfaceTestCase(unittest.IsolatedAsyncioTestCase):
+    """Connects core interfaces to a LocalNatsBroker."""
+
+    async def asyncSetUp(self):
+        self.broker = LocalNatsBroker()
+
+    async def make_interface(self, node_id, **config):
+        config = {"servers": SERVERS, "metrics": {"interval": 0}, **config}
+        interface = NatsMyceliumInterface(config, node_id)
+        with self.broker.install():
+            self.assertTrue(await interface.connect())
+        self.addAsyncCleanup(interface.disconnect)
+        return interface
+
+    async def serve(self, interface, handler):
+        """Subscribes `interface` to TOPIC, answering requests with handler(payload)."""
+
+        async def on_request(message, reply_subject=None):
+            await interface.send_reply(reply_subject, message, await handler(message["payload"]))
+
+        await interface.subscribe(TOPIC, on_request)
+
+
+class TestCoreInterfaceRequestReply(CoreInterfaceTestCase):
+    async def test_request_reply(self):
+        ethik = await self.make_interface("ETHIK")
+        koios = await self.make_interface("KOIOS")
+        requests = []
+
+        async def validate(payload):
+            requests.append(payload)
+            return {"valid": payload["n"] > 0}
+
+        await self.serve(ethik, validate)
+        response = await koios.send_request("ETHIK", TOPIC, {"n": 1}, timeout=1)
+
+        self.assertEqual(response, {"valid": True})
+        self.assertEqual(requests, [{"n": 1}])
+        self.assertEqual(koios.response_futures, {})
+
+    async def test_handler_error_is_raised_to_requester(self):
+        ethik = await self.make_interface("ETHIK")
+        koios = await self.make_interface("KOIOS")
+
+        async def on_request(message, reply_subject=None):
+            raise RuntimeError("rules unavailable")
+
+        await ethik.subscribe(TOPIC, on_request)
+        with self.assertRaisesRegex(Exception, "rules unavailable"):
+            await koios.send_request("ETHIK", TOPIC, {"n": 1}, timeout=1)
+
+    async def test_events_reach_callback_without_reply_subject(self):
+        ethik = await self.make_interface("ETHIK")
+        koios = await self.make_interface("KOIOS")
+        events = []
+
+        async def on_event(message):
+            events.append((message["source_subsystem"], message["payload"]))
+
+        await koios.subscribe("egos.events.*", on_event)
+        await ethik.publish_event("egos.events.audit", {"ok": True})
+        await self.broker.flush()
+        self.assertEqual(events, [("ETHIK", {"ok": True})])
+
+
+class TestCoreInterfaceMetrics(CoreInterfaceTestCase):
+    async def test_received_messages_are_counted_by_type_and_subject(self):
+        ethik = await self.make_interface("ETHIK")
+        koios = await self.make_interface("KOIOS")
+        events = []
+
+        async def on_message(message, reply_subject=None):
+            if reply_subject:
+                await ethik.send_reply(reply_subject, message, {"valid": True})
+            else:
+                events.append(message["payload"])
+
+        await ethik.subscribe("egos.ethik.*", on_message)
+        await koios.send_request("ETHIK", TOPIC, {"n": 1}, timeout=1)
+        await koios.publish_event("egos.ethik.audit", {"ok": True})
+        await self.broker.flush()
+
+        metrics = ethik.get_metrics()
+        self.assertEqual(events, [{"ok": True}])
+        self.assertEqual(metrics["message_types"]["REQUEST"], {IN: 1, OUT: 0})
+        self.assertEqual(metrics["message_types"]["EVENT"][IN], 1)
+        self.assertEqual(metrics["topics"][TOPIC][IN], 1)
+        self.assertEqual(metrics["topics"]["egos.ethik.audit"][IN], 1)
+        self.assertNotIn("egos.ethik.*", metrics["topics"])
+
+
+class TestCoreInterfaceSharedConnection(CoreInterfaceTestCase):
+    async def test_co_located_nodes_share_one_connection(self):
+        NatsConnectionManager._shared.pop(tuple(SERVERS), None)
+        self.addCleanup(NatsConnectionManager._shared.pop, tuple(SERVERS), None)
+        ethik = await self.make_interface("ETHIK", shared_connection=True)
+        koios = await self.make_interface("KOIOS", shared_connection=True)
+
+        async def validate(payload):
+            return {"valid": True}
+
+        await self.serve(ethik, validate)
+        response = await koios.send_request("ETHIK", TOPIC, {"n": 1}, timeout=1)
+
+        self.assertEqual(response, {"valid": True})
+        self.assertEqual(self.broker.get_stats()["clients"], 1)
+        manager = NatsConnectionManager._shared[tuple(SERVERS)]
+        self.assertEqual(
+            manager.get_stats()["clients"], ["ETHIK-GENERIC-v0.1", "KOIOS-GENERIC-v0.1"]
+        )
+
+        await ethik.disconnect()
+        await koios.disconnect()
+        self.assertEqual(self.broker.get_stats()["clients"], 0)
+
+
+class TestCoreInterfaceSingleFlight(CoreInterfaceTestCase):
+    async def test_identical_concurrent_requests_share_one_response(self):
+        ethik = await self.make_interface("ETHIK")
+        koios = await self.make_interface("KOIOS", single_flight=["egos.ethik.*"])
+        calls = 0
+
+        async def validate(payload):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"valid": True}
+
+        await self.serve(ethik, validate)
+        responses = await asyncio.gather(
+            *(koios.send_request("ETHIK", TOPIC, {"n": 1}, timeout=1) for _ in range(2))
+        )
+
+        self.assertEqual(responses, [{"valid": True}, {"valid": True}])
+        self.assertEqual(calls, 1)
+        stats = koios.get_single_flight_stats()
+        self.assertEqual(stats["subjects"]["egos.ethik.*"], {"calls": 2, "shared": 1})
+        self.assertEqual(stats["in_flight"], 0)
+
+
+@unittest.skipUnless("msgpack" in available_codecs(), "msgpack is not installed")
+class TestCoreInterfaceCodecNegotiation(CoreInterfaceTestCase):
+    async def test_peers_switch_to_a_negotiated_codec(self):
+        ethik = await self.make_interface("ETHIK", codecs=["msgpack"])
+        koios = await self.make_interface("KOIOS", codecs=["msgpack"])
+        content_types = []
+
+        async def record(msg):
+            content_types.append(split_frame(msg.data).content_type)
+
+        monitor = await self.broker.connect(SERVERS)
+        self.addAsyncCleanup(monitor.close)
+        await monitor.subscribe(TOPIC, cb=record)
+        await monitor.subscribe("_INBOX.>", cb=record)
+
+        async def echo(payload):
+            return payload
+
+        await self.serve(ethik, echo)
+        for n in range(2):
+            self.assertEqual(
+                await koios.send_request("ETHIK", TOPIC, {"n": n}, timeout=1), {"n": n}
+            )
+        await self.broker.flush()
+
+        json_type, msgpack_type = get_codec(JSON).content_type, get_codec("msgpack").content_type
+        # The first request is JSON (KOIOS knows nothing about ETHIK yet), ETHIK answers in
+        # msgpack as the request advertised it, and the second request uses msgpack too
+        self.assertEqual(content_types, [json_type, msgpack_type, msgpack_type, msgpack_type])
+        self.assertIn("msgpack", koios._peer_codecs["ETHIK"])
+
+
+if __name__ == "__main__":
+    unittest.main()
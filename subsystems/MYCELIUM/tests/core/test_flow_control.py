@@ -0,0 +1,165 @@
+# subsystems/MYCELIUM/tests/core/test_flow_control.py
+
+import asyncio
+from datetime import datetime
+import unittest
+
+from subsystems.MYCELIUM.core.flow_control import (
+    EVENT_LANE,
+    REQUEST_LANE,
+    RESPONSE_LANE,
+    PriorityMessageQueue,
+    QueueFullError,
+)
+from subsystems.MYCELIUM.core.network import MyceliumNetwork
+
+
+class TestPriorityMessageQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_responses_jump_ahead_of_events(self):
+        queue = PriorityMessageQueue()
+        await queue.put("event-1", EVENT_LANE)
+        await queue.put("request-1", REQUEST_LANE)
+        await queue.put("response-1", RESPONSE_LANE)
+        await queue.put("event-2", EVENT_LANE)
+        order = [(await queue.get())[1] for _ in range(4)]
+        self.assertEqual(order, ["response-1", "request-1", "event-1", "event-2"])
+
+    async def test_reject_policy_raises_but_accepts_forced_puts(self):
+        queue = PriorityMessageQueue(maxsize=1, overflow_policy="reject")
+        await queue.put("event-1")
+        with self.assertRaises(QueueFullError):
+            await queue.put("event-2")
+        await queue.put("response-1", RESPONSE_LANE, force=True)
+        self.assertEqual(queue.depths(), {RESPONSE_LANE: 1, REQUEST_LANE: 0, EVENT_LANE: 1})
+        self.assertEqual(queue.get_stats()["rejected"], 1)
+
+    async def test_drop_oldest_prefers_lowest_priority(self):
+        queue = PriorityMessageQueue(maxsize=2, overflow_policy="drop_oldest")
+        await queue.put("event-1", EVENT_LANE)
+        await queue.put("request-1", REQUEST_LANE)
+        self.assertEqual(await queue.put("request-2", REQUEST_LANE), "event-1")
+        self.assertEqual(await queue.put("event-2", EVENT_LANE), "event-2")  # Lowest priority
+        self.assertEqual(await queue.put("request-3", REQUEST_LANE), "request-1")
+        self.assertEqual([(await queue.get())[1] for _ in range(2)], ["request-2", "request-3"])
+        self.assertEqual(queue.dropped, 3)
+
+    async def test_block_policy_waits_for_room(self):
+        queue = PriorityMessageQueue(maxsize=1)
+        await queue.put("event-1")
+        producer = asyncio.create_task(queue.put("event-2"))
+        await asyncio.sleep(0.01)
+        self.assertFalse(producer.done())
+        self.assertEqual((await queue.get())[1], "event-1")
+        await asyncio.wait_for(producer, timeout=1.0)
+        self.assertEqual(queue.qsize(), 1)
+
+    def test_unknown_policy_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            PriorityMessageQueue(overflow_policy="spill")
+
+
+class TestNetworkBackpressure(unittest.IsolatedAsyncioTestCase):
+    def _message(self, msg_type, target, topic="egos.test", correlation_id=None):
+        return {
+            "header": {
+                "message_id": self.network.generate_uuid(),
+                "correlation_id": correlation_id,
+                "timestamp": datetime.now().isoformat(),
+                "sender_node": "SENDER",
+                "target_node": target,
+                "topic": topic,
+                "message_type": msg_type,
+                "priority": "MEDIUM",
+                "version": "1.0",
+            },
+            "payload": {},
+        }
+
+    async def test_node_concurrency_is_bounded(self):
+        self.network = MyceliumNetwork(node_concurrency=2)
+        await self.network.register_node("SENDER", "TEST", "1.0", [])
+        await self.network.register_node("SLOW", "TEST", "1.0", [])
+        running, peak, release = 0, 0, asyncio.Event()
+
+        async def slow_callback(message):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await release.wait()
+            running -= 1
+
+        await self.network.add_subscription("egos.test", "SLOW", slow_callback)
+        await self.network.start()
+        try:
+            for _ in range(10):
+                await self.network.route_message(self._message("EVENT", "TOPIC_TARGET"))
+            await asyncio.sleep(0.05)
+            status = self.network.get_network_status()["node_queues"]["SLOW"]
+            self.assertEqual(status["active"], 2)
+            self.assertEqual(status["depth"], 8)
+            release.set()
+            await asyncio.sleep(0.05)
+            self.assertEqual(peak, 2)
+            self.assertEqual(self.network.get_network_status()["node_queues"]["SLOW"]["depth"], 0)
+        finally:
+            await self.network.stop()
+
+    async def test_full_inbox_does_not_hold_up_other_nodes(self):
+        self.network = MyceliumNetwork(node_queue_size=1, node_concurrency=1)
+        await self.network.register_node("SENDER", "TEST", "1.0", [])
+        await self.network.register_node("SLOW", "TEST", "1.0", [])
+        await self.network.register_node("FAST", "TEST", "1.0", [])
+        release, delivered = asyncio.Event(), asyncio.Event()
+
+        async def slow_callback(message):
+            await release.wait()
+
+        async def fast_callback(message):
+            delivered.set()
+
+        await self.network.add_subscription("egos.slow", "SLOW", slow_callback)
+        await self.network.add_subscription("egos.fast", "FAST", fast_callback)
+        await self.network.start()
+        try:
+            await self.network.route_message(self._message("EVENT", "TOPIC_TARGET", "egos.slow"))
+            await asyncio.sleep(0.01)  # SLOW's only worker is now busy
+            for _ in range(3):
+                await self.network.route_message(
+                    self._message("EVENT", "TOPIC_TARGET", "egos.slow")
+                )
+            await self.network.route_message(self._message("EVENT", "TOPIC_TARGET", "egos.fast"))
+            await asyncio.wait_for(delivered.wait(), 0.5)
+            status = self.network.get_network_status()["node_queues"]["SLOW"]
+            self.assertEqual(status["active"], 1)
+            self.assertEqual(status["depth"], 1)
+            self.assertEqual(status["dropped"], 2)
+            release.set()
+        finally:
+            await self.network.stop()
+
+    async def test_dropped_request_is_answered_with_error(self):
+        self.network = MyceliumNetwork(max_queue_size=1, overflow_policy="drop_oldest")
+        await self.network.register_node("SENDER", "TEST", "1.0", [])
+        await self.network.register_node("TARGET", "TEST", "1.0", [])
+        responses = []
+
+        async def response_handler(message):
+            responses.append(message["payload"])
+
+        await self.network.register_response_handler("SENDER", response_handler)
+        await self.network.route_message(self._message("REQUEST", "TARGET", correlation_id="c-1"))
+        await self.network.route_message(self._message("REQUEST", "TARGET", correlation_id="c-2"))
+        await self.network.start()
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            await self.network.stop()
+        self.assertEqual(len(responses), 2)
+        self.assertEqual(responses[0]["status"], "ERROR")
+        self.assertIn("Request dropped", responses[0]["error_message"])
+        self.assertEqual(responses[1]["status"], "SUCCESS")
+        self.assertEqual(self.network.get_network_status()["queue"]["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+# subsystems/MYCELIUM/tests/core/test_local_broker.py
+
+import asyncio
+import json
+import unittest
+from unittest.mock import AsyncMock
+
+from nats.errors import (
+    MaxPayloadError,
+    NoRespondersError,
+    SlowConsumerError,
+    TimeoutError as NatsTimeoutError,
+)
+
+from subsystems.MYCELIUM.core.implementations.nats_interface import NatsMyceliumInterface
+from subsystems.MYCELIUM.core.local_broker import LocalNatsBroker
+from subsystems.MYCELIUM.core.nats_interface import (
+    NatsMyceliumInterface as CoreNatsMyceliumInterface,
+)
+
+SERVERS = ["nats://local:4222"]
+
+
+class TestLocalNatsBroker(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.broker = LocalNatsBroker()
+        self.nc = await self.broker.connect(SERVERS)
+        self.addAsyncCleanup(self.nc.close)
+
+    async def test_wildcards(self):
+        received = []
+
+        async def on_msg(msg):
+            received.append(msg.subject)
+
+        await self.nc.subscribe("egos.*.status", cb=on_msg)
+        await self.nc.subscribe("egos.>", cb=on_msg)
+        await self.nc.publish("egos.ETHIK.status", b"up")
+        await self.nc.publish("egos.ETHIK.audit.log", b"")
+        await self.nc.publish("other.ETHIK.status", b"")
+        await self.nc.flush()
+        self.assertEqual(
+            sorted(received), ["egos.ETHIK.audit.log", "egos.ETHIK.status", "egos.ETHIK.status"]
+        )
+
+    async def test_queue_group_delivers_to_one_member(self):
+        received = {"a": 0, "b": 0, "monitor": 0}
+
+        def counter(name):
+            async def on_msg(msg):
+                received[name] += 1
+
+            return on_msg
+
+        await self.nc.subscribe("work.items", queue="workers", cb=counter("a"))
+        await self.nc.subscribe("work.items", queue="workers", cb=counter("b"))
+        await self.nc.subscribe("work.items", cb=counter("monitor"))
+        for _ in range(6):
+            await self.nc.publish("work.items", b"job")
+        await self.nc.flush()
+        self.assertEqual(received, {"a": 3, "b": 3, "monitor": 6})
+
+    async def test_request_reply_through_inbox(self):
+        responder = await self.broker.connect(SERVERS)
+        self.addAsyncCleanup(responder.close)
+
+        async def echo(msg):
+            self.assertTrue(msg.reply.startswith("_INBOX."))
+            await msg.respond(b"re:" + msg.data)
+
+        await responder.subscribe("echo", cb=echo)
+        replies = await asyncio.gather(
+            *(self.nc.request("echo", str(i).encode(), timeout=1) for i in range(3))
+        )
+        self.assertEqual([reply.data for reply in replies], [b"re:0", b"re:1", b"re:2"])
+
+    async def test_request_errors(self):
+        with self.assertRaises(NoRespondersError):
+            await self.nc.request("nobody.listens", b"", timeout=1)
+
+        async def silent(msg):
+            pass
+
+        await self.nc.subscribe("silent", cb=silent)
+        with self.assertRaises(NatsTimeoutError):
+            await self.nc.request("silent", b"", timeout=0.02)
+        with self.assertRaises(MaxPayloadError):
+            await self.nc.publish("big", b"x" * (self.broker.max_payload + 1))
+
+    async def test_slow_consumer_drops_and_reports(self):
+        error_cb = AsyncMock()
+        consumer = await self.broker.connect(SERVERS, error_cb=error_cb)
+        self.addAsyncCleanup(consumer.close)
+        release = asyncio.Event()
+        received = []
+
+        async def slow(msg):
+            await release.wait()
+            received.append(msg.data)
+
+        await consumer.subscribe("fast.stream", cb=slow, pending_msgs_limit=2)
+        for i in range(5):
+            await self.nc.publish("fast.stream", str(i).encode())
+        release.set()
+        await self.nc.flush()
+
+        # Publishing does not yield, so only the first two messages fit in the queue
+        self.assertEqual(received, [b"0", b"1"])
+        self.assertEqual(self.broker.get_stats()["slow_consumer_drops"], 3)
+        self.assertEqual(error_cb.await_count, 3)
+        self.assertIsInstance(error_cb.await_args.args[0], SlowConsumerError)
+
+    async def test_unsubscribe_and_close(self):
+        closed_cb = AsyncMock()
+        client = await self.broker.connect(SERVERS, closed_cb=closed_cb)
+        received = []
+
+        async def on_msg(msg):
+            received.append(msg.data)
+
+        sub = await client.subscribe("egos.status", cb=on_msg)
+        await sub.unsubscribe()
+        await self.nc.publish("egos.status", b"up")
+        await self.nc.flush()
+        self.assertEqual(received, [])
+
+        await client.subscribe("egos.status", cb=on_msg)
+        await client.drain()
+        self.assertTrue(client.is_closed)
+        closed_cb.assert_awaited_once()
+        self.assertEqual(self.broker.get_stats()["subscriptions"], 0)
+
+
+class TestInterfacesOverLocalBroker(unittest.IsolatedAsyncioTestCase):
+    async def test_interfaces_exchange_messages(self):
+        broker = LocalNatsBroker()
+        with broker.install():
+            ethik = NatsMyceliumInterface("ETHIK")
+            koios = NatsMyceliumInterface("KOIOS")
+            await ethik.connect(SERVERS)
+            await koios.connect(SERVERS)
+        self.addAsyncCleanup(ethik.disconnect)
+        self.addAsyncCleanup(koios.disconnect)
+
+        events = []
+
+        async def on_event(envelope):
+            events.append((envelope["source_subsystem"], envelope["payload"]))
+
+        await koios.subscribe("egos.events.*", on_event)
+        await ethik.publish("egos.events.audit", {"ok": True})
+
+        async def answer(msg):
+            request = json.loads(msg.data)
+            await msg.respond(json.dumps({"payload": {"echo": request["payload"]}}).encode())
+
+        responder = await broker.connect(SERVERS)
+        self.addAsyncCleanup(responder.close)
+        await responder.subscribe("egos.atlas.map", cb=answer)
+        response = await koios.request("egos.atlas.map", {"depth": 2}, timeout=1)
+
+        await broker.flush()
+        self.assertEqual(events, [("ETHIK", {"ok": True})])
+        self.assertEqual(response["payload"], {"echo": {"depth": 2}})
+
+    async def test_core_interfaces_request_and_reply(self):
+        broker = LocalNatsBroker()
+        config = {"servers": SERVERS, "metrics": {"interval": 0}}
+        with broker.install():
+            ethik = CoreNatsMyceliumInterface(config, "ETHIK")
+            koios = CoreNatsMyceliumInterface(config, "KOIOS")
+            self.assertTrue(await ethik.connect())
+            self.assertTrue(await koios.connect())
+        self.addAsyncCleanup(ethik.disconnect)
+        self.addAsyncCleanup(koios.disconnect)
+
+        async def on_request(message, reply_subject=None):
+            await ethik.send_reply(reply_subject, message, {"echo": message["payload"]})
+
+        await ethik.subscribe("egos.atlas.map", on_request)
+        response = await koios.send_request("ETHIK", "egos.atlas.map", {"depth": 2}, timeout=1)
+        self.assertEqual(response, {"echo": {"depth": 2}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# subsystems/MYCELIUM/tests/core/test_metrics.py
+
+import asyncio
+import unittest
+
+from subsystems.MYCELIUM.core.metrics import (
+    IN,
+    OUT,
+    LatencyHistogram,
+    MeshMetrics,
+    MetricsReporter,
+)
+from subsystems.MYCELIUM.core.network import MyceliumNetwork
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_are_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(0.001)
+        for _ in range(10):
+            histogram.record(0.1)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        # Buckets are about 19% wide, so percentiles are within that of the samples
+        self.assertAlmostEqual(snapshot["p50_ms"], 1.0, delta=0.2)
+        self.assertAlmostEqual(snapshot["p95_ms"], 100.0, delta=20)
+        self.assertEqual(snapshot["max_ms"], 100.0)
+        self.assertEqual(LatencyHistogram().snapshot()["p99_ms"], 0.0)
+
+
+class TestMeshMetrics(unittest.TestCase):
+    def test_only_every_nth_operation_of_a_stage_is_timed(self):
+        metrics = MeshMetrics(sample_every=4)
+        for _ in range(8):
+            metrics.stop("encode", "egos.a", metrics.start("encode"))
+            metrics.stop("decode", "egos.a", metrics.start("decode"))
+        latency = metrics.snapshot()["latency"]
+        self.assertEqual(latency["encode"]["egos.a"]["count"], 2)
+        self.assertEqual(latency["decode"]["*"]["count"], 2)
+
+    def test_counters_and_topic_limit(self):
+        metrics = MeshMetrics(max_topics=2)
+        for topic in ("egos.a", "egos.b", "egos.c", "egos.d"):
+            metrics.count(topic, "EVENT", OUT)
+        metrics.count("egos.a", "RESPONSE", IN)
+        snapshot = metrics.snapshot()
+        self.assertEqual(
+            snapshot["topics"],
+            {"egos.a": {IN: 1, OUT: 1}, "egos.b": {IN: 0, OUT: 1}, "_other": {IN: 0, OUT: 2}},
+        )
+        self.assertEqual(snapshot["message_types"]["EVENT"], {IN: 0, OUT: 4})
+        self.assertEqual(snapshot["messages"], {IN: 1, OUT: 4})
+
+    def test_in_flight_tracks_current_and_peak(self):
+        metrics = MeshMetrics()
+        metrics.enter("requests")
+        metrics.enter("requests")
+        metrics.leave("requests")
+        self.assertEqual(metrics.snapshot()["in_flight"]["requests"], {"current": 1, "peak": 2})
+
+
+class TestMetricsReporter(unittest.IsolatedAsyncioTestCase):
+    async def test_publishes_snapshots_periodically(self):
+        published = []
+
+        async def publish(subject, payload):
+            published.append((subject, payload))
+
+        reporter = MetricsReporter(MeshMetrics(), publish, "egos.metrics.MYCELIUM.test", 0.01)
+        reporter.start()
+        await asyncio.sleep(0.035)
+        await reporter.stop()
+        self.assertGreaterEqual(len(published), 2)
+        self.assertEqual(published[0][0], "egos.metrics.MYCELIUM.test")
+        self.assertIn("latency", published[0][1])
+        self.assertFalse(reporter.running)
+
+
+class TestNetworkMetrics(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.network = MyceliumNetwork(metrics_sample_every=1, metrics_interval=0.01)
+        await self.network.register_node("CORUJA", "TEST", "1.0", [])
+        await self.network.register_node("ETHIK", "TEST", "1.0", [])
+        await self.network.start()
+
+    async def asyncTearDown(self):
+        await self.network.stop()
+
+    async def test_requests_and_handlers_are_measured(self):
+        for fast_path in (True, False):
+            await self.network.send_request(
+                "CORUJA", "ETHIK", "ethik.validate", {}, fast_path=fast_path
+            )
+        metrics = self.network.get_network_status()["metrics"]
+        self.assertEqual(metrics["latency"]["rtt"]["ethik.validate"]["count"], 2)
+        self.assertEqual(metrics["latency"]["handler"]["ethik.validate"]["count"], 2)
+        self.assertEqual(metrics["message_types"]["REQUEST"], {IN: 2, OUT: 2})
+        self.assertEqual(metrics["message_types"]["RESPONSE"], {IN: 2, OUT: 2})
+        self.assertEqual(metrics["in_flight"]["requests"], {"current": 0, "peak": 1})
+
+    async def test_snapshots_are_published_to_subscribers(self):
+        snapshots = []
+
+        async def on_metrics(message):
+            snapshots.append(message["payload"])
+
+        await self.network.add_subscription("egos.metrics.MYCELIUM.>", "CORUJA", on_metrics)
+        await asyncio.sleep(0.05)
+        self.assertTrue(snapshots)
+        self.assertIn("messages_per_s", snapshots[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
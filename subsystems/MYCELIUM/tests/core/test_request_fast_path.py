@@ -0,0 +1,95 @@
+# subsystems/MYCELIUM/tests/core/test_request_fast_path.py
+
+import asyncio
+import unittest
+
+from subsystems.MYCELIUM.core.network import MyceliumNetwork
+from subsystems.MYCELIUM.core.timer_wheel import TimerWheel
+
+
+class TestTimerWheel(unittest.IsolatedAsyncioTestCase):
+    async def test_fires_due_callbacks_and_skips_cancelled(self):
+        wheel = TimerWheel(tick=0.005, slots=8)
+        fired = []
+        wheel.schedule(0.01, lambda: fired.append("short"))
+        wheel.schedule(0.08, lambda: fired.append("long"))  # More than one revolution
+        cancelled = wheel.schedule(0.01, lambda: fired.append("cancelled"))
+        self.assertTrue(wheel.cancel(cancelled))
+        self.assertFalse(wheel.cancel(cancelled))
+
+        await asyncio.sleep(0.03)
+        self.assertEqual(fired, ["short"])
+        await asyncio.sleep(0.1)
+        self.assertEqual(fired, ["short", "long"])
+        self.assertEqual(len(wheel), 0)
+        await wheel.stop()
+
+
+class TestSendRequest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.network = MyceliumNetwork()
+        await self.network.register_node("CORUJA", "TEST", "1.0", [])
+        await self.network.register_node("ETHIK", "TEST", "1.0", [])
+        await self.network.start()
+
+    async def asyncTearDown(self):
+        await self.network.stop()
+
+    async def test_fast_path_calls_handler_without_queueing(self):
+        received = []
+
+        async def validate(message):
+            received.append(message)
+            self.assertEqual(self.network.message_queue.qsize(), 0)
+            return {"status": "SUCCESS", "is_valid": True}
+
+        self.network.nodes["ETHIK"].process_message = validate
+        payload = await self.network.send_request("CORUJA", "ETHIK", "ethik.validate", {"a": 1})
+
+        self.assertEqual(payload, {"status": "SUCCESS", "is_valid": True})
+        self.assertEqual(received[0]["header"]["message_type"], "REQUEST")
+        self.assertIsNotNone(received[0]["header"]["correlation_id"])
+        self.assertEqual(self.network.response_waiters, {})
+        self.assertEqual(self.network.get_network_status()["queue"]["high_water"], 0)
+
+    async def test_queued_path_resolves_waiter_by_correlation_id(self):
+        payload = await self.network.send_request(
+            "CORUJA", "ETHIK", "ethik.validate", {"a": 1}, fast_path=False
+        )
+        self.assertEqual(payload, {"status": "SUCCESS", "echo": {"a": 1}})
+        self.assertEqual(self.network.response_waiters, {})
+
+    async def test_error_responses_raise(self):
+        async def failing(message):
+            raise RuntimeError("rules unavailable")
+
+        self.network.nodes["ETHIK"].process_message = failing
+        with self.assertRaisesRegex(Exception, "Request failed: .*rules unavailable"):
+            await self.network.send_request("CORUJA", "ETHIK", "ethik.validate", {})
+        with self.assertRaisesRegex(Exception, "Request failed: .*not found"):
+            await self.network.send_request("CORUJA", "NEXUS", "nexus.analyze", {})
+
+    async def test_slow_handlers_time_out_and_waiters_are_cleaned(self):
+        cancelled = []
+
+        async def slow(message):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(message["header"]["correlation_id"])
+                raise
+
+        self.network.nodes["ETHIK"].process_message = slow
+        for fast_path in (True, False):
+            with self.subTest(fast_path=fast_path), self.assertRaises(asyncio.TimeoutError):
+                await self.network.send_request(
+                    "CORUJA", "ETHIK", "ethik.validate", {}, timeout=0.05, fast_path=fast_path
+                )
+            self.assertEqual(self.network.response_waiters, {})
+        # The timed-out fast-path handler was cancelled, not the caller's task
+        self.assertEqual(len(cancelled), 1)
+        await asyncio.sleep(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# subsystems/MYCELIUM/tests/core/test_single_flight.py
+
+import asyncio
+import unittest
+
+from subsystems.MYCELIUM.core.single_flight import SingleFlight, request_key
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    def test_request_key_ignores_key_order(self):
+        self.assertEqual(
+            request_key("atlas.map", {"a": 1, "b": [1, 2]}),
+            request_key("atlas.map", {"b": [1, 2], "a": 1}),
+        )
+        self.assertNotEqual(request_key("atlas.map", {"a": 1}), request_key("atlas.map", {"a": 2}))
+        self.assertNotEqual(
+            request_key("atlas.map", {}, "ATLAS"), request_key("atlas.map", {}, "NEXUS")
+        )
+
+    async def test_identical_requests_share_one_call(self):
+        single_flight = SingleFlight(["atlas.*"])
+        calls = 0
+
+        async def fetch_map():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"nodes": [1, 2, 3]}
+
+        key = request_key("atlas.map", {"depth": 2})
+        results = await asyncio.gather(
+            *(single_flight.run("atlas.map", key, fetch_map) for _ in range(5))
+        )
+
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(result == {"nodes": [1, 2, 3]} for result in results))
+        self.assertEqual(len({id(result) for result in results}), 5)  # Copies for followers
+        stats = single_flight.get_stats()
+        self.assertEqual(stats["subjects"]["atlas.*"], {"calls": 5, "shared": 4})
+        self.assertEqual(stats["in_flight"], 0)
+
+        # Nothing is cached once the response has arrived
+        await single_flight.run("atlas.map", key, fetch_map)
+        self.assertEqual(calls, 2)
+
+    async def test_errors_reach_every_caller_and_cancellation_does_not(self):
+        single_flight = SingleFlight([">"])
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise TimeoutError("no response")
+
+        key = request_key("nexus.analyze", {})
+        first = asyncio.create_task(single_flight.run("nexus.analyze", key, failing))
+        second = asyncio.create_task(single_flight.run("nexus.analyze", key, failing))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        with self.assertRaises(TimeoutError):
+            await second
+        self.assertTrue(first.cancelled())
+
+    def test_subjects_not_configured_are_not_coalesced(self):
+        self.assertIsNone(SingleFlight().pattern_for("atlas.map"))
+        self.assertIsNone(SingleFlight(["atlas.*"]).pattern_for("nexus.analyze"))
+        self.assertEqual(SingleFlight(["atlas.>"]).pattern_for("atlas.map.full"), "atlas.>")
+
+    def test_subject_cache_is_bounded(self):
+        single_flight = SingleFlight(["atlas.*"], cache_size=10)
+        for entity in range(100):
+            self.assertEqual(single_flight.pattern_for(f"atlas.map_{entity}"), "atlas.*")
+            self.assertIsNone(single_flight.pattern_for(f"nexus.analyze_{entity}"))
+        self.assertLessEqual(len(single_flight._enabled), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# subsystems/MYCELIUM/tests/core/test_topic_router.py
+
+import asyncio
+from datetime import datetime
+import unittest
+
+from subsystems.MYCELIUM.core.network import MyceliumNetwork
+from subsystems.MYCELIUM.core.topic_router import SubscriptionIndex
+
+
+async def callback_a(message):
+    pass
+
+
+async def callback_b(message):
+    pass
+
+
+class TestSubscriptionIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SubscriptionIndex()
+
+    def test_wildcard_matching(self):
+        self.index.add("egos.ethik.status", "EXACT", callback_a)
+        self.index.add("egos.*.status", "STAR", callback_a)
+        self.index.add("egos.>", "TAIL", callback_a)
+        self.index.add("*", "ONE_TOKEN", callback_a)
+
+        def matched(topic):
+            return sorted(node_id for node_id, _ in self.index.match(topic))
+
+        self.assertEqual(matched("egos.ethik.status"), ["EXACT", "STAR", "TAIL"])
+        self.assertEqual(matched("egos.koios.status"), ["STAR", "TAIL"])
+        self.assertEqual(matched("egos.koios.status.detail"), ["TAIL"])
+        self.assertEqual(matched("egos"), ["ONE_TOKEN"])  # '>' needs at least one token
+        self.assertEqual(matched("other.topic"), [])
+
+    def test_invalid_patterns_raise_value_error(self):
+        for pattern in ("egos..status", "egos.>.status", ""):
+            with self.subTest(pattern=pattern), self.assertRaises(ValueError):
+                self.index.add(pattern, "NODE", callback_a)
+
+    def test_duplicates_and_overlapping_patterns_match_once(self):
+        self.assertTrue(self.index.add("egos.>", "NODE", callback_a))
+        self.assertFalse(self.index.add("egos.>", "NODE", callback_a))
+        self.index.add("egos.*", "NODE", callback_a)
+        self.index.add("egos.*", "NODE", callback_b)
+        self.assertEqual(
+            self.index.match("egos.event"), (("NODE", callback_a), ("NODE", callback_b))
+        )
+
+    def test_cache_is_invalidated_by_changes(self):
+        self.index.add("egos.*", "A", callback_a)
+        self.assertEqual(len(self.index.match("egos.event")), 1)
+        self.index.add("egos.>", "B", callback_b)
+        self.assertEqual(len(self.index.match("egos.event")), 2)
+        self.assertEqual(self.index.remove("egos.*", "A"), 1)
+        self.assertEqual(self.index.match("egos.event"), (("B", callback_b),))
+
+    def test_remove_node_uses_reverse_index_and_prunes(self):
+        for i in range(50):
+            self.index.add(f"topic.{i}.*", "A", callback_a)
+        self.index.add("topic.1.*", "B", callback_b)
+        self.assertEqual(len(self.index.patterns_of("A")), 50)
+
+        self.assertEqual(self.index.remove_node("A"), 50)
+        self.assertEqual(self.index.patterns_of("A"), set())
+        self.assertEqual(list(self.index.patterns), ["topic.1.*"])
+        self.assertEqual(set(self.index._root.children["topic"].children), {"1"})
+        self.assertEqual(self.index.match("topic.1.x"), (("B", callback_b),))
+
+
+class TestNetworkWildcardRouting(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.network = MyceliumNetwork()
+        for node_id in ("SENDER", "ETHIK", "KOIOS"):
+            await self.network.register_node(node_id, "TEST", "1.0", [])
+        await self.network.start()
+
+    async def asyncTearDown(self):
+        await self.network.stop()
+
+    def _event(self, topic, target="TOPIC_TARGET"):
+        return {
+            "header": {
+                "message_id": self.network.generate_uuid(),
+                "correlation_id": None,
+                "timestamp": datetime.now().isoformat(),
+                "sender_node": "SENDER",
+                "target_node": target,
+                "topic": topic,
+                "message_type": "EVENT",
+                "priority": "MEDIUM",
+                "version": "1.0",
+            },
+            "payload": {},
+        }
+
+    async def test_events_reach_wildcard_subscribers(self):
+        received = []
+
+        async def ethik_callback(message):
+            received.append(("ETHIK", message["header"]["topic"]))
+
+        async def koios_callback(message):
+            received.append(("KOIOS", message["header"]["topic"]))
+
+        await self.network.add_subscription("egos.*.status", "ETHIK", ethik_callback)
+        await self.network.add_subscription("egos.>", "KOIOS", koios_callback)
+
+        await self.network.route_message(self._event("egos.cronos.status"))
+        await self.network.route_message(self._event("egos.cronos.backup.done"))
+        await asyncio.sleep(0.05)
+
+        self.assertCountEqual(
+            received,
+            [
+                ("ETHIK", "egos.cronos.status"),
+                ("KOIOS", "egos.cronos.status"),
+                ("KOIOS", "egos.cronos.backup.done"),
+            ],
+        )
+
+        await self.network.remove_node("KOIOS")
+        self.assertEqual(list(self.network.subscriptions), ["egos.*.status"])
+        self.assertTrue(await self.network.remove_subscription("egos.*.status", "ETHIK"))
+        self.assertEqual(self.network.match_subscriptions("egos.cronos.status"), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,7 @@ from nats.aio.msg import Msg
 from nats.errors import NoServersError
 import pytest
 
+from subsystems.MYCELIUM.core import codec
 from subsystems.MYCELIUM.core.implementations.nats_interface import NatsMyceliumInterface
 
 # Constants for testing
@@ -477,4 +478,263 @@ class TestNatsMyceliumInterface:
         # Assert nc.request was still called
         mock_nats_client.request.assert_awaited_once()
 
-    # ... rest of the placeholders ...
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(not codec.HAS_MSGPACK, reason="msgpack not installed")
+    async def test_request_codec_negotiation(self, mock_nats_client: AsyncMock):
+        """Requests use JSON until the responder advertises a preferred binary codec."""
+        nats_interface = NatsMyceliumInterface(TEST_SOURCE_SUBSYSTEM, codecs=["msgpack"])
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        response_envelope = {
+            "message_id": str(uuid.uuid4()),
+            "source_subsystem": "RESPONDER_SUB",
+            "correlation_id": None,
+            "payload": {"ok": True},
+            "metadata": {"accept": ["msgpack", "json"]},
+        }
+        mock_response_msg = MagicMock(spec=Msg)
+        mock_response_msg.data = codec.encode_envelope(
+            response_envelope, codec.get_codec("msgpack")
+        )
+        mock_nats_client.request.return_value = mock_response_msg
+
+        first = await nats_interface.request(TEST_SUBJECT, {"n": 1}, timeout=0.1)
+        second = await nats_interface.request(TEST_SUBJECT, {"n": 2}, timeout=0.1)
+
+        assert first["payload"] == second["payload"] == {"ok": True}
+        first_bytes, second_bytes = (c.args[1] for c in mock_nats_client.request.await_args_list)
+        assert json.loads(first_bytes)["metadata"]["accept"] == codec.available_codecs()
+        assert codec.decode_envelope(second_bytes)[1] == "msgpack"
+
+    @pytest.mark.asyncio
+    async def test_publish_compresses_large_payloads(self, mock_nats_client: AsyncMock):
+        """Payloads above the threshold travel compressed and are counted per subject."""
+        nats_interface = NatsMyceliumInterface(
+            TEST_SOURCE_SUBSYSTEM, compression={"enabled": True, "threshold_bytes": 1024}
+        )
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        large_payload = {"files": [{"path": f"file_{i}.py", "size": i} for i in range(500)]}
+
+        await nats_interface.publish(TEST_SUBJECT, large_payload)
+
+        sent_bytes = mock_nats_client.publish.await_args.args[1]
+        assert codec.split_frame(sent_bytes).encoding == "zlib"
+        assert nats_interface._unwrap_payload(sent_bytes)["payload"] == large_payload
+        stats = nats_interface.get_compression_stats()["sent"][TEST_SUBJECT]
+        assert stats["compressed"] == 1 and stats["ratio"] < 0.5
+
+    @pytest.mark.asyncio
+    async def test_large_payloads_stay_plain_json_by_default(self, mock_nats_client: AsyncMock):
+        """Without compression settings, peers that only parse JSON decode large messages."""
+        nats_interface = NatsMyceliumInterface(TEST_SOURCE_SUBSYSTEM)
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        large_payload = {"text": "x" * (128 * 1024)}
+
+        await nats_interface.publish(TEST_SUBJECT, large_payload)
+
+        sent_bytes = mock_nats_client.publish.await_args.args[1]
+        assert json.loads(sent_bytes.decode("utf-8"))["payload"] == large_payload
+        assert nats_interface.get_compression_stats()["sent"][TEST_SUBJECT]["compressed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_unpacked_for_subscribers(self, mock_nats_client: AsyncMock):
+        """A batch travels as one message and reaches the callback once per payload."""
+        nats_interface = NatsMyceliumInterface(TEST_SOURCE_SUBSYSTEM)
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        received = []
+
+        async def test_callback(envelope: Dict):
+            received.append(envelope)
+
+        await nats_interface.subscribe(TEST_SUBJECT, test_callback)
+        nats_callback = mock_nats_client.subscribe.await_args.kwargs["cb"]
+
+        await nats_interface.publish_batch(TEST_SUBJECT, [{"n": 1}, {"n": 2}, {"n": 3}])
+
+        mock_nats_client.publish.assert_awaited_once()
+        mock_msg = MagicMock(spec=Msg)
+        mock_msg.data = mock_nats_client.publish.await_args.args[1]
+        await nats_callback(mock_msg)
+        assert [envelope["payload"] for envelope in received] == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert len({envelope["message_id"] for envelope in received}) == 3
+        assert all(envelope["metadata"] == {} for envelope in received)
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_drop_rest_of_batch(
+        self, mock_nats_client: AsyncMock, caplog
+    ):
+        """A callback raising for one payload of a batch still gets the others."""
+        nats_interface = NatsMyceliumInterface(TEST_SOURCE_SUBSYSTEM)
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        received = []
+
+        async def test_callback(envelope: Dict):
+            if envelope["payload"]["n"] == 1:
+                raise RuntimeError("Callback failed")
+            received.append(envelope["payload"])
+
+        await nats_interface.subscribe(TEST_SUBJECT, test_callback)
+        nats_callback = mock_nats_client.subscribe.await_args.kwargs["cb"]
+        await nats_interface.publish_batch(TEST_SUBJECT, [{"n": 1}, {"n": 2}, {"n": 3}])
+
+        mock_msg = MagicMock(spec=Msg)
+        mock_msg.subject = TEST_SUBJECT
+        mock_msg.data = mock_nats_client.publish.await_args.args[1]
+        with caplog.at_level(logging.ERROR):
+            await nats_callback(mock_msg)
+        assert received == [{"n": 2}, {"n": 3}]
+        assert "Callback failed" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_coalesced_status_keeps_latest_value(self, mock_nats_client: AsyncMock):
+        """Latest-value-wins subjects send one batch with the newest payload per key."""
+        nats_interface = NatsMyceliumInterface(
+            TEST_SOURCE_SUBSYSTEM,
+            coalescing={"egos.*.status": {"window": 0.01, "latest_only": True, "key": "node"}},
+        )
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+
+        for i in range(5):
+            await nats_interface.publish("egos.cronos.status", {"node": "a", "progress": i})
+        await nats_interface.publish("egos.cronos.status", {"node": "b", "progress": 0})
+        await nats_interface.publish(TEST_SUBJECT, TEST_PAYLOAD)  # Not coalesced
+        assert mock_nats_client.publish.await_count == 1
+
+        await asyncio.sleep(0.05)
+        assert mock_nats_client.publish.await_count == 2
+        subject, data = mock_nats_client.publish.await_args.args
+        assert subject == "egos.cronos.status"
+        envelope = nats_interface._unwrap_payload(data)
+        assert [m["payload"] for m in envelope["payload"]["messages"]] == [
+            {"node": "a", "progress": 4},
+            {"node": "b", "progress": 0},
+        ]
+        assert nats_interface.get_batching_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_single_flight_requests_share_response(self, mock_nats_client: AsyncMock):
+        """Identical concurrent requests on single-flight subjects make one round trip."""
+        nats_interface = NatsMyceliumInterface(TEST_SOURCE_SUBSYSTEM, single_flight=["test.*"])
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        response = MagicMock(spec=Msg)
+        response.data = json.dumps({"payload": {"answer": 42}, "metadata": {}}).encode("utf-8")
+
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(0.02)
+            return response
+
+        mock_nats_client.request.side_effect = slow_request
+
+        results = await asyncio.gather(
+            nats_interface.request(TEST_SUBJECT, {"a": 1, "b": 2}),
+            nats_interface.request(TEST_SUBJECT, {"b": 2, "a": 1}),
+            nats_interface.request(TEST_SUBJECT, {"a": 2}),
+        )
+
+        assert [r["payload"] for r in results] == [{"answer": 42}] * 3
+        assert mock_nats_client.request.await_count == 2
+        stats = nats_interface.get_single_flight_stats()["subjects"]["test.*"]
+        assert stats == {"calls": 3, "shared": 1}
+
+    @pytest.mark.asyncio
+    async def test_metrics_count_messages_and_time_requests(self, mock_nats_client: AsyncMock):
+        """Messages are counted per subject and sampled operations are timed."""
+        nats_interface = NatsMyceliumInterface(
+            TEST_SOURCE_SUBSYSTEM, metrics={"sample_every": 1, "interval": 0}
+        )
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        response = MagicMock(spec=Msg)
+        response.data = json.dumps({"payload": {"ok": True}, "metadata": {}}).encode("utf-8")
+        mock_nats_client.request.return_value = response
+
+        await nats_interface.publish(TEST_SUBJECT, {"n": 1})
+        await nats_interface.request(TEST_SUBJECT, {"n": 2})
+
+        metrics = nats_interface.get_metrics()
+        assert metrics["topics"][TEST_SUBJECT] == {"in": 1, "out": 2}
+        assert metrics["message_types"]["REQUEST"] == {"in": 0, "out": 1}
+        assert metrics["latency"]["encode"][TEST_SUBJECT]["count"] == 2
+        assert metrics["latency"]["rtt"][TEST_SUBJECT]["count"] == 1
+        assert metrics["in_flight"]["requests"]["current"] == 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_count_received_messages_per_subject(self, mock_nats_client: AsyncMock):
+        """Messages on a wildcard subscription are counted under their own subject."""
+        nats_interface = NatsMyceliumInterface(
+            TEST_SOURCE_SUBSYSTEM, metrics={"sample_every": 1, "interval": 0}
+        )
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        await nats_interface.subscribe("egos.events.*", AsyncMock())
+        nats_callback = mock_nats_client.subscribe.await_args.kwargs["cb"]
+
+        mock_msg = MagicMock(spec=Msg)
+        mock_msg.subject = "egos.events.audit"
+        mock_msg.data = json.dumps({"payload": {"ok": True}, "metadata": {}}).encode("utf-8")
+        await nats_callback(mock_msg)
+
+        metrics = nats_interface.get_metrics()
+        assert metrics["topics"] == {"egos.events.audit": {"in": 1, "out": 0}}
+        assert metrics["latency"]["handler"]["egos.events.audit"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_split_envelopes_are_routed_on_the_header(self, mock_nats_client: AsyncMock):
+        """Subscribers receive split envelopes whose payload is decoded only when read."""
+        nats_interface = NatsMyceliumInterface(TEST_SOURCE_SUBSYSTEM, split_envelope=True)
+        with patch(
+            "subsystems.MYCELIUM.core.implementations.nats_interface.nats.connect",
+            return_value=mock_nats_client,
+        ):
+            await nats_interface.connect(TEST_SERVERS)
+        await nats_interface.publish(TEST_SUBJECT, {"rows": list(range(100))})
+        data = mock_nats_client.publish.await_args.args[1]
+        assert codec.is_split_frame(data)
+
+        received = []
+
+        async def header_only(envelope):
+            received.append(envelope)
+            assert envelope["source_subsystem"] == TEST_SOURCE_SUBSYSTEM
+
+        await nats_interface.subscribe(TEST_SUBJECT, header_only)
+        handler = mock_nats_client.subscribe.await_args.kwargs["cb"]
+        msg = MagicMock(spec=Msg)
+        msg.data = data
+        await handler(msg)
+
+        assert not received[0].payload_decoded
+        assert received[0]["payload"] == {"rows": list(range(100))}